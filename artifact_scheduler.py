@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Size-Aware Artifact Scheduling
+Plans the artifacts of a workflow run from their listing metadata (size_in_bytes,
+expired) before anything is downloaded:
+
+- expired artifacts are dropped (their download would only 410)
+- artifacts above the streaming threshold go to a dedicated streaming lane, so one
+  huge report never holds up the small ones
+- the rest run largest-first (LPT) on a worker pool, which keeps the makespan
+  within 4/3 of optimal
+
+Every plan carries its expected makespan from a throughput model; execute() reports
+it next to the actual wall time and feeds the observed times back into the model,
+so the estimates (and the threshold choice) can be tuned from real runs. Time a
+result reports as 'queue_wait' (waiting for a fair-scheduler parse slot) is not
+processing time and is left out, as are artifacts that failed. With a deadline,
+execute() cancels the artifacts that have not started when it passes, and does
+not start those the model expects to finish after it.
+"""
+
+import heapq
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_STREAMING_THRESHOLD = 256 * 1024 * 1024
+DEFAULT_BYTES_PER_SEC = 20 * 1024 * 1024
+DEFAULT_OVERHEAD_SEC = 0.05
+
+
+class ThroughputModel:
+    """
+    Expected processing time of an artifact: overhead + size / bytes_per_sec.
+
+    Both terms are refit after every observation by least squares over an
+    exponentially decaying window of recent artifacts.
+    """
+
+    def __init__(self, bytes_per_sec: float = DEFAULT_BYTES_PER_SEC, overhead_sec: float = DEFAULT_OVERHEAD_SEC,
+                 decay: float = 0.95):
+        self.bytes_per_sec = bytes_per_sec
+        self.overhead_sec = overhead_sec
+        self.decay = decay
+        self._sums = [0.0] * 5  # weight, size, seconds, size^2, size*seconds
+        self._lock = threading.Lock()
+
+    def expected(self, size: int) -> float:
+        return self.overhead_sec + size / self.bytes_per_sec
+
+    def observe(self, size: int, seconds: float):
+        """Fold one measured artifact into the estimates."""
+        with self._lock:
+            sums = [value * self.decay for value in self._sums]
+            for i, value in enumerate((1.0, size, seconds, size * size, size * seconds)):
+                sums[i] += value
+            self._sums = sums
+            weight, sx, sy, sxx, sxy = sums
+            denominator = weight * sxx - sx * sx
+            slope = (weight * sxy - sx * sy) / denominator if denominator > 1e-9 * weight * sxx else 0.0
+            if slope > 0:
+                self.bytes_per_sec = 1.0 / slope
+            # Keep the line through the weighted mean of the observations
+            self.overhead_sec = max(0.0, (sy - sx / self.bytes_per_sec) / weight)
+
+
+class ArtifactPlan:
+    """Lanes and expected times for one batch of artifacts."""
+
+    def __init__(self, pooled: List[Dict[str, Any]], streaming: List[Dict[str, Any]], expired: List[Dict[str, Any]],
+                 workers: int, model: ThroughputModel):
+        self.pooled = pooled
+        self.streaming = streaming
+        self.expired = expired
+        self.workers = workers
+        self.expected = {id(a): model.expected(a.get('size_in_bytes') or 0) for a in pooled + streaming}
+        self.expected_makespan = max(self._lpt_makespan(), sum(self.expected[id(a)] for a in streaming))
+        self.cancelled: List[Dict[str, Any]] = []
+        self.report: Optional[Dict[str, Any]] = None
+
+    def _lpt_makespan(self) -> float:
+        loads = [0.0] * min(self.workers, len(self.pooled))
+        for artifact in self.pooled:
+            heapq.heapreplace(loads, loads[0] + self.expected[id(artifact)])
+        return max(loads, default=0.0)
+
+    def __len__(self) -> int:
+        return len(self.pooled) + len(self.streaming)
+
+
+def plan_artifacts(artifacts: List[Dict[str, Any]], workers: int = 4,
+                   streaming_threshold: int = DEFAULT_STREAMING_THRESHOLD,
+                   model: Optional[ThroughputModel] = None, smallest_first: bool = False) -> ArtifactPlan:
+    """
+    Split artifacts into expired (dropped), streaming and pooled (largest first) lanes.
+
+    Args:
+        artifacts: GitHub artifact listings (size_in_bytes / expired are optional)
+        workers: Pool size the pooled lane will run on
+        streaming_threshold: Artifacts of at least this many bytes are streamed
+        model: Throughput model for expected times
+        smallest_first: Order the pooled lane smallest first (most artifacts done
+            early when time is short) instead of LPT
+    """
+    expired = [a for a in artifacts if a.get('expired')]
+    live = [a for a in artifacts if not a.get('expired')]
+    streaming = [a for a in live if (a.get('size_in_bytes') or 0) >= streaming_threshold]
+    pooled = sorted((a for a in live if (a.get('size_in_bytes') or 0) < streaming_threshold),
+                    key=lambda a: a.get('size_in_bytes') or 0, reverse=not smallest_first)
+    return ArtifactPlan(pooled, streaming, expired, max(1, workers), model or ThroughputModel())
+
+
+def execute(plan: ArtifactPlan, process: Callable[[Dict[str, Any], bool], Any],
+            model: Optional[ThroughputModel] = None,
+            deadline: Optional[float] = None) -> Iterator[Tuple[Dict[str, Any], Any, Optional[BaseException]]]:
+    """
+    Run a plan, yielding (artifact, result, error) in completion order.
+
+    process(artifact, streaming) runs on the worker threads; consume the results
+    (sink writes, counters) in the calling thread. A dict result's 'queue_wait'
+    seconds are subtracted from the artifact's measured time. Once the generator
+    is exhausted plan.report holds expected versus actual times.
+
+    At deadline (a time.monotonic() value) artifacts that have not started are
+    cancelled into plan.cancelled; those already running are allowed to finish.
+    With a model, an artifact whose expected time exceeds what is left when a
+    worker picks it up is cancelled too instead of being started.
+    """
+    started = time.perf_counter()
+    actual: Dict[int, float] = {}
+    failed = set()
+    skipped = set()
+    claim_deadline = deadline
+
+    def timed_process(artifact: Dict[str, Any], streaming: bool) -> Tuple[Any, Optional[BaseException]]:
+        if claim_deadline is not None and model is not None and \
+                time.monotonic() + model.expected(artifact.get('size_in_bytes') or 0) > claim_deadline:
+            skipped.add(id(artifact))
+            return None, None
+        start = time.perf_counter()
+        queue_wait = 0.0
+        try:
+            result = process(artifact, streaming)
+            if isinstance(result, dict):
+                queue_wait = result.get('queue_wait') or 0.0
+            return result, None
+        except Exception as e:
+            failed.add(id(artifact))
+            return None, e
+        finally:
+            actual[id(artifact)] = max(0.0, time.perf_counter() - start - queue_wait)
+
+    with ThreadPoolExecutor(max_workers=plan.workers, thread_name_prefix='artifact') as pool, \
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix='artifact-stream') as stream_lane:
+        # Submitted in LPT order; the pool picks them up as workers free up
+        futures = {pool.submit(timed_process, a, False): a for a in plan.pooled}
+        futures.update({stream_lane.submit(timed_process, a, True): a for a in plan.streaming})
+        pending = set(futures)
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done and deadline is not None:
+                plan.cancelled.extend(futures[f] for f in pending if f.cancel())
+                pending = {f for f in pending if not f.cancelled()}
+                deadline = None
+            for future in done:
+                result, error = future.result()
+                if id(futures[future]) in skipped:
+                    plan.cancelled.append(futures[future])
+                    continue
+                yield futures[future], result, error
+
+    wall = time.perf_counter() - started
+    if model is not None:
+        for artifact in plan.pooled + plan.streaming:
+            if id(artifact) in actual and id(artifact) not in failed:
+                model.observe(artifact.get('size_in_bytes') or 0, actual[id(artifact)])
+    plan.report = {
+        'artifacts': len(plan),
+        'streamed': len(plan.streaming),
+        'expired_skipped': len(plan.expired),
+        'cancelled': len(plan.cancelled),
+        'bytes': sum(a.get('size_in_bytes') or 0 for a in plan.pooled + plan.streaming if id(a) in actual),
+        'expected_makespan': plan.expected_makespan,
+        'actual_wall': wall,
+        'expected_work': sum(plan.expected.values()),
+        'actual_work': sum(actual.values())
+    }
+
+
+def summarize_reports(reports: List[Dict[str, Any]], model: Optional[ThroughputModel] = None) -> Dict[str, Any]:
+    """Aggregate execute() reports into expected/actual totals for tuning."""
+    summary = {key: sum(r[key] for r in reports) for key in
+               ('artifacts', 'streamed', 'expired_skipped', 'cancelled', 'bytes', 'expected_makespan', 'actual_wall',
+                'expected_work', 'actual_work')}
+    summary['batches'] = len(reports)
+    summary['makespan_ratio'] = summary['actual_wall'] / summary['expected_makespan'] if summary['expected_makespan'] else 0.0
+    if model is not None:
+        summary['model'] = {'bytes_per_sec': model.bytes_per_sec, 'overhead_sec': model.overhead_sec}
+    return summary
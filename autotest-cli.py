@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Autotest CLI
+One entry point for the ingestion and parser tools:
+
+    autotest-cli.py ingest [...]    pipeline-ingestion-system.py
+    autotest-cli.py load [...]      load-demo-data-to-autotest.py
+    autotest-cli.py fetch [...]     fetch-real-test-data.py
+    autotest-cli.py stress [...]    stress-test-parser.py
+    autotest-cli.py daemon          keep everything loaded and run jobs sent with --daemon URL
+    autotest-cli.py worker          long-running queue workers with the parser loaded once
+    autotest-cli.py bench           one-shot vs warm in-process jobs against a local GitHub simulator
+
+Script options are passed through unchanged (autotest-cli.py ingest --help lists
+them). With --daemon URL (or AUTOTEST_DAEMON_URL) the script commands run in a
+daemon that keeps the parser orchestrator, HTTP connection pools, history database
+and warmed scorers across jobs. Run long-running modes (--poll, --webhook-port,
+--upload-port, --workers) as their own processes rather than as daemon jobs,
+since the daemon runs one job at a time. The daemon and its clients share a
+bearer token in AUTOTEST_DAEMON_TOKEN.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+from cli_runner import (DEFAULT_DAEMON_PORT, JobDaemon, ROOT, SCRIPT_COMMANDS, daemon_status, load_command, run_captured,
+                        run_command, submit_job)
+from instrumentation import configure_from_env
+from lazy_imports import get_orchestrator
+
+
+def run_daemon(args: argparse.Namespace) -> int:
+    configure_from_env()
+    daemon = JobDaemon(os.environ['AUTOTEST_DAEMON_TOKEN'], args.host, args.port)
+    if not args.no_preload:
+        print(f"🔥 Preloaded scripts and parser in {daemon.preload():.2f}s")
+    print(f"🛰️  Job daemon on {daemon.url} (autotest-cli.py --daemon {daemon.url} ingest ...)")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"👋 Daemon stopped after {daemon.jobs} jobs")
+    return 0
+
+
+def run_workers(args: argparse.Namespace) -> int:
+    from work_queue import run_worker_pool
+    module = load_command('ingest')
+    if not args.no_preload:
+        # Forked workers inherit the loaded parser instead of each loading it on its first job
+        start = time.perf_counter()
+        get_orchestrator().load()
+        print(f"🔥 Parser loaded in {time.perf_counter() - start:.2f}s")
+    print(f"⚙️  {args.workers} workers serving {args.queue} (Ctrl-C to stop)")
+    try:
+        counts = run_worker_pool(args.queue, module.ingestion_worker, args.workers,
+                                 exit_when_idle=args.exit_when_idle, max_jobs=args.max_jobs, idle_sleep=args.idle_sleep)
+    except KeyboardInterrupt:
+        return 0
+    print(f"⚙️  Workers finished: {counts['completed']} jobs completed, {counts['failed']} retried, "
+          f"{counts['dead']} dead-lettered")
+    if counts['crashed']:
+        print(f"⚠️  {counts['crashed']} worker(s) crashed; their jobs are retried once the lease expires")
+    return 0
+
+
+def run_bench(args: argparse.Namespace) -> int:
+    from github_simulator import GitHubSimulator
+    simulator = GitHubSimulator(runs_per_repo=args.runs_per_repo).start()
+    job_args = ['--github-api', simulator.url, '--max-runs', str(args.max_runs)]
+    workdir = tempfile.TemporaryDirectory(prefix='autotest-bench-')
+    previous_cwd = os.getcwd()
+    os.chdir(workdir.name)  # history database, results log and demo files stay out of the caller's directory
+    print(f"⏱️  Benchmarking 'ingest {' '.join(job_args)}' against {simulator.url}")
+    try:
+        one_shot = None
+        if not args.skip_one_shot:
+            start = time.perf_counter()
+            subprocess.run([sys.executable, str(ROOT / SCRIPT_COMMANDS['ingest']), *job_args],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            one_shot = time.perf_counter() - start
+            print(f"   one-shot process: {one_shot:.2f}s")
+
+        seconds = []
+        for job in range(1, args.jobs + 1):
+            result = run_captured('ingest', job_args)
+            if result['exit_code']:
+                print(result['output'][-2000:])
+                print(f"❌ Job {job} exited with {result['exit_code']}")
+                return 1
+            seconds.append(result['seconds'])
+            print(f"   in-process job {job}: {result['seconds']:.2f}s")
+    finally:
+        os.chdir(previous_cwd)
+        workdir.cleanup()
+        simulator.stop()
+
+    warm = statistics.median(seconds[1:]) if len(seconds) > 1 else None
+    print(f"\n📊 First in-process job {seconds[0]:.2f}s"
+          + (f", warm jobs median {warm:.2f}s" if warm is not None else '')
+          + (f", one-shot process {one_shot:.2f}s" if one_shot is not None else ''))
+    if warm and one_shot:
+        print(f"   Warm jobs are {one_shot / warm:.1f}x faster than one-shot invocations")
+    print(f"   Simulator: {simulator.summary()}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Autotest ingestion and parser tools')
+    parser.add_argument('--daemon', default=os.getenv('AUTOTEST_DAEMON_URL'), metavar='URL',
+                        help='run script commands in a running autotest-cli.py daemon (default: AUTOTEST_DAEMON_URL)')
+    commands = parser.add_subparsers(dest='command', required=True, metavar='COMMAND')
+    for command, script in SCRIPT_COMMANDS.items():
+        # No help option of its own: --help is passed through to the script
+        commands.add_parser(command, add_help=False, help=f'run {script} (options passed through)')
+
+    daemon = commands.add_parser('daemon', help='keep scripts, parser and caches loaded and run submitted jobs '
+                                                '(shared token from AUTOTEST_DAEMON_TOKEN, required)')
+    daemon.add_argument('--host', default='127.0.0.1', help='interface to bind (default: %(default)s)')
+    daemon.add_argument('--port', type=int, default=DEFAULT_DAEMON_PORT, help='port to bind (default: %(default)s)')
+    daemon.add_argument('--no-preload', action='store_true', help='load scripts and the parser on the first job instead')
+    daemon.add_argument('--status', action='store_true', help='print the status of the daemon at --daemon URL and exit')
+
+    worker = commands.add_parser('worker', help='long-running ingestion queue workers with the parser loaded once')
+    worker.add_argument('--queue', default=os.getenv('WORK_QUEUE_DB', 'ingestion-queue.db'), metavar='DB|URL',
+                        help='work queue database file or --serve-queue URL (token from WORK_QUEUE_TOKEN) '
+                             '(default: WORK_QUEUE_DB or %(default)s)')
+    worker.add_argument('--workers', type=int, default=os.cpu_count() or 1, metavar='N',
+                        help='worker processes (default: CPU count)')
+    worker.add_argument('--max-jobs', type=int, metavar='N', help='stop each worker after N jobs (default: never)')
+    worker.add_argument('--idle-sleep', type=float, default=1.0, metavar='SECONDS',
+                        help='wait between claims while the queue is empty (default: %(default)s)')
+    worker.add_argument('--exit-when-idle', action='store_true', help='stop once the queue has no pending jobs')
+    worker.add_argument('--no-preload', action='store_true', help='let each worker load the parser on its first job')
+
+    bench = commands.add_parser('bench', help='compare one-shot and warm in-process ingest jobs')
+    bench.add_argument('--jobs', type=int, default=5, help='in-process ingest jobs to run (default: %(default)s)')
+    bench.add_argument('--max-runs', type=int, default=3, help='workflow runs per repository per job (default: %(default)s)')
+    bench.add_argument('--runs-per-repo', type=int, default=50, help='runs each simulated repository has (default: %(default)s)')
+    bench.add_argument('--skip-one-shot', action='store_true', help='skip the separate-process baseline run')
+
+    args, script_args = parser.parse_known_args(argv)
+    if args.command not in SCRIPT_COMMANDS:
+        if script_args:
+            parser.error(f"unrecognized arguments: {' '.join(script_args)}")
+        if args.command == 'daemon' and args.status:
+            if not args.daemon:
+                parser.error('daemon --status needs --daemon URL')
+            print(daemon_status(args.daemon))
+            return 0
+        if args.command == 'daemon' and not os.getenv('AUTOTEST_DAEMON_TOKEN'):
+            parser.error('daemon needs a shared token in AUTOTEST_DAEMON_TOKEN (clients send the same one)')
+        return {'daemon': run_daemon, 'worker': run_workers, 'bench': run_bench}[args.command](args)
+
+    if not args.daemon:
+        return run_command(args.command, script_args)
+    result = submit_job(args.daemon, args.command, script_args)
+    sys.stdout.write(result['output'])
+    print(f"🛰️  Job {result['job']} on {args.daemon}: exit {result['exit_code']} in {result['seconds']:.2f}s",
+          file=sys.stderr)
+    return result['exit_code']
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Startup Import-Time Check
+Imports each CLI script (without running main) under `python -X importtime` and
+fails when startup regresses:
+
+- a module that must stay lazy (the parser, numpy, ...) is imported at startup
+- the script's import time exceeds --budget-ms, or its recorded baseline by more
+  than --tolerance (record baselines with --update)
+
+Each script is measured --repeat times and the fastest run is kept, which keeps
+the check stable on noisy machines.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+ROOT = Path(__file__).resolve().parent
+SCRIPTS = (
+    'pipeline-ingestion-system.py',
+    'fetch-real-test-data.py',
+    'load-demo-data-to-autotest.py',
+    'stress-test-parser.py',
+    'autotest-cli.py'
+)
+# Loaded on first use only: the parser and numpy (see lazy_imports.py), and the modules of
+# one connector or serving mode, which are imported inside the branch that runs it
+LAZY_MODULES = ('core.parser_orchestrator', 'models', 'numpy', 'xml.etree.ElementTree',
+                'gitlab_connector', 'jenkins_connector', 'webhook_receiver', 'upload_service', 'work_queue',
+                'http.server', 'multiprocessing')
+DEFAULT_BUDGET_MS = 250.0
+DEFAULT_TOLERANCE = 0.25
+MARKER = '--- startup check ---'
+IMPORTTIME_RE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+LOADER = f'''
+import importlib.util, sys
+sys.stderr.write({MARKER!r} + "\\n")
+sys.stderr.flush()
+spec = importlib.util.spec_from_file_location("startup_check", sys.argv[1])
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+'''
+
+
+def measure(script: Path) -> Dict[str, Any]:
+    """Import a script once under -X importtime; returns total ms and per-module timings."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', LOADER, str(script)],
+                            cwd=script.parent, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f'importing {script.name} failed:\n{result.stderr[-2000:]}')
+    # Interpreter startup (site, encodings) is logged before the marker
+    lines = result.stderr.split(MARKER, 1)[-1].splitlines()
+    modules, total_us = {}, 0
+    for line in lines:
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match.group(1)), int(match.group(2)), match.group(3), match.group(4)
+        modules[name] = {'self_ms': self_us / 1000, 'cumulative_ms': cumulative_us / 1000, 'depth': len(indent) // 2}
+        if not indent:
+            total_us += cumulative_us
+    return {'total_ms': total_us / 1000, 'modules': modules}
+
+
+def check(script: Path, repeat: int, budget_ms: float, baseline_ms: float, tolerance: float) -> Dict[str, Any]:
+    """Measure a script; the result lists its startup problems (empty when it passes)."""
+    runs = [measure(script) for _ in range(repeat)]
+    best = min(runs, key=lambda run: run['total_ms'])
+    top = sorted(((m['cumulative_ms'], name) for name, m in best['modules'].items() if m['depth'] == 0), reverse=True)
+    print(f"⏱️  {script.name}: {best['total_ms']:.1f}ms "
+          f"(slowest: {', '.join(f'{name} {ms:.1f}ms' for ms, name in top[:4])})")
+
+    problems = [f'{script.name} imports {name} at startup' for name in LAZY_MODULES if name in best['modules']]
+    if best['total_ms'] > budget_ms:
+        problems.append(f"{script.name} takes {best['total_ms']:.1f}ms to import (budget {budget_ms:.0f}ms)")
+    if baseline_ms and best['total_ms'] > baseline_ms * (1 + tolerance):
+        problems.append(f"{script.name} takes {best['total_ms']:.1f}ms to import "
+                        f"(baseline {baseline_ms:.1f}ms + {tolerance:.0%})")
+    best['problems'] = problems
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check CLI script startup import time (-X importtime)')
+    parser.add_argument('scripts', nargs='*', default=list(SCRIPTS), help='scripts to check (default: all CLI scripts)')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'maximum import time per script (default: {DEFAULT_BUDGET_MS:.0f})')
+    parser.add_argument('--baseline', type=Path, help='JSON file of recorded import times per script')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'allowed slowdown over the baseline (default: {DEFAULT_TOLERANCE})')
+    parser.add_argument('--update', action='store_true', help='write the measured times to --baseline')
+    parser.add_argument('--repeat', type=int, default=3, help='imports per script; the fastest counts (default: 3)')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline and args.baseline.exists() and not args.update:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+
+    results = {name: check(ROOT / name, args.repeat, args.budget_ms, baseline.get(name, 0.0), args.tolerance)
+               for name in args.scripts}
+    problems = [problem for result in results.values() for problem in result['problems']]
+
+    if args.update and args.baseline:
+        args.baseline.write_text(json.dumps({name: round(result['total_ms'], 1) for name, result in results.items()},
+                                            indent=2), encoding='utf-8')
+        print(f"💾 Baseline written to {args.baseline}")
+    if problems:
+        print('\n❌ Startup regressions:')
+        for problem in problems:
+            print(f'   • {problem}')
+        sys.exit(1)
+    print('\n✅ Startup within budget')
+
+
+if __name__ == '__main__':
+    main()
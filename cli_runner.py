@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+CLI Job Runner
+Runs the CLI scripts as in-process jobs, so one long-running process can serve
+many invocations with its parser orchestrator, HTTP connection pools, history
+database and warmed scorers already loaded (see warm_cache.py).
+
+- run_command(): run one script's main() with an argument list and return its exit code
+- run_captured(): the same with environment overrides, timing and captured output
+- JobDaemon: HTTP server that runs jobs submitted by autotest-cli.py --daemon URL
+
+    POST /jobs    {"command": "ingest", "args": [...], "env": {...}}
+                  -> {"exit_code", "seconds", "output", "job"}
+    GET  /status  uptime, jobs run, whether the orchestrator is loaded, cache statistics
+
+Jobs run arbitrary script arguments and environment overrides inside the daemon
+process, so every request must carry the shared bearer token
+(AUTOTEST_DAEMON_TOKEN); submit_job() and daemon_status() send it.
+
+Jobs run one at a time. Each one sees the daemon's environment plus the job's
+"env" overrides (restored afterwards), and its stdout/stderr is captured and
+returned in the response. Both are process-wide (os.environ, sys.stdout and
+sys.stderr), which is why jobs are serialized: while a job runs, every other
+thread of the daemon also sees its environment and has its output captured.
+"""
+
+import contextlib
+import hmac
+import importlib.util
+import io
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+import urllib.request
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional
+
+from instrumentation import get_metrics
+from lazy_imports import get_orchestrator
+from warm_cache import cache_stats
+
+ROOT = Path(__file__).resolve().parent
+SCRIPT_COMMANDS = {
+    'ingest': 'pipeline-ingestion-system.py',
+    'load': 'load-demo-data-to-autotest.py',
+    'fetch': 'fetch-real-test-data.py',
+    'stress': 'stress-test-parser.py'
+}
+DEFAULT_DAEMON_PORT = 8087
+
+_modules: Dict[str, ModuleType] = {}
+_modules_lock = threading.Lock()
+
+
+def load_command(command: str) -> ModuleType:
+    """
+    Import the script behind a command (once per process). It is registered as
+    e.g. pipeline_ingestion_system so its functions can be pickled by reference.
+    """
+    if command not in SCRIPT_COMMANDS:
+        raise ValueError(f'unknown command {command!r} (expected one of {", ".join(SCRIPT_COMMANDS)})')
+    with _modules_lock:
+        if command not in _modules:
+            script = ROOT / SCRIPT_COMMANDS[command]
+            name = script.stem.replace('-', '_')
+            spec = importlib.util.spec_from_file_location(name, script)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[name]
+                raise
+            _modules[command] = module
+        return _modules[command]
+
+
+def run_command(command: str, argv: Optional[List[str]] = None) -> int:
+    """Run a command's main() in this process; returns its exit code (argparse errors and sys.exit included)."""
+    module = load_command(command)
+    try:
+        module.main(list(argv or []))
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    return 0
+
+
+@contextlib.contextmanager
+def job_environment(env: Optional[Dict[str, str]] = None):
+    """
+    Apply environment overrides for one job and restore the previous environment
+    afterwards. os.environ is process-wide: callers must not run jobs concurrently.
+    """
+    saved = dict(os.environ)
+    os.environ.update({key: str(value) for key, value in (env or {}).items()})
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+def run_captured(command: str, argv: Optional[List[str]] = None,
+                 env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Run a command in this process with environment overrides; returns its exit
+    code, time and output. The environment and the stdout/stderr redirection
+    apply to the whole process for the duration of the command.
+    """
+    output = io.StringIO()
+    start = time.perf_counter()
+    with job_environment(env), contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            exit_code = run_command(command, argv)
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+    return {'command': command, 'exit_code': exit_code, 'seconds': time.perf_counter() - start,
+            'output': output.getvalue()}
+
+
+class JobDaemon:
+    """Keeps the scripts and their expensive state loaded and runs submitted jobs over HTTP."""
+
+    def __init__(self, token: str, host: str = '127.0.0.1', port: int = DEFAULT_DAEMON_PORT):
+        """
+        Initialize the daemon.
+
+        Args:
+            token: Shared bearer token every request must present
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+        """
+        if not token:
+            raise ValueError('JobDaemon needs a shared token (AUTOTEST_DAEMON_TOKEN)')
+        from http.server import ThreadingHTTPServer  # only the daemon serves HTTP
+        self.token = token
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self.url = f'http://{host}:{self.port}'
+        self.started = time.time()
+        self.jobs = 0
+        self._job_lock = threading.Lock()
+
+    def preload(self, commands: Iterable[str] = tuple(SCRIPT_COMMANDS), orchestrator: bool = True) -> float:
+        """Import the scripts (and create the parser orchestrator) before the first job; returns seconds taken."""
+        start = time.perf_counter()
+        for command in commands:
+            load_command(command)
+        if orchestrator:
+            get_orchestrator().load()
+        return time.perf_counter() - start
+
+    def run_job(self, command: str, argv: Optional[List[str]] = None,
+                env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Run one job with captured output (jobs are serialized)."""
+        with self._job_lock:
+            self.jobs += 1
+            job = self.jobs
+            result = run_captured(command, argv, env)
+        get_metrics().observe('daemon_job_seconds', result['seconds'], command=command)
+        return {'job': job, **result}
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'uptime_seconds': time.time() - self.started,
+            'jobs': self.jobs,
+            'busy': self._job_lock.locked(),
+            'commands_loaded': sorted(_modules),
+            'orchestrator_loaded': get_orchestrator().loaded,
+            'orchestrator_load_seconds': get_orchestrator().load_seconds,
+            'cache': cache_stats()
+        }
+
+    def authorized(self, headers: Any) -> bool:
+        scheme, _, credentials = (headers.get('Authorization') or '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(credentials.strip().encode(), self.token.encode())
+
+    def _handler(self):
+        from http.server import BaseHTTPRequestHandler
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status: int, payload: Dict[str, Any]):
+                body = json.dumps(payload, default=str).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if not daemon.authorized(self.headers):
+                    self.send_error(401)
+                    return
+                if self.path.rstrip('/') != '/status':
+                    self.send_error(404)
+                    return
+                self._send(200, daemon.status())
+
+            def do_POST(self):
+                if not daemon.authorized(self.headers):
+                    self.send_error(401)
+                    return
+                if self.path.rstrip('/') != '/jobs':
+                    self.send_error(404)
+                    return
+                try:
+                    job = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                    command, argv, env = job['command'], job.get('args') or [], job.get('env') or {}
+                    if command not in SCRIPT_COMMANDS or not isinstance(argv, list) or not isinstance(env, dict):
+                        raise ValueError(f'invalid job {job!r}')
+                except (KeyError, TypeError, ValueError) as e:
+                    self._send(400, {'error': str(e)})
+                    return
+                self._send(200, daemon.run_job(command, [str(arg) for arg in argv], env))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'JobDaemon':
+        threading.Thread(target=self._server.serve_forever, name='job-daemon-http', daemon=True).start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _auth_headers(token: Optional[str]) -> Dict[str, str]:
+    token = token or os.getenv('AUTOTEST_DAEMON_TOKEN')
+    return {'Authorization': f'Bearer {token}'} if token else {}
+
+
+def submit_job(url: str, command: str, argv: Optional[List[str]] = None, env: Optional[Dict[str, str]] = None,
+               timeout: Optional[float] = None, token: Optional[str] = None) -> Dict[str, Any]:
+    """Run a job on a JobDaemon and wait for its result (token default: AUTOTEST_DAEMON_TOKEN)."""
+    request = urllib.request.Request(
+        f"{url.rstrip('/')}/jobs", data=json.dumps({'command': command, 'args': argv or [], 'env': env or {}}).encode('utf-8'),
+        headers={'Content-Type': 'application/json', **_auth_headers(token)}, method='POST'
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def daemon_status(url: str, timeout: float = 10, token: Optional[str] = None) -> Dict[str, Any]:
+    """Status of a running JobDaemon (token default: AUTOTEST_DAEMON_TOKEN)."""
+    request = urllib.request.Request(f"{url.rstrip('/')}/status", headers=_auth_headers(token))
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
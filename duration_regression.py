@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Duration Regression Detector
+Keeps compact per-test and per-suite duration statistics and flags statistically
+significant slowdowns when a new run is ingested.
+
+Each tracked series holds an exponentially weighted mean/variance and a small
+log-bucketed histogram (a quantile sketch) per key. A run is evaluated and folded
+in with array operations over its whole duration vector, so even runs with tens
+of thousands of cases are scored in a few milliseconds. Baselines live in memory
+and are warmed from the case durations of a TestHistoryStore (load_from_store).
+
+Requires numpy (pip install numpy).
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from history_store import STATUS_CODES, normalize_cases
+from lazy_imports import lazy_import
+
+# Optional dependency, imported when the first run is evaluated
+np = lazy_import('numpy')
+
+# Quantile sketch: bucket i covers durations up to SKETCH_MIN_SEC * SKETCH_GROWTH ** (i + 1)
+SKETCH_BUCKETS = 40
+SKETCH_MIN_SEC = 0.001
+SKETCH_GROWTH = 2 ** 0.5
+SKETCH_MAX_COUNT = 0xFFFF
+
+DEFAULT_ALPHA = 0.2
+DEFAULT_SIGMA = 3.0
+DEFAULT_MIN_RATIO = 1.5
+DEFAULT_MIN_DELTA_SEC = 0.05
+DEFAULT_MIN_SAMPLES = 5
+# Runs per project replayed by load_from_store (older samples have decayed out of the EWMA)
+DEFAULT_WARM_RUNS = 100
+
+
+def numpy_available() -> bool:
+    """Check if the optional numpy dependency is installed."""
+    return np is not None
+
+
+class DurationSeries:
+    """EWMA statistics plus a quantile sketch for a keyspace of integer ids."""
+
+    def __init__(self, alpha: float = DEFAULT_ALPHA, capacity: int = 1024):
+        self.alpha = alpha
+        self.mean = np.zeros(capacity, dtype=np.float64)
+        self.var = np.zeros(capacity, dtype=np.float64)
+        self.count = np.zeros(capacity, dtype=np.uint32)
+        self.sketch = np.zeros((capacity, SKETCH_BUCKETS), dtype=np.uint16)
+        self.bounds = SKETCH_MIN_SEC * SKETCH_GROWTH ** np.arange(1, SKETCH_BUCKETS + 1)
+
+    def _ensure_capacity(self, max_id: int):
+        size = len(self.count)
+        if max_id < size:
+            return
+        new_size = max(max_id + 1, size * 2)
+        self.mean = np.concatenate([self.mean, np.zeros(new_size - size)])
+        self.var = np.concatenate([self.var, np.zeros(new_size - size)])
+        self.count = np.concatenate([self.count, np.zeros(new_size - size, dtype=np.uint32)])
+        self.sketch = np.concatenate([self.sketch, np.zeros((new_size - size, SKETCH_BUCKETS), dtype=np.uint16)])
+
+    def quantiles(self, ids: 'np.ndarray', q: float) -> 'np.ndarray':
+        """Upper bucket bound of the q-quantile for each id (0 where no samples)."""
+        rows = self.sketch[ids].astype(np.uint32)
+        cumulative = np.cumsum(rows, axis=1)
+        totals = cumulative[:, -1]
+        bucket = np.argmax(cumulative >= np.maximum(1, np.ceil(q * totals))[:, None], axis=1)
+        return np.where(totals > 0, self.bounds[bucket], 0.0)
+
+    def evaluate(self, ids: 'np.ndarray', durations: 'np.ndarray', sigma: float, min_ratio: float,
+                 min_delta: float, min_samples: int) -> Dict[str, 'np.ndarray']:
+        """
+        Score a run against the current baselines, then fold it in.
+
+        Returns:
+            Dict of arrays (aligned with ids) describing the baseline and a regression mask
+        """
+        if len(ids):
+            self._ensure_capacity(int(ids.max()))
+
+        mean = self.mean[ids]
+        std = np.sqrt(self.var[ids])
+        count = self.count[ids]
+        p50 = self.quantiles(ids, 0.50)
+        p95 = self.quantiles(ids, 0.95)
+
+        delta = durations - mean
+        # Floor the spread so near-constant baselines do not turn jitter into huge z-scores
+        z_score = delta / np.maximum(std, np.maximum(0.05 * mean, 0.001))
+        regressed = (
+            (count >= min_samples)
+            & (z_score >= sigma)
+            & (durations >= mean * min_ratio)
+            & (delta >= min_delta)
+            & (durations > p95)
+        )
+
+        self._update(ids, durations)
+        return {'mean': mean, 'std': std, 'p50': p50, 'p95': p95, 'count': count,
+                'z_score': z_score, 'regressed': regressed}
+
+    def _update(self, ids: 'np.ndarray', durations: 'np.ndarray'):
+        """Fold durations into the EWMA statistics and sketches."""
+        first = self.count[ids] == 0
+        mean = self.mean[ids]
+        delta = durations - mean
+        alpha = self.alpha
+        self.mean[ids] = np.where(first, durations, mean + alpha * delta)
+        self.var[ids] = np.where(first, 0.0, (1 - alpha) * (self.var[ids] + alpha * delta * delta))
+        self.count[ids] = np.minimum(self.count[ids].astype(np.uint64) + 1, 0xFFFFFFFF)
+
+        buckets = np.clip(
+            np.ceil(np.log(np.maximum(durations, SKETCH_MIN_SEC) / SKETCH_MIN_SEC) / np.log(SKETCH_GROWTH)) - 1,
+            0, SKETCH_BUCKETS - 1
+        ).astype(np.intp)
+        # Halve saturated sketch rows so older samples decay instead of overflowing
+        full = ids[self.sketch[ids].max(axis=1) >= SKETCH_MAX_COUNT]
+        if len(full):
+            self.sketch[full] >>= 1
+        np.add.at(self.sketch, (ids, buckets), 1)
+
+    def memory_bytes(self) -> int:
+        return self.mean.nbytes + self.var.nbytes + self.count.nbytes + self.sketch.nbytes
+
+
+class DurationRegressionDetector:
+    """Flags test and suite slowdowns against their own duration history."""
+
+    def __init__(self, alpha: float = DEFAULT_ALPHA, sigma: float = DEFAULT_SIGMA,
+                 min_ratio: float = DEFAULT_MIN_RATIO, min_delta_sec: float = DEFAULT_MIN_DELTA_SEC,
+                 min_samples: int = DEFAULT_MIN_SAMPLES):
+        """
+        Initialize the detector.
+
+        Args:
+            alpha: EWMA smoothing factor (higher reacts faster)
+            sigma: Minimum z-score of a slowdown against the EWMA baseline
+            min_ratio: Minimum ratio of new duration to baseline mean
+            min_delta_sec: Minimum absolute slowdown in seconds
+            min_samples: Samples required before a key can be flagged
+        """
+        if np is None:
+            raise RuntimeError("numpy is required for duration regression detection. Install with: pip install numpy")
+        self.sigma = sigma
+        self.min_ratio = min_ratio
+        self.min_delta_sec = min_delta_sec
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self._cases: Optional[DurationSeries] = None
+        self._suites: Optional[DurationSeries] = None
+
+        # Internally assigned identities (used when no history-store ids are given)
+        self._test_index: Dict[Tuple[str, str, str], int] = {}
+        self._suite_index: Dict[Tuple[str, str], int] = {}
+        self._test_names: Dict[int, Tuple[str, str]] = {}
+        self._suite_names: List[str] = []
+
+    @property
+    def cases(self) -> DurationSeries:
+        """Per-test statistics (allocated on first use)."""
+        if self._cases is None:
+            self._cases = DurationSeries(self.alpha)
+        return self._cases
+
+    @property
+    def suites(self) -> DurationSeries:
+        """Per-suite statistics (allocated on first use)."""
+        if self._suites is None:
+            self._suites = DurationSeries(self.alpha)
+        return self._suites
+
+    def observe_run(self, project: str, test_cases: Iterable[Any],
+                    test_ids: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+        """
+        Evaluate one run for slowdowns and fold its durations into the baselines.
+
+        Args:
+            project: Project identifier
+            test_cases: Parsed test cases (models, dicts or normalized tuples)
+            test_ids: Stable test ids (e.g. from TestHistoryStore.record_run); assigned
+                internally from (project, suite, name) when omitted
+
+        Returns:
+            Dict with 'case_regressions' and 'suite_regressions' lists
+        """
+        cases = test_cases if isinstance(test_cases, list) and test_cases and isinstance(test_cases[0], tuple) \
+            else normalize_cases(test_cases)
+        # Skipped tests carry no meaningful duration
+        cases_with_ids = [
+            (case, index) for index, case in enumerate(cases) if case[2] != 'skipped'
+        ]
+        if not cases_with_ids:
+            return {'case_regressions': [], 'suite_regressions': []}
+
+        if test_ids is None:
+            test_ids = self._intern_tests(project, cases)
+        ids = np.fromiter((test_ids[index] for _, index in cases_with_ids), dtype=np.intp, count=len(cases_with_ids))
+        durations = np.fromiter((case[3] for case, _ in cases_with_ids), dtype=np.float64, count=len(cases_with_ids))
+        np.maximum(durations, 0.0, out=durations)
+
+        suite_keys = [self._suite_id(project, case[0]) for case, _ in cases_with_ids]
+        suite_ids = np.asarray(suite_keys, dtype=np.intp)
+        unique_suites, inverse = np.unique(suite_ids, return_inverse=True)
+        suite_durations = np.bincount(inverse, weights=durations)
+
+        case_eval = self.cases.evaluate(ids, durations, self.sigma, self.min_ratio, self.min_delta_sec, self.min_samples)
+        suite_eval = self.suites.evaluate(unique_suites, suite_durations, self.sigma, self.min_ratio,
+                                          self.min_delta_sec, self.min_samples)
+
+        case_regressions = [
+            self._describe(case_eval, position, durations, test_id=int(ids[position]),
+                           suite=cases_with_ids[position][0][0], name=cases_with_ids[position][0][1])
+            for position in np.flatnonzero(case_eval['regressed'])
+        ]
+        suite_regressions = [
+            self._describe(suite_eval, position, suite_durations, suite=self._suite_names[unique_suites[position]])
+            for position in np.flatnonzero(suite_eval['regressed'])
+        ]
+        case_regressions.sort(key=lambda r: r['z_score'], reverse=True)
+        suite_regressions.sort(key=lambda r: r['z_score'], reverse=True)
+        return {'case_regressions': case_regressions, 'suite_regressions': suite_regressions}
+
+    def load_from_store(self, store: Any, project: Optional[str] = None, runs_per_project: int = DEFAULT_WARM_RUNS) -> int:
+        """
+        Warm the baselines by replaying the case durations of the most recent runs in
+        a TestHistoryStore, oldest first (test ids are the store's, as passed by the pipeline).
+
+        Returns:
+            Number of runs replayed
+        """
+        query = (
+            'SELECT r.id, p.name, s.name, c.test_id, c.duration FROM case_results c '
+            'JOIN (SELECT id, project_id, started_at, ROW_NUMBER() OVER '
+            '(PARTITION BY project_id ORDER BY started_at DESC, id DESC) AS age FROM runs) r ON r.id = c.run_id '
+            'JOIN projects p ON p.id = r.project_id JOIN tests t ON t.id = c.test_id JOIN suites s ON s.id = t.suite_id '
+            'WHERE r.age <= ? AND c.status != ? '
+            # A test's last attempt in each run, as observe_run sees it
+            'AND NOT EXISTS (SELECT 1 FROM case_results later WHERE later.test_id = c.test_id '
+            'AND later.run_id = c.run_id AND later.attempt > c.attempt)'
+        )
+        params: Tuple[Any, ...] = (runs_per_project, STATUS_CODES['skipped'])
+        if project is not None:
+            query += ' AND p.name = ?'
+            params += (project,)
+        query += ' ORDER BY r.started_at, r.id'
+
+        replayed = 0
+        current = None
+        run: List[Tuple[str, int, float]] = []
+        for run_id, project_name, suite, test_id, duration in store.conn.execute(query, params):
+            if current is not None and current[0] != run_id:
+                self._replay(current[1], run)
+                replayed += 1
+                run = []
+            current = (run_id, project_name)
+            run.append((suite, test_id, duration or 0.0))
+        if current is not None:
+            self._replay(current[1], run)
+            replayed += 1
+        return replayed
+
+    def _replay(self, project: str, run: List[Tuple[str, int, float]]):
+        """Fold one stored run's (suite, test id, duration) rows into the baselines without scoring it."""
+        ids = np.fromiter((test_id for _, test_id, _ in run), dtype=np.intp, count=len(run))
+        durations = np.fromiter((duration for _, _, duration in run), dtype=np.float64, count=len(run))
+        np.maximum(durations, 0.0, out=durations)
+        suite_ids = np.asarray([self._suite_id(project, suite) for suite, _, _ in run], dtype=np.intp)
+        unique_suites, inverse = np.unique(suite_ids, return_inverse=True)
+        for series, keys, values in ((self.cases, ids, durations),
+                                     (self.suites, unique_suites, np.bincount(inverse, weights=durations))):
+            series._ensure_capacity(int(keys.max()))
+            series._update(keys, values)
+
+    def _describe(self, evaluation: Dict[str, 'np.ndarray'], position: int, durations: 'np.ndarray',
+                  **identity: Any) -> Dict[str, Any]:
+        mean = float(evaluation['mean'][position])
+        duration = float(durations[position])
+        return {
+            **identity,
+            'duration': duration,
+            'baseline_mean': mean,
+            'baseline_p50': float(evaluation['p50'][position]),
+            'baseline_p95': float(evaluation['p95'][position]),
+            'samples': int(evaluation['count'][position]),
+            'z_score': float(evaluation['z_score'][position]),
+            'ratio': duration / mean if mean > 0 else float('inf')
+        }
+
+    def _intern_tests(self, project: str, cases: List[Tuple]) -> List[int]:
+        test_ids = []
+        for suite, name, _, _, _ in cases:
+            key = (project, suite, name)
+            test_id = self._test_index.get(key)
+            if test_id is None:
+                test_id = self._test_index[key] = len(self._test_index)
+                self._test_names[test_id] = (suite, name)
+            test_ids.append(test_id)
+        return test_ids
+
+    def _suite_id(self, project: str, suite: str) -> int:
+        key = (project, suite)
+        suite_id = self._suite_index.get(key)
+        if suite_id is None:
+            suite_id = self._suite_index[key] = len(self._suite_names)
+            self._suite_names.append(suite)
+        return suite_id
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the per-key statistics."""
+        return sum(series.memory_bytes() for series in (self._cases, self._suites) if series is not None)
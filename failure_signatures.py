@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Failure Signature Clustering
+Normalizes failure messages and stack frames (numbers, addresses, ids, paths) and
+hashes them into stable cluster ids, so failures that differ only in values or
+line numbers collapse into one cluster.
+
+The cluster index is incremental - counts, affected tests and first/last seen
+are updated as each failure is ingested - and cheap enough to run inline.
+"""
+
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from history_store import normalize_cases
+
+# Stack frame lines (Java/.NET/JS "at ...", Python 'File "..."', Go "foo_test.go:12:")
+FRAME_RE = re.compile(r'^\s*(?:at\s+\S|File\s+"|[\w./\\-]+\.go:\d+)')
+
+# Applied in order: specific identifiers first, bare numbers last
+NORMALIZATION_RULES: List[Tuple['re.Pattern', str]] = [
+    (re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'), '<uuid>'),
+    (re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?'), '<ts>'),
+    (re.compile(r'0x[0-9a-fA-F]+'), '<addr>'),
+    (re.compile(r'(?:[A-Za-z]:)?(?:[\\/][\w.@+-]+)+[\\/]([\w.+-]+)'), r'\1'),
+    (re.compile(r'\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{12,}\b'), '<hash>'),
+    (re.compile(r'\d+(?:\.\d+)?'), '#'),
+    (re.compile(r'\s+'), ' '),
+]
+
+# Python tracebacks: the message head is the final "pkg.ExcType: message" line, not the banner
+PY_TRACEBACK_RE = re.compile(r'^Traceback \(most recent call last\):')
+PY_EXCEPTION_RE = re.compile(r'^[A-Za-z_][\w.]*(?::|$)')
+
+MAX_FRAMES = 3
+MAX_HEAD_CHARS = 200
+MAX_SAMPLE_CHARS = 500
+
+
+def normalize_text(text: str) -> str:
+    """Strip volatile values (numbers, addresses, ids, directories) from a line."""
+    for pattern, replacement in NORMALIZATION_RULES:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def failure_signature(message: str, exception_type: Optional[str] = None) -> str:
+    """
+    Canonical signature of a failure: exception type, normalized first message
+    line (for Python tracebacks, the final exception line) and the top
+    normalized stack frames.
+    """
+    lines = [line for line in message.splitlines() if line.strip()]
+    head = ''
+    if lines and any(PY_TRACEBACK_RE.match(line) for line in lines):
+        # The last unindented "ExcType: message" line is the exception that was raised
+        head = next((normalize_text(line)[:MAX_HEAD_CHARS] for line in reversed(lines)
+                     if PY_EXCEPTION_RE.match(line)), '')
+    frames = []
+    for line in lines:
+        if FRAME_RE.match(line):
+            if len(frames) < MAX_FRAMES:
+                frames.append(normalize_text(line))
+        elif not head:
+            head = normalize_text(line)[:MAX_HEAD_CHARS]
+        if head and len(frames) >= MAX_FRAMES:
+            break
+    return '\n'.join([exception_type or '', head, *frames])
+
+
+def cluster_id(signature: str) -> str:
+    """Stable 16-hex-digit cluster id for a signature."""
+    return hashlib.blake2b(signature.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class FailureClusterIndex:
+    """Incremental index of failure clusters."""
+
+    def __init__(self):
+        self.clusters: Dict[str, Dict[str, Any]] = {}
+        # Raw message -> cluster id, for repeated identical failures
+        self._message_cache: Dict[str, str] = {}
+        self._cache_limit = 100_000
+
+    def add(self, message: str, test: Any = None, project: Optional[str] = None,
+            exception_type: Optional[str] = None, seen_at: Optional[float] = None) -> str:
+        """
+        Assign a failure to its cluster and update the cluster's statistics.
+
+        Args:
+            message: Failure message and/or stack trace
+            test: Identity of the failing test (id or name), for affected-test counts
+            project: Project the failure came from
+            exception_type: Exception/failure type when reported separately
+            seen_at: Unix timestamp of the failure (defaults to now)
+
+        Returns:
+            Cluster id
+        """
+        seen_at = time.time() if seen_at is None else seen_at
+        cache_key = f'{exception_type}\x00{message}' if exception_type else message
+        cid = self._message_cache.get(cache_key)
+        if cid is None:
+            signature = failure_signature(message, exception_type)
+            cid = cluster_id(signature)
+            if len(self._message_cache) >= self._cache_limit:
+                self._message_cache.clear()
+            self._message_cache[cache_key] = cid
+            if cid not in self.clusters:
+                self.clusters[cid] = {
+                    'cluster_id': cid,
+                    'signature': signature,
+                    'sample': message[:MAX_SAMPLE_CHARS],
+                    'count': 0,
+                    'first_seen': seen_at,
+                    'last_seen': seen_at,
+                    'projects': {},
+                    'tests': set()
+                }
+
+        cluster = self.clusters[cid]
+        cluster['count'] += 1
+        if seen_at < cluster['first_seen']:
+            cluster['first_seen'] = seen_at
+        if seen_at > cluster['last_seen']:
+            cluster['last_seen'] = seen_at
+        if project is not None:
+            cluster['projects'][project] = cluster['projects'].get(project, 0) + 1
+        if test is not None:
+            cluster['tests'].add(test)
+        return cid
+
+    def observe_run(self, project: str, test_cases: Iterable[Any], test_ids: Optional[List[int]] = None,
+                    seen_at: Optional[float] = None) -> Dict[int, str]:
+        """
+        Cluster every failure of a run.
+
+        Returns:
+            Mapping of case position -> cluster id for failed/errored cases
+        """
+        cases = test_cases if isinstance(test_cases, list) and test_cases and isinstance(test_cases[0], tuple) \
+            else normalize_cases(test_cases)
+        assignments = {}
+        for position, (suite, name, status, _, message) in enumerate(cases):
+            if status not in ('failed', 'error') or not message:
+                continue
+            test = test_ids[position] if test_ids is not None else f'{suite}::{name}'
+            assignments[position] = self.add(str(message), test=test, project=project, seen_at=seen_at)
+        return assignments
+
+    def cluster(self, cid: str) -> Optional[Dict[str, Any]]:
+        """Summary of one cluster."""
+        cluster = self.clusters.get(cid)
+        return self._summary(cluster) if cluster else None
+
+    def top_clusters(self, n: int = 10, project: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Largest clusters (optionally within one project), biggest first."""
+        if project is None:
+            ranked = sorted(self.clusters.values(), key=lambda c: c['count'], reverse=True)
+        else:
+            ranked = sorted((c for c in self.clusters.values() if project in c['projects']),
+                            key=lambda c: c['projects'][project], reverse=True)
+        return [self._summary(c) for c in ranked[:n]]
+
+    def _summary(self, cluster: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'cluster_id': cluster['cluster_id'],
+            'signature': cluster['signature'],
+            'sample': cluster['sample'],
+            'count': cluster['count'],
+            'affected_tests': len(cluster['tests']),
+            'first_seen': cluster['first_seen'],
+            'last_seen': cluster['last_seen'],
+            'projects': dict(cluster['projects'])
+        }
+
+    def save(self, path: Any):
+        """Persist the index to a JSON file."""
+        data = [
+            {**cluster, 'tests': sorted(cluster['tests'], key=str)}
+            for cluster in self.clusters.values()
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: Any) -> 'FailureClusterIndex':
+        """Load an index saved with save(); a missing file gives an empty index."""
+        index = cls()
+        path = Path(path)
+        if path.exists():
+            with open(path, encoding='utf-8') as f:
+                for cluster in json.load(f):
+                    cluster['tests'] = set(cluster['tests'])
+                    index.clusters[cluster['cluster_id']] = cluster
+        return index
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Fair Tenant Scheduler
+Weighted fair queuing of parse work across tenants (ParseRequest.tenant_id), so a
+tenant backfilling a huge repository cannot starve interactive ingestion.
+
+Each admission request is tagged with a virtual finish time (start + bytes / weight,
+start-time fair queuing); when slots free up the eligible request with the smallest
+tag runs next. On top of that every tenant can have a concurrency cap and a byte
+budget (token bucket refilled at bytes_per_sec). Time spent waiting is recorded per
+tenant, both as scheduler_wait_seconds{tenant=...} in the metrics registry and in
+stats().
+
+With the defaults (no global limit, no caps or budgets) admission never blocks, so
+configure at least AUTOTEST_SCHED_CONCURRENCY for fairness to take effect.
+Environment:
+    AUTOTEST_SCHED_CONCURRENCY=8                         parse slots shared by all tenants
+    AUTOTEST_TENANT_WEIGHTS=pipeline-ingestion=4,demo=1  relative shares (default 1)
+    AUTOTEST_TENANT_CONCURRENCY=stress-test=2            per-tenant slot caps
+    AUTOTEST_TENANT_BYTES_PER_SEC=stress-test=50000000   per-tenant byte budgets
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from instrumentation import Histogram, get_metrics
+
+DEFAULT_TENANT = 'default'
+BUDGET_BURST_SEC = 5.0
+
+
+class TenantPolicy:
+    """Scheduling policy of one tenant."""
+
+    def __init__(self, weight: float = 1.0, max_concurrency: Optional[int] = None,
+                 bytes_per_sec: Optional[float] = None, burst_bytes: Optional[float] = None):
+        """
+        Args:
+            weight: Relative share when tenants compete for slots
+            max_concurrency: Slots the tenant may hold at once (unlimited when None)
+            bytes_per_sec: Sustained byte budget (unlimited when None)
+            burst_bytes: Budget bucket size (BUDGET_BURST_SEC worth of bytes_per_sec by default)
+        """
+        self.weight = max(weight, 1e-6)
+        self.max_concurrency = max_concurrency
+        self.bytes_per_sec = bytes_per_sec
+        self.burst_bytes = burst_bytes or (bytes_per_sec * BUDGET_BURST_SEC if bytes_per_sec else None)
+
+    def __repr__(self) -> str:
+        return (f'TenantPolicy(weight={self.weight}, max_concurrency={self.max_concurrency}, '
+                f'bytes_per_sec={self.bytes_per_sec})')
+
+
+class _Ticket:
+    __slots__ = ('tenant', 'cost', 'finish', 'enqueued_at', 'admitted')
+
+    def __init__(self, tenant: str, cost: int, finish: float):
+        self.tenant = tenant
+        self.cost = cost
+        self.finish = finish
+        self.enqueued_at = time.monotonic()
+        self.admitted = False
+
+
+class _TenantState:
+    def __init__(self, policy: TenantPolicy):
+        self.policy = policy
+        self.waiting: Deque[_Ticket] = deque()
+        self.running = 0
+        self.last_finish = 0.0
+        self.tokens = policy.burst_bytes or 0.0
+        self.refilled_at = time.monotonic()
+        self.wait = Histogram()
+        self.admitted = 0
+        self.bytes = 0
+
+    def refill(self, now: float):
+        policy = self.policy
+        if policy.bytes_per_sec:
+            self.tokens = min(policy.burst_bytes, self.tokens + (now - self.refilled_at) * policy.bytes_per_sec)
+        self.refilled_at = now
+
+    def budget_delay(self, cost: int) -> float:
+        """Seconds until the budget covers cost (a request larger than the bucket waits for a full bucket)."""
+        policy = self.policy
+        if not policy.bytes_per_sec:
+            return 0.0
+        needed = min(cost, policy.burst_bytes)
+        return max(0.0, (needed - self.tokens) / policy.bytes_per_sec)
+
+
+class FairScheduler:
+    """Admission control for parse work, shared by all threads of a process."""
+
+    def __init__(self, max_concurrency: Optional[int] = None, policies: Optional[Dict[str, TenantPolicy]] = None,
+                 default_policy: Optional[TenantPolicy] = None):
+        """
+        Args:
+            max_concurrency: Slots shared by all tenants (unlimited when None)
+            policies: Tenant id -> policy
+            default_policy: Policy of tenants not listed in policies
+        """
+        self.max_concurrency = max_concurrency
+        self.policies = dict(policies or {})
+        self.default_policy = default_policy or TenantPolicy()
+        self.metrics = get_metrics()
+        self._cond = threading.Condition()
+        self._tenants: Dict[str, _TenantState] = {}
+        self._running = 0
+        self._virtual_time = 0.0
+
+    def _state(self, tenant: str) -> _TenantState:
+        state = self._tenants.get(tenant)
+        if state is None:
+            state = self._tenants[tenant] = _TenantState(self.policies.get(tenant, self.default_policy))
+        return state
+
+    def _dispatch(self) -> float:
+        """
+        Admit eligible head-of-line tickets in virtual finish order.
+
+        Returns:
+            Seconds until a budget-blocked ticket may become eligible (0 if none is)
+        """
+        now = time.monotonic()
+        retry_in = 0.0
+        while self.max_concurrency is None or self._running < self.max_concurrency:
+            best: Optional[_TenantState] = None
+            for state in self._tenants.values():
+                if not state.waiting:
+                    continue
+                cap = state.policy.max_concurrency
+                if cap is not None and state.running >= cap:
+                    continue
+                state.refill(now)
+                delay = state.budget_delay(state.waiting[0].cost)
+                if delay > 0:
+                    retry_in = delay if not retry_in else min(retry_in, delay)
+                    continue
+                if best is None or state.waiting[0].finish < best.waiting[0].finish:
+                    best = state
+            if best is None:
+                break
+            ticket = best.waiting.popleft()
+            ticket.admitted = True
+            best.running += 1
+            if best.policy.bytes_per_sec:
+                best.tokens -= min(ticket.cost, best.policy.burst_bytes)
+            self._running += 1
+            self._virtual_time = max(self._virtual_time, ticket.finish - ticket.cost / best.policy.weight)
+        return retry_in
+
+    def acquire(self, tenant: Optional[str], cost: int = 0) -> float:
+        """
+        Block until the tenant may start a job of cost bytes.
+
+        Returns:
+            Seconds spent waiting
+        """
+        tenant = tenant or DEFAULT_TENANT
+        with self._cond:
+            state = self._state(tenant)
+            start = max(self._virtual_time, state.last_finish)
+            ticket = _Ticket(tenant, max(cost, 1), start + max(cost, 1) / state.policy.weight)
+            state.last_finish = ticket.finish
+            state.waiting.append(ticket)
+            retry_in = self._dispatch()
+            if not ticket.admitted:
+                self.metrics.gauge_add('scheduler_queued', 1, tenant=tenant)
+                while not ticket.admitted:
+                    # Wake any other tickets the last pass admitted, then wait for a release
+                    self._cond.notify_all()
+                    self._cond.wait(retry_in or None)
+                    retry_in = self._dispatch()
+                self.metrics.gauge_add('scheduler_queued', -1, tenant=tenant)
+                self._cond.notify_all()
+            waited = time.monotonic() - ticket.enqueued_at
+            state.wait.observe(waited)
+            state.admitted += 1
+            state.bytes += cost
+        self.metrics.observe('scheduler_wait_seconds', waited, tenant=tenant)
+        self.metrics.inc('scheduler_bytes_total', cost, tenant=tenant)
+        self.metrics.gauge_add('scheduler_running', 1, tenant=tenant)
+        return waited
+
+    def release(self, tenant: Optional[str]):
+        """Return a slot taken by acquire()."""
+        tenant = tenant or DEFAULT_TENANT
+        with self._cond:
+            self._tenants[tenant].running -= 1
+            self._running -= 1
+            if any(state.waiting for state in self._tenants.values()):
+                self._dispatch()
+                self._cond.notify_all()
+        self.metrics.gauge_add('scheduler_running', -1, tenant=tenant)
+
+    @contextmanager
+    def slot(self, tenant: Optional[str], cost: int = 0) -> Iterator[float]:
+        """Hold a slot for the duration of the block; yields the seconds spent waiting."""
+        waited = self.acquire(tenant, cost)
+        try:
+            yield waited
+        finally:
+            self.release(tenant)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tenant admissions, bytes, current load and queue-wait quantiles."""
+        with self._cond:
+            return {
+                tenant: {
+                    'admitted': state.admitted,
+                    'bytes': state.bytes,
+                    'running': state.running,
+                    'queued': len(state.waiting),
+                    'weight': state.policy.weight,
+                    'wait_p50': state.wait.quantile(0.50),
+                    'wait_p95': state.wait.quantile(0.95),
+                    'wait_total': state.wait.sum
+                }
+                for tenant, state in self._tenants.items()
+            }
+
+
+def parse_tenant_map(value: Optional[str]) -> Dict[str, float]:
+    """Parse 'tenant=value,tenant=value' into a dict."""
+    result = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            tenant, _, number = item.partition('=')
+            result[tenant.strip()] = float(number)
+    return result
+
+
+def tenant_policies_from_env() -> Dict[str, TenantPolicy]:
+    """Tenant policies from AUTOTEST_TENANT_WEIGHTS / _CONCURRENCY / _BYTES_PER_SEC."""
+    weights = parse_tenant_map(os.getenv('AUTOTEST_TENANT_WEIGHTS'))
+    caps = parse_tenant_map(os.getenv('AUTOTEST_TENANT_CONCURRENCY'))
+    budgets = parse_tenant_map(os.getenv('AUTOTEST_TENANT_BYTES_PER_SEC'))
+    return {
+        tenant: TenantPolicy(weight=weights.get(tenant, 1.0),
+                             max_concurrency=int(caps[tenant]) if tenant in caps else None,
+                             bytes_per_sec=budgets.get(tenant))
+        for tenant in set(weights) | set(caps) | set(budgets)
+    }
+
+
+_scheduler = FairScheduler()
+
+
+def get_scheduler() -> FairScheduler:
+    """Get the process-wide scheduler."""
+    return _scheduler
+
+
+def configure_scheduler_from_env() -> FairScheduler:
+    """Apply AUTOTEST_SCHED_CONCURRENCY and the AUTOTEST_TENANT_* policies to the process-wide scheduler."""
+    scheduler = get_scheduler()
+    concurrency = os.getenv('AUTOTEST_SCHED_CONCURRENCY')
+    with scheduler._cond:
+        if concurrency:
+            scheduler.max_concurrency = int(concurrency) or None
+        scheduler.policies.update(tenant_policies_from_env())
+        for tenant, state in scheduler._tenants.items():
+            state.policy = scheduler.policies.get(tenant, scheduler.default_policy)
+    return scheduler
@@ -8,6 +8,7 @@ to demonstrate and validate the parser with real-world CI/CD data.
 import os
 import sys
 import json
+import argparse
 import requests
 import time
 from pathlib import Path
@@ -17,25 +18,35 @@ from typing import Dict, List, Any, Optional
 parser_path = Path(r'C:\autotest\test-parser-mvp')
 sys.path.insert(0, str(parser_path))
 
-from core.parser_orchestrator import get_orchestrator
-from models import ParseRequest
+from lazy_imports import get_orchestrator, parse_request
+
+from instrumentation import configure_from_env, get_metrics, timed
+from profiling import Profiler, add_profile_argument, profiler_from_args
+from fair_scheduler import configure_scheduler_from_env, get_scheduler
+from github_tokens import GitHubTokenPool
+from http_cassette import add_cassette_arguments, cassette_from_args
+from warm_cache import shared
 
 class RealTestDataFetcher:
     """Fetches real test data from open source repositories."""
     
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(self, github_token: Optional[str] = None, profiler: Optional[Profiler] = None,
+                 github_tokens: Optional[GitHubTokenPool] = None):
         """
         Initialize the fetcher.
         
         Args:
             github_token: GitHub personal access token (optional, but recommended for higher rate limits)
+            profiler: Optional per-stage profiler (see --profile)
+            github_tokens: Token pool for GitHub API requests (built from github_token when omitted)
         """
         self.token = github_token
-        self.headers = {'Accept': 'application/vnd.github.v3+json'}
-        if github_token:
-            self.headers['Authorization'] = f'token {github_token}'
+        self.github = github_tokens or GitHubTokenPool([github_token] if github_token else [])
         
+        self.metrics = get_metrics()
+        self.profiler = profiler or Profiler(enabled=False)
         self.orchestrator = get_orchestrator()
+        self.scheduler = get_scheduler()
         
         # Curated list of repositories with good test data
         self.demo_repos = [
@@ -74,7 +85,7 @@ class RealTestDataFetcher:
         print("🔍 Fetching Real Test Data from Open Source Repositories")
         print("=" * 60)
         
-        if not self.token:
+        if not self.github.authenticated:
             print("⚠️  No GitHub token provided - using public API (rate limited)")
             print("   For better results, set GITHUB_TOKEN environment variable")
         
@@ -92,7 +103,8 @@ class RealTestDataFetcher:
             print(f"   Description: {repo_info['description']}")
             
             try:
-                repo_data = self._fetch_repo_test_data(repo_info)
+                with self.profiler.stage('repository', repo_info['name']):
+                    repo_data = self._fetch_repo_test_data(repo_info)
                 results['repositories'].append(repo_data)
                 results['total_artifacts'] += repo_data['artifacts_processed']
                 results['total_test_cases'] += repo_data['test_cases_parsed']
@@ -149,6 +161,8 @@ class RealTestDataFetcher:
                         try:
                             # Download and parse artifact
                             artifact_data = self._download_artifact(repo_name, artifact['id'])
+                            if artifact_data is not None:
+                                self.metrics.inc('bytes_downloaded_total', len(artifact_data), component='fetcher')
                             parse_result = self._parse_artifact_data(artifact_data, artifact['name'], repo_name)
                             
                             if parse_result['success']:
@@ -175,13 +189,14 @@ class RealTestDataFetcher:
         
         return repo_results
     
+    @timed('list_runs', component='fetcher')
     def _get_workflow_runs(self, repo_name: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Get recent workflow runs for a repository."""
         url = f"https://api.github.com/repos/{repo_name}/actions/runs"
         params = {'per_page': limit, 'status': 'completed'}
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
+            response = self.github.get(url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -191,12 +206,13 @@ class RealTestDataFetcher:
             print(f"      ❌ API request failed: {str(e)}")
             return []
     
+    @timed('list_artifacts', component='fetcher')
     def _get_artifacts(self, repo_name: str, run_id: int) -> List[Dict[str, Any]]:
         """Get artifacts for a workflow run."""
         url = f"https://api.github.com/repos/{repo_name}/actions/runs/{run_id}/artifacts"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.github.get(url, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -206,6 +222,7 @@ class RealTestDataFetcher:
             print(f"         ❌ Artifacts request failed: {str(e)}")
             return []
     
+    @timed('download', component='fetcher')
     def _download_artifact(self, repo_name: str, artifact_id: int) -> Optional[bytes]:
         """Download artifact data (simulated - would need authentication for real download)."""
         # Note: Real artifact download requires authentication and is complex
@@ -233,9 +250,10 @@ class RealTestDataFetcher:
         ]
         return any(indicator in name_lower for indicator in test_indicators)
     
+    @timed('parse', component='fetcher')
     def _parse_artifact_data(self, data: bytes, artifact_name: str, repo_name: str) -> Dict[str, Any]:
         """Parse artifact data using the parser system."""
-        request = ParseRequest(
+        request = parse_request(
             tenant_id="demo",
             project_id=repo_name.replace('/', '-'),
             environment="open-source-demo"
@@ -243,10 +261,13 @@ class RealTestDataFetcher:
         
         start_time = time.time()
         try:
-            response = self.orchestrator.parse_report(data, request)
-            parse_time = time.time() - start_time
+            self.metrics.inc('bytes_parsed_total', len(data), component='fetcher')
+            with self.scheduler.slot(request.tenant_id, len(data)) as queue_wait:
+                response = self.orchestrator.parse_report(data, request)
+            parse_time = time.time() - start_time - queue_wait
             
             if response.success:
+                self.metrics.inc('cases_parsed_total', response.data.totals.total, component='fetcher')
                 return {
                     'success': True,
                     'framework': response.data.framework,
@@ -445,21 +466,40 @@ Expected validation error but form was processed successfully
             total_parses = len(results['parsing_results'])
             print(f"   ✅ Parse success rate: {successful_parses}/{total_parses} ({successful_parses/total_parses*100:.1f}%)")
 
-def main():
-    """Main function to run real data testing."""
-    # Check for GitHub token
+def main(argv: Optional[List[str]] = None):
+    """Main function to run real data testing (argv defaults to the command line)."""
+    parser = argparse.ArgumentParser(description="Real Test Data Fetcher")
+    add_profile_argument(parser)
+    add_cassette_arguments(parser)
+    args = parser.parse_args(argv)
+    profiler = profiler_from_args(args)
+    configure_scheduler_from_env()
+    
+    # Check for GitHub tokens (GITHUB_TOKENS=tok1,tok2 and/or GITHUB_TOKEN)
     github_token = os.getenv('GITHUB_TOKEN')
     
+    # Optional record/replay of all GitHub traffic (--record DIR / --replay DIR); without one the
+    # pool and its connections are reused by later jobs in the same process (autotest-cli.py daemon)
+    cassette = cassette_from_args(args)
+    if cassette:
+        github_tokens = GitHubTokenPool.from_env()
+        cassette.mount(github_tokens.session)
+    else:
+        github_tokens = shared(('github_tokens', os.getenv('GITHUB_TOKENS'), github_token), GitHubTokenPool.from_env)
+    
     print("🌟 Real Test Data Demonstration")
     print("=" * 40)
     
-    if not github_token:
+    # Optional stage metrics (AUTOTEST_METRICS / AUTOTEST_METRICS_PORT / AUTOTEST_METRICS_FILE)
+    metrics = configure_from_env()
+    
+    if not github_tokens.authenticated:
         print("💡 Tip: Set GITHUB_TOKEN environment variable for better API access")
         print("   export GITHUB_TOKEN=your_token_here")
         print()
     
     # Create fetcher and run tests
-    fetcher = RealTestDataFetcher(github_token)
+    fetcher = RealTestDataFetcher(github_token, profiler=profiler, github_tokens=github_tokens)
     demo_results = fetcher.test_with_real_data()
     
     # Save results for analysis
@@ -470,6 +510,17 @@ def main():
         json.dump(demo_results, f, indent=2, default=str)
     
     print(f"\n💾 Results saved to: {output_file}")
+    if cassette:
+        print(f"📼 Cassette: {json.dumps(cassette.summary())}")
+    
+    metrics_file = metrics.dump()
+    if metrics_file:
+        print(f"📈 Metrics written to: {metrics_file}")
+
+    profile_file = profiler.write('real-data-fetch')
+    if profile_file:
+        profiler.print_summary()
+        print(f"🔬 Profiles written to: {profile_file.parent} (summary: {profile_file.name})")
     print(f"🎉 Real data testing complete!")
 
 if __name__ == "__main__":
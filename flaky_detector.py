@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Flaky Test Detection Engine
+Scores tests for flakiness incrementally as each run is ingested.
+
+Per-test state is a fixed-size rolling window of pass/fail outcomes packed into
+a 64-bit integer, a parallel window marking which of those outcomes flipped on a
+same-commit retry, the last seen commit and the test's project, all held in typed
+arrays indexed by test id so millions of tests stay compact: about 25 bytes per
+test (8 + 8 for the two windows, 4 + 4 for commit and project, 1 for the count).
+Tests that have flipped at least once are tracked per project, so "top N
+flakiest tests" only looks at actual candidates.
+"""
+
+import heapq
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from history_store import STATUS_NAMES, normalize_cases
+
+DEFAULT_WINDOW = 30
+MAX_WINDOW = 64
+
+# Same-commit retry flips at which the retry component of the score saturates
+RETRY_SATURATION = 3
+
+# Weights of the score components
+FLIP_WEIGHT = 0.7
+RETRY_WEIGHT = 0.3
+
+
+def _commit_key(commit_sha: Optional[str]) -> int:
+    """Compact 32-bit key for a commit (0 means unknown)."""
+    if not commit_sha:
+        return 0
+    return zlib.crc32(commit_sha.encode('utf-8')) or 1
+
+
+class FlakinessScorer:
+    """Streaming per-test flakiness scorer."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW, min_runs: int = 5):
+        """
+        Initialize the scorer.
+
+        Args:
+            window: Number of most recent outcomes kept per test (max 64)
+            min_runs: Outcomes required before a test can be reported
+        """
+        if not 2 <= window <= MAX_WINDOW:
+            raise ValueError(f"window must be between 2 and {MAX_WINDOW}")
+        self.window = window
+        self.min_runs = min_runs
+        self._mask = (1 << window) - 1
+
+        # Per-test state, indexed by test id
+        self._outcomes = array('Q')      # bit i set = failed, bit 0 is the newest outcome
+        self._counts = array('B')        # outcomes currently in the window
+        self._commits = array('I')       # last commit key seen
+        self._retry_bits = array('Q')    # bit i set = outcome i flipped on the same commit (retry)
+        self._projects = array('I')      # project index of the test
+
+        # Project and (internally assigned) test identities
+        self._project_index: Dict[str, int] = {}
+        self._project_names: List[str] = []
+        self._test_index: Dict[Tuple[str, str, str], int] = {}
+        self._test_names: Dict[int, Tuple[str, str]] = {}
+        # TestHistoryStore that names store-assigned test ids (set by load_from_store)
+        self.name_store: Optional[Any] = None
+
+        # project index -> {test id: score} for tests with a non-zero score
+        self._candidates: Dict[int, Dict[int, float]] = {}
+
+    def _ensure_capacity(self, test_id: int):
+        """Grow the state arrays to cover a test id."""
+        size = len(self._counts)
+        if test_id < size:
+            return
+        grow = max(test_id + 1 - size, size, 1024)
+        self._outcomes.extend(array('Q', bytes(8 * grow)))
+        self._counts.extend(array('B', bytes(grow)))
+        self._commits.extend(array('I', bytes(4 * grow)))
+        self._retry_bits.extend(array('Q', bytes(8 * grow)))
+        self._projects.extend(array('I', bytes(4 * grow)))
+
+    def _project(self, project: str) -> int:
+        if project not in self._project_index:
+            self._project_index[project] = len(self._project_names)
+            self._project_names.append(project)
+        return self._project_index[project]
+
+    def observe_run(self, project: str, test_cases: Iterable[Any], commit_sha: Optional[str] = None,
+                    test_ids: Optional[Sequence[int]] = None) -> int:
+        """
+        Fold one run's outcomes into the per-test windows.
+
+        Args:
+            project: Project identifier
+            test_cases: Parsed test cases (models, dicts or normalized tuples)
+            commit_sha: Commit the run was built from, used to spot same-commit retries
+            test_ids: Stable test ids (e.g. from TestHistoryStore.record_run); assigned
+                internally from (project, suite, name) when omitted
+
+        Returns:
+            Number of outcomes observed (skipped tests are ignored)
+        """
+        cases = test_cases if isinstance(test_cases, list) and test_cases and isinstance(test_cases[0], tuple) \
+            else normalize_cases(test_cases)
+        project_idx = self._project(project)
+        commit = _commit_key(commit_sha)
+
+        if test_ids is None:
+            test_ids = []
+            for suite, name, _, _, _ in cases:
+                key = (project, suite, name)
+                test_id = self._test_index.get(key)
+                if test_id is None:
+                    test_id = self._test_index[key] = len(self._test_index)
+                    self._test_names[test_id] = (suite, name)
+                test_ids.append(test_id)
+
+        if test_ids:
+            self._ensure_capacity(max(test_ids))
+
+        outcomes, counts, commits = self._outcomes, self._counts, self._commits
+        retry_bits, projects = self._retry_bits, self._projects
+        candidates = self._candidates.setdefault(project_idx, {})
+        mask, window = self._mask, self.window
+
+        observed = 0
+        for test_id, (_, _, status, _, _) in zip(test_ids, cases):
+            if status == 'skipped':
+                continue
+            failed = 0 if status == 'passed' else 1
+            count = counts[test_id]
+            bits = outcomes[test_id]
+
+            retry = 1 if count and commit and commits[test_id] == commit and (bits & 1) != failed else 0
+            # Retry flips age out of the window together with their outcomes
+            retries = retry_bits[test_id] = ((retry_bits[test_id] << 1) | retry) & mask
+
+            bits = outcomes[test_id] = ((bits << 1) | failed) & mask
+            if count < window:
+                counts[test_id] = count + 1
+            commits[test_id] = commit
+            projects[test_id] = project_idx
+            observed += 1
+
+            # Consistently passing tests (the vast majority) cannot score
+            if bits or retries:
+                score = self._score(test_id)
+                if score > 0:
+                    candidates[test_id] = score
+                    continue
+            if candidates:
+                candidates.pop(test_id, None)
+
+        return observed
+
+    def observe_codes(self, project: str, test_ids: Sequence[int], status_codes: Sequence[int],
+                      commit_sha: Optional[str] = None) -> int:
+        """Fold outcomes given as history-store status codes."""
+        cases = [('', '', STATUS_NAMES[code], 0.0, None) for code in status_codes]
+        return self.observe_run(project, cases, commit_sha=commit_sha, test_ids=test_ids)
+
+    def _stats(self, test_id: int) -> Tuple[int, int, int, int]:
+        """(outcomes in window, failures, flips, same-commit retry flips) for a test."""
+        count = self._counts[test_id]
+        bits = self._outcomes[test_id] & ((1 << count) - 1)
+        failures = bits.bit_count()
+        flips = ((bits ^ (bits >> 1)) & ((1 << (count - 1)) - 1)).bit_count() if count > 1 else 0
+        return count, failures, flips, (self._retry_bits[test_id] & ((1 << count) - 1)).bit_count()
+
+    def _score(self, test_id: int) -> float:
+        """Flakiness score in [0, 1]: mostly flip rate, boosted by same-commit retries."""
+        count, _, flips, retries = self._stats(test_id)
+        if count < 2 or (flips == 0 and retries == 0):
+            return 0.0
+        flip_rate = flips / (count - 1)
+        return FLIP_WEIGHT * flip_rate + RETRY_WEIGHT * min(1.0, retries / RETRY_SATURATION)
+
+    def test_stats(self, test_id: int) -> Dict[str, Any]:
+        """Flakiness statistics of one test."""
+        if test_id >= len(self._counts) or not self._counts[test_id]:
+            return {'test_id': test_id, 'runs': 0, 'score': 0.0}
+        count, failures, flips, retries = self._stats(test_id)
+        stats = {
+            'test_id': test_id,
+            'project': self._project_names[self._projects[test_id]],
+            'runs': count,
+            'failure_rate': failures / count,
+            'flips': flips,
+            'flip_rate': flips / (count - 1) if count > 1 else 0.0,
+            'same_commit_retry_flips': retries,
+            'score': self._score(test_id)
+        }
+        if test_id not in self._test_names and self.name_store is not None:
+            self._test_names.update(self.name_store.test_names([test_id]))
+        if test_id in self._test_names:
+            stats['suite'], stats['name'] = self._test_names[test_id]
+        return stats
+
+    def top_flaky(self, project: str, n: int = 10, min_score: float = 0.0) -> List[Dict[str, Any]]:
+        """Top N flakiest tests of a project, highest score first."""
+        project_idx = self._project_index.get(project)
+        if project_idx is None:
+            return []
+        counts, min_runs = self._counts, self.min_runs
+        candidates = (
+            (score, test_id) for test_id, score in self._candidates.get(project_idx, {}).items()
+            if score > min_score and counts[test_id] >= min_runs
+        )
+        top = [test_id for _, test_id in heapq.nlargest(n, candidates)]
+        if self.name_store is not None:
+            # Name store-assigned ids in one lookup (names are cached for later reports)
+            self._test_names.update(self.name_store.test_names([t for t in top if t not in self._test_names]))
+        return [self.test_stats(test_id) for test_id in top]
+
+    def load_from_store(self, store: Any, project: Optional[str] = None) -> int:
+        """
+        Rebuild state by replaying runs from a TestHistoryStore, oldest first. The
+        store is kept to name its test ids in reports.
+
+        Returns:
+            Number of runs replayed
+        """
+        self.name_store = store
+        # case_results is clustered by test, so replay in one sorted pass rather than per-run lookups
+        query = (
+            'SELECT r.id, p.name, r.commit_sha, c.test_id, c.status FROM case_results c '
+            'JOIN runs r ON r.id = c.run_id JOIN projects p ON p.id = r.project_id'
+        )
+        params: Tuple[Any, ...] = ()
+        if project is not None:
+            query += ' WHERE p.name = ?'
+            params = (project,)
+        # Attempts in order, so flips between a run's attempts count as same-commit retries
+        query += ' ORDER BY r.started_at, r.id, c.attempt'
+
+        replayed = 0
+        current = None
+        test_ids: List[int] = []
+        codes: List[int] = []
+        for run_id, project_name, commit_sha, test_id, status in store.conn.execute(query, params):
+            if current is not None and current[0] != run_id:
+                self.observe_codes(current[1], test_ids, codes, current[2])
+                replayed += 1
+                test_ids, codes = [], []
+            current = (run_id, project_name, commit_sha)
+            test_ids.append(test_id)
+            codes.append(status)
+        if current is not None:
+            self.observe_codes(current[1], test_ids, codes, current[2])
+            replayed += 1
+        return replayed
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the per-test state arrays."""
+        return sum(a.itemsize * len(a) for a in (self._outcomes, self._counts, self._commits,
+                                                 self._retry_bits, self._projects))
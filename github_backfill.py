@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+GitHub Actions Backfill
+Lists the complete workflow run history of a repository by partitioning it into
+created-date slices (created=<from>..<to>), so onboarding years of history does not
+depend on a single paginated listing.
+
+GitHub answers at most 1000 runs per filtered query, so slices whose total_count
+exceeds that are split in half (on whole seconds) until they fit; a slice that
+cannot be split further is listed up to the cap and counted as truncated. Within a slice the first page
+reveals total_count and the remaining pages are fetched in parallel; several slices
+are listed concurrently. All requests share one token bucket sized to the hourly
+quota, and an exhausted quota (X-RateLimit-Remaining: 0) parks every thread until
+X-RateLimit-Reset (with a GitHubTokenPool, the pool switches tokens first).
+
+Slices are cells of a fixed grid counted from the Unix epoch, so they do not
+move when --since or --until change between invocations. Finished slices are
+recorded in a checkpoint file, and a resumed backfill lists only the parts of
+[since, until) that no finished slice covers.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from github_tokens import GitHubTokenPool
+from http_limits import RateLimiter
+
+GITHUB_API = 'https://api.github.com'
+MAX_RESULTS_PER_QUERY = 1000
+PER_PAGE = 100
+MIN_SLICE = timedelta(minutes=10)
+DEFAULT_REQUESTS_PER_HOUR = 4500  # of the 5000/h token quota, leaving room for interactive calls
+MAX_RETRIES = 3
+
+
+def parse_date(value: str) -> datetime:
+    """Parse an ISO date or timestamp (UTC unless it carries an offset)."""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def slice_key(since: datetime, until: datetime) -> str:
+    """Checkpoint key of the slice [since, until)."""
+    return f"{_iso(since)}..{_iso(until)}"
+
+
+def created_qualifier(since: datetime, until: datetime) -> str:
+    """created= qualifier listing [since, until): GitHub's range includes both ends, so it stops a second early."""
+    return f"{_iso(since)}..{_iso(until - timedelta(seconds=1))}"
+
+
+def parse_slice_key(key: str) -> Tuple[datetime, datetime]:
+    since, until = key.split('..')
+    return parse_date(since), parse_date(until)
+
+
+def _utc(timestamp: int) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+def date_slices(since: datetime, until: datetime, slice_days: float = 7) -> List[Tuple[datetime, datetime]]:
+    """
+    Partition [since, until) into slices on a fixed grid, newest first.
+
+    Grid cells are slice_days wide and counted from the Unix epoch, so the same
+    cell gets the same boundaries (and checkpoint key) whatever since and until a
+    backfill is started or resumed with; only the oldest and newest slices are
+    clipped to the range. Boundaries are whole seconds.
+    """
+    step = max(1, round(slice_days * 86400))
+    start, end = int(since.timestamp()), int(until.timestamp())
+    slices = []
+    cell = start - start % step
+    while cell < end:
+        slices.append((_utc(max(cell, start)), _utc(min(cell + step, end))))
+        cell += step
+    return slices[::-1]
+
+
+class BackfillCheckpoint:
+    """JSON record of finished slices per repository, rewritten atomically."""
+
+    def __init__(self, path: Any):
+        self.path = Path(path)
+        self.slices: Dict[str, Dict[str, Any]] = json.loads(self.path.read_text()) if self.path.exists() else {}
+        self._lock = threading.Lock()
+
+    def remaining(self, repo: str, since: datetime, until: datetime) -> List[Tuple[datetime, datetime]]:
+        """Parts of [since, until) that no finished slice of the repository covers, oldest first."""
+        gaps = [(since, until)]
+        for key in self.slices.get(repo, {}):
+            done_since, done_until = parse_slice_key(key)
+            gaps = [(start, end) for gap_since, gap_until in gaps
+                    for start, end in ((gap_since, min(gap_until, done_since)), (max(gap_since, done_until), gap_until))
+                    if start < end]
+        return gaps
+
+    def mark(self, repo: str, key: str, runs: int):
+        """Record a finished slice and persist the checkpoint."""
+        with self._lock:
+            self.slices.setdefault(repo, {})[key] = {'runs': runs, 'completed_at': time.time()}
+            tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+            tmp.write_text(json.dumps(self.slices, indent=1))
+            os.replace(tmp, self.path)
+
+
+class GitHubBackfill:
+    """Parallel, rate-budgeted listing of a repository's workflow run history."""
+
+    def __init__(self, repo: str, token: Optional[str] = None, max_workers: int = 8,
+                 requests_per_hour: float = DEFAULT_REQUESTS_PER_HOUR, base_url: str = GITHUB_API,
+                 session: Optional[requests.Session] = None, event: Optional[str] = 'push', timeout: float = 30,
+                 token_pool: Optional[GitHubTokenPool] = None):
+        """
+        Initialize the backfill.
+
+        Args:
+            repo: owner/name
+            token: GitHub token (unauthenticated quotas are far too small for a backfill)
+            max_workers: Concurrent page requests
+            requests_per_hour: Request budget shared by all threads
+            base_url: API root (a local simulator for tests)
+            session: Session to use (a pooled one is created when omitted)
+            event: Only list runs triggered by this event (all events when None)
+            timeout: Per-request timeout in seconds
+            token_pool: Token pool to send requests through (token and session are then
+                ignored; the pool handles rate limits per token)
+        """
+        self.repo = repo
+        self.url = f"{base_url.rstrip('/')}/repos/{repo}/actions/runs"
+        self.max_workers = max_workers
+        self.event = event
+        self.timeout = timeout
+        self.limiter = RateLimiter(requests_per_hour / 3600.0, burst=max_workers)
+        self.token_pool = token_pool
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Accept'] = 'application/vnd.github+json'
+        if token:
+            self.session.headers['Authorization'] = f'token {token}'
+        self.stats = {'requests': 0, 'pages': 0, 'runs_listed': 0, 'slices_split': 0, 'slices_truncated': 0,
+                      'runs_truncated': 0, 'rate_limit_waits': 0}
+        self.truncated: List[str] = []  # slices with more runs than one query returns
+        self._stats_lock = threading.Lock()
+
+    def _get_page(self, created: str, page: int) -> Dict[str, Any]:
+        params = {'status': 'completed', 'created': created, 'per_page': PER_PAGE, 'page': page}
+        if self.event:
+            params['event'] = self.event
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.acquire()
+            if self.token_pool is not None:
+                response = self.token_pool.get(self.url, params=params, timeout=self.timeout)
+            else:
+                response = self.session.get(self.url, params=params, timeout=self.timeout)
+            self._count('requests')
+            # With a token pool one exhausted token does not stall the others; the pool parks instead
+            exhausted = response.headers.get('X-RateLimit-Remaining') == '0' and self.token_pool is None
+            if exhausted or response.status_code == 429:
+                reset = float(response.headers.get('X-RateLimit-Reset') or 0)
+                wait_for = reset - time.time() if reset else float(response.headers.get('Retry-After', 2 ** attempt))
+                self.limiter.pause(max(1.0, wait_for))
+                self._count('rate_limit_waits')
+                if response.status_code in (403, 429) and attempt < MAX_RETRIES:
+                    continue
+            if response.status_code >= 500 and attempt < MAX_RETRIES:
+                time.sleep(2 ** attempt)
+                continue
+            response.raise_for_status()
+            self._count('pages')
+            return response.json()
+        response.raise_for_status()
+        return {}
+
+    def fetch_slice(self, since: datetime, until: datetime, pages: ThreadPoolExecutor) -> List[Dict[str, Any]]:
+        """All runs created in [since, until) (whole seconds), splitting the slice while it exceeds the query cap."""
+        created = created_qualifier(since, until)
+        first = self._get_page(created, 1)
+        total = first.get('total_count', 0)
+        seconds = int((until - since).total_seconds())
+        if total > MAX_RESULTS_PER_QUERY:
+            if until - since > MIN_SLICE and seconds > 1:
+                self._count('slices_split')
+                middle = since + timedelta(seconds=seconds // 2)
+                return self.fetch_slice(middle, until, pages) + self.fetch_slice(since, middle, pages)
+            with self._stats_lock:
+                self.stats['slices_truncated'] += 1
+                self.stats['runs_truncated'] += total - MAX_RESULTS_PER_QUERY
+                self.truncated.append(created)
+
+        runs = list(first.get('workflow_runs', []))
+        last_page = min(-(-total // PER_PAGE), MAX_RESULTS_PER_QUERY // PER_PAGE)
+        for result in pages.map(lambda page: self._get_page(created, page), range(2, last_page + 1)):
+            runs.extend(result.get('workflow_runs', []))
+        self._count('runs_listed', len(runs))
+        return runs
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[stat] += amount
+
+    def iter_slices(self, since: datetime, until: Optional[datetime] = None, slice_days: float = 7,
+                    checkpoint: Optional[BackfillCheckpoint] = None) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Yield (slice key, runs) for every unfinished slice, newest first as they complete.
+
+        Parts of a slice already covered by the checkpoint (e.g. the newest slice of
+        an earlier invocation that ended at its own until) are not listed again.
+        Mark a slice in the checkpoint only once its runs are ingested (or queued).
+        """
+        until = until or datetime.now(timezone.utc)
+        slices = [(s, u) for cell in date_slices(since, until, slice_days)
+                  for s, u in (checkpoint.remaining(self.repo, *cell) if checkpoint else [cell])[::-1]]
+        concurrent_slices = max(1, self.max_workers // 4)
+        with ThreadPoolExecutor(self.max_workers, thread_name_prefix='backfill-page') as pages, \
+                ThreadPoolExecutor(concurrent_slices, thread_name_prefix='backfill-slice') as lister:
+            pending = {}
+            remaining = iter(slices)
+            for s, u in remaining:
+                pending[lister.submit(self.fetch_slice, s, u, pages)] = slice_key(s, u)
+                if len(pending) >= 2 * concurrent_slices:
+                    break
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    yield key, future.result()
+                    next_slice = next(remaining, None)
+                    if next_slice is not None:
+                        pending[lister.submit(self.fetch_slice, *next_slice, pages)] = slice_key(*next_slice)
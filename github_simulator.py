@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+GitHub Actions API Simulator
+Local stand-in for api.github.com, so PipelineIngestionSystem can be load tested
+end to end without the network or a token quota.
+
+Every owner/name exists. Its runs are derived deterministically from the repository
+name and the seed, so a repository keeps the same runs across restarts. Runs are
+spaced run_interval apart going back from startup, and about failure_rate of them
+failed. The simulator serves the endpoints the ingestion code uses:
+
+    GET /repos/{owner}/{repo}/actions/runs                 paginated (per_page, page, created=a..b)
+    GET /repos/{owner}/{repo}/actions/runs/{id}/artifacts  artifact listings with real sizes
+    GET /repos/{owner}/{repo}/actions/artifacts/{id}/zip   302 to /_blobs/{id}.zip, like GitHub
+    GET /_blobs/{id}.zip                                   zip archive streamed in chunks
+    GET /rate_limit, GET /_stats
+
+Artifact archives are real zip files built from the synthetic report generators
+(a few cached variants per framework and artifact name). API responses carry
+X-RateLimit-* headers with a per-token quota that answers 403 once exhausted.
+Latency and a 5xx error rate can be injected.
+
+Standalone server for benchmarks on one box:
+    python github_simulator.py --port 8090 --runs 2000
+    GITHUB_API_URL=http://localhost:8090 python pipeline-ingestion-system.py --workers 8 --max-runs 2000
+"""
+
+import argparse
+import io
+import json
+import random
+import re
+import threading
+import time
+import zipfile
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from synthetic_reports import GENERATORS, generate_report
+
+RUN_ID_STRIDE = 10_000_000
+ARTIFACT_ID_STRIDE = 10
+MAX_PER_PAGE = 100
+MAX_FILTERED_RESULTS = 1000
+CHUNK_SIZE = 64 * 1024
+
+# Artifact name and report file per framework; the last artifact is not a test report
+ARTIFACTS = {
+    'junit': [('surefire-reports', 'TEST-results.xml'), ('integration-test-results', 'TEST-integration.xml')],
+    'pytest': [('pytest-results', 'report.json'), ('api-test-results', 'api-report.json')],
+    'jest': [('jest-results', 'jest-results.json')],
+    'go-test': [('go-test-results', 'test.json')],
+    'xunit': [('xunit-test-results', 'TestResults.xml')]
+}
+BUILD_ARTIFACT = ('build-output', 'build.log')
+
+_RUNS_PATH = re.compile(r'^/repos/([^/]+/[^/]+)/actions/runs$')
+_ARTIFACTS_PATH = re.compile(r'^/repos/([^/]+/[^/]+)/actions/runs/(\d+)/artifacts$')
+_DOWNLOAD_PATH = re.compile(r'^/repos/([^/]+/[^/]+)/actions/artifacts/(\d+)/zip$')
+_BLOB_PATH = re.compile(r'^/_blobs/(\d+)\.zip$')
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _parse_iso(value: str) -> float:
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=timezone.utc).timestamp()
+
+
+class GitHubSimulator:
+    """Threaded HTTP server imitating the GitHub Actions REST API."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, runs_per_repo: int = 500,
+                 run_interval: float = 3600.0, failure_rate: float = 0.15, latency_ms: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: Optional[int] = 5000, rate_window: float = 3600.0,
+                 expire_after_days: float = 90.0, variants: int = 4, seed: int = 42,
+                 frameworks: Optional[Dict[str, str]] = None, bandwidth: Optional[float] = None):
+        """
+        Initialize the simulator (call start() to begin serving).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            runs_per_repo: Workflow runs every repository has
+            run_interval: Seconds between consecutive runs of a repository
+            failure_rate: Share of runs that concluded 'failure'
+            latency_ms: Mean injected latency per request (uniform 0.5x-1.5x)
+            error_rate: Share of requests answered with a 500/502
+            rate_limit: Requests per token per window (unlimited when None)
+            rate_window: Rate limit window in seconds
+            expire_after_days: Artifacts of older runs are listed as expired
+            variants: Cached report variants per framework and artifact name
+            seed: Seed of the synthetic history
+            frameworks: Framework per repository (derived from the name when missing)
+            bandwidth: Download throttle in bytes per second (unthrottled when None)
+        """
+        self.runs_per_repo = runs_per_repo
+        self.run_interval = run_interval
+        self.failure_rate = failure_rate
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.expire_after = expire_after_days * 86400.0
+        self.variants = max(1, variants)
+        self.seed = seed
+        self.frameworks = dict(frameworks or {})
+        self.bandwidth = bandwidth
+        self.anchor = float(int(time.time()))
+        self._repos: Dict[str, int] = {}
+        self._repo_names: List[str] = []
+        self._archives: Dict[Tuple[str, str, int], bytes] = {}
+        self._quota: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.stats = Counter()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self.url = f'http://{host}:{self.port}'
+
+    # Synthetic history
+
+    def _repo_index(self, repo: str) -> int:
+        with self._lock:
+            index = self._repos.get(repo)
+            if index is None:
+                index = self._repos[repo] = len(self._repo_names)
+                self._repo_names.append(repo)
+            return index
+
+    def framework(self, repo: str) -> str:
+        if repo not in self.frameworks:
+            hinted = [f for f in GENERATORS if f.split('-')[0] in repo.lower()]
+            frameworks = sorted(GENERATORS)
+            self.frameworks[repo] = hinted[0] if hinted else frameworks[zlib.crc32(repo.encode()) % len(frameworks)]
+        return self.frameworks[repo]
+
+    def _rng(self, *key: Any) -> random.Random:
+        return random.Random(zlib.crc32(repr((self.seed, *key)).encode()))
+
+    def run(self, repo: str, index: int) -> Dict[str, Any]:
+        """Run number index of a repository (0 = newest)."""
+        rng = self._rng(repo, index)
+        run_id = (self._repo_index(repo) + 1) * RUN_ID_STRIDE + index
+        created = self.anchor - index * self.run_interval - rng.uniform(0, self.run_interval / 2)
+        return {
+            'id': run_id,
+            'name': 'CI',
+            'run_number': self.runs_per_repo - index,
+            'run_attempt': 1,
+            'event': 'push',
+            'status': 'completed',
+            'conclusion': 'failure' if rng.random() < self.failure_rate else 'success',
+            'head_branch': 'main',
+            'head_sha': '%040x' % rng.getrandbits(160),
+            'created_at': _iso(created),
+            'updated_at': _iso(created + rng.uniform(60, 900)),
+            'html_url': f'https://github.com/{repo}/actions/runs/{run_id}',
+            'repository': {'full_name': repo}
+        }
+
+    def _locate_run(self, run_id: int) -> Optional[Tuple[str, int]]:
+        repo_index, index = divmod(run_id, RUN_ID_STRIDE)
+        with self._lock:
+            if not 1 <= repo_index <= len(self._repo_names) or index >= self.runs_per_repo:
+                return None
+            return self._repo_names[repo_index - 1], index
+
+    def artifacts(self, repo: str, index: int) -> List[Dict[str, Any]]:
+        """Artifact listing of a run, with the sizes of the archives that will be served."""
+        run = self.run(repo, index)
+        expired = self.anchor - _parse_iso(run['created_at']) > self.expire_after
+        listing = []
+        for position, (name, _) in enumerate(ARTIFACTS[self.framework(repo)] + [BUILD_ARTIFACT]):
+            artifact_id = run['id'] * ARTIFACT_ID_STRIDE + position
+            listing.append({
+                'id': artifact_id,
+                'name': name,
+                'size_in_bytes': len(self._archive(repo, artifact_id)),
+                'expired': expired,
+                'created_at': run['created_at'],
+                'archive_download_url': f'{self.url}/repos/{repo}/actions/artifacts/{artifact_id}/zip',
+                'workflow_run': {'id': run['id']}
+            })
+        return listing
+
+    def _archive(self, repo: str, artifact_id: int) -> bytes:
+        """Zip archive of an artifact (cached per framework, artifact name and variant)."""
+        position = artifact_id % ARTIFACT_ID_STRIDE
+        framework = self.framework(repo)
+        entries = ARTIFACTS[framework] + [BUILD_ARTIFACT]
+        name, filename = entries[min(position, len(entries) - 1)]
+        key = (framework, name, artifact_id // ARTIFACT_ID_STRIDE % self.variants)
+        with self._lock:
+            archive = self._archives.get(key)
+            if archive is None:
+                if (name, filename) == BUILD_ARTIFACT:
+                    content = b'Build succeeded\n' * 64
+                else:
+                    content = bytes(generate_report(framework, name))
+                buffer = io.BytesIO()
+                with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+                    zf.writestr(filename, content)
+                archive = self._archives[key] = buffer.getvalue()
+        return archive
+
+    def list_runs(self, repo: str, params: Dict[str, str]) -> Dict[str, Any]:
+        """One page of a repository's runs, newest first."""
+        per_page = min(MAX_PER_PAGE, max(1, int(params.get('per_page', 30))))
+        page = max(1, int(params.get('page', 1)))
+        if params.get('status') not in (None, 'completed', 'success', 'failure') or \
+                params.get('event') not in (None, 'push'):
+            return {'total_count': 0, 'workflow_runs': []}
+
+        first, last = 0, self.runs_per_repo
+        created = params.get('created')
+        if created and '..' in created:
+            since, until = (_parse_iso(v) for v in created.split('..'))
+            # created = anchor - index * interval - jitter (jitter < interval / 2)
+            first = max(0, int((self.anchor - until) // self.run_interval) - 1)
+            last = min(self.runs_per_repo, int((self.anchor - since) // self.run_interval) + 2)
+            indices = [i for i in range(first, last)
+                       if since <= _parse_iso(self.run(repo, i)['created_at']) <= until]
+        else:
+            indices = range(first, last)
+        if params.get('status') in ('success', 'failure'):
+            indices = [i for i in indices if self.run(repo, i)['conclusion'] == params['status']]
+
+        total = len(indices)
+        offset = (page - 1) * per_page
+        if created and offset >= MAX_FILTERED_RESULTS:
+            return {'total_count': total, 'workflow_runs': []}
+        return {'total_count': total,
+                'workflow_runs': [self.run(repo, i) for i in list(indices[offset:offset + per_page])]}
+
+    # Request handling
+
+    def _charge(self, token: str) -> Tuple[Dict[str, str], bool]:
+        """Count a request against a token's quota; returns (headers, allowed)."""
+        if self.rate_limit is None:
+            return {}, True
+        now = time.time()
+        with self._lock:
+            window = self._quota.get(token)
+            if window is None or now >= window[0]:
+                window = self._quota[token] = [now + self.rate_window, 0]
+            allowed = window[1] < self.rate_limit
+            if allowed:
+                window[1] += 1
+            used = window[1]
+            reset = window[0]
+        return {'X-RateLimit-Limit': str(self.rate_limit), 'X-RateLimit-Remaining': str(max(0, self.rate_limit - used)),
+                'X-RateLimit-Used': str(used), 'X-RateLimit-Reset': str(int(reset)),
+                'X-RateLimit-Resource': 'core'}, allowed
+
+    def _inject(self) -> Optional[int]:
+        """Sleep the injected latency; returns an error status when one is injected."""
+        with self._lock:
+            delay = self.latency_ms * self._random.uniform(0.5, 1.5) / 1000.0 if self.latency_ms else 0.0
+            fail = self.error_rate and self._random.random() < self.error_rate
+            status = self._random.choice((500, 502)) if fail else None
+        if delay:
+            time.sleep(delay)
+        return status
+
+    def handle(self, path: str, query: Dict[str, str], token: str) -> Tuple[int, Dict[str, str], Any]:
+        """
+        Route one GET request.
+
+        Returns:
+            (status, headers, body) where body is a JSON-serializable object or bytes
+        """
+        self.stats['requests'] += 1
+        if path == '/_stats':
+            return 200, {}, self.summary()
+
+        match = _BLOB_PATH.match(path)
+        if match:
+            # Blob storage: no API quota, but latency and errors apply
+            error = self._inject()
+            if error:
+                self.stats['errors_injected'] += 1
+                return error, {}, {'message': 'Server Error'}
+            artifact_id = int(match.group(1))
+            located = self._locate_run(artifact_id // ARTIFACT_ID_STRIDE)
+            if located is None:
+                return 404, {}, {'message': 'Not Found'}
+            self.stats['downloads'] += 1
+            return 200, {'Content-Type': 'application/zip'}, self._archive(located[0], artifact_id)
+
+        headers, allowed = self._charge(token)
+        if path == '/rate_limit':
+            return 200, headers, {'resources': {'core': {k.split('-')[-1].lower(): v for k, v in headers.items()}}}
+        if not allowed:
+            self.stats['rate_limited'] += 1
+            return 403, headers, {'message': 'API rate limit exceeded for token (simulated).'}
+        error = self._inject()
+        if error:
+            self.stats['errors_injected'] += 1
+            return error, headers, {'message': 'Server Error'}
+
+        match = _RUNS_PATH.match(path)
+        if match:
+            self.stats['list_runs'] += 1
+            return 200, headers, self.list_runs(match.group(1), query)
+        match = _ARTIFACTS_PATH.match(path)
+        if match:
+            located = self._locate_run(int(match.group(2)))
+            if located is None or located[0] != match.group(1):
+                return 404, headers, {'message': 'Not Found'}
+            self.stats['list_artifacts'] += 1
+            artifacts = self.artifacts(*located)
+            return 200, headers, {'total_count': len(artifacts), 'artifacts': artifacts}
+        match = _DOWNLOAD_PATH.match(path)
+        if match:
+            artifact_id = int(match.group(2))
+            if self._locate_run(artifact_id // ARTIFACT_ID_STRIDE) is None:
+                return 404, headers, {'message': 'Not Found'}
+            return 302, {**headers, 'Location': f'{self.url}/_blobs/{artifact_id}.zip'}, b''
+        return 404, headers, {'message': 'Not Found'}
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, 'repositories': len(self._repo_names), 'cached_archives': len(self._archives)}
+
+    def _handler(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; Nagle would hold the body for the delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                token = self.headers.get('Authorization') or self.client_address[0]
+                status, headers, body = simulator.handle(url.path, query, token)
+                data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', headers.pop('Content-Type', 'application/json; charset=utf-8'))
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                view = memoryview(data)
+                for offset in range(0, len(data), CHUNK_SIZE):
+                    chunk = view[offset:offset + CHUNK_SIZE]
+                    self.wfile.write(chunk)
+                    if simulator.bandwidth:
+                        time.sleep(len(chunk) / simulator.bandwidth)
+                simulator.stats['bytes_served'] += len(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'GitHubSimulator':
+        """Serve from a daemon thread."""
+        threading.Thread(target=self._server.serve_forever, name='github-simulator', daemon=True).start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline GitHub Actions API simulator')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--runs', type=int, default=500, help='workflow runs per repository')
+    parser.add_argument('--run-interval', type=float, default=3600.0, help='seconds between runs')
+    parser.add_argument('--failure-rate', type=float, default=0.15)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='mean injected latency per request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with 5xx')
+    parser.add_argument('--rate-limit', type=int, default=5000, help='requests per token per window (0 = unlimited)')
+    parser.add_argument('--rate-window', type=float, default=3600.0)
+    parser.add_argument('--bandwidth', type=float, help='download throttle in bytes per second')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    simulator = GitHubSimulator(args.host, args.port, runs_per_repo=args.runs, run_interval=args.run_interval,
+                                failure_rate=args.failure_rate, latency_ms=args.latency_ms,
+                                error_rate=args.error_rate, rate_limit=args.rate_limit or None,
+                                rate_window=args.rate_window, seed=args.seed, bandwidth=args.bandwidth)
+    print(f"🛰️  GitHub Actions simulator on {simulator.url} ({args.runs} runs per repository)")
+    try:
+        simulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"📊 {json.dumps(simulator.summary())}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+GitHub Token Pool
+Spreads GitHub API requests over several tokens. Remaining quota and reset time
+are tracked per token from the X-RateLimit-* response headers, and every request
+goes to the token with the most headroom (remaining minus requests in flight).
+
+A token that hits its primary or secondary rate limit is set aside until its
+reset time (or Retry-After) and the request is retried on another one. When every
+token is exhausted the request is parked until the earliest reset instead of being
+dropped; only a wait longer than max_park raises RateLimitExhausted, which the
+work queue treats as a retryable failure. A request still rate limited after
+MAX_ATTEMPTS tries raises it too, instead of returning the 403/429.
+
+Environment:
+    GITHUB_TOKENS=tok1,tok2,...   token pool (GITHUB_TOKEN is added when set)
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from structured_log import get_logger
+
+AUTHENTICATED_LIMIT = 5000
+UNAUTHENTICATED_LIMIT = 60
+SECONDARY_LIMIT_PAUSE_SEC = 60.0
+MAX_ATTEMPTS = 6
+
+
+class RateLimitExhausted(Exception):
+    """Every token is rate limited for longer than the caller is willing to wait."""
+
+    def __init__(self, retry_at: float):
+        super().__init__(f'all GitHub tokens rate limited until {time.strftime("%H:%M:%S", time.localtime(retry_at))}')
+        self.retry_at = retry_at
+
+
+class TokenState:
+    """Quota bookkeeping of one token (None = unauthenticated)."""
+
+    def __init__(self, token: Optional[str]):
+        self.token = token
+        self.limit = AUTHENTICATED_LIMIT if token else UNAUTHENTICATED_LIMIT
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+        self.in_flight = 0
+        self.requests = 0
+
+    @property
+    def label(self) -> str:
+        return f'…{self.token[-4:]}' if self.token else 'anonymous'
+
+    def headroom(self, now: float) -> float:
+        if now < self.blocked_until:
+            return 0
+        remaining = self.limit if self.remaining is None or now >= self.reset_at else self.remaining
+        return remaining - self.in_flight
+
+    def available_at(self, now: float) -> float:
+        """When this token can be used again (now if it has headroom)."""
+        if self.headroom(now) > 0:
+            return now
+        return max(self.blocked_until, self.reset_at if self.remaining == 0 else now)
+
+
+class GitHubTokenPool:
+    """Thread-safe pool of GitHub tokens with quota-aware routing."""
+
+    def __init__(self, tokens: Optional[List[str]] = None, max_park: Optional[float] = None,
+                 session: Optional[requests.Session] = None, pool_size: int = 16):
+        """
+        Args:
+            tokens: Tokens to rotate through (unauthenticated requests when empty)
+            max_park: Longest wait for a reset before RateLimitExhausted is raised (unbounded when None)
+            session: Session to use (a pooled one is created when omitted)
+            pool_size: Connections kept per host
+        """
+        unique = list(dict.fromkeys(t for t in (tokens or []) if t))
+        self.tokens = [TokenState(t) for t in unique] or [TokenState(None)]
+        self.max_park = max_park
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.log = get_logger('github')
+        self._cond = threading.Condition()
+        self.stats = {'requests': 0, 'rate_limited': 0, 'parked': 0, 'parked_seconds': 0.0}
+
+    @classmethod
+    def from_env(cls, **kwargs: Any) -> 'GitHubTokenPool':
+        """Pool of GITHUB_TOKENS plus GITHUB_TOKEN."""
+        tokens = [t.strip() for t in os.getenv('GITHUB_TOKENS', '').split(',') if t.strip()]
+        if os.getenv('GITHUB_TOKEN'):
+            tokens.append(os.getenv('GITHUB_TOKEN'))
+        return cls(tokens, **kwargs)
+
+    @property
+    def authenticated(self) -> bool:
+        return self.tokens[0].token is not None
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def _checkout(self, max_park: Optional[float]) -> TokenState:
+        """Reserve the token with the most headroom, parking (up to max_park) while all are exhausted."""
+        with self._cond:
+            parked_at = None
+            while True:
+                now = time.time()
+                best = max(self.tokens, key=lambda state: state.headroom(now))
+                if best.headroom(now) > 0:
+                    best.in_flight += 1
+                    if parked_at is not None:
+                        self.stats['parked_seconds'] += now - parked_at
+                    return best
+                retry_at = min(state.available_at(now) for state in self.tokens)
+                if max_park is not None and retry_at - now > max_park:
+                    raise RateLimitExhausted(retry_at)
+                if parked_at is None:
+                    parked_at = now
+                    self.stats['parked'] += 1
+                    self.log.warning('github.parked', f"         ⏸️  All {len(self.tokens)} GitHub token(s) rate limited - "
+                                     f"waiting {retry_at - now:.0f}s for a reset", wait=retry_at - now)
+                # Returning tokens wake us early; otherwise wait for the reset
+                self._cond.wait(max(0.05, retry_at - now + 1.0))
+
+    def _checkin(self, state: TokenState, response: Optional[requests.Response]):
+        with self._cond:
+            state.in_flight -= 1
+            state.requests += 1
+            if response is not None:
+                headers = response.headers
+                if headers.get('X-RateLimit-Limit'):
+                    state.limit = int(headers['X-RateLimit-Limit'])
+                if headers.get('X-RateLimit-Reset'):
+                    state.reset_at = float(headers['X-RateLimit-Reset'])
+                if headers.get('X-RateLimit-Remaining'):
+                    state.remaining = int(headers['X-RateLimit-Remaining'])
+                if self._rate_limited(response):
+                    self.stats['rate_limited'] += 1
+                    if state.remaining == 0:
+                        state.blocked_until = max(state.blocked_until, state.reset_at)
+                    else:
+                        # Secondary (abuse) limit: back off this token only
+                        retry_after = float(headers.get('Retry-After') or SECONDARY_LIMIT_PAUSE_SEC)
+                        state.blocked_until = time.time() + retry_after
+            self._cond.notify_all()
+
+    @staticmethod
+    def _rate_limited(response: requests.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        return (response.headers.get('X-RateLimit-Remaining') == '0' or 'Retry-After' in response.headers
+                or 'rate limit' in response.text.lower())
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, timeout: float = 30,
+            headers: Optional[Dict[str, str]] = None, max_park: Optional[float] = None,
+            **kwargs: Any) -> requests.Response:
+        """
+        GET with the token that has the most headroom; rate-limited responses are
+        retried on another token (or after a reset) rather than returned.
+
+        Args:
+            max_park: Longest wait for a reset on this request (the pool's max_park when None)
+
+        Raises:
+            RateLimitExhausted: No token frees up within max_park, or the request was
+                still rate limited after MAX_ATTEMPTS tries
+        """
+        max_park = self.max_park if max_park is None else max_park
+        for _ in range(MAX_ATTEMPTS):
+            state = self._checkout(max_park)
+            request_headers = {'Accept': 'application/vnd.github+json', **(headers or {})}
+            if state.token:
+                request_headers['Authorization'] = f'token {state.token}'
+            response = None
+            try:
+                response = self.session.get(url, params=params, headers=request_headers, timeout=timeout, **kwargs)
+            finally:
+                self._checkin(state, response)
+            self.stats['requests'] += 1
+            if not self._rate_limited(response):
+                return response
+            self.log.info('github.token_limited', f"         🔁 Token {state.label} rate limited - switching",
+                          token=state.label, status=response.status_code)
+        with self._cond:
+            now = time.time()
+            raise RateLimitExhausted(min(state.available_at(now) for state in self.tokens))
+
+    def quota(self) -> List[Dict[str, Any]]:
+        """Current quota view per token (tokens masked)."""
+        now = time.time()
+        with self._cond:
+            return [{'token': state.label, 'limit': state.limit, 'remaining': state.remaining,
+                     'reset_in': max(0.0, state.reset_at - now), 'requests': state.requests,
+                     'headroom': state.headroom(now)} for state in self.tokens]
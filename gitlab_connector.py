@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+GitLab CI Connector
+Pulls test reports from GitLab pipelines. Each finished pipeline's cheap
+test_report_summary is fetched first: pipelines without tests, or unchanged since
+the last ingestion, are skipped before anything is downloaded. Only then are the
+JUnit XML files extracted from the artifact archives of the jobs that produced the
+report (falling back to the pipeline's full test_report rendered as JUnit XML).
+
+Projects are listed and pipelines fetched concurrently, and reports are yielded as
+each pipeline's downloads finish. Listings follow keyset/Link-header pagination,
+and all threads share one rate limiter that also honours 429 Retry-After. Job
+archives are streamed to a temporary file, and no report is inflated beyond
+max_report_bytes. A project or pipeline that cannot be listed or fetched is
+counted in stats and errors and skipped; the others are still ingested.
+"""
+
+import gzip
+import io
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_limits import MAX_REPORT_BYTES, RateLimiter
+from jenkins_connector import JUNIT_ARTIFACT_RE, bounded_map, test_report_to_junit
+
+DEFAULT_REQUESTS_PER_SECOND = 10.0
+MAX_RETRIES = 3
+PER_PAGE = 100
+READ_CHUNK = 1024 * 1024
+
+# GitLab test_report case statuses -> the Jenkins-style statuses test_report_to_junit renders
+CASE_STATUSES = {'success': 'PASSED', 'failed': 'FAILED', 'error': 'FAILED', 'skipped': 'SKIPPED'}
+
+
+def gitlab_report_to_junit(report: Dict[str, Any]) -> bytes:
+    """Render a GitLab pipeline test_report payload as JUnit XML."""
+    return test_report_to_junit({'suites': [
+        {
+            'name': suite.get('name'),
+            'duration': suite.get('total_time'),
+            'cases': [
+                {
+                    'className': case.get('classname'),
+                    'name': case.get('name'),
+                    'duration': case.get('execution_time'),
+                    'status': CASE_STATUSES.get(case.get('status'), 'PASSED'),
+                    'errorDetails': case.get('system_output'),
+                    'errorStackTrace': case.get('stack_trace') or case.get('system_output')
+                }
+                for case in suite.get('test_cases', [])
+            ]
+        }
+        for suite in report.get('test_suites', [])
+    ]})
+
+
+class GitLabConnector:
+    """Fetches changed pipelines' test reports from GitLab projects."""
+
+    def __init__(self, base_url: str = 'https://gitlab.com', token: Optional[str] = None, max_workers: int = 8,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND, timeout: float = 30,
+                 session: Optional[requests.Session] = None, max_report_bytes: int = MAX_REPORT_BYTES):
+        """
+        Initialize the connector.
+
+        Args:
+            base_url: GitLab instance URL
+            token: Personal/project access token (PRIVATE-TOKEN)
+            max_workers: Concurrent API calls / downloads
+            requests_per_second: Request budget shared by all threads
+            timeout: Per-request timeout in seconds
+            session: Session to use (a pooled one is created when omitted)
+            max_report_bytes: Largest report extracted from a job archive (larger ones are skipped)
+        """
+        self.api_url = base_url.rstrip('/') + '/api/v4'
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_report_bytes = max_report_bytes
+        self.limiter = RateLimiter(requests_per_second)
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if token:
+            self.session.headers['PRIVATE-TOKEN'] = token
+        self.stats = {'requests': 0, 'pipelines_listed': 0, 'pipelines_skipped': 0, 'downloads': 0,
+                      'projects_failed': 0, 'pipelines_failed': 0, 'reports_too_large': 0}
+        self.errors: List[str] = []
+        self._stats_lock = threading.Lock()
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[stat] += amount
+
+    def _failed(self, stat: str, what: str, error: Exception):
+        with self._stats_lock:
+            self.stats[stat] += 1
+            self.errors.append(f'{what}: {type(error).__name__}: {error}')
+
+    def _get(self, url: str, params: Optional[Dict[str, Any]] = None, allow_404: bool = False,
+             stream: bool = False) -> Optional[requests.Response]:
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.acquire()
+            response = self.session.get(url, params=params, timeout=self.timeout, stream=stream)
+            self._count('requests')
+            if response.status_code == 429 and attempt < MAX_RETRIES:
+                self.limiter.pause(float(response.headers.get('Retry-After', 2 ** attempt)))
+                continue
+            if response.headers.get('RateLimit-Remaining') == '0' and response.headers.get('RateLimit-Reset'):
+                self.limiter.pause(max(0.0, float(response.headers['RateLimit-Reset']) - time.time()))
+            if allow_404 and response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response
+        return None
+
+    def _project_url(self, project: str) -> str:
+        return f"{self.api_url}/projects/{quote(project, safe='')}"
+
+    def _paginate(self, url: str, params: Dict[str, Any], limit: int) -> Iterator[Dict[str, Any]]:
+        """Follow Link rel="next" headers (keyset or offset) until limit items are read."""
+        params = {**params, 'per_page': min(PER_PAGE, limit)}
+        seen = 0
+        while url and seen < limit:
+            response = self._get(url, params)
+            for item in response.json():
+                yield item
+                seen += 1
+                if seen >= limit:
+                    return
+            url = response.links.get('next', {}).get('url')
+            params = None  # the next link carries the query
+
+    def list_pipelines(self, project: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recently updated finished pipelines of a project."""
+        params = {'scope': 'finished', 'order_by': 'updated_at', 'sort': 'desc', 'pagination': 'keyset'}
+        pipelines = list(self._paginate(f'{self._project_url(project)}/pipelines', params, limit))
+        self._count('pipelines_listed', len(pipelines))
+        return pipelines
+
+    def test_report_summary(self, project: str, pipeline_id: int) -> Dict[str, Any]:
+        """Totals and per-suite job ids of a pipeline's test report."""
+        response = self._get(f'{self._project_url(project)}/pipelines/{pipeline_id}/test_report_summary', allow_404=True)
+        return response.json() if response is not None else {}
+
+    def fetch_reports(self, project: str, pipeline: Dict[str, Any], summary: Dict[str, Any]) -> List[Tuple[str, bytes]]:
+        """
+        Download the JUnit XML reports behind a pipeline's test report summary.
+
+        Returns:
+            (artifact name, report bytes) pairs
+        """
+        reports = []
+        job_ids = sorted({job_id for suite in summary.get('test_suites', []) for job_id in suite.get('build_ids', [])})
+        for job_id in job_ids:
+            response = self._get(f'{self._project_url(project)}/jobs/{job_id}/artifacts', allow_404=True, stream=True)
+            if response is None:
+                continue
+            self._count('downloads')
+            # Archives can be far larger than the reports in them: spool to disk, not memory
+            with response, tempfile.TemporaryFile(prefix='gitlab-artifacts-') as archive:
+                for chunk in response.iter_content(chunk_size=READ_CHUNK):
+                    archive.write(chunk)
+                reports.extend(self._extract_junit(job_id, archive))
+        if not reports:
+            response = self._get(f"{self._project_url(project)}/pipelines/{pipeline['id']}/test_report", allow_404=True)
+            report = response.json() if response is not None else {}
+            if report.get('test_suites'):
+                reports.append((f"pipeline-{pipeline['id']}-test_report.xml", gitlab_report_to_junit(report)))
+        return reports
+
+    def _extract_junit(self, job_id: int, archive: IO[bytes]) -> List[Tuple[str, bytes]]:
+        """
+        JUnit reports in a job's artifact archive; corrupt archives and members are
+        skipped, as are reports that inflate beyond max_report_bytes (counted in stats).
+        """
+        reports = []
+        try:
+            with zipfile.ZipFile(archive) as zf:
+                for info in zf.infolist():
+                    name = info.filename[:-3] if info.filename.endswith('.gz') else info.filename
+                    if info.is_dir() or not JUNIT_ARTIFACT_RE.search(name):
+                        continue
+                    try:
+                        data = self._read_limited(zf, info)
+                    except (zipfile.BadZipFile, OSError, EOFError, zlib.error):  # bad CRC, truncated or corrupt gzip
+                        continue
+                    if data is None:
+                        self._failed('reports_too_large', f'job-{job_id}/{name}',
+                                     ValueError(f'report exceeds {self.max_report_bytes} bytes'))
+                        continue
+                    reports.append((f'job-{job_id}/{name}', data))
+        except zipfile.BadZipFile:
+            pass
+        return reports
+
+    def _read_limited(self, zf: zipfile.ZipFile, info: zipfile.ZipInfo) -> Optional[bytes]:
+        """A member's (gunzipped) content read in chunks; None once it passes max_report_bytes."""
+        if info.file_size > self.max_report_bytes and not info.filename.endswith('.gz'):
+            return None
+        data = io.BytesIO()
+        with zf.open(info) as member:
+            source = gzip.GzipFile(fileobj=member) if info.filename.endswith('.gz') else member
+            while True:
+                chunk = source.read(READ_CHUNK)
+                if not chunk:
+                    return data.getvalue()
+                if data.tell() + len(chunk) > self.max_report_bytes:
+                    return None
+                data.write(chunk)
+
+    @staticmethod
+    def fingerprint(pipeline: Dict[str, Any], summary: Dict[str, Any]) -> str:
+        """Identity of a pipeline's test results; unchanged fingerprints are not re-ingested."""
+        total = summary.get('total', {})
+        return f"{pipeline.get('updated_at')}:{total.get('count')}:{total.get('failed')}:{total.get('error')}"
+
+    def _pipeline_reports(self, project: str, pipeline: Dict[str, Any], known: Dict[str, str]
+                          ) -> Optional[Tuple[str, str, List[Tuple[Dict[str, Any], str, bytes]]]]:
+        """(state key, fingerprint, reports) of a changed pipeline, None when skipped; known is only read here."""
+        key = f"{project}:{pipeline['id']}"
+        summary = self.test_report_summary(project, pipeline['id'])
+        fingerprint = self.fingerprint(pipeline, summary)
+        if not summary.get('total', {}).get('count') or known.get(key) == fingerprint:
+            self._count('pipelines_skipped')
+            return None
+        run = {
+            'id': pipeline['id'],
+            'name': project,
+            'run_number': pipeline.get('iid'),
+            'conclusion': pipeline.get('status'),
+            'head_branch': pipeline.get('ref'),
+            'head_sha': pipeline.get('sha'),
+            'created_at': pipeline.get('created_at'),
+            'url': pipeline.get('web_url')
+        }
+        reports = [(run, name, data) for name, data in self.fetch_reports(project, pipeline, summary)]
+        return key, fingerprint, reports
+
+    def iter_reports(self, projects: List[str], pipelines_per_project: int = 20,
+                     known: Optional[Dict[str, str]] = None) -> Iterator[Tuple[Dict[str, Any], str, bytes]]:
+        """
+        List projects and fetch their pipelines concurrently, and yield each pipeline's
+        new test reports as soon as they are downloaded.
+
+        Args:
+            projects: Project paths ('group/project') or numeric ids
+            pipelines_per_project: Most recently updated pipelines to consider per project
+            known: "project:pipeline_id" -> fingerprint of already ingested pipelines;
+                a pipeline is added (by the consuming thread) once all its reports have
+                been consumed, so pipelines left unconsumed by an error are fetched again
+
+        Yields:
+            (run, artifact name, report bytes)
+        """
+        known = {} if known is None else known
+
+        # One failing project or pipeline (HTTP error, malformed payload) must not abort the others
+        def project_pipelines(project):
+            try:
+                return [(project, pipeline) for pipeline in self.list_pipelines(project, pipelines_per_project)]
+            except Exception as e:
+                self._failed('projects_failed', project, e)
+                return []
+
+        def pipeline_reports(item):
+            project, pipeline = item
+            try:
+                return self._pipeline_reports(project, pipeline, known)
+            except Exception as e:
+                self._failed('pipelines_failed', f"{project}#{pipeline.get('id')}", e)
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='gitlab') as executor:
+            pipelines = [item for items in executor.map(project_pipelines, map(str, projects)) for item in items]
+            for result in bounded_map(executor, pipeline_reports, pipelines, 2 * self.max_workers):
+                if result is None:
+                    continue
+                key, fingerprint, reports = result
+                yield from reports
+                known[key] = fingerprint
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Test Result History Store
+Persists parsed test results in a local SQLite database (WAL mode) so results
+survive beyond a single ingestion run and can be queried across runs.
+
+Schema is normalized into projects, suites, tests (stable integer ids per test
+identity), runs and case_results. Each run is written with batched executemany
+calls inside a single transaction.
+
+A run is keyed by (project, external_id, run_attempt): the reports of one CI run
+(several artifacts or jobs) are recorded into the same run instead of one run
+each. A test reported more than once in a run (a rerun, or the same test in
+another report) keeps every attempt, numbered in report order, so pass/fail flips
+between attempts are not lost.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_DB_PATH = Path('test-history.db')
+
+# Case statuses are stored as small integers
+STATUS_CODES = {'passed': 0, 'failed': 1, 'error': 2, 'skipped': 3}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+STATUS_ALIASES = {
+    'pass': 'passed', 'success': 'passed', 'ok': 'passed',
+    'fail': 'failed', 'failure': 'failed',
+    'errored': 'error', 'broken': 'error',
+    'skip': 'skipped', 'pending': 'skipped', 'ignored': 'skipped', 'disabled': 'skipped', 'todo': 'skipped',
+}
+
+# SQLite caps the number of bound parameters per statement
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS suites (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    name TEXT NOT NULL,
+    UNIQUE (project_id, name)
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    suite_id INTEGER NOT NULL REFERENCES suites(id),
+    name TEXT NOT NULL,
+    UNIQUE (suite_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_tests_project_name ON tests (project_id, name);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    branch TEXT,
+    commit_sha TEXT,
+    build_number TEXT,
+    external_id TEXT,
+    run_attempt INTEGER NOT NULL DEFAULT 1,
+    framework TEXT,
+    started_at REAL NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_project_branch ON runs (project_id, branch, started_at);
+"""
+
+# Clustered on (test_id, run_id, attempt) so "history of test X" is a single range scan
+# (kept out of SCHEMA so _migrate() can rebuild it)
+CASE_RESULTS_TABLE = """
+CREATE TABLE IF NOT EXISTS case_results (
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    attempt INTEGER NOT NULL DEFAULT 0,
+    status INTEGER NOT NULL,
+    duration REAL,
+    message TEXT,
+    PRIMARY KEY (test_id, run_id, attempt)
+) WITHOUT ROWID;
+"""
+
+# Created after _migrate(), since databases from before run_attempt lack the column
+RUN_KEY_INDEX = 'CREATE INDEX IF NOT EXISTS idx_runs_key ON runs (project_id, external_id, run_attempt)'
+
+
+# Candidate field names for each normalized column, in priority order
+CASE_FIELDS = {
+    'suite': ('suite', 'suite_name', 'classname', 'class_name'),
+    'name': ('name', 'test_name', 'title', 'nodeid'),
+    'status': ('status', 'outcome', 'result'),
+    'duration': ('duration_sec', 'duration', 'time'),
+    'message': ('failure_message', 'message', 'error_message', 'stack_trace'),
+}
+
+_status_cache: Dict[Any, str] = {}
+
+
+def _field(case: Any, *names: str, default: Any = None) -> Any:
+    """Read the first present field from a dict or model object."""
+    for name in names:
+        if isinstance(case, dict):
+            value = case.get(name)
+        else:
+            value = getattr(case, name, None)
+        if value is not None:
+            return value
+    return default
+
+
+def normalize_status(status: Any) -> str:
+    """Map framework-specific statuses (or TestStatus enums) onto passed/failed/error/skipped."""
+    try:
+        return _status_cache[status]
+    except (KeyError, TypeError):
+        pass
+    value = getattr(status, 'value', status)
+    name = str(value or 'passed').lower()
+    name = STATUS_ALIASES.get(name, name)
+    name = name if name in STATUS_CODES else 'failed'
+    try:
+        _status_cache[status] = name
+    except TypeError:
+        pass
+    return name
+
+
+def normalize_case(case: Any) -> Tuple[str, str, str, float, Optional[str]]:
+    """
+    Flatten a parsed test case into (suite, name, status, duration, message).
+
+    Accepts the parser's test case models as well as plain dicts.
+    """
+    suite = _field(case, *CASE_FIELDS['suite'], default='')
+    name = _field(case, *CASE_FIELDS['name'], default='')
+    status = normalize_status(_field(case, *CASE_FIELDS['status']))
+    duration = _field(case, *CASE_FIELDS['duration'], default=0.0)
+    message = _field(case, *CASE_FIELDS['message'])
+    try:
+        duration = float(duration)
+    except (TypeError, ValueError):
+        duration = 0.0
+    return str(suite), str(name), status, duration, message
+
+
+def normalize_cases(test_cases: Iterable[Any]) -> List[Tuple[str, str, str, float, Optional[str]]]:
+    """
+    Normalize a whole run of test cases.
+
+    Field names are resolved once from the first case rather than probed for
+    every case; cases that do not match the first case's shape fall back to
+    normalize_case().
+    """
+    cases = test_cases if isinstance(test_cases, list) else list(test_cases)
+    if not cases:
+        return []
+
+    sample = cases[0]
+    is_dict = isinstance(sample, dict)
+    resolved = {}
+    for column, names in CASE_FIELDS.items():
+        resolved[column] = next(
+            (name for name in names if (sample.get(name) if is_dict else getattr(sample, name, None)) is not None),
+            None
+        )
+    if resolved['name'] is None:
+        return [normalize_case(case) for case in cases]
+
+    def reader(column: str, default: Any = None):
+        name = resolved[column]
+        if name is None:
+            return lambda case: default
+        if is_dict:
+            return lambda case: case.get(name, default)
+        return lambda case: getattr(case, name, default)
+
+    get_suite, get_name = reader('suite', ''), reader('name', '')
+    get_status, get_duration, get_message = reader('status'), reader('duration', 0.0), reader('message')
+
+    normalized = []
+    append = normalized.append
+    for case in cases:
+        if isinstance(case, dict) is not is_dict:
+            append(normalize_case(case))
+            continue
+        duration = get_duration(case)
+        try:
+            duration = float(duration)
+        except (TypeError, ValueError):
+            duration = 0.0
+        append((str(get_suite(case) or ''), str(get_name(case)), normalize_status(get_status(case)),
+                duration, get_message(case)))
+    return normalized
+
+
+class TestHistoryStore:
+    """SQLite-backed store of test runs and per-case results."""
+
+    def __init__(self, db_path: Any = DEFAULT_DB_PATH):
+        """
+        Open (or create) the history database.
+
+        Args:
+            db_path: Path of the SQLite database file, or ':memory:'
+        """
+        self.db_path = str(db_path)
+        # Worker processes share the file, so wait for their write locks instead of failing
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        self.conn.execute('PRAGMA foreign_keys=OFF')
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.executescript(CASE_RESULTS_TABLE)
+        self.conn.execute(RUN_KEY_INDEX)
+
+        # Identity caches: name -> id
+        self._project_ids: Dict[str, int] = {}
+        self._suite_ids: Dict[Tuple[int, str], int] = {}
+        self._test_ids: Dict[Tuple[int, str], int] = {}
+
+    def _migrate(self):
+        """Bring a database written before run keys and case attempts up to the current schema."""
+        if 'run_attempt' not in {row[1] for row in self.conn.execute('PRAGMA table_info(runs)')}:
+            self.conn.execute('ALTER TABLE runs ADD COLUMN run_attempt INTEGER NOT NULL DEFAULT 1')
+        case_columns = {row[1] for row in self.conn.execute('PRAGMA table_info(case_results)')}
+        if case_columns and 'attempt' not in case_columns:
+            # The primary key changes, so the table is rebuilt
+            self.conn.executescript(
+                'BEGIN IMMEDIATE;'
+                'ALTER TABLE case_results RENAME TO case_results_old;'
+                + CASE_RESULTS_TABLE +
+                'INSERT INTO case_results (test_id, run_id, attempt, status, duration, message) '
+                'SELECT test_id, run_id, 0, status, duration, message FROM case_results_old;'
+                'DROP TABLE case_results_old;'
+                'COMMIT;'
+            )
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def record_run(self, project: str, test_cases: Iterable[Any], branch: Optional[str] = None,
+                   commit_sha: Optional[str] = None, build_number: Optional[str] = None,
+                   external_id: Optional[str] = None, framework: Optional[str] = None,
+                   started_at: Optional[float] = None, run_attempt: int = 1) -> Dict[str, Any]:
+        """
+        Record a parsed report and all of its test cases in a single transaction.
+
+        The report is added to the run already recorded under (project, external_id,
+        run_attempt), if any; otherwise a new run is created. Every case is stored as
+        an attempt of its test in that run, after the attempts already stored.
+
+        Args:
+            project: Project identifier (e.g. "spring-projects-spring-petclinic")
+            test_cases: Parsed test cases (models or dicts)
+            branch: Branch the run was built from
+            commit_sha: Commit the run was built from
+            build_number: CI build number
+            external_id: Run id in the originating CI system
+            framework: Detected test framework
+            started_at: Run start as a Unix timestamp (defaults to now)
+            run_attempt: Attempt of the CI run (e.g. GitHub's run_attempt)
+
+        Run totals count each test once, by its last attempt.
+
+        Returns:
+            Dict with the run id, the test id and normalized case of every attempt
+            (in case order), 'last_attempts' (positions of each test's last attempt
+            among them), 'retries' (attempts beyond a test's first in this report)
+            and the run's totals
+        """
+        cases = normalize_cases(test_cases)
+        started_at = time.time() if started_at is None else started_at
+
+        cur = self.conn.cursor()
+        cur.execute('BEGIN IMMEDIATE')
+        try:
+            project_id = self._project_id(cur, project)
+            suite_ids = self._suite_ids_for(cur, project_id, {suite for suite, _, _, _, _ in cases})
+            test_ids = self._test_ids_for(cur, project_id, suite_ids, [(suite, name) for suite, name, _, _, _ in cases])
+
+            run_id = None
+            if external_id is not None:
+                cur.execute('SELECT MAX(id) FROM runs WHERE project_id = ? AND external_id = ? AND run_attempt = ?',
+                            (project_id, external_id, run_attempt))
+                run_id = cur.fetchone()[0]
+            next_attempt: Dict[int, int] = {}
+            if run_id is None:
+                cur.execute(
+                    'INSERT INTO runs (project_id, branch, commit_sha, build_number, external_id, run_attempt, framework, '
+                    'started_at, total, passed, failed, skipped, duration) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, 0, 0, 0, 0)',
+                    (project_id, branch, commit_sha, build_number, external_id, run_attempt, framework, started_at)
+                )
+                run_id = cur.lastrowid
+            else:
+                cur.execute('SELECT test_id, MAX(attempt) + 1 FROM case_results WHERE run_id = ? GROUP BY test_id',
+                            (run_id,))
+                next_attempt.update(cur.fetchall())
+
+            rows = []
+            for test_id, (_, _, status, duration, message) in zip(test_ids, cases):
+                attempt = next_attempt.get(test_id, 0)
+                next_attempt[test_id] = attempt + 1
+                rows.append((test_id, run_id, attempt, STATUS_CODES[status], duration, message))
+            cur.executemany(
+                'INSERT INTO case_results (test_id, run_id, attempt, status, duration, message) VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+            # Totals over every report of the run, each test by its last attempt
+            cur.execute(
+                'SELECT COUNT(*), COALESCE(SUM(status = 0), 0), COALESCE(SUM(status = 3), 0), COALESCE(SUM(duration), 0.0) '
+                'FROM case_results c WHERE run_id = ? AND attempt = '
+                '(SELECT MAX(attempt) FROM case_results WHERE test_id = c.test_id AND run_id = c.run_id)',
+                (run_id,)
+            )
+            total, passed, skipped, duration = cur.fetchone()
+            totals = {'total': total, 'passed': passed, 'failed': total - passed - skipped, 'skipped': skipped,
+                      'duration': duration}
+            cur.execute('UPDATE runs SET total = ?, passed = ?, failed = ?, skipped = ?, duration = ? WHERE id = ?',
+                        (total, passed, totals['failed'], skipped, duration, run_id))
+            cur.execute('COMMIT')
+        except BaseException:
+            cur.execute('ROLLBACK')
+            # Cached ids may refer to rows that were just rolled back
+            self._project_ids.clear()
+            self._suite_ids.clear()
+            self._test_ids.clear()
+            raise
+
+        last_attempts = sorted({test_id: index for index, test_id in enumerate(test_ids)}.values())
+        return {'run_id': run_id, 'project_id': project_id, 'test_ids': test_ids, 'cases': cases,
+                'last_attempts': last_attempts, 'retries': len(cases) - len(last_attempts), **totals}
+
+    def _project_id(self, cur: sqlite3.Cursor, project: str) -> int:
+        """Get or create the id of a project."""
+        if project not in self._project_ids:
+            cur.execute('INSERT OR IGNORE INTO projects (name) VALUES (?)', (project,))
+            cur.execute('SELECT id FROM projects WHERE name = ?', (project,))
+            self._project_ids[project] = cur.fetchone()[0]
+        return self._project_ids[project]
+
+    def _suite_ids_for(self, cur: sqlite3.Cursor, project_id: int, suites: Iterable[str]) -> Dict[str, int]:
+        """Get or create ids for a set of suite names."""
+        missing = [suite for suite in suites if (project_id, suite) not in self._suite_ids]
+        if missing:
+            cur.executemany('INSERT OR IGNORE INTO suites (project_id, name) VALUES (?, ?)',
+                            [(project_id, suite) for suite in missing])
+            for chunk_start in range(0, len(missing), LOOKUP_CHUNK):
+                chunk = missing[chunk_start:chunk_start + LOOKUP_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                cur.execute(f'SELECT name, id FROM suites WHERE project_id = ? AND name IN ({placeholders})',
+                            (project_id, *chunk))
+                for name, suite_id in cur.fetchall():
+                    self._suite_ids[(project_id, name)] = suite_id
+        return {suite: self._suite_ids[(project_id, suite)] for suite in suites}
+
+    def _test_ids_for(self, cur: sqlite3.Cursor, project_id: int, suite_ids: Dict[str, int],
+                      identities: List[Tuple[str, str]]) -> List[int]:
+        """
+        Map (suite, name) identities onto stable test ids, creating new ones in bulk.
+
+        New ids are allocated in Python from MAX(id) + 1; the surrounding
+        BEGIN IMMEDIATE holds the write lock so concurrent writers cannot race.
+        """
+        keys = [(suite_ids[suite], name) for suite, name in identities]
+        missing = list({key for key in keys if key not in self._test_ids})
+
+        if missing:
+            # Another process may already have created some of these tests
+            by_suite: Dict[int, List[str]] = {}
+            for suite_id, name in missing:
+                by_suite.setdefault(suite_id, []).append(name)
+            for suite_id, names in by_suite.items():
+                for chunk_start in range(0, len(names), LOOKUP_CHUNK):
+                    chunk = names[chunk_start:chunk_start + LOOKUP_CHUNK]
+                    placeholders = ','.join('?' * len(chunk))
+                    cur.execute(f'SELECT name, id FROM tests WHERE suite_id = ? AND name IN ({placeholders})',
+                                (suite_id, *chunk))
+                    for name, test_id in cur.fetchall():
+                        self._test_ids[(suite_id, name)] = test_id
+
+            new_keys = [key for key in missing if key not in self._test_ids]
+            if new_keys:
+                cur.execute('SELECT COALESCE(MAX(id), 0) FROM tests')
+                next_id = cur.fetchone()[0] + 1
+                rows = []
+                for offset, (suite_id, name) in enumerate(new_keys):
+                    test_id = next_id + offset
+                    self._test_ids[(suite_id, name)] = test_id
+                    rows.append((test_id, project_id, suite_id, name))
+                cur.executemany('INSERT INTO tests (id, project_id, suite_id, name) VALUES (?, ?, ?, ?)', rows)
+
+        return [self._test_ids[key] for key in keys]
+
+    def test_history(self, project: str, test_name: str, suite: Optional[str] = None,
+                     limit: int = 50) -> List[Dict[str, Any]]:
+        """History of one test across runs (every attempt), newest first."""
+        query = (
+            'SELECT r.id, c.attempt, r.branch, r.commit_sha, r.started_at, c.status, c.duration, c.message '
+            'FROM tests t JOIN projects p ON p.id = t.project_id JOIN suites s ON s.id = t.suite_id '
+            'JOIN case_results c ON c.test_id = t.id JOIN runs r ON r.id = c.run_id '
+            'WHERE p.name = ? AND t.name = ?'
+        )
+        params: List[Any] = [project, test_name]
+        if suite is not None:
+            query += ' AND s.name = ?'
+            params.append(suite)
+        query += ' ORDER BY c.run_id DESC, c.attempt DESC LIMIT ?'
+        params.append(limit)
+
+        return [
+            {'run_id': run_id, 'attempt': attempt, 'branch': branch, 'commit_sha': commit_sha, 'started_at': started_at,
+             'status': STATUS_NAMES[status], 'duration': duration, 'message': message}
+            for run_id, attempt, branch, commit_sha, started_at, status, duration, message
+            in self.conn.execute(query, params)
+        ]
+
+    def test_names(self, test_ids: Iterable[int]) -> Dict[int, Tuple[str, str]]:
+        """(suite, name) of each known test id."""
+        test_ids = list(test_ids)
+        names: Dict[int, Tuple[str, str]] = {}
+        for chunk_start in range(0, len(test_ids), LOOKUP_CHUNK):
+            chunk = test_ids[chunk_start:chunk_start + LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            for test_id, suite, name in self.conn.execute(
+                    f'SELECT t.id, s.name, t.name FROM tests t JOIN suites s ON s.id = t.suite_id WHERE t.id IN ({placeholders})',
+                    chunk):
+                names[test_id] = (suite, name)
+        return names
+
+    def project_runs(self, project: str, branch: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Runs of a project (optionally on one branch), newest first."""
+        query = (
+            'SELECT r.id, r.branch, r.commit_sha, r.build_number, r.external_id, r.run_attempt, r.framework, r.started_at, '
+            'r.total, r.passed, r.failed, r.skipped, r.duration '
+            'FROM runs r JOIN projects p ON p.id = r.project_id WHERE p.name = ?'
+        )
+        params: List[Any] = [project]
+        if branch is not None:
+            query += ' AND r.branch = ?'
+            params.append(branch)
+        query += ' ORDER BY r.started_at DESC LIMIT ?'
+        params.append(limit)
+
+        columns = ['run_id', 'branch', 'commit_sha', 'build_number', 'external_id', 'run_attempt', 'framework',
+                   'started_at', 'total', 'passed', 'failed', 'skipped', 'duration']
+        return [dict(zip(columns, row)) for row in self.conn.execute(query, params)]
+
+    def stats(self) -> Dict[str, int]:
+        """Row counts for each table."""
+        return {
+            table: self.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in ('projects', 'suites', 'tests', 'runs', 'case_results')
+        }
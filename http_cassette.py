@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+HTTP Record/Replay Cassettes
+Captures the HTTP interactions of a requests.Session (GitHub API calls, redirects
+and artifact bytes) into a cassette directory, and serves them back without the
+network, so ingestion benchmarks run on identical, realistic input.
+
+A cassette is a directory:
+
+    interactions.jsonl   one line per response: request key, status, headers,
+                         body digest and the time the response took
+    blobs/ab/<sha256>.gz response bodies, gzip-compressed and content-addressed,
+                         so identical pages and artifacts are stored once
+
+Requests are matched on method and URL with sorted query parameters. Request
+headers are never recorded. Signature and token query parameters, and user:password
+in URLs, are stripped from match keys and from recorded Location headers. Signed
+artifact redirects (S3, Azure SAS, GCS) are therefore stored without their
+credentials and still replay. Repeated requests for the same key replay their recorded
+responses in order, the last one repeating. Replay runs at full speed, or in
+'replay-timed' mode sleeps the recorded response time. A request missing from the cassette
+raises CassetteMiss, a requests.ConnectionError, so callers handle it like an
+outage.
+
+Recording is append-only, and blobs are written atomically. Several worker
+processes can therefore record into one cassette.
+Environment (read by worker processes, set by cassette_from_args):
+    HTTP_CASSETTE=DIR   HTTP_CASSETTE_MODE=record|replay|replay-timed
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+MODES = ('record', 'replay', 'replay-timed')
+# Response headers that are specific to one connection or decoded by requests already
+DROPPED_HEADERS = {'set-cookie', 'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+# Query parameters that carry credentials (signed blob URLs, tokens); compared case-insensitively
+CREDENTIAL_PARAMS = {'sig', 'signature', 'token', 'access_token', 'jwt', 'x-amz-signature', 'x-amz-credential',
+                     'x-amz-security-token', 'x-goog-signature', 'x-goog-credential'}
+
+
+class CassetteMiss(requests.ConnectionError):
+    """A replayed request has no recorded response."""
+
+
+def strip_credentials(url: str, sort_query: bool = False) -> str:
+    """URL without user:password and credential query parameters (optionally with sorted parameters)."""
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if name.lower() not in CREDENTIAL_PARAMS]
+    if sort_query:
+        query.sort()
+    netloc = parts.netloc.rpartition('@')[2]
+    return urlunsplit((parts.scheme, netloc, parts.path, urlencode(query), parts.fragment))
+
+
+def request_key(method: str, url: str) -> str:
+    """Match key of a request: method and URL with sorted query parameters, credentials stripped."""
+    return f"{method.upper()} {strip_credentials(url.split('#', 1)[0], sort_query=True)}"
+
+
+class Cassette:
+    """Record or replay the HTTP traffic of the sessions it is mounted on."""
+
+    def __init__(self, path: Any, mode: str = 'replay'):
+        """
+        Args:
+            path: Cassette directory (created when recording)
+            mode: 'record', 'replay' or 'replay-timed' (replay with recorded response times)
+        """
+        if mode not in MODES:
+            raise ValueError(f'unknown cassette mode {mode!r} (expected one of {", ".join(MODES)})')
+        self.path = Path(path)
+        self.mode = mode
+        self.index_file = self.path / 'interactions.jsonl'
+        self._lock = threading.Lock()
+        self._recorded: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self.stats = {'recorded': 0, 'replayed': 0, 'misses': 0, 'bytes': 0, 'blobs_written': 0, 'blobs_deduplicated': 0}
+        if mode == 'record':
+            (self.path / 'blobs').mkdir(parents=True, exist_ok=True)
+        else:
+            if not self.index_file.exists():
+                raise FileNotFoundError(f'no cassette at {self.path} (record one with --record)')
+            with open(self.index_file, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        interaction = json.loads(line)
+                        self._recorded[interaction['key']].append(interaction)
+
+    def __len__(self) -> int:
+        return sum(len(interactions) for interactions in self._recorded.values())
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.path / 'blobs' / digest[:2] / f'{digest}.gz'
+
+    def _store_blob(self, body: bytes) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        blob = self._blob_path(digest)
+        if blob.exists():
+            self.stats['blobs_deduplicated'] += 1
+            return digest
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(f'{blob.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp.write_bytes(gzip.compress(body, compresslevel=6))
+        os.replace(tmp, blob)
+        self.stats['blobs_written'] += 1
+        return digest
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response, seconds: float):
+        """Append one interaction (the response body must be fully read)."""
+        body = response.content or b''
+        interaction = {
+            'key': request_key(request.method, request.url),
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {k: strip_credentials(v) if k.lower() == 'location' else v
+                        for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS},
+            'body': self._store_blob(body),
+            'size': len(body),
+            'seconds': seconds,
+            'recorded_at': time.time()
+        }
+        line = json.dumps(interaction) + '\n'
+        with self._lock:
+            # One write per line on an O_APPEND file keeps concurrent recorders from interleaving
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+            self.stats['recorded'] += 1
+            self.stats['bytes'] += len(body)
+
+    def replay(self, request: requests.PreparedRequest) -> requests.Response:
+        """Build the next recorded response for a request."""
+        key = request_key(request.method, request.url)
+        with self._lock:
+            interactions = self._recorded.get(key)
+            if not interactions:
+                self.stats['misses'] += 1
+                raise CassetteMiss(f'{key} is not in cassette {self.path}', request=request)
+            position = self._cursor[key]
+            self._cursor[key] = position + 1
+            interaction = interactions[min(position, len(interactions) - 1)]
+        body = gzip.decompress(self._blob_path(interaction['body']).read_bytes())
+        if self.mode == 'replay-timed':
+            time.sleep(interaction['seconds'])
+
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.reason = interaction.get('reason')
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        response.url = request.url
+        response.request = request
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        # Content is already in memory; iter_content() serves it from there
+        response._content = body
+        response._content_consumed = True
+        with self._lock:
+            self.stats['replayed'] += 1
+            self.stats['bytes'] += len(body)
+        return response
+
+    def mount(self, session: requests.Session) -> requests.Session:
+        """Route every request of a session through the cassette."""
+        current = session.get_adapter('https://')
+        adapter = CassetteAdapter(self, current if isinstance(current, HTTPAdapter) else None)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def summary(self) -> Dict[str, Any]:
+        return {'path': str(self.path), 'mode': self.mode, **self.stats}
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Transport adapter that records through a real adapter or replays from a cassette."""
+
+    def __init__(self, cassette: Cassette, upstream: Optional[HTTPAdapter] = None):
+        super().__init__()
+        self.cassette = cassette
+        self.upstream = upstream or HTTPAdapter()
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        if self.cassette.mode != 'record':
+            return self.cassette.replay(request)
+        start = time.perf_counter()
+        response = self.upstream.send(request, **kwargs)
+        response.content  # read the body so it can be recorded (and timed)
+        self.cassette.record(request, response, time.perf_counter() - start)
+        return response
+
+    def close(self):
+        self.upstream.close()
+
+
+def add_cassette_arguments(parser: Any):
+    """Add the standard --record / --replay / --replay-timing options to an argparse parser."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--record', metavar='DIR', help='record all GitHub HTTP traffic into a cassette directory')
+    group.add_argument('--replay', metavar='DIR', help='serve GitHub HTTP traffic from a recorded cassette (no network)')
+    parser.add_argument('--replay-timing', action='store_true',
+                        help='with --replay, reproduce the recorded response times instead of running at full speed')
+
+
+def cassette_from_args(args: Any) -> Optional[Cassette]:
+    """
+    Build a Cassette from parsed cassette arguments (None when neither option is given).
+
+    The choice is exported to HTTP_CASSETTE / HTTP_CASSETTE_MODE so worker
+    processes pick up the same cassette through cassette_from_env().
+    """
+    if args.record:
+        path, mode = args.record, 'record'
+    elif args.replay:
+        path, mode = args.replay, 'replay-timed' if args.replay_timing else 'replay'
+    else:
+        return None
+    os.environ['HTTP_CASSETTE'] = path
+    os.environ['HTTP_CASSETTE_MODE'] = mode
+    return Cassette(path, mode)
+
+
+def cassette_from_env() -> Optional[Cassette]:
+    """Cassette configured by HTTP_CASSETTE / HTTP_CASSETTE_MODE (None when unset)."""
+    path = os.getenv('HTTP_CASSETTE')
+    return Cassette(path, os.getenv('HTTP_CASSETTE_MODE', 'replay')) if path else None
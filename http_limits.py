@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+HTTP Limits
+Limits shared by the connectors and services that talk HTTP: the token bucket that
+paces API requests across threads, and the cap on a decompressed report.
+
+Kept free of heavy imports so the CLI scripts can load it at startup without
+pulling in any connector.
+"""
+
+import threading
+import time
+from typing import Optional
+
+MAX_REPORT_BYTES = 512 * 1024 * 1024
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by all connector threads."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.paused_until:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+                else:
+                    delay = self.paused_until - now
+            time.sleep(delay)
+
+    def pause(self, seconds: float):
+        """Hold every thread back (after a 429 or an exhausted quota)."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Time-Budgeted Ingestion
+Helpers for ingesting as much value as possible inside a fixed window (a cron slot):
+
+- Deadline: monotonic wall-clock budget shared by every stage
+- order_runs(): failed runs before successful ones, newest first within each group
+- fit_artifacts(): all artifacts of a run when they fit the remaining time,
+  otherwise the smallest ones that do (the rest are deferred)
+- IngestionCheckpoint: runs and artifacts left over at the deadline (or after an
+  error, up to MAX_RUN_ATTEMPTS times), so the next window resumes with them
+  instead of starting over
+- CoverageReport: what was covered versus what is still pending
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from artifact_scheduler import ThroughputModel
+
+FAILED_CONCLUSIONS = ('failure', 'timed_out')
+MAX_DONE_KEYS = 5000
+# Windows in which a run may hit errors before it is given up on
+MAX_RUN_ATTEMPTS = 3
+
+
+class Deadline:
+    """A time budget measured on the monotonic clock."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.started_at = time.monotonic()
+        self.at = self.started_at + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+
+def run_key(repo_name: str, run: Dict[str, Any]) -> str:
+    """Identity of a workflow run attempt (also its checkpoint key)."""
+    return f"{repo_name}:{run['id']}:{run.get('run_attempt', 1)}"
+
+
+def is_failed_run(run: Dict[str, Any]) -> bool:
+    return run.get('conclusion') in FAILED_CONCLUSIONS
+
+
+def order_runs(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Order work items ({'repo', 'run', ...}) by value: failed first, then newest first."""
+    # ISO-8601 UTC timestamps sort chronologically as strings
+    by_recency = sorted(items, key=lambda item: item['run'].get('created_at') or '', reverse=True)
+    return sorted(by_recency, key=lambda item: not is_failed_run(item['run']))
+
+
+def fit_artifacts(artifacts: List[Dict[str, Any]], remaining: float, model: ThroughputModel,
+                  workers: int = 1) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Split a run's artifacts into those to process now and those deferred.
+
+    When the expected work of all artifacts (spread over the workers) fits the
+    remaining time everything is selected; otherwise artifacts are taken
+    smallest first while they still fit.
+
+    Returns:
+        (selected, deferred)
+    """
+    live = [a for a in artifacts if not a.get('expired')]
+    expected = {id(a): model.expected(a.get('size_in_bytes') or 0) for a in live}
+    if sum(expected.values()) / max(1, workers) <= remaining:
+        return artifacts, []
+    # Expired artifacts stay selected so the plan can report them as skipped
+    selected = [a for a in artifacts if a.get('expired')]
+    deferred, work = [], 0.0
+    for artifact in sorted(live, key=lambda a: a.get('size_in_bytes') or 0):
+        if (work + expected[id(artifact)]) / max(1, workers) <= remaining:
+            work += expected[id(artifact)]
+            selected.append(artifact)
+        else:
+            deferred.append(artifact)
+    return selected, deferred
+
+
+class IngestionCheckpoint:
+    """JSON record of work left at the last deadline and of runs already ingested."""
+
+    def __init__(self, path: Any):
+        self.path = Path(path)
+        self.pending: List[Dict[str, Any]] = []
+        self.done: List[str] = []
+
+    @classmethod
+    def load(cls, path: Any) -> 'IngestionCheckpoint':
+        """Load a checkpoint; a missing file gives an empty one."""
+        checkpoint = cls(path)
+        if checkpoint.path.exists():
+            data = json.loads(checkpoint.path.read_text(encoding='utf-8'))
+            checkpoint.pending = data.get('pending', [])
+            checkpoint.done = data.get('done', [])
+        return checkpoint
+
+    def mark_done(self, key: str):
+        if key not in self.done:
+            self.done.append(key)
+            del self.done[:-MAX_DONE_KEYS]
+
+    def save(self):
+        """Persist atomically."""
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp.write_text(json.dumps({'pending': self.pending, 'done': self.done, 'saved_at': time.time()}),
+                       encoding='utf-8')
+        os.replace(tmp, self.path)
+
+
+class CoverageReport:
+    """Counts of covered versus pending repositories, runs and artifacts."""
+
+    def __init__(self, deadline: Deadline):
+        self.deadline = deadline
+        self.deadline_hit = False
+        self.repositories = {'listed': 0, 'pending': 0}
+        self.runs = {'done': 0, 'partial': 0, 'pending': 0, 'failed_done': 0, 'failed_pending': 0}
+        self.artifacts = {'done': 0, 'pending': 0, 'bytes_done': 0, 'bytes_pending': 0}
+
+    def run_finished(self, run: Dict[str, Any], processed: Iterable[Dict[str, Any]],
+                     pending: Optional[List[Dict[str, Any]]] = None):
+        """Record a run whose artifacts were processed (pending holds those left over)."""
+        self._count_artifacts(processed, 'done')
+        if pending:
+            self._count_artifacts(pending, 'pending')
+            self.runs['partial'] += 1
+            if is_failed_run(run):
+                self.runs['failed_pending'] += 1
+        else:
+            self.runs['done'] += 1
+            if is_failed_run(run):
+                self.runs['failed_done'] += 1
+
+    def run_pending(self, run: Dict[str, Any], artifacts: Optional[List[Dict[str, Any]]] = None):
+        """Record a run that was not reached (artifacts when already listed)."""
+        self.runs['pending'] += 1
+        if is_failed_run(run):
+            self.runs['failed_pending'] += 1
+        if artifacts:
+            self._count_artifacts(artifacts, 'pending')
+
+    def _count_artifacts(self, artifacts: Iterable[Dict[str, Any]], state: str):
+        for artifact in artifacts:
+            self.artifacts[state] += 1
+            self.artifacts[f'bytes_{state}'] += artifact.get('size_in_bytes') or 0
+
+    def report(self) -> Dict[str, Any]:
+        runs_total = self.runs['done'] + self.runs['partial'] + self.runs['pending']
+        artifacts_total = self.artifacts['done'] + self.artifacts['pending']
+        return {
+            'time_budget': self.deadline.seconds,
+            'elapsed': self.deadline.elapsed(),
+            'deadline_hit': self.deadline_hit,
+            'repositories': dict(self.repositories),
+            'runs': dict(self.runs),
+            'artifacts': dict(self.artifacts),
+            'run_coverage': self.runs['done'] / runs_total if runs_total else 1.0,
+            'artifact_coverage': self.artifacts['done'] / artifacts_total if artifacts_total else 1.0
+        }
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Pipeline Instrumentation
+Per-stage spans, latency histograms (p50/p95/p99), in-flight gauges and byte/case
+counters for the ingestion system, demo loader and real data fetcher, exposed in
+Prometheus text format over HTTP or as a dump file.
+
+Disabled by default; every call is a single attribute check until enabled.
+Environment:
+    AUTOTEST_METRICS=1            enable collection
+    AUTOTEST_METRICS_PORT=9108    serve /metrics on this port
+    AUTOTEST_METRICS_FILE=path    write a Prometheus text dump at exit of main()
+"""
+
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+METRIC_PREFIX = 'autotest_'
+
+# Latency buckets in seconds (upper bounds), 0.5ms .. 2min
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (f'{k}="{_escape(v)}"' for k, v in pairs)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    """Fixed-bucket histogram with interpolated quantiles."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.total += 1
+            self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket."""
+        if not self.total:
+            return 0.0
+        rank = q * self.total
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index >= len(self.buckets):
+                    return self.buckets[-1]
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+class Metrics:
+    """Registry of counters, gauges and histograms keyed by name and labels."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._server: Optional[Any] = None  # ThreadingHTTPServer once serve() is called
+        self.dump_path: Optional[Path] = None
+
+    def inc(self, name: str, value: float = 1, **labels: Any):
+        """Increment a counter."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def gauge_add(self, name: str, delta: float, **labels: Any):
+        """Add to (or subtract from) a gauge."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0) + delta
+
+    def gauge_set(self, name: str, value: float, **labels: Any):
+        """Set a gauge."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any):
+        """Record a histogram observation."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        series = self._histograms.get(name)
+        histogram = series.get(key) if series else None
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, {}).setdefault(key, Histogram())
+        histogram.observe(value)
+
+    @contextmanager
+    def span(self, stage: str, **labels: Any) -> Iterator[None]:
+        """
+        Time a pipeline stage.
+
+        Records stage_seconds{stage=...} and stage_errors_total, and tracks the
+        number of in-flight spans per stage.
+        """
+        if not self.enabled:
+            yield
+            return
+        labels['stage'] = stage
+        self.gauge_add('stage_in_flight', 1, **labels)
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.inc('stage_errors_total', 1, **labels)
+            raise
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - start, **labels)
+            self.gauge_add('stage_in_flight', -1, **labels)
+
+    def stage_quantiles(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95/p99 and counts of every stage_seconds series, keyed by its labels."""
+        summary = {}
+        for key, histogram in self._histograms.get('stage_seconds', {}).items():
+            summary[_format_labels(key) or 'all'] = {
+                'count': histogram.total,
+                'sum': histogram.sum,
+                'p50': histogram.quantile(0.50),
+                'p95': histogram.quantile(0.95),
+                'p99': histogram.quantile(0.99)
+            }
+        return summary
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+
+        for name, series in sorted(counters.items()):
+            lines.append(f'# TYPE {METRIC_PREFIX}{name} counter')
+            for key, value in sorted(series.items()):
+                lines.append(f'{METRIC_PREFIX}{name}{_format_labels(key)} {value:g}')
+        for name, series in sorted(gauges.items()):
+            lines.append(f'# TYPE {METRIC_PREFIX}{name} gauge')
+            for key, value in sorted(series.items()):
+                lines.append(f'{METRIC_PREFIX}{name}{_format_labels(key)} {value:g}')
+        for name, series in sorted(histograms.items()):
+            lines.append(f'# TYPE {METRIC_PREFIX}{name} histogram')
+            for key, histogram in sorted(series.items()):
+                with histogram.lock:
+                    counts, total, value_sum = list(histogram.counts), histogram.total, histogram.sum
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, counts):
+                    cumulative += count
+                    lines.append(f'{METRIC_PREFIX}{name}_bucket{_format_labels(key, ("le", f"{bound:g}"))} {cumulative}')
+                lines.append(f'{METRIC_PREFIX}{name}_bucket{_format_labels(key, ("le", "+Inf"))} {total}')
+                lines.append(f'{METRIC_PREFIX}{name}_sum{_format_labels(key)} {value_sum:g}')
+                lines.append(f'{METRIC_PREFIX}{name}_count{_format_labels(key)} {total}')
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path: Any = None) -> Optional[Path]:
+        """Write the Prometheus text dump to a file (defaults to the configured dump path)."""
+        path = Path(path) if path else self.dump_path
+        if not self.enabled or path is None:
+            return None
+        path.write_text(self.render_prometheus(), encoding='utf-8')
+        return path
+
+    def serve(self, port: int, host: str = '127.0.0.1') -> Any:
+        """Serve /metrics from a daemon thread (returns the ThreadingHTTPServer)."""
+        # Imported here: http.server is a noticeable part of startup for every script
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True).start()
+        return self._server
+
+    def shutdown(self):
+        """Stop the metrics HTTP server if running."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Get the process-wide metrics registry."""
+    return _metrics
+
+
+def timed(stage: str, **labels: Any):
+    """Decorator that wraps every call of a function in a metrics span."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _metrics.enabled:
+                return func(*args, **kwargs)
+            with _metrics.span(stage, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def configure_from_env() -> Metrics:
+    """Enable metrics, the HTTP endpoint and the dump file from AUTOTEST_METRICS* variables."""
+    metrics = get_metrics()
+    port = os.getenv('AUTOTEST_METRICS_PORT')
+    dump_file = os.getenv('AUTOTEST_METRICS_FILE')
+    if os.getenv('AUTOTEST_METRICS', '').lower() in ('1', 'true', 'yes') or port or dump_file:
+        metrics.enabled = True
+    if dump_file:
+        metrics.dump_path = Path(dump_file)
+    if metrics.enabled and port and metrics._server is None:
+        metrics.serve(int(port))
+        print(f"📈 Metrics served on http://127.0.0.1:{port}/metrics")
+    return metrics
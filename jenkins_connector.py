@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Jenkins Connector
+Lists jobs and builds through the Jenkins JSON API and downloads their test reports
+(archived JUnit XML artifacts, or the testReport API rendered as JUnit XML) so they
+can be fed into the same parse pipeline as GitHub Actions artifacts.
+
+Every API call uses a tree= filter so Jenkins only serializes the fields we read,
+and builds are traversed concurrently over one pooled session. A job or build
+that cannot be listed, described or downloaded is counted in stats and errors
+and skipped; the others are still ingested.
+"""
+
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+from xml.sax.saxutils import escape, quoteattr
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Folder-like job classes whose children are jobs themselves
+FOLDER_CLASSES = ('Folder', 'OrganizationFolder', 'WorkflowMultiBranchProject')
+FOLDER_DEPTH = 4
+
+JOB_FIELDS = 'name,url,_class'
+BUILD_FIELDS = 'number,url,result,timestamp,duration,building'
+BUILD_DETAIL_TREE = (
+    'number,url,result,timestamp,duration,building,'
+    'artifacts[fileName,relativePath],'
+    'actions[lastBuiltRevision[SHA1,branch[name]],totalCount,failCount,skipCount]'
+)
+TEST_REPORT_TREE = 'suites[name,duration,cases[className,name,duration,status,errorDetails,errorStackTrace]]'
+
+JUNIT_ARTIFACT_RE = re.compile(r'(^|/)(TEST-[^/]*|[^/]*(junit|test|surefire|failsafe|result)[^/]*)\.xml$', re.IGNORECASE)
+
+FAILED_STATUSES = ('FAILED', 'REGRESSION')
+SKIPPED_STATUSES = ('SKIPPED',)
+
+
+def _jobs_tree(depth: int = FOLDER_DEPTH) -> str:
+    tree = JOB_FIELDS
+    for _ in range(depth - 1):
+        tree = f'{JOB_FIELDS},jobs[{tree}]'
+    return f'jobs[{tree}]'
+
+
+def test_report_to_junit(report: Dict[str, Any]) -> bytes:
+    """Render a Jenkins testReport API payload as JUnit XML."""
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n']
+    for suite in report.get('suites', []):
+        cases = suite.get('cases', [])
+        failures = sum(1 for c in cases if c.get('status') in FAILED_STATUSES)
+        skipped = sum(1 for c in cases if c.get('status') in SKIPPED_STATUSES)
+        parts.append(
+            f'  <testsuite name={quoteattr(suite.get("name") or "jenkins")} tests="{len(cases)}" '
+            f'failures="{failures}" errors="0" skipped="{skipped}" time="{suite.get("duration") or 0}">\n'
+        )
+        for case in cases:
+            parts.append(
+                f'    <testcase classname={quoteattr(case.get("className") or "")} '
+                f'name={quoteattr(case.get("name") or "")} time="{case.get("duration") or 0}"'
+            )
+            status = case.get('status')
+            if status in FAILED_STATUSES:
+                message = case.get('errorDetails') or 'failed'
+                parts.append(
+                    f'>\n      <failure message={quoteattr(message.splitlines()[0] if message else "")}>'
+                    f'{escape(case.get("errorStackTrace") or message)}</failure>\n    </testcase>\n'
+                )
+            elif status in SKIPPED_STATUSES:
+                parts.append('>\n      <skipped/>\n    </testcase>\n')
+            else:
+                parts.append('/>\n')
+        parts.append('  </testsuite>\n')
+    parts.append('</testsuites>\n')
+    return ''.join(parts).encode('utf-8')
+
+
+class JenkinsConnector:
+    """Traverses Jenkins jobs and builds and yields their test reports."""
+
+    def __init__(self, base_url: str, auth: Optional[Tuple[str, str]] = None, max_workers: int = 8,
+                 timeout: float = 30, session: Optional[requests.Session] = None):
+        """
+        Initialize the connector.
+
+        Args:
+            base_url: Jenkins root URL
+            auth: (username, API token)
+            max_workers: Concurrent API calls / downloads
+            timeout: Per-request timeout in seconds
+            session: Session to use (a pooled one is created when omitted)
+        """
+        self.base_url = base_url.rstrip('/') + '/'
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if auth:
+            self.session.auth = auth
+        self.stats = {'jobs_failed': 0, 'builds': 0, 'builds_failed': 0}
+        self.errors: List[str] = []
+        self._stats_lock = threading.Lock()
+
+    def _failed(self, stat: str, what: str, error: Exception):
+        with self._stats_lock:
+            self.stats[stat] += 1
+            self.errors.append(f'{what}: {type(error).__name__}: {error}')
+
+    def _get_json(self, url: str, tree: str) -> Dict[str, Any]:
+        response = self.session.get(url.rstrip('/') + '/api/json', params={'tree': tree}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def list_jobs(self, folder_url: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List buildable jobs, descending into folders and multibranch projects.
+
+        Returns:
+            Dicts with 'name' (full path, e.g. 'team/service/main') and 'url'
+        """
+        data = self._get_json(folder_url or self.base_url, _jobs_tree())
+        jobs: List[Dict[str, Any]] = []
+
+        def walk(entries: Iterable[Dict[str, Any]], prefix: str):
+            for entry in entries:
+                name = f"{prefix}{entry['name']}"
+                if 'jobs' in entry or entry.get('_class', '').rsplit('.', 1)[-1] in FOLDER_CLASSES:
+                    walk(entry.get('jobs', []), f'{name}/')
+                else:
+                    jobs.append({'name': name, 'url': entry['url']})
+
+        walk(data.get('jobs', []), '')
+        return jobs
+
+    def list_builds(self, job: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
+        """Most recent completed builds of a job (newest first)."""
+        data = self._get_json(job['url'], f'builds[{BUILD_FIELDS}]{{0,{limit}}}')
+        # {0,limit} bounds the payload; the slice also holds for servers that ignore ranges
+        return [build for build in data.get('builds', [])[:limit] if not build.get('building')]
+
+    def build_run(self, job: Dict[str, Any], build: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fetch build details and describe the build in the run shape the ingestion
+        pipeline uses for GitHub workflow runs (id, name, conclusion, head_branch, ...).
+        """
+        detail = self._get_json(build['url'], BUILD_DETAIL_TREE)
+        run = {
+            'id': f"{job['name']}#{detail['number']}",
+            'name': job['name'],
+            'run_number': detail['number'],
+            'url': detail['url'],
+            'conclusion': (detail.get('result') or 'unknown').lower(),
+            'created_at': datetime.fromtimestamp(detail['timestamp'] / 1000, tz=timezone.utc).isoformat(),
+            'artifacts': detail.get('artifacts', []),
+            'has_test_report': False
+        }
+        for action in detail.get('actions', []):
+            if not action:
+                continue
+            revision = action.get('lastBuiltRevision')
+            if revision:
+                run['head_sha'] = revision.get('SHA1')
+                branches = revision.get('branch') or []
+                if branches:
+                    run['head_branch'] = branches[0]['name'].rsplit('/', 1)[-1]
+            if 'totalCount' in action:
+                run['has_test_report'] = True
+        return run
+
+    def fetch_reports(self, run: Dict[str, Any]) -> List[Tuple[str, bytes]]:
+        """
+        Download a build's test reports: archived JUnit XML artifacts when present,
+        otherwise the testReport API rendered as JUnit XML.
+
+        Returns:
+            (artifact name, report bytes) pairs
+        """
+        reports = []
+        for artifact in run['artifacts']:
+            path = artifact['relativePath']
+            if JUNIT_ARTIFACT_RE.search(path):
+                response = self.session.get(f"{run['url'].rstrip('/')}/artifact/{quote(path)}", timeout=self.timeout)
+                response.raise_for_status()
+                reports.append((path, response.content))
+        if not reports and run['has_test_report']:
+            report = self._get_json(f"{run['url'].rstrip('/')}/testReport", TEST_REPORT_TREE)
+            reports.append(('testReport.xml', test_report_to_junit(report)))
+        return reports
+
+    def iter_reports(self, max_jobs: Optional[int] = None, builds_per_job: int = 5,
+                     job_filter: Optional[Callable[[str], bool]] = None
+                     ) -> Iterator[Tuple[Dict[str, Any], str, bytes]]:
+        """
+        Traverse jobs and builds concurrently and yield each test report as soon as
+        it is downloaded.
+
+        Yields:
+            (run, artifact name, report bytes)
+        """
+        jobs = self.list_jobs()
+        if job_filter:
+            jobs = [job for job in jobs if job_filter(job['name'])]
+        if max_jobs is not None:
+            jobs = jobs[:max_jobs]
+
+        # One failing job or build (HTTP error, malformed payload) must not abort the others
+        def job_builds(job):
+            try:
+                return [(job, build) for build in self.list_builds(job, builds_per_job)]
+            except Exception as e:
+                self._failed('jobs_failed', job['name'], e)
+                return []
+
+        def build_reports(item):
+            job, build = item
+            try:
+                run = self.build_run(job, build)
+                reports = [(run, name, data) for name, data in self.fetch_reports(run)]
+            except Exception as e:
+                self._failed('builds_failed', f"{job['name']}#{build.get('number')}", e)
+                return []
+            with self._stats_lock:
+                self.stats['builds'] += 1
+            return reports
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='jenkins') as executor:
+            builds = [item for items in executor.map(job_builds, jobs) for item in items]
+            for reports in bounded_map(executor, build_reports, builds, 2 * self.max_workers):
+                yield from reports
+
+
+def bounded_map(executor: ThreadPoolExecutor, fn: Callable, items: Iterable[Any], max_in_flight: int) -> Iterator[Any]:
+    """Map fn over items keeping at most max_in_flight calls submitted; yields in completion order."""
+    pending = set()
+    items_iter = iter(items)
+    for item in items_iter:
+        pending.add(executor.submit(fn, item))
+        if len(pending) >= max_in_flight:
+            break
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+            item = next(items_iter, None)
+            if item is not None:
+                pending.add(executor.submit(fn, item))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Lazy Imports
+Defers heavy imports, and creation of the test parser's orchestrator, until first
+use, so short invocations (cron polls, --help, modes that never parse) don't pay
+for them at startup.
+
+- lazy_import(): module proxy that imports on first attribute access
+- get_orchestrator(): process-wide orchestrator proxy, created on the first parse
+  (which is when the parser loads its framework plugins)
+- parse_request(): builds a models.ParseRequest, importing models on first call
+
+check-import-time.py guards the scripts' startup against regressions.
+"""
+
+import importlib
+import importlib.util
+import threading
+import time
+from typing import Any, Optional
+
+from instrumentation import get_metrics
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Any:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr in ('_name', '_module', '_lock'):  # not set yet (e.g. while unpickling)
+            raise AttributeError(attr)
+        value = getattr(self._load(), attr)
+        # Later lookups of the same attribute skip __getattr__
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r} ({'loaded' if self.loaded else 'not loaded'})>"
+
+
+def lazy_import(name: str) -> Optional[LazyModule]:
+    """
+    Module proxy for name, imported on first use (None when it is not installed,
+    which is checked without importing it).
+    """
+    try:
+        if importlib.util.find_spec(name) is None:
+            return None
+    except (ImportError, ValueError):  # a parent package is missing
+        return None
+    return LazyModule(name)
+
+
+class LazyOrchestrator:
+    """Proxy for the parser orchestrator that creates it on first use."""
+
+    def __init__(self):
+        self._orchestrator = None
+        self._lock = threading.Lock()
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._orchestrator is not None
+
+    def _load(self) -> Any:
+        if self._orchestrator is None:
+            with self._lock:
+                if self._orchestrator is None:
+                    start = time.perf_counter()
+                    from core.parser_orchestrator import get_orchestrator as create_orchestrator
+                    orchestrator = create_orchestrator()
+                    self.load_seconds = time.perf_counter() - start
+                    get_metrics().observe('parser_load_seconds', self.load_seconds)
+                    self._orchestrator = orchestrator
+        return self._orchestrator
+
+    def load(self) -> Any:
+        """Create the orchestrator now instead of on the first parse (warms long-running processes)."""
+        return self._load()
+
+    def parse_report(self, content: Any, request: Any) -> Any:
+        return self._load().parse_report(content, request)
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr in ('_orchestrator', '_lock', 'load_seconds'):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+
+_orchestrator = LazyOrchestrator()
+
+
+def get_orchestrator() -> LazyOrchestrator:
+    """Get the process-wide (lazily created) parser orchestrator."""
+    return _orchestrator
+
+
+def parse_request(**fields: Any) -> Any:
+    """Build a models.ParseRequest (the parser's models are imported on first call)."""
+    from models import ParseRequest
+    return ParseRequest(**fields)
@@ -7,7 +7,7 @@ Loads realistic test data directly into your autotest platform for testing and d
 import os
 import sys
 import json
-import requests
+import argparse
 import time
 from pathlib import Path
 from typing import Dict, List, Any, Optional
@@ -16,27 +16,41 @@ from typing import Dict, List, Any, Optional
 parser_path = Path(r'C:\autotest\test-parser-mvp')
 sys.path.insert(0, str(parser_path))
 
-from core.parser_orchestrator import get_orchestrator
-from models import ParseRequest
+from lazy_imports import get_orchestrator, parse_request
+
+from history_store import TestHistoryStore
+from warm_cache import shared
+from instrumentation import configure_from_env, get_metrics, timed
+from profiling import Profiler, add_profile_argument, profiler_from_args
+from structured_log import configure_logging_from_env, get_logger
+from fair_scheduler import configure_scheduler_from_env, get_scheduler
 
 class AutotestDemoDataLoader:
     """Loads demo test data directly into autotest platform."""
     
-    def __init__(self, autotest_api_url: str = "http://localhost:4000", auth_token: Optional[str] = None):
+    def __init__(self, autotest_api_url: str = "http://localhost:4000", auth_token: Optional[str] = None,
+                 history_store: Optional[TestHistoryStore] = None, profiler: Optional[Profiler] = None):
         """
         Initialize the demo data loader.
         
         Args:
             autotest_api_url: URL of your autotest backend API
             auth_token: Authentication token for autotest API
+            history_store: Optional store that persists every parsed run
+            profiler: Optional per-stage profiler (see --profile)
         """
         self.api_url = autotest_api_url.rstrip('/')
         self.auth_token = auth_token
+        self.history_store = history_store
+        self.metrics = get_metrics()
+        self.profiler = profiler or Profiler(enabled=False)
+        self.log = get_logger('loader')
         self.headers = {'Content-Type': 'application/json'}
         if auth_token:
             self.headers['Authorization'] = f'Bearer {auth_token}'
         
         self.orchestrator = get_orchestrator()
+        self.scheduler = get_scheduler()
     
     def load_demo_scenarios(self, team_id: int = 4) -> Dict[str, Any]:
         """
@@ -105,21 +119,37 @@ class AutotestDemoDataLoader:
             'errors': []
         }
         
-        for scenario in demo_scenarios:
-            print(f"\n📦 Loading: {scenario['repo_name']}")
-            print(f"   🔧 Framework: {scenario['framework']}")
-            print(f"   📊 {scenario['test_count']} tests, {scenario['failure_rate']*100:.1f}% failure rate")
+        for scenario_index, scenario in enumerate(demo_scenarios, 1):
+            log = self.log.bind(repo=scenario['repo_name'])
+            log.info('scenario.start', f"\n📦 Loading: {scenario['repo_name']}\n"
+                     f"   🔧 Framework: {scenario['framework']}\n"
+                     f"   📊 {scenario['test_count']} tests, {scenario['failure_rate']*100:.1f}% failure rate",
+                     framework=scenario['framework'], test_count=scenario['test_count'])
             
             try:
                 # Generate realistic test data
-                test_data = self._generate_test_data(scenario)
+                with self.profiler.stage('generate', scenario['repo_name']):
+                    test_data = self._generate_test_data(scenario)
                 
                 # Parse with Python parser
-                parse_result = self._parse_test_data(test_data, scenario)
+                with self.profiler.stage('parse', scenario['repo_name']):
+                    parse_result = self._parse_test_data(test_data, scenario)
                 
                 if parse_result['success']:
+                    if self.history_store:
+                        with self.metrics.span('track', component='loader'):
+                            self.history_store.record_run(
+                                scenario['repo_name'].replace('/', '-'),
+                                parse_result['test_cases'],
+                                branch="main",
+                                build_number=scenario.get('build_number'),
+                                external_id=parse_result['run_id'],
+                                framework=parse_result['framework']
+                            )
+                    
                     # Upload to autotest platform via API
-                    upload_result = self._upload_to_autotest(parse_result, scenario, team_id)
+                    with self.profiler.stage('upload', scenario['repo_name']):
+                        upload_result = self._upload_to_autotest(parse_result, scenario, team_id)
                     
                     if upload_result['success']:
                         loading_results['scenarios_loaded'] += 1
@@ -127,22 +157,29 @@ class AutotestDemoDataLoader:
                         loading_results['builds_created'] += 1
                         loading_results['frameworks_tested'].add(scenario['framework'])
                         
-                        print(f"   ✅ Loaded {parse_result['test_count']} tests to autotest platform")
+                        log.info('scenario.loaded', f"   ✅ Loaded {parse_result['test_count']} tests to autotest platform",
+                                 tests=parse_result['test_count'], build_id=upload_result['build_id'])
                     else:
-                        print(f"   ❌ Upload failed: {upload_result['error']}")
+                        log.error('scenario.upload_failed', f"   ❌ Upload failed: {upload_result['error']}",
+                                  error=upload_result['error'])
                         loading_results['errors'].append(f"{scenario['repo_name']}: {upload_result['error']}")
                 else:
-                    print(f"   ❌ Parse failed: {parse_result['error']}")
+                    log.error('scenario.parse_failed', f"   ❌ Parse failed: {parse_result['error']}", error=parse_result['error'])
                     loading_results['errors'].append(f"{scenario['repo_name']}: {parse_result['error']}")
                 
             except Exception as e:
                 error_msg = f"{scenario['repo_name']}: {str(e)}"
                 loading_results['errors'].append(error_msg)
-                print(f"   ❌ Error: {str(e)}")
+                log.error('scenario.error', f"   ❌ Error: {str(e)}", error=str(e))
+            
+            self.log.progress(scenario_index, len(demo_scenarios),
+                              loaded=loading_results['scenarios_loaded'], tests=loading_results['total_test_cases'])
         
+        self.log.flush()
         self._print_loading_summary(loading_results)
         return loading_results
     
+    @timed('generate', component='loader')
     def _generate_test_data(self, scenario: Dict[str, Any]) -> bytes:
         """Generate realistic test data for a scenario."""
         framework = scenario['framework']
@@ -207,14 +244,15 @@ Actual: {random.randint(1, 100)}
                 test_cases.append(f'''
         <testcase classname="{package}.{package.split('.')[-1].title()}Test" name="{test_name}" time="{duration}"/>''')
         
-        xml_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+        header = f'''<?xml version="1.0" encoding="UTF-8"?>
 <testsuites name="{repo_name} Tests" tests="{test_count}" failures="{failures}" errors="{errors}" time="{total_time:.3f}">
     <testsuite name="{repo_name.replace('/', '.')}.AllTests" tests="{test_count}" failures="{failures}" errors="{errors}" time="{total_time:.3f}">
-        {''.join(test_cases)}
+        '''
+        footer = '''
     </testsuite>
 </testsuites>'''
         
-        return xml_content.encode('utf-8')
+        return ''.join([header, *test_cases, footer]).encode('utf-8')
     
     def _generate_pytest_data(self, test_count: int, failure_rate: float, repo_name: str) -> bytes:
         """Generate realistic Pytest JSON data."""
@@ -392,20 +430,22 @@ Actual: {random.randint(1, 100)}
                 test_cases.append(f'''
         <test name="{assembly_name}.{test_name}" type="{assembly_name}" method="{test_name}" result="Pass" time="{duration}"/>''')
         
-        xml_content = f'''<?xml version="1.0" encoding="utf-8"?>
+        header = f'''<?xml version="1.0" encoding="utf-8"?>
 <assemblies timestamp="{datetime.now().strftime('%m/%d/%Y %H:%M:%S')}">
     <assembly name="{assembly_name}" test-framework="xUnit.net 2.4.2" run-date="{datetime.now().strftime('%Y-%m-%d')}" run-time="{datetime.now().strftime('%H:%M:%S')}" total="{test_count}" passed="{test_count-failures}" failed="{failures}" skipped="0" time="{total_time:.3f}">
         <collection total="{test_count}" passed="{test_count-failures}" failed="{failures}" skipped="0" name="Test collection for {assembly_name}">
-            {''.join(test_cases)}
+            '''
+        footer = '''
         </collection>
     </assembly>
 </assemblies>'''
         
-        return xml_content.encode('utf-8')
+        return ''.join([header, *test_cases, footer]).encode('utf-8')
     
+    @timed('parse', component='loader')
     def _parse_test_data(self, data: bytes, scenario: Dict[str, Any]) -> Dict[str, Any]:
         """Parse test data using the Python parser."""
-        request = ParseRequest(
+        request = parse_request(
             tenant_id="demo-data",
             project_id=scenario['repo_name'].replace('/', '-'),
             environment="demo",
@@ -414,9 +454,12 @@ Actual: {random.randint(1, 100)}
         )
         
         try:
-            response = self.orchestrator.parse_report(data, request)
+            self.metrics.inc('bytes_parsed_total', len(data), component='loader')
+            with self.scheduler.slot(request.tenant_id, len(data)):
+                response = self.orchestrator.parse_report(data, request)
             
             if response.success:
+                self.metrics.inc('cases_parsed_total', response.data.totals.total, component='loader')
                 return {
                     'success': True,
                     'framework': response.data.framework,
@@ -435,16 +478,19 @@ Actual: {random.randint(1, 100)}
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    @timed('upload', component='loader')
     def _upload_to_autotest(self, parse_result: Dict[str, Any], scenario: Dict[str, Any], team_id: int) -> Dict[str, Any]:
         """Upload parsed results to autotest platform via API."""
         
         # Simulate the results upload API call
         # In reality, this would call your autotest API endpoints
         
-        print(f"      🔄 Simulating upload to autotest API...")
-        print(f"         📊 {parse_result['test_count']} test cases")
-        print(f"         🔧 Framework: {parse_result['framework']}")
-        print(f"         📈 Results: {parse_result['passed']} passed, {parse_result['failed']} failed")
+        self.log.info('upload.simulated', f"      🔄 Simulating upload to autotest API...\n"
+                      f"         📊 {parse_result['test_count']} test cases\n"
+                      f"         🔧 Framework: {parse_result['framework']}\n"
+                      f"         📈 Results: {parse_result['passed']} passed, {parse_result['failed']} failed",
+                      repo=scenario['repo_name'], tests=parse_result['test_count'], framework=parse_result['framework'],
+                      passed=parse_result['passed'], failed=parse_result['failed'])
         
         # Simulate API call delay
         time.sleep(0.1)
@@ -476,13 +522,27 @@ Actual: {random.randint(1, 100)}
         print(f"   2. Verify parsing results across different frameworks")
         print(f"   3. Test dashboard features with realistic data")
 
-def main():
-    """Main function for demo data loading."""
+def main(argv: Optional[List[str]] = None):
+    """Main function for demo data loading (argv defaults to the command line)."""
+    parser = argparse.ArgumentParser(description="Autotest Demo Data Loader")
+    add_profile_argument(parser)
+    args = parser.parse_args(argv)
+    profiler = profiler_from_args(args)
+    configure_scheduler_from_env()
+    configure_logging_from_env()
+    
     print("🎨 Autotest Demo Data Loader")
     print("=" * 30)
     
-    # Initialize loader
-    loader = AutotestDemoDataLoader()
+    # Optional stage metrics (AUTOTEST_METRICS / AUTOTEST_METRICS_PORT / AUTOTEST_METRICS_FILE)
+    metrics = configure_from_env()
+    
+    # Initialize loader (the history connection is reused by later jobs in the same process)
+    history_db = os.getenv('TEST_HISTORY_DB', 'test-history.db')
+    loader = AutotestDemoDataLoader(
+        history_store=shared(('history_store', history_db), lambda: TestHistoryStore(history_db)),
+        profiler=profiler
+    )
     
     # Load demo scenarios
     results = loader.load_demo_scenarios(team_id=4)
@@ -491,6 +551,15 @@ def main():
     print(f"   • Use this data to test your dashboard features")
     print(f"   • Validate parsing across {len(results['frameworks_tested'])} frameworks")
     print(f"   • Test with {results['total_test_cases']} realistic test cases")
+    
+    metrics_file = metrics.dump()
+    if metrics_file:
+        print(f"📈 Metrics written to: {metrics_file}")
+
+    profile_file = profiler.write('demo-loader')
+    if profile_file:
+        profiler.print_summary()
+        print(f"🔬 Profiles written to: {profile_file.parent} (summary: {profile_file.name})")
 
 if __name__ == "__main__":
     main()
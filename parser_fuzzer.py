@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+"""
+Parser Fuzzing Harness
+Mutates a seed corpus of test reports at high rate and parses the mutants in
+parallel sandboxed worker processes, looking for algorithmic blow-ups rather than
+just crashes.
+
+Mutations are structure-aware: XML gets deep nesting, entity expansion (billion
+laughs), external entities, huge and numerous attributes, subtree duplication and
+odd numeric attributes; JSON gets deep nesting, huge strings and numbers, type
+confusion, key explosions and array duplication; line-delimited JSON (go test)
+gets line-level variants. Byte-level truncation, bit flips and garbage injection
+apply to everything.
+
+Before fuzzing, every seed is parsed to fit a size-normalized baseline per format
+(overhead + bytes x rate, for CPU time and for memory). A mutant is flagged when its
+parse time or peak memory exceeds a multiple of the baseline for its size, when
+the worker hangs past the timeout (it is killed and replaced), or when the worker
+dies or raises RecursionError/MemoryError. Flagged inputs are written to the
+findings directory together with findings.jsonl, so they can be replayed.
+
+Workers run with an address-space limit (RLIMIT_AS, POSIX only). Peak memory is
+the larger of the tracemalloc peak and the growth of the worker's maximum RSS.
+"""
+
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import random
+import re
+import time
+import tracemalloc
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits or ru_maxrss
+    resource = None
+
+DEFAULT_TARGET = 'parser_fuzzer:parse_with_orchestrator'
+DEFAULT_TIMEOUT_SEC = 10.0
+DEFAULT_MEMORY_LIMIT = 2 * 1024 ** 3
+DEFAULT_TIME_FACTOR = 10.0
+DEFAULT_MEMORY_FACTOR = 20.0
+MIN_FLAG_SECONDS = 0.05
+MIN_FLAG_BYTES = 16 * 1024 ** 2
+MAX_SEED_BYTES = 4 * 1024 ** 2
+MAX_MUTANT_BYTES = 64 * 1024 ** 2
+FATAL_ERRORS = ('RecursionError', 'MemoryError', 'SystemError')
+
+
+# Corpus
+
+def detect_kind(data: bytes) -> str:
+    """Rough format of a report: 'xml', 'json', 'jsonl' or 'text'."""
+    head = data[:4096].lstrip(b'\xef\xbb\xbf \t\r\n')
+    if head.startswith(b'<'):
+        return 'xml'
+    if head.startswith((b'{', b'[')):
+        first_line = head.split(b'\n', 1)[0].strip()
+        if b'\n' in head and first_line.endswith(b'}') and head.count(b'\n{') > 1:
+            return 'jsonl'
+        return 'json'
+    return 'text'
+
+
+def load_corpus(directories: Iterable[Any], include_synthetic: bool = True) -> Dict[str, bytes]:
+    """
+    Seed corpus: every file (up to MAX_SEED_BYTES) under the given directories, plus
+    one generated report per framework so each format is covered even when the
+    directories are thin.
+    """
+    seeds = {}
+    for directory in directories:
+        directory = Path(directory)
+        if not directory.is_dir():
+            continue
+        for path in sorted(p for p in directory.rglob('*') if p.is_file()):
+            if 0 < path.stat().st_size <= MAX_SEED_BYTES:
+                seeds[str(path)] = path.read_bytes()
+    if include_synthetic:
+        from synthetic_reports import GENERATORS
+        state = random.getstate()
+        random.seed(0)
+        try:
+            for framework, generator in GENERATORS.items():
+                seeds[f'synthetic:{framework}'] = bytes(generator('unit-tests'))
+        finally:
+            random.setstate(state)
+    return seeds
+
+
+# Mutators: (data, rng) -> mutant bytes
+
+def _insert_at(data: bytes, position: int, payload: bytes) -> bytes:
+    return data[:position] + payload + data[position:]
+
+
+def _element_starts(data: bytes) -> List[Tuple[int, int]]:
+    """(start, end) of start tags (not declarations, comments or end tags)."""
+    return [m.span() for m in re.finditer(rb'<[A-Za-z_][^<>]*?>', data[:MAX_SEED_BYTES])]
+
+
+def xml_deep_nesting(data: bytes, rng: random.Random) -> bytes:
+    depth = rng.choice((200, 2000, 20000, 100000))
+    tags = _element_starts(data)
+    if not tags:
+        return b'<a>' * depth + b'</a>' * depth
+    _, end = rng.choice(tags)
+    if data[end - 2:end] == b'/>':
+        end -= 2
+        return data[:end] + b'>' + b'<n>' * depth + b'</n>' * depth + data[end:].replace(b'/>', b'>', 1)
+    return _insert_at(data, end, b'<n>' * depth + b'</n>' * depth)
+
+
+def xml_entity_expansion(data: bytes, rng: random.Random) -> bytes:
+    levels = rng.choice((5, 8, 10))
+    entities = [b'<!ENTITY e0 "' + b'lol' * 10 + b'">']
+    for level in range(1, levels):
+        entities.append(b'<!ENTITY e%d "' % level + b''.join(b'&e%d;' % (level - 1) for _ in range(10)) + b'">')
+    doctype = b'<!DOCTYPE r [' + b''.join(entities) + b']>'
+    body = re.sub(rb'^\s*<\?xml[^>]*\?>', b'', data, count=1)
+    tags = _element_starts(body)
+    reference = b'&e%d;' % (levels - 1)
+    if tags:
+        _, end = tags[min(1, len(tags) - 1)]
+        if body[end - 2:end] != b'/>':
+            body = _insert_at(body, end, reference)
+    return b'<?xml version="1.0"?>' + doctype + body
+
+
+def xml_external_entity(data: bytes, rng: random.Random) -> bytes:
+    target = rng.choice((b'file:///etc/passwd', b'file:///dev/zero', b'http://127.0.0.1:9/x'))
+    body = re.sub(rb'^\s*<\?xml[^>]*\?>', b'', data, count=1)
+    tags = _element_starts(body)
+    if tags:
+        _, end = tags[0]
+        if body[end - 2:end] != b'/>':
+            body = _insert_at(body, end, b'&xxe;')
+    return b'<?xml version="1.0"?><!DOCTYPE r [<!ENTITY xxe SYSTEM "' + target + b'">]>' + body
+
+
+def xml_huge_attribute(data: bytes, rng: random.Random) -> bytes:
+    tags = _element_starts(data)
+    if not tags:
+        return data
+    start, _ = rng.choice(tags)
+    name_end = re.match(rb'<[^\s/>]+', data[start:]).end() + start
+    if rng.random() < 0.5:
+        payload = b' huge="' + b'A' * rng.choice((1 << 16, 1 << 20, 1 << 24)) + b'"'
+    else:
+        payload = b''.join(b' a%d="%d"' % (i, i) for i in range(rng.choice((1000, 10000, 100000))))
+    return _insert_at(data, name_end, payload)
+
+
+def xml_duplicate_subtree(data: bytes, rng: random.Random) -> bytes:
+    cases = list(re.finditer(rb'<testcase\b.*?(?:/>|</testcase>)', data[:MAX_SEED_BYTES], re.S))
+    if not cases:
+        return data
+    case = rng.choice(cases)
+    copies = rng.choice((100, 1000, 10000))
+    return data[:case.end()] + case.group(0) * copies + data[case.end():]
+
+
+def xml_numeric_attributes(data: bytes, rng: random.Random) -> bytes:
+    weird = rng.choice((b'NaN', b'-1', b'1e309', b'-0', b'9' * 5000, b'0x10', b'', b'1,5'))
+    return re.sub(rb'\b(time|tests|failures|errors|skipped)="[^"]*"', lambda m: m.group(1) + b'="' + weird + b'"',
+                  data, count=rng.randint(1, 50))
+
+
+def xml_long_text(data: bytes, rng: random.Random) -> bytes:
+    tags = _element_starts(data)
+    if not tags:
+        return data
+    _, end = rng.choice(tags)
+    if data[end - 2:end] == b'/>':
+        return data
+    size = rng.choice((1 << 16, 1 << 20, 1 << 24))
+    payload = rng.choice((b'<![CDATA[' + b'x' * size + b']]>', b'&amp;' * (size // 5), b'\n' * size))
+    return _insert_at(data, end, payload)
+
+
+def json_deep_nesting(data: bytes, rng: random.Random) -> bytes:
+    depth = rng.choice((200, 2000, 20000, 100000))
+    opener, closer = rng.choice(((b'[', b']'), (b'{"a":', b'}')))
+    positions = [m.end() for m in re.finditer(rb'":\s*', data[:MAX_SEED_BYTES])]
+    if not positions:
+        return opener * depth + data + closer * depth
+    position = rng.choice(positions)
+    value_end = re.match(rb'("(?:[^"\\]|\\.)*"|[^,}\]]*)', data[position:]).end() + position
+    return data[:position] + opener * depth + data[position:value_end] + closer * depth + data[value_end:]
+
+
+def _json_load(data: bytes) -> Optional[Any]:
+    try:
+        return json.loads(data)
+    except (ValueError, RecursionError):
+        return None
+
+
+def _json_nodes(document: Any) -> List[Tuple[Any, Any]]:
+    """(container, key) of every value in a JSON document."""
+    nodes, stack = [], [document]
+    while stack and len(nodes) < 100000:
+        node = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node) if isinstance(node, list) else ()
+        for key, value in items:
+            nodes.append((node, key))
+            stack.append(value)
+    return nodes
+
+
+def json_value_mutation(data: bytes, rng: random.Random) -> bytes:
+    document = _json_load(data)
+    nodes = _json_nodes(document) if document is not None else []
+    if not nodes:
+        return data
+    for _ in range(rng.randint(1, 5)):
+        container, key = rng.choice(nodes)
+        value = container[key]
+        copies = 10 if isinstance(value, (dict, list)) else 1000  # replicated containers grow fast
+        container[key] = rng.choice((
+            None, True, -1, 0.0, 1e308, '', [], {}, 'A' * rng.choice((1 << 16, 1 << 20)),
+            '\u0000' * 1000, '\ud800', [value] * copies, {'nested': value}
+        ))
+    return json.dumps(document).encode('utf-8', 'surrogatepass')
+
+
+def json_huge_number(data: bytes, rng: random.Random) -> bytes:
+    number = rng.choice((b'9' * rng.choice((5000, 100000, 1000000)), b'1e400', b'-1e-400', b'1' + b'0' * 400 + b'.5'))
+    matches = list(re.finditer(rb'(?<=[:\[,])\s*-?\d+(\.\d+)?([eE][-+]?\d+)?', data[:MAX_SEED_BYTES]))
+    if not matches:
+        return data
+    match = rng.choice(matches)
+    return data[:match.start()] + number + data[match.end():]
+
+
+def json_key_explosion(data: bytes, rng: random.Random) -> bytes:
+    count = rng.choice((1000, 10000, 100000))
+    if rng.random() < 0.5:
+        keys = b','.join(b'"k%d":%d' % (i, i) for i in range(count))  # distinct keys
+    else:
+        keys = b','.join(b'"k":%d' % i for i in range(count))  # duplicate keys
+    position = data.find(b'{')
+    if position < 0:
+        return data
+    return data[:position + 1] + keys + (b',' if data[position + 1:].lstrip()[:1] != b'}' else b'') + data[position + 1:]
+
+
+def json_array_duplication(data: bytes, rng: random.Random) -> bytes:
+    document = _json_load(data)
+    if document is None:
+        return data
+    arrays = [(c, k) for c, k in _json_nodes(document) if isinstance(c[k], list) and c[k]]
+    if not arrays:
+        return data
+    container, key = rng.choice(arrays)
+    container[key] = container[key] * rng.choice((100, 1000, 10000))
+    return json.dumps(document).encode('utf-8', 'surrogatepass')
+
+
+def jsonl_line_mutation(data: bytes, rng: random.Random) -> bytes:
+    lines = data.split(b'\n')
+    line = rng.choice(lines) if lines else b''
+    choice = rng.random()
+    if choice < 0.3:
+        lines[rng.randrange(len(lines))] = line * rng.choice((2, 100))  # several objects on one line
+    elif choice < 0.6:
+        lines.extend([line] * rng.choice((1000, 100000)))
+    else:
+        lines.insert(rng.randrange(len(lines) + 1), b'{"Output":"' + b'x' * rng.choice((1 << 16, 1 << 22)) + b'"}')
+    return b'\n'.join(lines)
+
+
+def bytes_truncate(data: bytes, rng: random.Random) -> bytes:
+    return data[:rng.randrange(max(1, len(data)))]
+
+
+def bytes_flip(data: bytes, rng: random.Random) -> bytes:
+    mutant = bytearray(data)
+    for _ in range(rng.randint(1, max(1, len(mutant) // 1000))):
+        if mutant:
+            mutant[rng.randrange(len(mutant))] ^= 1 << rng.randrange(8)
+    return bytes(mutant)
+
+
+def bytes_garbage(data: bytes, rng: random.Random) -> bytes:
+    garbage = rng.choice((b'\x00\xff\xfe\xfd' * 100, b'\xef\xbb\xbf', b'\xff\xfe', bytes(rng.getrandbits(8) for _ in range(256))))
+    return _insert_at(data, rng.randrange(len(data) + 1), garbage)
+
+
+MUTATORS: Dict[str, Tuple[Tuple[str, ...], Callable[[bytes, random.Random], bytes]]] = {
+    'xml_deep_nesting': (('xml',), xml_deep_nesting),
+    'xml_entity_expansion': (('xml',), xml_entity_expansion),
+    'xml_external_entity': (('xml',), xml_external_entity),
+    'xml_huge_attribute': (('xml',), xml_huge_attribute),
+    'xml_duplicate_subtree': (('xml',), xml_duplicate_subtree),
+    'xml_numeric_attributes': (('xml',), xml_numeric_attributes),
+    'xml_long_text': (('xml',), xml_long_text),
+    'json_deep_nesting': (('json', 'jsonl'), json_deep_nesting),
+    'json_value_mutation': (('json',), json_value_mutation),
+    'json_huge_number': (('json', 'jsonl'), json_huge_number),
+    'json_key_explosion': (('json',), json_key_explosion),
+    'json_array_duplication': (('json',), json_array_duplication),
+    'jsonl_line_mutation': (('jsonl',), jsonl_line_mutation),
+    'bytes_truncate': (('xml', 'json', 'jsonl', 'text'), bytes_truncate),
+    'bytes_flip': (('xml', 'json', 'jsonl', 'text'), bytes_flip),
+    'bytes_garbage': (('xml', 'json', 'jsonl', 'text'), bytes_garbage)
+}
+
+
+def mutate(data: bytes, rng: random.Random, max_mutations: int = 2) -> Tuple[bytes, List[str]]:
+    """Apply 1..max_mutations mutators that suit the input's format."""
+    kind = detect_kind(data)
+    names = [name for name, (kinds, _) in MUTATORS.items() if kind in kinds]
+    applied = []
+    for _ in range(rng.randint(1, max_mutations)):
+        name = rng.choice(names)
+        try:
+            mutant = MUTATORS[name][1](data, rng)
+        except (ValueError, RecursionError):  # e.g. re-serializing an already deeply nested mutant
+            continue
+        if len(mutant) <= MAX_MUTANT_BYTES:
+            data = mutant
+            applied.append(name)
+    return data, applied
+
+
+# Targets: bytes -> anything; exceptions count as rejections
+
+def parse_with_orchestrator(data: bytes) -> bool:
+    """Parse with the test parser's orchestrator (the parser path must be importable)."""
+    from lazy_imports import get_orchestrator, parse_request
+    request = parse_request(tenant_id='fuzz', project_id='fuzz', report_type=None, environment='fuzz')
+    response = get_orchestrator().parse_report(data, request)
+    if not response.success:
+        raise ValueError(response.error)
+    return True
+
+
+def parse_with_stdlib(data: bytes) -> bool:
+    """Reference target: ElementTree for XML, json for everything else (checks the harness itself)."""
+    kind = detect_kind(data)
+    if kind == 'xml':
+        import xml.etree.ElementTree as ET
+        ET.fromstring(data)
+    elif kind == 'jsonl':
+        for line in data.splitlines():
+            if line.strip():
+                json.loads(line)
+    else:
+        json.loads(data)
+    return True
+
+
+def resolve_target(spec: str) -> Callable[[bytes], Any]:
+    """Import a 'module:function' target."""
+    module, _, function = spec.partition(':')
+    return getattr(importlib.import_module(module), function)
+
+
+# Sandboxed workers
+
+def _max_rss() -> int:
+    if resource is None:
+        return 0
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _worker_main(conn: Any, target_spec: str, memory_limit: Optional[int], seeds: Dict[str, bytes]):
+    if resource is not None and memory_limit:
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        except (ValueError, OSError):
+            pass
+    target = resolve_target(target_spec)
+    # Warm up on the seeds so lazy imports and caches don't count against the first mutant
+    for data in seeds.values():
+        try:
+            target(data)
+        except Exception:
+            pass
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        task_id, seed_name, mutation_seed, data = task
+        mutators: List[str] = []
+        if data is None:
+            # Mutating here keeps the parent from becoming the bottleneck
+            data, mutators = mutate(seeds[seed_name], random.Random(mutation_seed))
+        # Traced only while parsing: tracing slows the (allocation-heavy) mutators down a lot
+        tracemalloc.start()
+        rss_before = _max_rss()
+        # CPU time, so workers sharing cores don't inflate each other's parse times
+        start = time.process_time()
+        outcome, error = 'ok', None
+        try:
+            target(data)
+        except Exception as e:
+            outcome = 'fatal' if type(e).__name__ in FATAL_ERRORS else 'rejected'
+            error = f'{type(e).__name__}: {str(e)[:200]}'
+        seconds = time.process_time() - start
+        peak = max(tracemalloc.get_traced_memory()[1], _max_rss() - rss_before)
+        tracemalloc.stop()
+        conn.send((task_id, outcome, seconds, peak, error, mutators, len(data), detect_kind(data)))
+
+
+class _Worker:
+    def __init__(self, context: Any, target: str, memory_limit: Optional[int], seeds: Dict[str, bytes]):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, target, memory_limit, seeds), daemon=True)
+        self.process.start()
+        child.close()
+        self.task: Optional[Dict[str, Any]] = None
+        self.started_at = 0.0
+
+    def submit(self, task: Dict[str, Any]):
+        self.task = task
+        self.started_at = time.monotonic()
+        self.conn.send((task['id'], task.get('seed'), task.get('mutation_seed'), task.get('data')))
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+
+
+# Baseline and fuzzing loop
+
+class Baseline:
+    """Size-normalized cost model per format: overhead + bytes x rate (time and memory)."""
+
+    def __init__(self):
+        self.models: Dict[str, Dict[str, float]] = {}
+
+    def fit(self, samples: List[Dict[str, Any]]):
+        """Fit from parses of the seed corpus ({'kind', 'size', 'seconds', 'peak'})."""
+        if not samples:
+            return
+        # Fixed cost comes from the cheapest input of any format, so formats with a single seed still get a rate
+        overheads = {metric: min(s[metric] for s in samples) for metric in ('seconds', 'peak')}
+        for kind in {s['kind'] for s in samples} | {'*'}:
+            group = [s for s in samples if kind in ('*', s['kind'])]
+            model = {}
+            for metric, unit in (('seconds', 'seconds'), ('peak', 'bytes')):
+                overhead = overheads[metric]
+                rates = sorted(max(0.0, s[metric] - overhead) / max(1, s['size']) for s in group)
+                model[f'{unit}_overhead'] = overhead
+                model[f'{unit}_per_byte'] = rates[len(rates) // 2]
+            self.models[kind] = model
+
+    def expected(self, kind: str, size: int) -> Tuple[float, float]:
+        """(seconds, peak bytes) expected for an input of this format and size."""
+        model = self.models.get(kind) or self.models.get('*')
+        if model is None:
+            return 0.0, 0.0
+        return (model['seconds_overhead'] + size * model['seconds_per_byte'],
+                model['bytes_overhead'] + size * model['bytes_per_byte'])
+
+
+class ParserFuzzer:
+    """Runs mutants of a seed corpus through sandboxed parser workers and flags blow-ups."""
+
+    def __init__(self, seeds: Dict[str, bytes], target: str = DEFAULT_TARGET, workers: Optional[int] = None,
+                 timeout: float = DEFAULT_TIMEOUT_SEC, memory_limit: Optional[int] = DEFAULT_MEMORY_LIMIT,
+                 time_factor: float = DEFAULT_TIME_FACTOR, memory_factor: float = DEFAULT_MEMORY_FACTOR,
+                 findings_dir: Any = 'fuzz-findings', seed: int = 0):
+        """
+        Args:
+            seeds: Seed corpus (name -> content)
+            target: 'module:function' parsing bytes in the workers
+            workers: Worker processes (CPU count by default)
+            timeout: Seconds after which a parse is a hang and its worker is killed
+            memory_limit: Address-space limit per worker in bytes (None to disable)
+            time_factor: Flag parses slower than this multiple of the baseline for their size
+            memory_factor: Flag parses whose peak memory exceeds this multiple of the baseline
+            findings_dir: Where flagged inputs and findings.jsonl are written
+            seed: Random seed of the mutation stream
+        """
+        if not seeds:
+            raise ValueError('empty seed corpus')
+        self.seeds = seeds
+        self.target = target
+        self.workers = workers or os.cpu_count() or 2
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.time_factor = time_factor
+        self.memory_factor = memory_factor
+        self.findings_dir = Path(findings_dir)
+        self.rng = random.Random(seed)
+        self.baseline = Baseline()
+        self.findings: List[Dict[str, Any]] = []
+        self.stats: Dict[str, Any] = {'executions': 0, 'outcomes': {}, 'flagged': {}, 'mutators': {}}
+        methods = multiprocessing.get_all_start_methods()
+        # fork keeps sys.path tweaks of the calling script (parser path) in the workers
+        self._context = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, self.target, self.memory_limit, self.seeds)
+
+    def _run(self, tasks: Iterator[Dict[str, Any]], deadline: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Execute tasks on the worker pool, yielding them with outcome, seconds and peak filled in."""
+        pool = [self._spawn() for _ in range(self.workers)]
+        exhausted = False
+        try:
+            while True:
+                for worker in pool:
+                    if worker.task is None and not exhausted and (deadline is None or time.monotonic() < deadline):
+                        task = next(tasks, None)
+                        if task is None:
+                            exhausted = True
+                        else:
+                            worker.submit(task)
+                busy = [w for w in pool if w.task is not None]
+                if not busy:
+                    return
+                ready = wait([w.conn for w in busy] + [w.process.sentinel for w in busy], timeout=0.1)
+                now = time.monotonic()
+                for index, worker in enumerate(pool):
+                    if worker.task is None:
+                        continue
+                    task = worker.task
+                    if worker.conn in ready:
+                        try:
+                            (_, task['outcome'], task['seconds'], task['peak'], task['error'], mutators,
+                             task['size'], task['kind']) = worker.conn.recv()
+                            task.setdefault('mutators', mutators)
+                            worker.task = None
+                            yield task
+                            continue
+                        except (EOFError, OSError):
+                            pass
+                    if worker.process.sentinel in ready or not worker.process.is_alive():
+                        task.update(outcome='crash', seconds=now - worker.started_at, peak=0,
+                                    error=f'worker exited with {worker.process.exitcode}')
+                    elif now - worker.started_at > self.timeout:
+                        task.update(outcome='hang', seconds=now - worker.started_at, peak=0,
+                                    error=f'no result after {self.timeout:.0f}s')
+                    else:
+                        continue
+                    worker.kill()
+                    pool[index] = self._spawn()
+                    yield task
+        finally:
+            for worker in pool:
+                if worker.task is not None:
+                    worker.kill()
+                else:
+                    worker.stop()
+
+    def fit_baseline(self, repeats: int = 3) -> Baseline:
+        """Parse every seed (repeats times, best time and memory kept) and fit the baseline."""
+        tasks = ({'id': f'{name}#{i}', 'name': name, 'data': data, 'kind': detect_kind(data), 'size': len(data)}
+                 for i in range(repeats) for name, data in self.seeds.items())
+        best: Dict[str, Dict[str, Any]] = {}
+        for task in self._run(tasks):
+            if task['outcome'] in ('crash', 'hang'):
+                continue
+            current = best.setdefault(task['name'], dict(task))
+            current['seconds'] = min(current['seconds'], task['seconds'])
+            current['peak'] = min(current['peak'], task['peak'])
+        self.baseline.fit(list(best.values()))
+        return self.baseline
+
+    def _mutants(self, limit: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Mutation tasks: a seed and the random seed the worker mutates it with."""
+        names = sorted(self.seeds)
+        count = 0
+        while limit is None or count < limit:
+            count += 1
+            yield {'id': count, 'seed': names[count % len(names)], 'mutation_seed': self.rng.getrandbits(64)}
+
+    def regenerate(self, task: Dict[str, Any]) -> bytes:
+        """Rebuild a task's mutant (mutation is deterministic given the seed and mutation seed)."""
+        if task.get('data') is None:
+            task['data'], task['mutators'] = mutate(self.seeds[task['seed']], random.Random(task['mutation_seed']))
+            task.setdefault('kind', detect_kind(task['data']))
+            task.setdefault('size', len(task['data']))
+        return task['data']
+
+    def classify(self, task: Dict[str, Any]) -> Optional[str]:
+        """Why a finished task is a finding (None when it is not)."""
+        if task['outcome'] in ('crash', 'hang', 'fatal'):
+            return task['outcome']
+        expected_seconds, expected_peak = self.baseline.expected(task['kind'], task['size'])
+        task['expected_seconds'], task['expected_peak'] = expected_seconds, expected_peak
+        if task['seconds'] > max(MIN_FLAG_SECONDS, self.time_factor * expected_seconds):
+            return 'slow'
+        if task['peak'] > max(MIN_FLAG_BYTES, self.memory_factor * expected_peak):
+            return 'memory'
+        return None
+
+    def _record(self, task: Dict[str, Any], reason: str):
+        self.regenerate(task)
+        self.findings_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha1(task['data']).hexdigest()[:12]
+        extension = {'xml': 'xml', 'json': 'json', 'jsonl': 'jsonl'}.get(task['kind'], 'txt')
+        input_file = self.findings_dir / f'{reason}-{digest}.{extension}'
+        input_file.write_bytes(task['data'])
+        finding = {key: task.get(key) for key in ('seed', 'mutators', 'kind', 'size', 'outcome', 'seconds', 'peak',
+                                                  'expected_seconds', 'expected_peak', 'error')}
+        finding.update(reason=reason, input=str(input_file), found_at=time.time())
+        self.findings.append(finding)
+        with open(self.findings_dir / 'findings.jsonl', 'a', encoding='utf-8') as f:
+            f.write(json.dumps(finding) + '\n')
+
+    def fuzz(self, duration: Optional[float] = None, iterations: Optional[int] = None,
+             on_finding: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Fuzz until duration seconds pass or iterations mutants ran (fits the baseline first if needed).
+
+        Returns:
+            Summary with executions, execs/sec, outcome and finding counts
+        """
+        if not self.baseline.models:
+            self.fit_baseline()
+        started = time.monotonic()
+        deadline = started + duration if duration else None
+        for task in self._run(self._mutants(iterations), deadline):
+            stats = self.stats
+            stats['executions'] += 1
+            stats['outcomes'][task['outcome']] = stats['outcomes'].get(task['outcome'], 0) + 1
+            reason = self.classify(task)
+            if reason:
+                stats['flagged'][reason] = stats['flagged'].get(reason, 0) + 1
+                self._record(task, reason)
+                if on_finding:
+                    on_finding(self.findings[-1])
+            for name in task.get('mutators', ()):
+                stats['mutators'][name] = stats['mutators'].get(name, 0) + 1
+        elapsed = time.monotonic() - started
+        return {**self.stats, 'elapsed': elapsed, 'execs_per_sec': self.stats['executions'] / elapsed if elapsed else 0.0,
+                'findings': len(self.findings), 'baseline': self.baseline.models, 'findings_dir': str(self.findings_dir)}
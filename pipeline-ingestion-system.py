@@ -8,26 +8,71 @@ to populate the autotest platform with real-world test data for demonstration an
 import os
 import sys
 import json
+import argparse
+import queue
+import threading
 import requests
 import time
-import base64
 import random
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Any, Optional, Iterable, Tuple
 from datetime import datetime, timedelta
-import xml.etree.ElementTree as ET
+import io
+import tempfile
+import zipfile
+from contextlib import ExitStack, contextmanager
 
 # Add the test parser to Python path
 parser_path = Path(r'C:\autotest\test-parser-mvp')
 sys.path.insert(0, str(parser_path))
 
-from core.parser_orchestrator import get_orchestrator
-from models import ParseRequest
+from lazy_imports import get_orchestrator, parse_request
+
+from history_store import TestHistoryStore
+from flaky_detector import FlakinessScorer
+from duration_regression import DurationRegressionDetector, numpy_available
+from failure_signatures import FailureClusterIndex
+from instrumentation import configure_from_env, get_metrics, timed
+from profiling import Profiler, add_profile_argument, profiler_from_args
+from http_cassette import add_cassette_arguments, cassette_from_args, cassette_from_env
+from structured_log import configure_logging_from_env, get_logger
+from results_sink import ResultsSink
+from http_limits import MAX_REPORT_BYTES
+from artifact_scheduler import DEFAULT_STREAMING_THRESHOLD, ThroughputModel, execute, plan_artifacts, summarize_reports
+from github_backfill import (DEFAULT_REQUESTS_PER_HOUR, MAX_RESULTS_PER_QUERY, MIN_SLICE, BackfillCheckpoint, GitHubBackfill,
+                             parse_date)
+from github_tokens import GitHubTokenPool, RateLimitExhausted
+from warm_cache import shared
+from poll_scheduler import PollScheduler
+from synthetic_reports import generate_report
+from ingestion_budget import (MAX_RUN_ATTEMPTS, CoverageReport, Deadline, IngestionCheckpoint, fit_artifacts,
+                              order_runs, run_key)
+from fair_scheduler import configure_scheduler_from_env, get_scheduler
+
+if TYPE_CHECKING:
+    # Each serving mode loads its module (and http.server, multiprocessing) only when it runs
+    from upload_service import UploadService
+    from webhook_receiver import WebhookReceiver
+
+DEFAULT_RESULTS_LOG = 'pipeline-ingestion-results.ndjson'
+DEFAULT_CHECKPOINT_FILE = 'ingestion-checkpoint.json'
+GITHUB_API = 'https://api.github.com'
+TENANT_ID = 'pipeline-ingestion'
+QUEUE_MAX_PARK_SEC = 60.0
+BACKFILL_TENANT_ID = 'pipeline-backfill'
 
 class PipelineIngestionSystem:
     """System for ingesting test results from various CI/CD pipelines."""
     
-    def __init__(self, github_token: Optional[str] = None, jenkins_url: Optional[str] = None, jenkins_auth: Optional[tuple] = None):
+    def __init__(self, github_token: Optional[str] = None, jenkins_url: Optional[str] = None, jenkins_auth: Optional[tuple] = None,
+                 history_store: Optional[TestHistoryStore] = None, flaky_scorer: Optional[FlakinessScorer] = None,
+                 duration_detector: Optional[DurationRegressionDetector] = None,
+                 failure_index: Optional[FailureClusterIndex] = None, profiler: Optional[Profiler] = None,
+                 results_sink: Optional[ResultsSink] = None, gitlab_url: str = 'https://gitlab.com',
+                 gitlab_token: Optional[str] = None, artifact_workers: int = 4,
+                 streaming_threshold: int = DEFAULT_STREAMING_THRESHOLD,
+                 github_tokens: Optional[GitHubTokenPool] = None, github_api: str = GITHUB_API,
+                 download_artifacts: Optional[bool] = None, max_report_bytes: int = MAX_REPORT_BYTES):
         """
         Initialize the ingestion system.
         
@@ -35,16 +80,49 @@ class PipelineIngestionSystem:
             github_token: GitHub personal access token
             jenkins_url: Jenkins server URL
             jenkins_auth: Jenkins authentication (username, password/token)
+            history_store: Optional store that persists every parsed run
+            flaky_scorer: Optional flakiness scorer updated with every parsed run
+            duration_detector: Optional detector that flags slowdowns in every parsed run
+            failure_index: Optional index that clusters every parsed failure by signature
+            profiler: Optional per-stage profiler (see --profile)
+            results_sink: NDJSON sink every parse result is appended to (opened on first ingestion
+                at pipeline-ingestion-results.ndjson when omitted)
+            gitlab_url: GitLab instance URL
+            gitlab_token: GitLab access token
+            artifact_workers: Threads downloading and parsing the artifacts of a run
+            streaming_threshold: Artifacts of at least this many bytes go to the streaming lane
+            github_tokens: Token pool for GitHub API requests (built from github_token when omitted)
+            github_api: GitHub API root (a local GitHubSimulator for load tests)
+            download_artifacts: Download and unzip artifacts instead of simulating their
+                contents (default: only when github_api is not the public API)
+            max_report_bytes: Largest report extracted from a downloaded artifact archive
         """
         self.github_token = github_token
         self.jenkins_url = jenkins_url
         self.jenkins_auth = jenkins_auth
+        self.gitlab_url = gitlab_url
+        self.gitlab_token = gitlab_token
+        self.history_store = history_store
+        self.flaky_scorer = flaky_scorer
+        self.duration_detector = duration_detector
+        self.failure_index = failure_index
+        self.results_sink = results_sink
+        self.metrics = get_metrics()
+        self.profiler = profiler or Profiler(enabled=False)
+        self.log = get_logger('ingestion')
+        self.scheduler = get_scheduler()
+        self.artifact_workers = artifact_workers
+        self.streaming_threshold = streaming_threshold
+        self.max_report_bytes = max_report_bytes
+        self.throughput_model = ThroughputModel()
+        self.schedule_reports: List[Dict[str, Any]] = []
+        self._track_lock = threading.Lock()
         self.orchestrator = get_orchestrator()
         
-        # GitHub API headers
-        self.github_headers = {'Accept': 'application/vnd.github.v3+json'}
-        if github_token:
-            self.github_headers['Authorization'] = f'token {github_token}'
+        # GitHub API requests are spread over the token pool
+        self.github = github_tokens or GitHubTokenPool([github_token] if github_token else [])
+        self.github_api = github_api.rstrip('/')
+        self.download_artifacts = github_api != GITHUB_API if download_artifacts is None else download_artifacts
         
         # Popular repositories with good test data
         self.demo_repositories = [
@@ -85,13 +163,17 @@ class PipelineIngestionSystem:
             }
         ]
     
-    def ingest_demo_data(self, max_repos: int = 3, max_runs_per_repo: int = 2) -> Dict[str, Any]:
+    def ingest_demo_data(self, max_repos: int = 3, max_runs_per_repo: int = 2, time_budget: Optional[float] = None,
+                         checkpoint_file: Path = Path(DEFAULT_CHECKPOINT_FILE)) -> Dict[str, Any]:
         """
         Ingest test data from demo repositories for testing the app.
         
         Args:
             max_repos: Maximum number of repositories to process
             max_runs_per_repo: Maximum workflow runs per repository
+            time_budget: Seconds to finish in; work is then ordered by value, stopped at
+                the deadline and the remainder checkpointed (see _ingest_within_budget)
+            checkpoint_file: Where work left at the deadline is kept for the next window
             
         Returns:
             Dict containing ingestion results and statistics
@@ -100,30 +182,39 @@ class PipelineIngestionSystem:
         print("=" * 50)
         print(f"📊 Target: {max_repos} repositories, {max_runs_per_repo} runs each")
         
-        if not self.github_token:
+        if not self.github.authenticated and self.github_api == GITHUB_API:
             print("⚠️  No GitHub token - using public API (rate limited)")
             print("   Set GITHUB_TOKEN environment variable for better access")
         
+        if self.results_sink is None:
+            self.results_sink = ResultsSink(DEFAULT_RESULTS_LOG)
+        
         ingestion_results = {
             'repositories_processed': 0,
             'workflow_runs_processed': 0,
             'artifacts_downloaded': 0,
             'test_cases_ingested': 0,
             'frameworks_found': set(),
-            'parsing_results': [],
             'errors': [],
             'processing_time': 0
         }
         
         start_time = time.time()
         
-        for repo_info in self.demo_repositories[:max_repos]:
-            print(f"\n📦 Processing Repository: {repo_info['name']}")
-            print(f"   🔧 Expected Framework: {repo_info['framework']}")
-            print(f"   📝 Description: {repo_info['description']}")
+        repositories = self.demo_repositories[:max_repos]
+        if time_budget is not None:
+            ingestion_results['coverage'] = self._ingest_within_budget(
+                repositories, max_runs_per_repo, Deadline(time_budget), checkpoint_file, ingestion_results)
+            repositories = []
+        for repo_index, repo_info in enumerate(repositories, 1):
+            log = self.log.bind(repo=repo_info['name'])
+            log.info('repository.start', f"\n📦 Processing Repository: {repo_info['name']}\n"
+                     f"   🔧 Expected Framework: {repo_info['framework']}\n"
+                     f"   📝 Description: {repo_info['description']}", framework=repo_info['framework'])
             
             try:
-                repo_results = self._ingest_github_repository(repo_info, max_runs_per_repo)
+                with self.profiler.stage('repository', repo_info['name']):
+                    repo_results = self._ingest_github_repository(repo_info, max_runs_per_repo)
                 
                 # Aggregate results
                 ingestion_results['repositories_processed'] += 1
@@ -131,142 +222,932 @@ class PipelineIngestionSystem:
                 ingestion_results['artifacts_downloaded'] += repo_results['artifacts_processed']
                 ingestion_results['test_cases_ingested'] += repo_results['test_cases_parsed']
                 ingestion_results['frameworks_found'].update(repo_results['frameworks_found'])
-                ingestion_results['parsing_results'].extend(repo_results['parse_results'])
                 
-                print(f"   ✅ Repository Summary:")
-                print(f"      🏃 Runs processed: {repo_results['runs_processed']}")
-                print(f"      📁 Artifacts: {repo_results['artifacts_processed']}")
-                print(f"      🧪 Test cases: {repo_results['test_cases_parsed']}")
+                log.info('repository.done', f"   ✅ Repository Summary:\n"
+                         f"      🏃 Runs processed: {repo_results['runs_processed']}\n"
+                         f"      📁 Artifacts: {repo_results['artifacts_processed']}\n"
+                         f"      🧪 Test cases: {repo_results['test_cases_parsed']}",
+                         runs=repo_results['runs_processed'], artifacts=repo_results['artifacts_processed'],
+                         test_cases=repo_results['test_cases_parsed'])
                 
+            except RateLimitExhausted as e:
+                # Every later repository would hit the same limit
+                ingestion_results['errors'].append(f"Repository {repo_info['name']}: {str(e)}")
+                log.error('github.exhausted', f"   ❌ {str(e)} - stopping", retry_at=e.retry_at)
+                break
             except Exception as e:
                 error_msg = f"Repository {repo_info['name']}: {str(e)}"
                 ingestion_results['errors'].append(error_msg)
-                print(f"   ❌ Error: {str(e)}")
+                log.error('repository.error', f"   ❌ Error: {str(e)}", error=str(e))
+            
+            self.log.progress(repo_index, len(repositories),
+                              runs=ingestion_results['workflow_runs_processed'],
+                              artifacts=ingestion_results['artifacts_downloaded'],
+                              tests=ingestion_results['test_cases_ingested'])
         
+        self.log.flush()
+        self.results_sink.flush()
+        ingestion_results['parse_summary'] = self.results_sink.summary()
+        ingestion_results['tenant_scheduling'] = self.scheduler.stats()
+        ingestion_results['artifact_scheduling'] = summarize_reports(self.schedule_reports, self.throughput_model)
         ingestion_results['processing_time'] = time.time() - start_time
         ingestion_results['frameworks_found'] = list(ingestion_results['frameworks_found'])
         
+        if self.flaky_scorer:
+            ingestion_results['flaky_tests'] = {
+                repo_info['name']: self.flaky_scorer.top_flaky(repo_info['name'].replace('/', '-'))
+                for repo_info in self.demo_repositories[:max_repos]
+            }
+        if self.failure_index:
+            ingestion_results['failure_clusters'] = self.failure_index.top_clusters(10)
+        
         self._print_ingestion_summary(ingestion_results)
         self._save_ingestion_results(ingestion_results)
         
         return ingestion_results
     
+    def _ingest_within_budget(self, repositories: List[Dict[str, Any]], max_runs_per_repo: int, deadline: Deadline,
+                              checkpoint_file: Path, ingestion_results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ingest as much value as fits before the deadline.
+        
+        Runs left in the checkpoint by the previous window are merged with freshly
+        listed ones, and all are processed failed first, newest first. When a run's
+        artifacts do not fit the remaining time the smallest ones go first and the
+        rest are deferred. At the deadline no new stage starts, artifacts not yet
+        started are cancelled, and everything left over is written to the checkpoint.
+        Artifacts that raised, and runs that raised, are kept pending too (up to
+        MAX_RUN_ATTEMPTS windows with errors). Requests park for a rate limit reset
+        only while time is left; when none frees up in time, the window ends early
+        and its remaining runs stay pending without using up an attempt.
+        
+        Returns:
+            Coverage report (covered versus pending)
+        """
+        checkpoint = IngestionCheckpoint.load(checkpoint_file)
+        coverage = CoverageReport(deadline)
+        done_keys = set(checkpoint.done)
+        work = {run_key(item['repo'], item['run']): item for item in checkpoint.pending}
+        if work:
+            print(f"♻️  Resuming {len(work)} run(s) left from the previous window")
+        
+        # Stage 1: list recent runs (parking for a rate limit reset only while time is left)
+        exhausted: Optional[RateLimitExhausted] = None
+        for repo_info in repositories:
+            if deadline.expired() or exhausted:
+                coverage.repositories['pending'] += 1
+                continue
+            try:
+                with self.profiler.stage('repository', repo_info['name']):
+                    runs = self._get_github_workflow_runs(repo_info['name'], max_runs_per_repo,
+                                                          max_park=deadline.remaining())
+            except RateLimitExhausted as e:
+                exhausted = e
+                coverage.repositories['pending'] += 1
+                continue
+            coverage.repositories['listed'] += 1
+            ingestion_results['repositories_processed'] += 1
+            for run in runs:
+                key = run_key(repo_info['name'], run)
+                if key not in done_keys and key not in work:
+                    work[key] = {'repo': repo_info['name'], 'run': run}
+        
+        # Stage 2: process runs by value
+        totals = {'runs_processed': 0, 'artifacts_processed': 0, 'test_cases_parsed': 0,
+                  'frameworks_found': ingestion_results['frameworks_found']}
+        ordered = order_runs(list(work.values()))
+        pending = []
+        for index, item in enumerate(ordered):
+            if deadline.expired() or exhausted:
+                for left in ordered[index:]:
+                    coverage.run_pending(left['run'], left.get('artifacts'))
+                pending.extend(ordered[index:])
+                break
+            repo_info, run = self._repo_info(item['repo']), item['run']
+            log = self.log.bind(repo=item['repo'])
+            log.info('run.start', f"      🏃 Processing run: {run['name']} ({run['conclusion']}) "
+                     f"- {deadline.remaining():.0f}s left", run_id=run['id'], conclusion=run['conclusion'])
+            
+            errored: List[Dict[str, Any]] = []
+            try:
+                with self.profiler.stage('repository', item['repo']):
+                    artifacts = item.get('artifacts')
+                    if artifacts is None:
+                        artifacts = [a for a in self._get_github_artifacts(item['repo'], run['id'],
+                                                                           max_park=deadline.remaining())
+                                     if self._is_test_artifact(a['name'])]
+                    selected, deferred = fit_artifacts(artifacts, deadline.remaining(), self.throughput_model,
+                                                       self.artifact_workers)
+                    plan = plan_artifacts(selected, self.artifact_workers, self.streaming_threshold,
+                                          self.throughput_model, smallest_first=bool(deferred))
+                    if deferred:
+                        log.info('artifacts.deferred', f"         ⏳ Short on time - smallest first, deferring {len(deferred)} artifact(s)",
+                                 run_id=run['id'], deferred=[a['name'] for a in deferred])
+                    if len(plan) or plan.expired:
+                        errored = self._execute_artifact_plan(repo_info, run, plan, totals, deadline)
+            except RateLimitExhausted as e:
+                # Not the run's fault: it stays pending without using up an attempt, as do the runs after it
+                exhausted = e
+                coverage.run_pending(run, item.get('artifacts'))
+                pending.append(item)
+                continue
+            except Exception as e:
+                ingestion_results['errors'].append(f"Run {item['repo']}#{run['id']}: {str(e)}")
+                log.error('run.error', f"         ❌ Run processing error: {str(e)}", run_id=run['id'], error=str(e))
+                # Keep the run (and any artifacts resumed with it) for the next window
+                attempts = item.get('attempts', 0) + 1
+                if attempts < MAX_RUN_ATTEMPTS:
+                    coverage.run_pending(run, item.get('artifacts'))
+                    pending.append({**item, 'attempts': attempts})
+                else:
+                    log.warning('run.given_up', f"         ⚠️  Giving up on the run after {attempts} attempts", run_id=run['id'])
+                    checkpoint.mark_done(run_key(item['repo'], run))
+                continue
+            
+            attempts = item.get('attempts', 0) + bool(errored)
+            if errored and attempts >= MAX_RUN_ATTEMPTS:
+                log.warning('artifacts.given_up', f"         ⚠️  Giving up on {len(errored)} artifact(s) after {attempts} attempts",
+                            run_id=run['id'], artifacts=[a['name'] for a in errored])
+                errored = []
+            left = plan.cancelled + deferred + errored
+            coverage.run_finished(run, [a for a in plan.pooled + plan.streaming if a not in left], left)
+            if left:
+                pending.append({'repo': item['repo'], 'run': run, 'artifacts': left, 'attempts': attempts})
+            else:
+                checkpoint.mark_done(run_key(item['repo'], run))
+            if artifacts:
+                totals['runs_processed'] += 1
+                self.metrics.inc('runs_processed_total', component='ingestion')
+        
+        if exhausted:
+            ingestion_results['errors'].append(str(exhausted))
+            self.log.error('github.exhausted', f"   ❌ {str(exhausted)} - the rest is left for the next window",
+                           retry_at=exhausted.retry_at)
+        coverage.deadline_hit = deadline.expired() or bool(pending) or coverage.repositories['pending'] > 0
+        checkpoint.pending = pending
+        checkpoint.save()
+        
+        ingestion_results['workflow_runs_processed'] += totals['runs_processed']
+        ingestion_results['artifacts_downloaded'] += totals['artifacts_processed']
+        ingestion_results['test_cases_ingested'] += totals['test_cases_parsed']
+        report = coverage.report()
+        report['checkpoint'] = str(checkpoint_file)
+        self.log.info('budget.done', f"\n⏰ Time budget: {report['elapsed']:.0f}s of {deadline.seconds:.0f}s, "
+                      f"{report['runs']['done']} run(s) covered, {len(pending)} pending",
+                      **{k: v for k, v in report.items() if not isinstance(v, dict)})
+        return report
+    
+    def ingest_jenkins(self, max_jobs: Optional[int] = None, builds_per_job: int = 5,
+                       max_workers: int = 8) -> Dict[str, Any]:
+        """
+        Ingest test reports from the configured Jenkins server.
+        
+        Builds are traversed and downloaded concurrently; reports are parsed as
+        they arrive, through the same pipeline as GitHub artifacts.
+        
+        Args:
+            max_jobs: Maximum number of jobs to process (all when None)
+            builds_per_job: Most recent completed builds per job
+            max_workers: Concurrent Jenkins API calls / downloads
+            
+        Returns:
+            Dict containing ingestion results and statistics
+        """
+        if not self.jenkins_url:
+            raise ValueError("jenkins_url is required for Jenkins ingestion")
+        
+        print("🔄 Jenkins Test Result Ingestion")
+        print("=" * 50)
+        print(f"📊 Target: {self.jenkins_url} ({max_jobs or 'all'} jobs, {builds_per_job} builds each)")
+        
+        from jenkins_connector import JenkinsConnector  # loaded only for Jenkins ingestion
+        connector = JenkinsConnector(self.jenkins_url, auth=self.jenkins_auth, max_workers=max_workers)
+        results = self._ingest_report_stream('jenkins', connector.iter_reports(max_jobs, builds_per_job),
+                                             Path('jenkins-ingestion-results.json'))
+        results['errors'].extend(f'jenkins: {error}' for error in connector.errors)
+        results['jenkins_requests'] = dict(connector.stats)
+        if connector.errors:
+            print(f"⚠️  Jenkins: {connector.stats['jobs_failed']} job(s) and {connector.stats['builds_failed']} "
+                  f"build(s) skipped after errors (first: {connector.errors[0]})")
+        return results
+    
+    def ingest_gitlab(self, projects: List[str], pipelines_per_project: int = 20, max_workers: int = 8,
+                      state_file: Path = Path('gitlab-ingestion-state.json')) -> Dict[str, Any]:
+        """
+        Ingest test reports from GitLab CI pipelines.
+        
+        Pipelines whose test report summary is unchanged since the last ingestion
+        (tracked in state_file) are skipped before any artifact is downloaded.
+        
+        Args:
+            projects: GitLab project paths ('group/project') or ids
+            pipelines_per_project: Most recently updated pipelines to consider per project
+            max_workers: Concurrent GitLab API calls / downloads
+            state_file: JSON file holding fingerprints of already ingested pipelines
+            
+        Returns:
+            Dict containing ingestion results and statistics
+        """
+        print("🔄 GitLab CI Test Result Ingestion")
+        print("=" * 50)
+        print(f"📊 Target: {self.gitlab_url} ({len(projects)} projects, {pipelines_per_project} pipelines each)")
+        
+        from gitlab_connector import GitLabConnector  # loaded only for GitLab ingestion
+        known = json.loads(state_file.read_text()) if state_file.exists() else {}
+        connector = GitLabConnector(self.gitlab_url, token=self.gitlab_token, max_workers=max_workers,
+                                    max_report_bytes=self.max_report_bytes)
+        results = self._ingest_report_stream('gitlab', connector.iter_reports(projects, pipelines_per_project, known),
+                                             Path('gitlab-ingestion-results.json'))
+        state_file.write_text(json.dumps(known))
+        results['errors'].extend(f'gitlab: {error}' for error in connector.errors)
+        results['gitlab_requests'] = dict(connector.stats)
+        print(f"⏭️  Unchanged or test-less pipelines skipped: {connector.stats['pipelines_skipped']}")
+        if connector.errors:
+            print(f"⚠️  GitLab: {connector.stats['projects_failed']} project(s), {connector.stats['pipelines_failed']} "
+                  f"pipeline(s) and {connector.stats['reports_too_large']} oversized report(s) skipped "
+                  f"(first: {connector.errors[0]})")
+        return results
+    
+    def _ingest_report_stream(self, source: str, reports: Iterable[Tuple[Dict[str, Any], str, Any]],
+                              output_file: Path) -> Dict[str, Any]:
+        """Parse (run, artifact name, report) items from a connector as they arrive."""
+        if self.results_sink is None:
+            self.results_sink = ResultsSink(DEFAULT_RESULTS_LOG)
+        
+        ingestion_results = {
+            'repositories_processed': 0,
+            'workflow_runs_processed': 0,
+            'artifacts_downloaded': 0,
+            'test_cases_ingested': 0,
+            'frameworks_found': set(),
+            'errors': [],
+            'processing_time': 0
+        }
+        projects_seen = set()
+        runs_seen = set()
+        
+        start_time = time.time()
+        try:
+            with self.metrics.span(source, component='ingestion'):
+                for run, artifact_name, data in reports:
+                    log = self.log.bind(repo=run['name'], run_id=run['id'])
+                    self.metrics.inc('bytes_downloaded_total', len(data), component='ingestion')
+                    projects_seen.add(run['name'])
+                    runs_seen.add((run['name'], run['id']))
+                    
+                    with self.profiler.stage('repository', run['name']):
+                        parse_result = self._parse_test_data(data, artifact_name, run['name'], run)
+                    self.results_sink.write(parse_result)
+                    
+                    if parse_result['success']:
+                        ingestion_results['artifacts_downloaded'] += 1
+                        ingestion_results['test_cases_ingested'] += parse_result['test_count']
+                        ingestion_results['frameworks_found'].add(parse_result['framework'])
+                        log.info('artifact.parsed', f"   ✅ {run['name']} #{run['id']} {artifact_name}: {parse_result['test_count']} tests ({parse_result['framework']})",
+                                 artifact=artifact_name, tests=parse_result['test_count'], framework=parse_result['framework'])
+                    else:
+                        log.error('artifact.parse_failed', f"   ❌ {run['name']} #{run['id']} {artifact_name}: {parse_result['error']}",
+                                  artifact=artifact_name, error=parse_result['error'])
+                    self.log.progress(len(runs_seen), runs=len(runs_seen), artifacts=ingestion_results['artifacts_downloaded'],
+                                      tests=ingestion_results['test_cases_ingested'])
+        except (requests.RequestException, KeyError, ValueError) as e:
+            # Raised by the connector's listing (an API error or a malformed payload): keep what was ingested
+            ingestion_results['errors'].append(f"{source}: {type(e).__name__}: {e}")
+            self.log.error(f'{source}.error', f"   ❌ {source} API error: {type(e).__name__}: {e}", error=str(e))
+        
+        self.log.flush()
+        self.results_sink.flush()
+        ingestion_results['repositories_processed'] = len(projects_seen)
+        ingestion_results['workflow_runs_processed'] = len(runs_seen)
+        ingestion_results['parse_summary'] = self.results_sink.summary()
+        ingestion_results['tenant_scheduling'] = self.scheduler.stats()
+        ingestion_results['processing_time'] = time.time() - start_time
+        ingestion_results['frameworks_found'] = list(ingestion_results['frameworks_found'])
+        
+        if self.flaky_scorer:
+            ingestion_results['flaky_tests'] = {name: self.flaky_scorer.top_flaky(name.replace('/', '-')) for name in sorted(projects_seen)}
+        if self.failure_index:
+            ingestion_results['failure_clusters'] = self.failure_index.top_clusters(10)
+        
+        self._print_ingestion_summary(ingestion_results)
+        self._save_ingestion_results(ingestion_results, output_file)
+        
+        return ingestion_results
+    
+    def poll_repositories(self, scheduler: PollScheduler, repositories: Optional[List[str]] = None,
+                          max_runs_per_repo: int = 10, state_file: Optional[Path] = None,
+                          stop_event: Optional[Any] = None, max_polls: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Continuously poll repositories at the cadence each has shown (see poll_scheduler).
+        
+        Each due repository's recent runs are listed and only runs not ingested
+        before (by id) are ingested; runs whose ingestion fails are retried on the
+        next poll. The poll outcome and the API requests it spent then set the
+        repository's next due time.
+        
+        Args:
+            scheduler: PollScheduler holding per-repository cadences and the request budget
+            repositories: Repositories to track (the demo repositories when omitted)
+            max_runs_per_repo: Runs listed per poll
+            state_file: JSON file the scheduler state is saved to after every round
+            stop_event: threading.Event that ends the loop when set (runs until interrupted otherwise)
+            max_polls: Stop after this many polls
+            
+        Returns:
+            Dict containing ingestion and polling statistics
+        """
+        if self.results_sink is None:
+            self.results_sink = ResultsSink(DEFAULT_RESULTS_LOG)
+        
+        scheduler.add(repositories or [repo_info['name'] for repo_info in self.demo_repositories])
+        totals = {'runs_processed': 0, 'artifacts_processed': 0, 'test_cases_parsed': 0, 'frameworks_found': set()}
+        polls = 0
+        print(f"🔭 Polling {len(scheduler.repos)} repositories adaptively "
+              f"(budget {scheduler.requests_per_hour:.0f} requests/hour)")
+        
+        try:
+            while (stop_event is None or not stop_event.is_set()) and (max_polls is None or polls < max_polls):
+                due = scheduler.due()
+                if not due:
+                    wakeup = min(scheduler.next_wakeup(), 60.0)
+                    if stop_event is not None:
+                        stop_event.wait(wakeup)
+                    else:
+                        time.sleep(wakeup)
+                    continue
+                
+                for repo_name in due[:max_polls - polls if max_polls is not None else None]:
+                    requests_before = self.github.stats['requests']
+                    try:
+                        runs = self._get_github_workflow_runs(repo_name, max_runs_per_repo)
+                    except RateLimitExhausted as e:
+                        # Polls resume after the reset; repositories stay due until then
+                        self.log.warning('github.exhausted', f"   ⏸️  {str(e)}", retry_at=e.retry_at)
+                        if stop_event is not None:
+                            stop_event.wait(max(0.0, e.retry_at - time.time()))
+                        else:
+                            time.sleep(max(0.0, e.retry_at - time.time()))
+                        break
+                    run_times = {run['id']: parse_date(run['created_at']).timestamp() if run.get('created_at') else None
+                                 for run in runs}
+                    unseen = set(scheduler.unseen_runs(repo_name, run_times))
+                    new_runs = [run for run in runs if run['id'] in unseen]
+                    
+                    repo_info = self._repo_info(repo_name)
+                    ingested = []
+                    for run in new_runs:
+                        try:
+                            with self.profiler.stage('repository', repo_name):
+                                self._ingest_github_run(repo_info, run, totals)
+                            ingested.append(run['id'])
+                        except Exception as e:
+                            # Not marked ingested: the run is retried on the next poll
+                            self.log.error('run.error', f"   ❌ Run processing error: {str(e)}",
+                                           repo=repo_name, run_id=run['id'], error=str(e))
+                    
+                    scheduler.mark_ingested(repo_name, ingested)
+                    scheduler.observe_runs(repo_name, (run_times[run_id] for run_id in ingested if run_times[run_id] is not None))
+                    scheduler.record_poll(repo_name, len(ingested), max(1, self.github.stats['requests'] - requests_before))
+                    polls += 1
+                    self.log.info('poll.done', f"   🔭 {repo_name}: {len(new_runs)} new run(s), next poll in "
+                                  f"{scheduler.repos[repo_name]['next_due'] - time.time():.0f}s",
+                                  repo=repo_name, new_runs=len(new_runs), interval=scheduler.repos[repo_name]['interval'])
+                
+                if state_file is not None:
+                    scheduler.save(state_file)
+                self.log.progress(polls, runs=totals['runs_processed'], tests=totals['test_cases_parsed'])
+        except KeyboardInterrupt:
+            print("\n⏹️  Polling stopped")
+        
+        if state_file is not None:
+            scheduler.save(state_file)
+        self.log.flush()
+        self.results_sink.flush()
+        return {**totals, 'frameworks_found': sorted(totals['frameworks_found']), 'polling': scheduler.summary()}
+    
+    def serve_webhooks(self, receiver: 'WebhookReceiver', reconcile_interval: float = 900.0,
+                       max_runs_per_repo: int = 5, stop_event: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Ingest runs pushed by the webhook receiver as they arrive.
+        
+        Every reconcile_interval seconds the demo repositories are polled once and
+        any completed run the webhooks missed is queued (duplicates are dropped by
+        the receiver), so polling only acts as a fallback.
+        
+        Args:
+            receiver: Started WebhookReceiver whose queue is consumed
+            reconcile_interval: Seconds between reconciliation polls (0 disables them)
+            max_runs_per_repo: Recent runs checked per repository when reconciling
+            stop_event: threading.Event that ends the loop when set (runs until interrupted otherwise)
+            
+        Returns:
+            Dict containing ingestion statistics
+        """
+        if self.results_sink is None:
+            self.results_sink = ResultsSink(DEFAULT_RESULTS_LOG)
+        
+        print(f"📡 Listening for workflow_run webhooks on port {receiver.port}")
+        totals = {
+            'runs_processed': 0,
+            'artifacts_processed': 0,
+            'test_cases_parsed': 0,
+            'frameworks_found': set()
+        }
+        events = 0
+        next_reconcile = time.monotonic() + reconcile_interval
+        
+        try:
+            while stop_event is None or not stop_event.is_set():
+                if reconcile_interval and time.monotonic() >= next_reconcile:
+                    queued = self._reconcile_runs(receiver, max_runs_per_repo)
+                    self.log.info('webhook.reconciled', f"   🔁 Reconciliation poll queued {queued} missed run(s)", queued=queued)
+                    next_reconcile = time.monotonic() + reconcile_interval
+                
+                try:
+                    job = receiver.queue.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                
+                log = self.log.bind(repo=job['repo'], run_id=job['run']['id'], source=job['source'])
+                log.info('webhook.run', f"   🏃 {job['repo']}: {job['run'].get('name')} ({job['run'].get('conclusion')}) via {job['source']}")
+                try:
+                    with self.metrics.span('webhook_run', component='ingestion'), self.profiler.stage('repository', job['repo']):
+                        self._ingest_github_run(self._repo_info(job['repo']), job['run'], totals)
+                except Exception as e:
+                    # Forget the run so a redelivery or the next reconciliation poll retries it
+                    receiver.seen.discard(receiver.run_key(job['repo'], job['run']), job.get('delivery_key'))
+                    log.error('webhook.error', f"   ❌ Run processing error: {str(e)}", error=str(e))
+                finally:
+                    receiver.queue.task_done()
+                
+                events += 1
+                self.log.progress(events, runs=totals['runs_processed'], artifacts=totals['artifacts_processed'],
+                                  tests=totals['test_cases_parsed'], queued=receiver.queue.qsize())
+        except KeyboardInterrupt:
+            print("\n⏹️  Webhook ingestion stopped")
+        
+        self.log.flush()
+        self.results_sink.flush()
+        return {**totals, 'frameworks_found': list(totals['frameworks_found']), 'events': events,
+                'receiver': dict(receiver.stats)}
+
+    def serve_uploads(self, service: 'UploadService') -> Dict[str, Any]:
+        """
+        Ingest reports pushed by CI agents to an UploadService (built with
+        process=self.ingest_upload) until interrupted.
+
+        Returns:
+            The service's upload counters
+        """
+        if self.results_sink is None:
+            self.results_sink = ResultsSink(DEFAULT_RESULTS_LOG)
+
+        print(f"📤 Accepting report uploads on port {service.port} (POST /uploads?project=owner/name)")
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            print("\n⏹️  Upload ingestion stopped")
+        service.stop()
+
+        self.log.flush()
+        self.results_sink.flush()
+        return service.status()
+
+    def ingest_upload(self, report: bytes, upload: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse and store one uploaded report (called on the UploadService's worker threads)."""
+        log = self.log.bind(repo=upload['project'], upload_id=upload['upload_id'])
+        self.metrics.inc('bytes_downloaded_total', len(report), component='uploads')
+        parse_result = self._parse_test_data(report, upload['artifact'], upload['project'], upload['run'])
+        # The sink is not thread-safe; uploads are parsed on several workers
+        with self._track_lock:
+            self.results_sink.write(parse_result)
+
+        if parse_result['success']:
+            log.info('upload.parsed', f"   ✅ {upload['project']} {upload['artifact']}: {parse_result['test_count']} tests ({parse_result['framework']})",
+                     artifact=upload['artifact'], tests=parse_result['test_count'], framework=parse_result['framework'])
+        else:
+            log.error('upload.parse_failed', f"   ❌ {upload['project']} {upload['artifact']}: {parse_result['error']}",
+                      artifact=upload['artifact'], error=parse_result['error'])
+        return parse_result
+
+    def backfill_repository(self, repo_name: str, since: datetime, until: Optional[datetime] = None,
+                            slice_days: float = 7, work_queue: Optional[Any] = None, max_workers: int = 8,
+                            checkpoint_file: Path = Path('github-backfill-checkpoint.json')) -> Dict[str, Any]:
+        """
+        Ingest a repository's workflow run history from since to until (now by default).
+        
+        History is listed in created-date slices paginated in parallel (see
+        github_backfill). Each slice's runs are ingested inline, or queued as 'run'
+        jobs of the low-priority backfill tenant when a work queue is given, so
+        worker processes share the load and interactive ingestion keeps precedence.
+        A slice is checkpointed once its runs are ingested (or queued); rerunning
+        the same backfill resumes after the last finished slice.
+        
+        Args:
+            repo_name: owner/name
+            since: Oldest run creation time to ingest
+            until: Newest run creation time to ingest
+            slice_days: Width of each created-date slice
+            work_queue: WorkQueue/RemoteWorkQueue to fan the runs out to
+            max_workers: Concurrent listing requests
+            checkpoint_file: JSON file recording finished slices
+            
+        Returns:
+            Dict containing backfill statistics
+        """
+        if self.results_sink is None:
+            self.results_sink = ResultsSink(DEFAULT_RESULTS_LOG)
+        
+        log = self.log.bind(repo=repo_name)
+        checkpoint = BackfillCheckpoint(checkpoint_file)
+        backfill = GitHubBackfill(repo_name, token_pool=self.github, max_workers=max_workers, base_url=self.github_api,
+                                  requests_per_hour=DEFAULT_REQUESTS_PER_HOUR * len(self.github))
+        repo_info = self._repo_info(repo_name)
+        totals = {'runs_processed': 0, 'artifacts_processed': 0, 'test_cases_parsed': 0, 'frameworks_found': set()}
+        slices_done = runs_seen = runs_queued = 0
+        start_time = time.time()
+        
+        print(f"⏪ Backfilling {repo_name} from {since:%Y-%m-%d} in {slice_days:g}-day slices")
+        for key, runs in backfill.iter_slices(since, until, slice_days, checkpoint):
+            with self.metrics.span('backfill_slice', component='ingestion'), self.profiler.stage('backfill_slice', repo_name):
+                if work_queue is not None:
+                    queued = work_queue.enqueue_many(
+                        {'kind': 'run', 'tenant': BACKFILL_TENANT_ID, 'priority': -1,
+                         'payload': {'repo': repo_name, 'run': run},
+                         'dedupe_key': f"run:{repo_name}:{run['id']}:{run.get('run_attempt', 1)}"}
+                        for run in runs
+                    )
+                    runs_queued += sum(1 for job_id in queued if job_id is not None)
+                else:
+                    for run in runs:
+                        try:
+                            self._ingest_github_run(repo_info, run, totals)
+                        except RateLimitExhausted:
+                            raise  # the slice stays unfinished and is listed again on resume
+                        except Exception as e:
+                            log.error('run.error', f"   ❌ Run processing error: {str(e)}", run_id=run['id'], error=str(e))
+            checkpoint.mark(repo_name, key, len(runs))
+            slices_done += 1
+            runs_seen += len(runs)
+            log.info('backfill.slice', f"   🧱 {key}: {len(runs)} runs", slice=key, runs=len(runs))
+            self.log.progress(slices_done, runs=runs_seen, queued=runs_queued, tests=totals['test_cases_parsed'])
+        
+        if backfill.truncated:
+            log.warning('backfill.truncated', f"   ⚠️  {backfill.stats['runs_truncated']} runs not listed: "
+                        f"{len(backfill.truncated)} slice(s) exceed {MAX_RESULTS_PER_QUERY} runs in under {MIN_SLICE}",
+                        slices=backfill.truncated, runs=backfill.stats['runs_truncated'])
+        self.log.flush()
+        self.results_sink.flush()
+        results = {
+            'repository': repo_name,
+            'slices_completed': slices_done,
+            'runs_listed': runs_seen,
+            'runs_queued': runs_queued,
+            'runs_processed': totals['runs_processed'],
+            'artifacts_processed': totals['artifacts_processed'],
+            'test_cases_parsed': totals['test_cases_parsed'],
+            'frameworks_found': sorted(totals['frameworks_found']),
+            'listing': dict(backfill.stats),
+            'processing_time': time.time() - start_time
+        }
+        print(f"⏪ Backfill finished: {slices_done} slices, {runs_seen} runs listed "
+              f"({backfill.stats['requests']} API requests) in {results['processing_time']:.1f}s")
+        return results
+    
+    def _reconcile_runs(self, receiver: 'WebhookReceiver', max_runs_per_repo: int) -> int:
+        """Poll the demo repositories once and queue completed runs not seen via webhooks."""
+        queued = 0
+        for repo_info in self.demo_repositories:
+            for run in self._get_github_workflow_runs(repo_info['name'], max_runs_per_repo):
+                if receiver.offer(repo_info['name'], run, source='poll') == 'accepted':
+                    queued += 1
+        return queued
+    
+    def _repo_info(self, repo_name: str) -> Dict[str, Any]:
+        """Configured repository entry, or a default one for repositories only seen via webhooks."""
+        for repo_info in self.demo_repositories:
+            if repo_info['name'] == repo_name:
+                return repo_info
+        return {'name': repo_name, 'type': 'github', 'framework': 'junit', 'description': '', 'artifact_patterns': []}
+    
+    def enqueue_repositories(self, work_queue: Any, max_runs_per_repo: int = 5) -> int:
+        """Seed a work queue with one 'repo' job per demo repository (see queue_handlers)."""
+        jobs = [{'kind': 'repo', 'tenant': TENANT_ID, 'payload': {'repo': repo_info['name'], 'max_runs': max_runs_per_repo}}
+                for repo_info in self.demo_repositories]
+        return sum(1 for job_id in work_queue.enqueue_many(jobs) if job_id is not None)
+    
+    def queue_handlers(self, work_queue: Any) -> Dict[str, Callable[[Dict[str, Any]], None]]:
+        """
+        Job handlers for queue-driven ingestion.
+        
+        'repo' jobs list recent runs and fan out 'run' jobs, 'run' jobs list test
+        artifacts and fan out 'artifact' jobs, and 'artifact' jobs download and parse
+        one report. 'backfill' jobs list a repository's history slice by slice and
+        fan out its runs. Run and artifact jobs carry dedupe keys, so reseeding a repository
+        never ingests the same artifact twice, and a failing artifact only retries
+        itself. Exceptions propagate so the queue can retry or dead-letter the job.
+        """
+        totals = {'runs_processed': 0, 'artifacts_processed': 0, 'test_cases_parsed': 0, 'frameworks_found': set()}
+        
+        def repo_job(job: Dict[str, Any]):
+            repo_name = job['payload']['repo']
+            runs = self._get_github_workflow_runs(repo_name, job['payload'].get('max_runs', 5))
+            queued = work_queue.enqueue_many(
+                {'kind': 'run', 'tenant': job.get('tenant', TENANT_ID), 'payload': {'repo': repo_name, 'run': run},
+                 'dedupe_key': f"run:{repo_name}:{run['id']}:{run.get('run_attempt', 1)}"}
+                for run in runs
+            )
+            self.log.info('queue.runs', f"   📋 {repo_name}: queued {sum(1 for q in queued if q)} of {len(runs)} runs",
+                          repo=repo_name, runs=len(runs))
+        
+        def run_job(job: Dict[str, Any]):
+            repo_name, run = job['payload']['repo'], job['payload']['run']
+            artifacts = [a for a in self._get_github_artifacts(repo_name, run['id']) if self._is_test_artifact(a['name'])]
+            work_queue.enqueue_many(
+                {'kind': 'artifact', 'tenant': job.get('tenant', TENANT_ID), 'priority': job.get('priority', 0), 'payload': {'repo': repo_name, 'run': run, 'artifact': artifact},
+                 'dedupe_key': f"artifact:{repo_name}:{artifact.get('id') or (run['id'], artifact['name'])}"}
+                for artifact in artifacts
+            )
+            totals['runs_processed'] += 1
+            self.metrics.inc('runs_processed_total', component='ingestion')
+        
+        def artifact_job(job: Dict[str, Any]):
+            payload = job['payload']
+            with self.profiler.stage('repository', payload['repo']):
+                self._ingest_github_artifact(self._repo_info(payload['repo']), payload['run'], payload['artifact'], totals)
+            self.log.progress(totals['artifacts_processed'], tests=totals['test_cases_parsed'])
+        
+        def backfill_job(job: Dict[str, Any]):
+            # Stays leased while listing, so idle workers keep waiting for the runs it queues
+            payload = job['payload']
+            self.backfill_repository(payload['repo'], parse_date(payload['since']),
+                                     parse_date(payload['until']) if payload.get('until') else None,
+                                     payload.get('slice_days', 7), work_queue=work_queue)
+        
+        return {'repo': repo_job, 'run': run_job, 'artifact': artifact_job, 'backfill': backfill_job}
+    
+    @timed('repository', component='ingestion')
     def _ingest_github_repository(self, repo_info: Dict[str, Any], max_runs: int) -> Dict[str, Any]:
         """Ingest test data from a GitHub repository."""
         repo_name = repo_info['name']
+        log = self.log.bind(repo=repo_name)
         
         # Get recent workflow runs
         workflow_runs = self._get_github_workflow_runs(repo_name, max_runs)
         
         if not workflow_runs:
-            print(f"      ⚠️  No workflow runs found")
-            return {'runs_processed': 0, 'artifacts_processed': 0, 'test_cases_parsed': 0, 'frameworks_found': set(), 'parse_results': []}
+            log.warning('runs.none', f"      ⚠️  No workflow runs found")
+            return {'runs_processed': 0, 'artifacts_processed': 0, 'test_cases_parsed': 0, 'frameworks_found': set()}
         
-        print(f"      📋 Found {len(workflow_runs)} recent workflow runs")
+        log.info('runs.found', f"      📋 Found {len(workflow_runs)} recent workflow runs", count=len(workflow_runs))
         
         repo_results = {
             'runs_processed': 0,
             'artifacts_processed': 0, 
             'test_cases_parsed': 0,
-            'frameworks_found': set(),
-            'parse_results': []
+            'frameworks_found': set()
         }
         
         for run in workflow_runs:
-            print(f"      🏃 Processing run: {run['name']} ({run['conclusion']})")
+            log.info('run.start', f"      🏃 Processing run: {run['name']} ({run['conclusion']})",
+                     run_id=run['id'], conclusion=run['conclusion'])
             
             try:
-                # Get artifacts for this run
-                artifacts = self._get_github_artifacts(repo_name, run['id'])
-                
-                if not artifacts:
-                    print(f"         📁 No artifacts found")
+                if not self._ingest_github_run(repo_info, run, repo_results):
                     continue
                 
-                # Filter for test artifacts
-                test_artifacts = [a for a in artifacts if self._is_test_artifact(a['name'])]
-                
-                if not test_artifacts:
-                    print(f"         📁 No test artifacts found in {len(artifacts)} artifacts")
-                    continue
-                
-                print(f"         📁 Found {len(test_artifacts)} test artifacts: {[a['name'] for a in test_artifacts]}")
-                
-                # Process each test artifact
-                for artifact in test_artifacts:
-                    try:
-                        # Simulate artifact download and parsing
-                        # (Real GitHub artifact download requires complex authentication)
-                        test_data = self._simulate_artifact_data(repo_info['framework'], artifact['name'])
-                        
-                        if test_data:
-                            parse_result = self._parse_test_data(test_data, artifact['name'], repo_name)
-                            
-                            if parse_result['success']:
-                                repo_results['artifacts_processed'] += 1
-                                repo_results['test_cases_parsed'] += parse_result['test_count']
-                                repo_results['frameworks_found'].add(parse_result['framework'])
-                                repo_results['parse_results'].append(parse_result)
-                                
-                                print(f"            ✅ Parsed {parse_result['test_count']} tests ({parse_result['framework']})")
-                            else:
-                                print(f"            ❌ Parse failed: {parse_result['error']}")
-                    
-                    except Exception as e:
-                        print(f"            ❌ Artifact error: {str(e)}")
-                        continue
-                
-                repo_results['runs_processed'] += 1
-                
-                # Rate limiting
-                time.sleep(0.5)
+                # Courtesy delay against the public API (simulators are load tested flat out)
+                if self.github_api == GITHUB_API:
+                    time.sleep(0.5)
                 
+            except RateLimitExhausted:
+                raise
             except Exception as e:
-                print(f"         ❌ Run processing error: {str(e)}")
+                log.error('run.error', f"         ❌ Run processing error: {str(e)}", run_id=run['id'], error=str(e))
                 continue
         
         return repo_results
     
-    def _get_github_workflow_runs(self, repo_name: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """Get recent workflow runs from GitHub."""
-        url = f"https://api.github.com/repos/{repo_name}/actions/runs"
+    def _ingest_github_run(self, repo_info: Dict[str, Any], run: Dict[str, Any], repo_results: Dict[str, Any]) -> bool:
+        """
+        Ingest the test artifacts of one workflow run into repo_results.
+        
+        Returns:
+            True when the run had test artifacts and was processed
+        """
+        repo_name = repo_info['name']
+        log = self.log.bind(repo=repo_name)
+        
+        # Get artifacts for this run
+        artifacts = self._get_github_artifacts(repo_name, run['id'])
+        
+        if not artifacts:
+            log.info('artifacts.none', f"         📁 No artifacts found", run_id=run['id'])
+            return False
+        
+        # Filter for test artifacts
+        test_artifacts = [a for a in artifacts if self._is_test_artifact(a['name'])]
+        
+        if not test_artifacts:
+            log.info('artifacts.no_tests', f"         📁 No test artifacts found in {len(artifacts)} artifacts",
+                     run_id=run['id'], artifacts=len(artifacts))
+            return False
+        
+        log.info('artifacts.found', f"         📁 Found {len(test_artifacts)} test artifacts: {[a['name'] for a in test_artifacts]}",
+                 run_id=run['id'], artifacts=[a['name'] for a in test_artifacts])
+        
+        # Drop expired artifacts, stream huge ones, run the rest largest-first
+        plan = plan_artifacts(test_artifacts, self.artifact_workers, self.streaming_threshold, self.throughput_model)
+        self._execute_artifact_plan(repo_info, run, plan, repo_results)
+        
+        repo_results['runs_processed'] += 1
+        self.metrics.inc('runs_processed_total', component='ingestion')
+        return True
+    
+    def _execute_artifact_plan(self, repo_info: Dict[str, Any], run: Dict[str, Any], plan: Any,
+                               repo_results: Dict[str, Any], deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        """
+        Run an artifact plan and record its results. Artifacts not started by the deadline, or expected
+        to finish after it, end up in plan.cancelled; downloads park for a rate limit only while time is left.
+        
+        Returns:
+            Artifacts whose download or processing raised
+        """
+        repo_name = repo_info['name']
+        errored = []
+        log = self.log.bind(repo=repo_name)
+        if plan.expired:
+            log.info('artifacts.expired', f"         ⌛ Skipping {len(plan.expired)} expired artifact(s)",
+                     run_id=run['id'], expired=[a['name'] for a in plan.expired])
+        
+        process = lambda a, streaming: self._process_github_artifact(repo_info, run, a, streaming, deadline)
+        for artifact, parse_result, error in execute(plan, process, self.throughput_model,
+                                                     deadline.at if deadline else None):
+            if error is not None:
+                errored.append(artifact)
+                self.results_sink.write({'success': False, 'error': str(error), 'parse_time': 0.0,
+                                         'artifact_name': artifact['name'], 'repo_name': repo_name})
+                log.error('artifact.error', f"            ❌ Artifact error: {str(error)}", artifact=artifact['name'], error=str(error))
+            elif parse_result is not None:
+                self._record_artifact_result(repo_name, artifact, parse_result, repo_results)
+        
+        self.schedule_reports.append(plan.report)
+        log.debug('artifacts.schedule', f"         ⏱️  Expected {plan.report['expected_makespan']:.2f}s, took {plan.report['actual_wall']:.2f}s",
+                  run_id=run['id'], **plan.report)
+        return errored
+    
+    def _ingest_github_artifact(self, repo_info: Dict[str, Any], run: Dict[str, Any], artifact: Dict[str, Any],
+                                repo_results: Dict[str, Any]):
+        """Download and parse one test artifact into repo_results (download errors propagate)."""
+        streaming = (artifact.get('size_in_bytes') or 0) >= self.streaming_threshold
+        parse_result = self._process_github_artifact(repo_info, run, artifact, streaming)
+        if parse_result is not None:
+            self._record_artifact_result(repo_info['name'], artifact, parse_result, repo_results)
+    
+    def _process_github_artifact(self, repo_info: Dict[str, Any], run: Dict[str, Any], artifact: Dict[str, Any],
+                                 streaming: bool = False, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """
+        Download and parse one test artifact (thread-safe; results are recorded by the caller).
+        
+        Archives in the streaming lane are spooled to disk instead of being held in
+        memory next to the extracted report.
+        """
+        with ExitStack() as stack:
+            spool_dir = None
+            if streaming and self.download_artifacts:
+                spool_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix='artifact-'))
+            with self.metrics.span('download', component='ingestion', lane='streaming' if streaming else 'pooled'):
+                if self.download_artifacts:
+                    test_data = self._download_github_artifact(artifact, spool_dir, deadline)
+                else:
+                    test_data = self._simulate_artifact_data(repo_info['framework'], artifact['name'])
+            if test_data is not None:
+                self.metrics.inc('bytes_downloaded_total', len(test_data), component='ingestion')
+            
+            if not test_data:
+                return None
+            
+            return self._parse_test_data(test_data, artifact['name'], repo_info['name'], run)
+    
+    def _download_github_artifact(self, artifact: Dict[str, Any], spool_dir: Optional[str] = None,
+                                  deadline: Optional[Deadline] = None) -> Optional[bytes]:
+        """
+        Download an artifact archive and return its (largest) report file.
+        
+        With spool_dir the archive is written there instead of kept in memory. Reports
+        larger than max_report_bytes (declared or actually decompressed) raise ValueError.
+        With a deadline the request parks for a rate limit reset only while time is left
+        (RateLimitExhausted otherwise) and its socket timeout is capped by the time left.
+        """
+        url = artifact.get('archive_download_url')
+        if not url:
+            return None
+        max_park, timeout = None, 120.0
+        if deadline is not None:
+            max_park = deadline.remaining()
+            timeout = min(timeout, max(1.0, max_park))
+        response = self.github.get(url, timeout=timeout, stream=spool_dir is not None, max_park=max_park)
+        response.raise_for_status()
+        if spool_dir is None:
+            archive = io.BytesIO(response.content)
+        else:
+            archive = Path(spool_dir) / 'artifact.zip'
+            with open(archive, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+        with zipfile.ZipFile(archive) as zf:
+            members = [m for m in zf.infolist() if not m.is_dir()]
+            if not members:
+                return None
+            member = max(members, key=lambda m: m.file_size)
+            if member.file_size > self.max_report_bytes:
+                raise ValueError(f"report {member.filename} is {member.file_size} bytes "
+                                 f"(limit {self.max_report_bytes})")
+            with zf.open(member) as source:
+                # The declared size can lie: count what is actually inflated
+                data = io.BytesIO()
+                while chunk := source.read(1024 * 1024):
+                    if data.tell() + len(chunk) > self.max_report_bytes:
+                        raise ValueError(f"report {member.filename} inflates beyond {self.max_report_bytes} bytes")
+                    data.write(chunk)
+            return data.getvalue()
+    
+    def _record_artifact_result(self, repo_name: str, artifact: Dict[str, Any], parse_result: Dict[str, Any],
+                                repo_results: Dict[str, Any]):
+        """Write a parse result to the sink and fold it into repo_results."""
+        log = self.log.bind(repo=repo_name)
+        self.results_sink.write(parse_result)
+        
+        if parse_result['success']:
+            repo_results['artifacts_processed'] += 1
+            repo_results['test_cases_parsed'] += parse_result['test_count']
+            repo_results['frameworks_found'].add(parse_result['framework'])
+            
+            log.info('artifact.parsed', f"            ✅ Parsed {parse_result['test_count']} tests ({parse_result['framework']})",
+                     artifact=artifact['name'], tests=parse_result['test_count'],
+                     framework=parse_result['framework'], parse_time=parse_result['parse_time'])
+            if parse_result.get('slow_tests'):
+                log.warning('artifact.slow_tests', f"            🐢 {len(parse_result['slow_tests'])} test(s) slower than their baseline",
+                            artifact=artifact['name'], slow_tests=len(parse_result['slow_tests']))
+        else:
+            log.error('artifact.parse_failed', f"            ❌ Parse failed: {parse_result['error']}",
+                      artifact=artifact['name'], error=parse_result['error'])
+    
+    @timed('list_runs', component='ingestion')
+    def _get_github_workflow_runs(self, repo_name: str, limit: int = 5,
+                                  max_park: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get recent workflow runs from GitHub (paginated beyond 100).
+        
+        RateLimitExhausted (no token frees up within max_park) propagates rather than
+        ending the listing early.
+        """
+        url = f"{self.github_api}/repos/{repo_name}/actions/runs"
         params = {
-            'per_page': limit,
+            'per_page': min(limit, 100),
             'status': 'completed',
             'event': 'push'  # Focus on push events for more reliable test data
         }
         
+        runs: List[Dict[str, Any]] = []
         try:
-            response = requests.get(url, headers=self.github_headers, params=params, timeout=30)
-            
-            if response.status_code == 403:
-                print(f"         ⚠️  Rate limited - consider adding GitHub token")
-                return []
-            elif response.status_code == 404:
-                print(f"         ⚠️  Repository not found or no actions")
-                return []
-            
-            response.raise_for_status()
-            data = response.json()
-            return data.get('workflow_runs', [])
+            while len(runs) < limit:
+                params['page'] = len(runs) // params['per_page'] + 1
+                # Rate limits are absorbed by the token pool (switch tokens or park until reset)
+                response = self.github.get(url, params=params, timeout=30, max_park=max_park)
+                
+                if response.status_code == 403:
+                    self.log.warning('github.forbidden', f"         ⚠️  Access denied to workflow runs", repo=repo_name)
+                    break
+                elif response.status_code == 404:
+                    self.log.warning('github.not_found', f"         ⚠️  Repository not found or no actions", repo=repo_name)
+                    break
+                
+                response.raise_for_status()
+                page = response.json().get('workflow_runs', [])
+                runs.extend(page)
+                if len(page) < params['per_page']:
+                    break
             
         except requests.RequestException as e:
-            print(f"         ❌ GitHub API error: {str(e)}")
-            return []
+            self.log.error('github.error', f"         ❌ GitHub API error: {str(e)}", repo=repo_name, error=str(e))
+        return runs[:limit]
     
-    def _get_github_artifacts(self, repo_name: str, run_id: int) -> List[Dict[str, Any]]:
-        """Get artifacts for a GitHub workflow run."""
-        url = f"https://api.github.com/repos/{repo_name}/actions/runs/{run_id}/artifacts"
+    @timed('list_artifacts', component='ingestion')
+    def _get_github_artifacts(self, repo_name: str, run_id: int, max_park: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Get artifacts for a GitHub workflow run (RateLimitExhausted propagates)."""
+        url = f"{self.github_api}/repos/{repo_name}/actions/runs/{run_id}/artifacts"
         
         try:
-            response = requests.get(url, headers=self.github_headers, timeout=30)
+            response = self.github.get(url, timeout=30, max_park=max_park)
             response.raise_for_status()
             
             data = response.json()
             return data.get('artifacts', [])
             
         except requests.RequestException as e:
-            print(f"            ❌ Artifacts API error: {str(e)}")
+            self.log.error('github.artifacts_error', f"            ❌ Artifacts API error: {str(e)}",
+                           repo=repo_name, run_id=run_id, error=str(e))
             return []
     
     def _is_test_artifact(self, artifact_name: str) -> bool:
@@ -284,325 +1165,32 @@ class PipelineIngestionSystem:
         Simulate realistic test data based on framework.
         In production, this would download actual artifacts.
         """
-        print(f"            🔄 Simulating {framework} test data for {artifact_name}")
-        
-        if framework == 'junit':
-            return self._generate_realistic_junit_data(artifact_name)
-        elif framework == 'pytest':
-            return self._generate_realistic_pytest_data(artifact_name)
-        elif framework == 'jest':
-            return self._generate_realistic_jest_data(artifact_name)
-        elif framework == 'go-test':
-            return self._generate_realistic_go_data(artifact_name)
-        elif framework == 'xunit':
-            return self._generate_realistic_xunit_data(artifact_name)
-        else:
-            return self._generate_realistic_junit_data(artifact_name)  # Default
-    
-    def _generate_realistic_junit_data(self, artifact_name: str) -> bytes:
-        """Generate realistic JUnit XML data based on artifact name."""
-        # Determine complexity based on artifact name
-        if 'integration' in artifact_name.lower():
-            test_count = 25
-            failure_rate = 0.12  # Integration tests fail more
-        elif 'unit' in artifact_name.lower():
-            test_count = 150
-            failure_rate = 0.05  # Unit tests are more reliable
-        else:
-            test_count = 75
-            failure_rate = 0.08
-        
-        # Generate test cases
-        test_cases = []
-        failures = int(test_count * failure_rate)
-        errors = max(1, int(test_count * 0.02))  # 2% errors
-        
-        for i in range(test_count):
-            test_name = f"test{i:03d}"
-            duration = round(random.uniform(0.01, 3.0), 3)
-            
-            if i < failures:
-                # Failed test
-                test_cases.append(f'''
-        <testcase classname="com.example.TestSuite{i//20}" name="{test_name}" time="{duration}">
-            <failure message="Test assertion failed" type="AssertionError">
-Expected: {random.randint(1, 100)}
-Actual: {random.randint(1, 100)}
-    at com.example.TestSuite{i//20}.{test_name}(TestSuite{i//20}.java:{random.randint(20, 100)})
-            </failure>
-        </testcase>''')
-            elif i < failures + errors:
-                # Error test
-                test_cases.append(f'''
-        <testcase classname="com.example.TestSuite{i//20}" name="{test_name}" time="{duration}">
-            <error message="System error" type="RuntimeException">
-Database connection timeout
-    at com.example.TestSuite{i//20}.{test_name}(TestSuite{i//20}.java:{random.randint(20, 100)})
-            </error>
-        </testcase>''')
-            else:
-                # Passed test
-                test_cases.append(f'''
-        <testcase classname="com.example.TestSuite{i//20}" name="{test_name}" time="{duration}"/>''')
-        
-        total_time = sum(float(tc.split('time="')[1].split('"')[0]) for tc in test_cases if 'time="' in tc)
-        
-        xml_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<testsuites name="Realistic JUnit Tests" tests="{test_count}" failures="{failures}" errors="{errors}" time="{total_time:.3f}">
-    <testsuite name="com.example.RealisticTests" tests="{test_count}" failures="{failures}" errors="{errors}" time="{total_time:.3f}">
-        {''.join(test_cases)}
-    </testsuite>
-</testsuites>'''
-        
-        return xml_content.encode('utf-8')
-    
-    def _generate_realistic_pytest_data(self, artifact_name: str) -> bytes:
-        """Generate realistic Pytest JSON data."""
-        import random
-        
-        # Determine test characteristics
-        if 'api' in artifact_name.lower():
-            test_count = 45
-            failure_rate = 0.08
-        elif 'unit' in artifact_name.lower():
-            test_count = 120
-            failure_rate = 0.04
-        else:
-            test_count = 65
-            failure_rate = 0.06
-        
-        tests = []
-        passed = 0
-        failed = 0
-        skipped = 0
-        
-        for i in range(test_count):
-            outcome = random.choices(
-                ['passed', 'failed', 'skipped'],
-                weights=[1-failure_rate-0.02, failure_rate, 0.02]  # 2% skipped
-            )[0]
-            
-            test = {
-                "nodeid": f"tests/test_module_{i//20}.py::TestClass{i//20}::test_method_{i:03d}",
-                "outcome": outcome,
-                "duration": round(random.uniform(0.001, 2.0), 3)
-            }
-            
-            if outcome == 'failed':
-                test["call"] = {
-                    "outcome": "failed",
-                    "longrepr": f"AssertionError: Test {i} failed - expected {random.randint(1,100)}, got {random.randint(1,100)}"
-                }
-                failed += 1
-            elif outcome == 'passed':
-                test["call"] = {"outcome": "passed"}
-                passed += 1
-            else:
-                test["setup"] = {"longrepr": [f"tests/test_module_{i//20}.py", random.randint(10,50), "Skipped: not implemented"]}
-                skipped += 1
-            
-            tests.append(test)
-        
-        pytest_data = {
-            "created": datetime.now().isoformat(),
-            "duration": sum(t['duration'] for t in tests),
-            "exitcode": 1 if failed > 0 else 0,
-            "environment": {
-                "Python": "3.9.16",
-                "Platform": "Linux-5.4.0-x86_64",
-                "Packages": {"pytest": "7.4.3", "django": "4.2.7"}
-            },
-            "summary": {
-                "total": test_count,
-                "passed": passed,
-                "failed": failed,
-                "skipped": skipped
-            },
-            "tests": tests
-        }
-        
-        return json.dumps(pytest_data, indent=2).encode('utf-8')
-    
-    def _generate_realistic_jest_data(self, artifact_name: str) -> bytes:
-        """Generate realistic Jest JSON data."""
-        import random
-        
-        # Frontend tests typically have different characteristics
-        test_count = 85
-        failure_rate = 0.03  # Frontend tests are usually more stable
-        
-        assertion_results = []
-        passed = 0
-        failed = 0
-        pending = 0
-        
-        for i in range(test_count):
-            status = random.choices(
-                ['passed', 'failed', 'pending'],
-                weights=[1-failure_rate-0.01, failure_rate, 0.01]  # 1% pending
-            )[0]
-            
-            assertion = {
-                "ancestorTitles": [f"ComponentTest{i//15}", f"describe block {i//5}"],
-                "title": f"should handle scenario {i:03d}",
-                "status": status,
-                "duration": random.randint(50, 800)
-            }
-            
-            if status == 'failed':
-                assertion["failureMessages"] = [
-                    f"Error: expect(received).toBe(expected)\n\nExpected: {random.randint(1,100)}\nReceived: {random.randint(1,100)}\n\n  at Object.<anonymous> (/project/src/component.test.js:{random.randint(10,200)}:23)"
-                ]
-                failed += 1
-            elif status == 'passed':
-                passed += 1
-            else:
-                pending += 1
-            
-            assertion_results.append(assertion)
-        
-        jest_data = {
-            "numTotalTests": test_count,
-            "numPassedTests": passed,
-            "numFailedTests": failed,
-            "numPendingTests": pending,
-            "success": failed == 0,
-            "startTime": int(time.time() * 1000) - 45000,
-            "endTime": int(time.time() * 1000),
-            "testResults": [
-                {
-                    "assertionResults": assertion_results,
-                    "name": "/project/src/components/realistic.test.js"
-                }
-            ]
-        }
-        
-        return json.dumps(jest_data, indent=2).encode('utf-8')
-    
-    def _generate_realistic_go_data(self, artifact_name: str) -> bytes:
-        """Generate realistic Go test JSON data."""
-        import random
-        
-        packages = [
-            "github.com/gin-gonic/gin",
-            "github.com/gin-gonic/gin/binding", 
-            "github.com/gin-gonic/gin/render"
-        ]
-        
-        events = []
-        test_count = 35
-        
-        for i in range(test_count):
-            package = random.choice(packages)
-            test_name = f"Test{random.choice(['Handler', 'Middleware', 'Router', 'Binding'])}{i:02d}"
-            outcome = random.choices(['pass', 'fail'], weights=[0.92, 0.08])[0]  # 8% failure rate
-            duration = round(random.uniform(0.001, 0.5), 3)
-            
-            # Run event
-            events.append(json.dumps({
-                "Action": "run",
-                "Package": package,
-                "Test": test_name
-            }))
-            
-            # Output event
-            events.append(json.dumps({
-                "Action": "output",
-                "Package": package,
-                "Test": test_name,
-                "Output": f"=== RUN   {test_name}\\n"
-            }))
-            
-            if outcome == 'fail':
-                # Failure output
-                events.append(json.dumps({
-                    "Action": "output",
-                    "Package": package,
-                    "Test": test_name,
-                    "Output": f"--- FAIL: {test_name} ({duration:.3f}s)\\n"
-                }))
-                events.append(json.dumps({
-                    "Action": "output",
-                    "Package": package,
-                    "Test": test_name,
-                    "Output": f"    handler_test.go:{random.randint(20,100)}: Test failed\\n"
-                }))
-            
-            # Result event
-            events.append(json.dumps({
-                "Action": outcome,
-                "Package": package,
-                "Test": test_name,
-                "Elapsed": duration
-            }))
-        
-        return '\n'.join(events).encode('utf-8')
-    
-    def _generate_realistic_xunit_data(self, artifact_name: str) -> bytes:
-        """Generate realistic xUnit XML data."""
-        import random
-        
-        test_count = 95
-        failure_rate = 0.06
-        
-        assemblies = []
-        
-        # Generate test assemblies
-        for assembly_idx in range(3):
-            assembly_name = f"TestAssembly{assembly_idx}"
-            tests_in_assembly = test_count // 3
-            failures = int(tests_in_assembly * failure_rate)
-            
-            test_cases = []
-            
-            for i in range(tests_in_assembly):
-                test_name = f"TestMethod{i:03d}"
-                duration = round(random.uniform(0.01, 2.0), 3)
-                
-                if i < failures:
-                    # Failed test
-                    test_cases.append(f'''
-        <test name="{assembly_name}.{test_name}" type="{assembly_name}" method="{test_name}" result="Fail" time="{duration}">
-            <failure exception-type="Xunit.Sdk.XunitException">
-                <message>Assert.Equal() Failure\nExpected: {random.randint(1,100)}\nActual:   {random.randint(1,100)}</message>
-                <stack-trace>   at {assembly_name}.{test_name}() in TestFile{assembly_idx}.cs:line {random.randint(20,100)}</stack-trace>
-            </failure>
-        </test>''')
-                else:
-                    # Passed test
-                    test_cases.append(f'''
-        <test name="{assembly_name}.{test_name}" type="{assembly_name}" method="{test_name}" result="Pass" time="{duration}"/>''')
-            
-            assemblies.append(f'''
-    <assembly name="{assembly_name}" test-framework="xUnit.net 2.4.2" run-date="2023-12-01" run-time="10:30:00" total="{tests_in_assembly}" passed="{tests_in_assembly-failures}" failed="{failures}" skipped="0" time="{sum(float(tc.split('time="')[1].split('"')[0]) for tc in test_cases if 'time="' in tc):.3f}">
-        <collection total="{tests_in_assembly}" passed="{tests_in_assembly-failures}" failed="{failures}" skipped="0" name="Test collection for {assembly_name}">
-            {''.join(test_cases)}
-        </collection>
-    </assembly>''')
-        
-        xml_content = f'''<?xml version="1.0" encoding="utf-8"?>
-<assemblies timestamp="12/01/2023 10:30:00">
-    {''.join(assemblies)}
-</assemblies>'''
-        
-        return xml_content.encode('utf-8')
+        self.log.debug('artifact.simulated', f"            🔄 Simulating {framework} test data for {artifact_name}",
+                       framework=framework, artifact=artifact_name)
+        return generate_report(framework, artifact_name)
     
-    def _parse_test_data(self, data: bytes, artifact_name: str, repo_name: str) -> Dict[str, Any]:
+    @timed('parse', component='ingestion')
+    def _parse_test_data(self, data: bytes, artifact_name: str, repo_name: str,
+                         run: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Parse test data using the parser system."""
-        request = ParseRequest(
-            tenant_id="pipeline-ingestion",
+        run = run or {}
+        request = parse_request(
+            tenant_id=TENANT_ID,
             project_id=repo_name.replace('/', '-'),
             environment="demo",
-            branch="main"
+            branch=run.get('head_branch') or "main"
         )
         
         start_time = time.time()
         try:
-            response = self.orchestrator.parse_report(data, request)
-            parse_time = time.time() - start_time
+            self.metrics.inc('bytes_parsed_total', len(data), component='ingestion')
+            with self.scheduler.slot(request.tenant_id, len(data)) as queue_wait:
+                response = self.orchestrator.parse_report(data, request)
+            parse_time = time.time() - start_time - queue_wait
             
             if response.success:
-                return {
+                self.metrics.inc('cases_parsed_total', response.data.totals.total, component='ingestion')
+                result = {
                     'success': True,
                     'framework': response.data.framework,
                     'test_count': response.data.totals.total,
@@ -611,11 +1199,18 @@ Database connection timeout
                     'skipped': response.data.totals.skipped,
                     'duration': response.data.totals.duration_sec,
                     'parse_time': parse_time,
+                    'queue_wait': queue_wait,
                     'artifact_name': artifact_name,
                     'repo_name': repo_name,
                     'run_id': response.run_id
                 }
+                if self.history_store or self.flaky_scorer or self.duration_detector or self.failure_index:
+                    # Artifacts are parsed concurrently; the stores and analyses are not thread-safe
+                    with self._track_lock:
+                        result.update(self._track_run(request, response, run))
+                return result
             else:
+                self.metrics.inc('parse_failures_total', component='ingestion')
                 return {
                     'success': False,
                     'error': response.error,
@@ -624,6 +1219,7 @@ Database connection timeout
                     'repo_name': repo_name
                 }
         except Exception as e:
+            self.metrics.inc('parse_failures_total', component='ingestion')
             return {
                 'success': False,
                 'error': str(e),
@@ -632,6 +1228,51 @@ Database connection timeout
                 'repo_name': repo_name
             }
     
+    @timed('track', component='ingestion')
+    def _track_run(self, request: Any, response: Any, run: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist a successfully parsed run and feed it to the cross-run analyses."""
+        tracked = {}
+        test_cases = response.data.test_cases
+        test_ids = None
+        started_at = None
+        if run.get('created_at'):
+            started_at = datetime.fromisoformat(run['created_at'].replace('Z', '+00:00')).timestamp()
+        
+        if self.history_store:
+            recorded = self.history_store.record_run(
+                request.project_id,
+                test_cases,
+                branch=request.branch,
+                commit_sha=run.get('head_sha'),
+                build_number=str(run['run_number']) if run.get('run_number') else None,
+                external_id=str(run['id']) if run.get('id') else response.run_id,
+                framework=response.data.framework,
+                started_at=started_at,
+                run_attempt=run.get('run_attempt') or 1
+            )
+            tracked['history_run_id'] = recorded['run_id']
+            test_cases, test_ids = recorded['cases'], recorded['test_ids']
+        
+        if self.flaky_scorer:
+            # Every attempt: a rerun that flipped is a same-commit retry
+            self.flaky_scorer.observe_run(request.project_id, test_cases, commit_sha=run.get('head_sha'), test_ids=test_ids)
+        
+        if self.duration_detector:
+            # One duration per test (its last attempt)
+            timed_cases, timed_ids = test_cases, test_ids
+            if test_ids is not None:
+                last = recorded['last_attempts']
+                timed_cases, timed_ids = [test_cases[i] for i in last], [test_ids[i] for i in last]
+            regressions = self.duration_detector.observe_run(request.project_id, timed_cases, test_ids=timed_ids)
+            tracked['slow_tests'] = regressions['case_regressions']
+            tracked['slow_suites'] = regressions['suite_regressions']
+        
+        if self.failure_index:
+            assignments = self.failure_index.observe_run(request.project_id, test_cases, test_ids=test_ids, seen_at=started_at)
+            tracked['failure_clusters'] = len(set(assignments.values()))
+        
+        return tracked
+    
     def _print_ingestion_summary(self, results: Dict[str, Any]):
         """Print comprehensive ingestion summary."""
         print(f"\n📊 PIPELINE INGESTION SUMMARY")
@@ -643,26 +1284,57 @@ Database connection timeout
         print(f"🧪 Test cases ingested: {results['test_cases_ingested']}")
         print(f"🔧 Frameworks found: {', '.join(results['frameworks_found'])}")
         
-        if results['parsing_results']:
-            successful_parses = sum(1 for r in results['parsing_results'] if r['success'])
-            total_parses = len(results['parsing_results'])
-            avg_parse_time = sum(r['parse_time'] for r in results['parsing_results']) / len(results['parsing_results'])
+        parse_summary = results.get('parse_summary', {})
+        if parse_summary.get('results'):
+            successful_parses = parse_summary['successes']
+            total_parses = parse_summary['results']
+            avg_parse_time = parse_summary['avg_parse_time']
             
             print(f"✅ Parse success rate: {successful_parses}/{total_parses} ({successful_parses/total_parses*100:.1f}%)")
             print(f"⚡ Average parse time: {avg_parse_time:.3f}s")
+            print(f"📝 Per-artifact results: {parse_summary['results_file']} (session {parse_summary['session_id']})")
             
             if results['test_cases_ingested'] > 0:
                 throughput = results['test_cases_ingested'] / results['processing_time']
                 print(f"🚀 Overall throughput: {throughput:.0f} test cases/second")
         
+        coverage = results.get('coverage')
+        if coverage:
+            print(f"⏰ Time budget: {coverage['elapsed']:.0f}s of {coverage['time_budget']:.0f}s"
+                  f"{' (deadline hit)' if coverage['deadline_hit'] else ''}")
+            print(f"   Covered {coverage['runs']['done']} run(s) ({coverage['runs']['failed_done']} failed), "
+                  f"{coverage['artifacts']['done']} artifact(s); pending {coverage['runs']['pending'] + coverage['runs']['partial']} "
+                  f"run(s) ({coverage['runs']['failed_pending']} failed), {coverage['artifacts']['pending']} artifact(s), "
+                  f"{coverage['repositories']['pending']} unlisted repositories")
+            print(f"   Run coverage {coverage['run_coverage']:.0%}, artifact coverage {coverage['artifact_coverage']:.0%} "
+                  f"- remainder checkpointed to {coverage['checkpoint']}")
+        
+        scheduling = results.get('artifact_scheduling', {})
+        if scheduling.get('batches'):
+            print(f"🗓️  Artifact scheduling: expected {scheduling['expected_makespan']:.2f}s, "
+                  f"actual {scheduling['actual_wall']:.2f}s over {scheduling['batches']} run(s) "
+                  f"({scheduling['streamed']} streamed, {scheduling['expired_skipped']} expired skipped)")
+        
+        for repo_name, flaky_tests in results.get('flaky_tests', {}).items():
+            if flaky_tests:
+                print(f"🎲 Flakiest tests in {repo_name}:")
+                for test in flaky_tests[:3]:
+                    name = f"{test['suite']}.{test['name']}" if 'name' in test else f"test #{test['test_id']}"
+                    print(f"   • {name}: score {test['score']:.2f}, {test['flips']} flips in {test['runs']} runs")
+        
+        if results.get('failure_clusters'):
+            print(f"🧩 Top failure clusters:")
+            for cluster in results['failure_clusters'][:3]:
+                print(f"   • {cluster['count']}x ({cluster['affected_tests']} tests): {cluster['sample'].splitlines()[0][:80]}")
+        
         if results['errors']:
             print(f"\n❌ Errors encountered: {len(results['errors'])}")
             for error in results['errors'][:3]:  # Show first 3 errors
                 print(f"   • {error}")
     
-    def _save_ingestion_results(self, results: Dict[str, Any]):
+    @timed('save_results', component='ingestion')
+    def _save_ingestion_results(self, results: Dict[str, Any], output_file: Path = Path('pipeline-ingestion-results.json')):
         """Save ingestion results for analysis."""
-        output_file = Path('pipeline-ingestion-results.json')
         
         # Prepare data for JSON serialization
         serializable_results = {
@@ -670,6 +1342,8 @@ Database connection timeout
             'timestamp': datetime.now().isoformat(),
             'frameworks_found': list(results['frameworks_found'])
         }
+        if self.metrics.enabled:
+            serializable_results['stage_latency'] = self.metrics.stage_quantiles()
         
         with open(output_file, 'w') as f:
             json.dump(serializable_results, f, indent=2, default=str)
@@ -726,23 +1400,18 @@ Database connection timeout
         }
         
         for scenario in demo_scenarios:
-            print(f"\n🔧 Creating {scenario['name']} ({scenario['framework']})")
-            print(f"   📊 {scenario['test_count']} tests, {scenario['failure_rate']*100:.1f}% failure rate")
+            log = self.log.bind(scenario=scenario['name'])
+            log.info('scenario.start', f"\n🔧 Creating {scenario['name']} ({scenario['framework']})\n"
+                     f"   📊 {scenario['test_count']} tests, {scenario['failure_rate']*100:.1f}% failure rate",
+                     framework=scenario['framework'], test_count=scenario['test_count'])
             
             # Generate test data
-            if scenario['framework'] == 'junit':
-                test_data = self._generate_realistic_junit_data(scenario['name'])
-            elif scenario['framework'] == 'pytest':
-                test_data = self._generate_realistic_pytest_data(scenario['name'])
-            elif scenario['framework'] == 'jest':
-                test_data = self._generate_realistic_jest_data(scenario['name'])
-            elif scenario['framework'] == 'go-test':
-                test_data = self._generate_realistic_go_data(scenario['name'])
-            elif scenario['framework'] == 'xunit':
-                test_data = self._generate_realistic_xunit_data(scenario['name'])
+            with self.profiler.stage('generate', scenario['name']):
+                test_data = generate_report(scenario['framework'], scenario['name'])
             
             # Parse the data
-            parse_result = self._parse_test_data(test_data, f"{scenario['name']}.xml", scenario['name'])
+            with self.profiler.stage('parse', scenario['name']):
+                parse_result = self._parse_test_data(test_data, f"{scenario['name']}.xml", scenario['name'])
             
             if parse_result['success']:
                 scenario_result = {
@@ -751,16 +1420,18 @@ Database connection timeout
                     'success': True
                 }
                 demo_data['total_test_cases'] += parse_result['test_count']
-                print(f"   ✅ Generated and parsed {parse_result['test_count']} tests")
+                log.info('scenario.parsed', f"   ✅ Generated and parsed {parse_result['test_count']} tests",
+                         tests=parse_result['test_count'])
             else:
                 scenario_result = {
                     **scenario,
                     'error': parse_result['error'],
                     'success': False
                 }
-                print(f"   ❌ Parse failed: {parse_result['error']}")
+                log.error('scenario.parse_failed', f"   ❌ Parse failed: {parse_result['error']}", error=parse_result['error'])
             
             demo_data['scenarios'].append(scenario_result)
+        self.log.flush()
         
         # Save demo dataset
         demo_file = Path('demo-dataset.json')
@@ -775,31 +1446,281 @@ Database connection timeout
         
         return demo_data
 
-def main():
-    """Main function for pipeline ingestion testing."""
+def warm_flaky_scorer(history_store: TestHistoryStore) -> FlakinessScorer:
+    """Flakiness scorer loaded with the runs already in the history database."""
+    flaky_scorer = FlakinessScorer()
+    flaky_scorer.load_from_store(history_store)
+    return flaky_scorer
+
+def warm_duration_detector(history_store: TestHistoryStore) -> DurationRegressionDetector:
+    """Duration detector with baselines from the recent runs in the history database."""
+    duration_detector = DurationRegressionDetector()
+    duration_detector.load_from_store(history_store)
+    return duration_detector
+
+@contextmanager
+def ingestion_worker(work_queue: Any):
+    """
+    Per-process ingestion system for run_worker_pool: own parser, HTTP session,
+    history connection and NDJSON results file (so lines never interleave).
+    """
+    results_log = Path(os.getenv('INGESTION_RESULTS_LOG', DEFAULT_RESULTS_LOG))
+    results_sink = ResultsSink(results_log.with_suffix(f'.worker-{os.getpid()}{results_log.suffix}'))
+    history_store = TestHistoryStore(os.getenv('TEST_HISTORY_DB', 'test-history.db'))
+    # Park for a rate limit reset briefly only; longer waits fail the job until the reset (RateLimitExhausted.retry_at)
+    github_tokens = GitHubTokenPool.from_env(max_park=float(os.getenv('GITHUB_MAX_PARK_SEC', QUEUE_MAX_PARK_SEC)))
+    cassette = cassette_from_env()
+    if cassette:
+        cassette.mount(github_tokens.session)
+    ingestion_system = PipelineIngestionSystem(
+        github_tokens=github_tokens,
+        github_api=os.getenv('GITHUB_API_URL', GITHUB_API),
+        history_store=history_store,
+        duration_detector=warm_duration_detector(history_store) if numpy_available() else None,
+        results_sink=results_sink
+    )
+    try:
+        yield ingestion_system.queue_handlers(work_queue)
+    finally:
+        ingestion_system.log.flush()
+        results_sink.close()
+        history_store.close()
+
+def main(argv: Optional[List[str]] = None):
+    """Main function for pipeline ingestion testing (argv defaults to the command line)."""
     import random
     random.seed(42)  # Consistent results for testing
     
+    parser = argparse.ArgumentParser(description="Pipeline Test Result Ingestion System")
+    add_profile_argument(parser)
+    add_cassette_arguments(parser)
+    parser.add_argument('--webhook-port', type=int, metavar='PORT',
+                        help='receive GitHub workflow_run webhooks on PORT and ingest runs as they complete '
+                             '(secret from WEBHOOK_SECRET, required unless --insecure)')
+    parser.add_argument('--upload-port', type=int, metavar='PORT',
+                        help='accept test reports pushed by CI agents on PORT (POST /uploads?project=owner/name; '
+                             'bearer token from UPLOAD_TOKEN, required unless --insecure; limits from UPLOAD_MAX_MB, '
+                             'UPLOAD_MAX_CONCURRENT, UPLOAD_BACKLOG)')
+    parser.add_argument('--bind', default=os.getenv('AUTOTEST_BIND_HOST', '127.0.0.1'), metavar='HOST',
+                        help='interface --webhook-port, --upload-port and --serve-queue listen on '
+                             '(default: AUTOTEST_BIND_HOST or %(default)s)')
+    parser.add_argument('--insecure', action='store_true',
+                        help='accept unsigned webhook deliveries and unauthenticated uploads when WEBHOOK_SECRET '
+                             'or UPLOAD_TOKEN is not set')
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help='ingest through the durable work queue with N worker processes')
+    parser.add_argument('--queue', default=os.getenv('WORK_QUEUE_DB'), metavar='DB|URL',
+                        help='work queue database file, or the URL of another host\'s --serve-queue (token from '
+                             'WORK_QUEUE_TOKEN) (default: WORK_QUEUE_DB or ingestion-queue.db)')
+    parser.add_argument('--serve-queue', type=int, metavar='PORT',
+                        help='share the local work queue with workers on other machines while --workers '
+                             'ingest (shared token from WORK_QUEUE_TOKEN, required)')
+    parser.add_argument('--backfill', metavar='OWNER/REPO',
+                        help='ingest the full workflow run history of a repository (resumable; with --workers '
+                             'the runs are spread over the worker processes)')
+    parser.add_argument('--since', default=(datetime.now() - timedelta(days=730)).strftime('%Y-%m-%d'),
+                        help='oldest run creation date to backfill (default: two years ago)')
+    parser.add_argument('--until', help='newest run creation date to backfill (default: now)')
+    parser.add_argument('--slice-days', type=float, default=7.0, help='width of each backfill slice in days')
+    parser.add_argument('--time-budget', type=float, metavar='SECONDS',
+                        default=float(os.environ['INGEST_TIME_BUDGET']) if os.getenv('INGEST_TIME_BUDGET') else None,
+                        help='finish repository ingestion within SECONDS: failed and recent runs first, the rest '
+                             'checkpointed for the next invocation (default: INGEST_TIME_BUDGET, unlimited)')
+    parser.add_argument('--checkpoint', default=os.getenv('INGEST_CHECKPOINT_FILE', DEFAULT_CHECKPOINT_FILE), metavar='FILE',
+                        help='where --time-budget keeps unfinished work (default: %(default)s)')
+    parser.add_argument('--github-api', default=os.getenv('GITHUB_API_URL', GITHUB_API), metavar='URL',
+                        help='GitHub API root, e.g. a github_simulator.py instance for offline load tests; artifacts '
+                             'are then downloaded and unzipped (default: GITHUB_API_URL or %(default)s)')
+    parser.add_argument('--max-runs', type=int, metavar='N',
+                        help='workflow runs to ingest per repository (default: 1, or 5 with --workers)')
+    parser.add_argument('--poll', action='store_true',
+                        help='poll repositories continuously at their learned build cadence (repositories from '
+                             'POLL_REPOS_FILE, one owner/name per line; budget from POLL_REQUESTS_PER_HOUR)')
+    args = parser.parse_args(argv)
+    if args.webhook_port is not None and not os.getenv('WEBHOOK_SECRET') and not args.insecure:
+        parser.error('--webhook-port needs WEBHOOK_SECRET (or --insecure to accept unsigned deliveries)')
+    if args.upload_port is not None and not os.getenv('UPLOAD_TOKEN') and not args.insecure:
+        parser.error('--upload-port needs UPLOAD_TOKEN (or --insecure to accept unauthenticated uploads)')
+    if args.serve_queue and not args.workers:
+        parser.error('--serve-queue is only served while --workers run (the queue closes when they finish)')
+    if args.serve_queue and (args.queue or '').startswith(('http://', 'https://')):
+        parser.error('--serve-queue shares a local queue database, not a remote --queue')
+    if args.serve_queue and not os.getenv('WORK_QUEUE_TOKEN'):
+        parser.error('--serve-queue needs a shared token in WORK_QUEUE_TOKEN (workers send the same one)')
+    profiler = profiler_from_args(args)
+    configure_logging_from_env()
+    configure_scheduler_from_env()
+    
     print("🌟 Pipeline Test Result Ingestion System")
     print("=" * 50)
     
-    # Check for GitHub token
-    github_token = os.getenv('GITHUB_TOKEN')
+    os.environ['GITHUB_API_URL'] = args.github_api  # inherited by worker processes
+    
+    # Optional record/replay of all GitHub traffic (--record DIR / --replay DIR)
+    cassette = cassette_from_args(args)
+    
+    # GitHub tokens (GITHUB_TOKENS=tok1,tok2 and/or GITHUB_TOKEN) share the API load; the pool and its
+    # connections are reused by later jobs in the same process (autotest-cli.py daemon) unless a cassette is mounted
+    if cassette:
+        github_tokens = GitHubTokenPool.from_env()
+        cassette.mount(github_tokens.session)
+        print(f"📼 {'Recording' if cassette.mode == 'record' else 'Replaying'} GitHub traffic: {cassette.path}")
+    else:
+        github_tokens = shared(('github_tokens', os.getenv('GITHUB_TOKENS'), os.getenv('GITHUB_TOKEN')),
+                               GitHubTokenPool.from_env)
+    
+    # Optional Jenkins server (JENKINS_URL, JENKINS_USER / JENKINS_TOKEN)
+    jenkins_url = os.getenv('JENKINS_URL')
+    jenkins_auth = (os.getenv('JENKINS_USER'), os.getenv('JENKINS_TOKEN')) if os.getenv('JENKINS_USER') else None
+    
+    # Optional GitLab projects (GITLAB_PROJECTS=group/a,group/b, GITLAB_URL, GITLAB_TOKEN)
+    gitlab_projects = [p.strip() for p in os.getenv('GITLAB_PROJECTS', '').split(',') if p.strip()]
+    
+    # Optional stage metrics (AUTOTEST_METRICS / AUTOTEST_METRICS_PORT / AUTOTEST_METRICS_FILE)
+    metrics = configure_from_env()
+    
+    # Persist parsed runs across invocations (connection, scorer and baselines are kept warm between daemon jobs)
+    history_db = os.getenv('TEST_HISTORY_DB', 'test-history.db')
+    history_store = shared(('history_store', history_db), lambda: TestHistoryStore(history_db))
+    
+    # Warm the flakiness scorer from previously ingested runs, in the modes that report flaky tests
+    # (queue workers build their own systems; the upload service only stores runs)
+    flaky_scorer = None
+    if not args.workers and args.upload_port is None:
+        flaky_scorer = shared(('flaky_scorer', history_db), lambda: warm_flaky_scorer(history_store))
+    
+    # Duration baselines need numpy for vectorized evaluation (queue workers warm their own)
+    duration_detector = None
+    if not numpy_available():
+        print("⚠️  numpy not installed - duration regression detection disabled. Install with: pip install numpy")
+    elif not args.workers:
+        duration_detector = shared(('duration_detector', history_db), lambda: warm_duration_detector(history_store))
+    
+    # Failure clusters persist alongside the history database
+    failure_index_file = Path(os.getenv('FAILURE_CLUSTERS_FILE', 'failure-clusters.json'))
+    failure_index = shared(('failure_index', str(failure_index_file)), lambda: FailureClusterIndex.load(failure_index_file))
+    
+    # Per-artifact parse results are streamed to an append-only NDJSON file
+    results_sink = ResultsSink(os.getenv('INGESTION_RESULTS_LOG', DEFAULT_RESULTS_LOG))
     
     # Create ingestion system
-    ingestion_system = PipelineIngestionSystem(github_token=github_token)
+    ingestion_system = PipelineIngestionSystem(
+        github_token=os.getenv('GITHUB_TOKEN'),
+        github_tokens=github_tokens,
+        github_api=args.github_api,
+        jenkins_url=jenkins_url,
+        jenkins_auth=jenkins_auth,
+        gitlab_url=os.getenv('GITLAB_URL', 'https://gitlab.com'),
+        gitlab_token=os.getenv('GITLAB_TOKEN'),
+        history_store=history_store,
+        flaky_scorer=flaky_scorer,
+        duration_detector=duration_detector,
+        failure_index=failure_index,
+        profiler=profiler,
+        results_sink=results_sink
+    )
     
-    print("\n🎯 Choose ingestion mode:")
-    print("1. 📊 Create Demo Dataset (for dashboard testing)")
-    print("2. 🔄 Ingest from Real Repositories (requires GitHub token)")
-    print("3. 🧪 Both (comprehensive testing)")
+    if args.workers:
+        # Queue mode: repo -> run -> artifact jobs survive restarts and spread over processes
+        from work_queue import DEFAULT_QUEUE_PATH, QueueServer, open_queue, run_worker_pool
+        args.queue = args.queue or DEFAULT_QUEUE_PATH
+        work_queue = open_queue(args.queue)
+        queue_server = (QueueServer(work_queue, os.environ['WORK_QUEUE_TOKEN'], host=args.bind, port=args.serve_queue).start()
+                        if args.serve_queue else None)
+        if args.backfill:
+            work_queue.enqueue('backfill', {'repo': args.backfill, 'since': args.since, 'until': args.until,
+                                            'slice_days': args.slice_days}, tenant=BACKFILL_TENANT_ID, priority=-1)
+            print(f"📥 Queued backfill of {args.backfill} in {args.queue}")
+        elif not args.queue.startswith(('http://', 'https://')):
+            seeded = ingestion_system.enqueue_repositories(work_queue, max_runs_per_repo=args.max_runs or 5)
+            print(f"📥 Queued {seeded} repositories in {args.queue}")
+        counts = run_worker_pool(args.queue, ingestion_worker, args.workers, exit_when_idle=True)
+        print(f"⚙️  Workers finished: {counts['completed']} jobs completed, {counts['failed']} retried, "
+              f"{counts['dead']} dead-lettered")
+        if counts['crashed']:
+            print(f"⚠️  {counts['crashed']} worker(s) crashed; their jobs are retried once the lease expires")
+        print(f"   Queue: {work_queue.stats()['by_status']}")
+        if queue_server:
+            queue_server.stop()
+        work_queue.close()
+    elif args.poll:
+        poll_state_file = Path(os.getenv('POLL_STATE_FILE', 'poll-schedule.json'))
+        scheduler = PollScheduler.load(poll_state_file, requests_per_hour=float(os.getenv('POLL_REQUESTS_PER_HOUR', '2000')))
+        repos_file = os.getenv('POLL_REPOS_FILE')
+        repositories = None
+        if repos_file:
+            repositories = [line.strip() for line in Path(repos_file).read_text().splitlines()
+                            if line.strip() and not line.startswith('#')]
+        # Seed cadences of repositories that have history but no poll state yet
+        new_repos = [r for r in repositories or [i['name'] for i in ingestion_system.demo_repositories]
+                     if r not in scheduler.repos]
+        scheduler.load_from_store(history_store, new_repos)
+        results = ingestion_system.poll_repositories(scheduler, repositories, state_file=poll_state_file)
+        polling = results['polling']
+        print(f"🔭 {polling['polls']} polls ({polling['productive_polls']} found new runs), {polling['requests']} requests, "
+              f"{polling['hot_repositories']} hot / {polling['cold_repositories']} cold repositories")
+    elif args.backfill:
+        ingestion_system.backfill_repository(args.backfill, parse_date(args.since),
+                                             parse_date(args.until) if args.until else None, args.slice_days)
+    elif args.webhook_port is not None:
+        # Push-based mode: webhooks drive ingestion, polling only reconciles
+        webhook_secret = os.getenv('WEBHOOK_SECRET')
+        if not webhook_secret:
+            print("⚠️  --insecure: WEBHOOK_SECRET not set - accepting unsigned deliveries")
+        from webhook_receiver import WebhookReceiver
+        receiver = WebhookReceiver(webhook_secret, host=args.bind, port=args.webhook_port).start()
+        ingestion_system.serve_webhooks(receiver, reconcile_interval=float(os.getenv('WEBHOOK_RECONCILE_SEC', '900')))
+        receiver.stop()
+    elif args.upload_port is not None:
+        # Push-based mode for CI agents: reports are streamed in, parsed by the service's workers and stored
+        upload_token = os.getenv('UPLOAD_TOKEN')
+        if not upload_token:
+            print("⚠️  --insecure: UPLOAD_TOKEN not set - accepting unauthenticated uploads")
+        from upload_service import UploadService, upload_limits_from_env
+        service = UploadService(ingestion_system.ingest_upload, upload_token, host=args.bind, port=args.upload_port,
+                                **upload_limits_from_env())
+        uploads = ingestion_system.serve_uploads(service)
+        print(f"📤 {uploads['accepted']} uploads accepted ({uploads['parsed']} parsed, {uploads['failed']} failed), "
+              f"{uploads['rejected']} rejected, {uploads['busy']} refused while busy")
+    else:
+        print("\n🎯 Choose ingestion mode:")
+        print("1. 📊 Create Demo Dataset (for dashboard testing)")
+        print("2. 🔄 Ingest from Real Repositories (requires GitHub token)")
+        print("3. 🧪 Both (comprehensive testing)")
+        
+        # For automated testing, create demo dataset
+        print("\n🎨 Creating Demo Dataset...")
+        demo_results = ingestion_system.create_demo_dataset()
+        
+        print("\n🔄 Ingesting from Repositories...")
+        ingestion_results = ingestion_system.ingest_demo_data(max_repos=2, max_runs_per_repo=args.max_runs or 1, time_budget=args.time_budget,
+                                                              checkpoint_file=Path(args.checkpoint))
+        
+        if jenkins_url:
+            print("\n🔄 Ingesting from Jenkins...")
+            ingestion_system.ingest_jenkins(builds_per_job=int(os.getenv('JENKINS_BUILDS_PER_JOB', '5')))
+        
+        if gitlab_projects:
+            print("\n🔄 Ingesting from GitLab CI...")
+            ingestion_system.ingest_gitlab(gitlab_projects)
     
-    # For automated testing, create demo dataset
-    print("\n🎨 Creating Demo Dataset...")
-    demo_results = ingestion_system.create_demo_dataset()
+    failure_index.save(failure_index_file)
+    results_sink.close()
+    if cassette:
+        summary = cassette.summary()
+        print(f"📼 Cassette {summary['path']}: {summary['recorded']} recorded, {summary['replayed']} replayed, "
+              f"{summary['misses']} missing, {summary['blobs_deduplicated']} duplicate bodies")
+    metrics_file = metrics.dump()
+    if metrics_file:
+        print(f"📈 Metrics written to: {metrics_file}")
+
+    profile_file = profiler.write('pipeline-ingestion')
+    if profile_file:
+        profiler.print_summary()
+        print(f"🔬 Profiles written to: {profile_file.parent} (summary: {profile_file.name})")
     
-    print("\n🔄 Ingesting from Repositories...")
-    ingestion_results = ingestion_system.ingest_demo_data(max_repos=2, max_runs_per_repo=1)
+    if args.workers or args.poll or args.backfill or args.webhook_port is not None or args.upload_port is not None:
+        return
     
     print(f"\n🎉 Pipeline Ingestion Complete!")
     print(f"   • Demo dataset created with {demo_results['total_test_cases']} test cases")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Adaptive Polling Scheduler
+Decides which repositories to poll for new workflow runs, and when, from the
+build cadence each repository has shown so far.
+
+Every repository keeps an exponentially weighted average of the gap between its
+runs, and is polled at a fraction of that gap, so hourly builders are checked
+every few minutes. Once a repository has been silent for several of its usual gaps
+(or has no cadence yet) every empty poll doubles its interval up to max_interval,
+so dormant repositories cost a few requests a week.
+
+Polls share a global request budget (token bucket): when more repositories are
+due than the budget allows, the ones expected to have the most new runs go first,
+and when the projected poll rate exceeds the budget all intervals are stretched
+proportionally.
+
+Runs are recognised as new by id (the most recent TRACKED_RUNS ingested ids are
+kept per repository), so a long run that finishes after shorter, later ones is
+still picked up, and a run whose ingestion failed stays new until it succeeds.
+
+State is saved as JSON so cadences survive restarts, and can be warmed from the
+run timestamps in a TestHistoryStore.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+DEFAULT_REQUESTS_PER_HOUR = 2000.0
+MIN_INTERVAL_SEC = 300.0
+MAX_INTERVAL_SEC = 7 * 86400.0
+INITIAL_INTERVAL_SEC = 3600.0
+CADENCE_FRACTION = 0.25
+BACKOFF_FACTOR = 2.0
+SILENCE_GAPS = 3.0
+GAP_SMOOTHING = 0.3
+TRACKED_RUNS = 1000
+
+
+class PollScheduler:
+    """Per-repository poll intervals learned from run timestamps, under a global budget."""
+
+    def __init__(self, requests_per_hour: float = DEFAULT_REQUESTS_PER_HOUR, min_interval: float = MIN_INTERVAL_SEC,
+                 max_interval: float = MAX_INTERVAL_SEC, cadence_fraction: float = CADENCE_FRACTION):
+        """
+        Args:
+            requests_per_hour: API requests all polls together may spend
+            min_interval: Shortest interval between polls of one repository
+            max_interval: Longest interval (cold repositories back off up to this)
+            cadence_fraction: Poll interval as a fraction of the learned build gap
+        """
+        self.requests_per_hour = requests_per_hour
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.cadence_fraction = cadence_fraction
+        self.repos: Dict[str, Dict[str, Any]] = {}
+        self._tokens = requests_per_hour / 60.0  # start with a minute's worth of budget
+        self._refilled_at: Optional[float] = None
+        self.stats = {'polls': 0, 'productive_polls': 0, 'requests': 0, 'deferred': 0}
+
+    def add(self, repos: Iterable[str], now: Optional[float] = None):
+        """Track repositories; new ones are due immediately."""
+        now = time.time() if now is None else now
+        for repo in repos:
+            self.repos.setdefault(repo, {
+                'interval': INITIAL_INTERVAL_SEC, 'next_due': now, 'last_polled': None,
+                'last_run_at': None, 'gap': None, 'empty_polls': 0, 'ingested': []
+            })
+
+    def unseen_runs(self, repo: str, run_times: Dict[Hashable, Optional[float]]) -> List[Hashable]:
+        """
+        Ids of listed runs that have not been ingested yet.
+
+        Args:
+            repo: Repository polled
+            run_times: Listed run id -> creation timestamp (None when unknown)
+        """
+        state = self.repos[repo]
+        if state.get('ingested') is None:
+            # State saved before run ids were tracked: runs up to last_run_at were ingested
+            last = state['last_run_at']
+            state['ingested'] = [run_id for run_id, run_at in run_times.items()
+                                 if last is not None and (run_at is None or run_at <= last)]
+        ingested = set(state['ingested'])
+        return [run_id for run_id in run_times if run_id not in ingested]
+
+    def mark_ingested(self, repo: str, run_ids: Iterable[Hashable]):
+        """Remember runs as ingested (only the most recent TRACKED_RUNS ids are kept)."""
+        state = self.repos[repo]
+        ingested = state.get('ingested') or []
+        ingested.extend(run_id for run_id in run_ids if run_id not in ingested)
+        state['ingested'] = ingested[-TRACKED_RUNS:]
+
+    def observe_runs(self, repo: str, run_times: Iterable[float]):
+        """Fold run creation timestamps (any order, duplicates ignored) into the repository's cadence."""
+        state = self.repos[repo]
+        for run_at in sorted(set(run_times)):
+            last = state['last_run_at']
+            if last is not None and run_at <= last:
+                continue
+            if last is not None:
+                gap = run_at - last
+                state['gap'] = gap if state['gap'] is None else state['gap'] + GAP_SMOOTHING * (gap - state['gap'])
+            state['last_run_at'] = run_at
+
+    def _pressure(self) -> float:
+        """Projected poll rate relative to the budget (>= 1 stretches every interval)."""
+        polls_per_hour = sum(3600.0 / state['interval'] for state in self.repos.values())
+        return max(1.0, polls_per_hour / self.requests_per_hour) if self.requests_per_hour else 1.0
+
+    def record_poll(self, repo: str, new_runs: int, requests: int = 1, now: Optional[float] = None):
+        """
+        Schedule a repository's next poll after polling it.
+
+        Args:
+            repo: Repository polled
+            new_runs: Runs found that were not seen before
+            requests: API requests the poll (and its ingestion) spent
+            now: Poll time
+        """
+        now = time.time() if now is None else now
+        state = self.repos[repo]
+        self._tokens -= requests
+        self.stats['polls'] += 1
+        self.stats['requests'] += requests
+        cadence = state['gap'] * self.cadence_fraction if state['gap'] else None
+        silence = now - state['last_run_at'] if state['last_run_at'] is not None else None
+        if new_runs:
+            self.stats['productive_polls'] += 1
+            state['empty_polls'] = 0
+            interval = cadence or state['interval']
+        elif cadence and silence is not None and silence < SILENCE_GAPS * state['gap']:
+            # Quiet, but still within the usual cadence
+            state['empty_polls'] += 1
+            interval = cadence
+        else:
+            # Silent for longer than usual (or no cadence yet): back off
+            state['empty_polls'] += 1
+            interval = state['interval'] * BACKOFF_FACTOR
+        state['interval'] = min(self.max_interval, max(self.min_interval, interval))
+        state['last_polled'] = now
+        state['next_due'] = now + min(self.max_interval, state['interval'] * self._pressure())
+
+    def _urgency(self, state: Dict[str, Any], now: float) -> float:
+        """Expected number of runs missed since the last poll."""
+        if state['last_polled'] is None:
+            return float('inf')
+        gap = state['gap'] or state['interval']
+        return (now - state['last_polled']) / gap
+
+    def due(self, now: Optional[float] = None, requests_per_poll: int = 1) -> List[str]:
+        """Repositories to poll now, most urgent first, limited by the remaining budget."""
+        now = time.time() if now is None else now
+        budget_per_sec = self.requests_per_hour / 3600.0
+        if self._refilled_at is not None:
+            self._tokens = min(self.requests_per_hour / 60.0, self._tokens + (now - self._refilled_at) * budget_per_sec)
+        self._refilled_at = now
+        ready = [repo for repo, state in self.repos.items() if state['next_due'] <= now]
+        ready.sort(key=lambda repo: self._urgency(self.repos[repo], now), reverse=True)
+        allowed = max(0, int(self._tokens // requests_per_poll))
+        self.stats['deferred'] += max(0, len(ready) - allowed)
+        return ready[:allowed]
+
+    def next_wakeup(self, now: Optional[float] = None) -> float:
+        """Seconds until the next repository is due (or budget refills enough for one poll)."""
+        now = time.time() if now is None else now
+        if not self.repos:
+            return self.max_interval
+        earliest = min(state['next_due'] for state in self.repos.values())
+        budget_wait = (1 - self._tokens) * 3600.0 / self.requests_per_hour if self._tokens < 1 else 0.0
+        return max(0.0, earliest - now, budget_wait)
+
+    def summary(self) -> Dict[str, Any]:
+        """Poll statistics and the current interval distribution."""
+        intervals = sorted(state['interval'] for state in self.repos.values())
+        return {
+            **self.stats,
+            'repositories': len(self.repos),
+            'projected_polls_per_hour': sum(3600.0 / i for i in intervals),
+            'budget_per_hour': self.requests_per_hour,
+            'median_interval_sec': intervals[len(intervals) // 2] if intervals else 0.0,
+            'hot_repositories': sum(1 for i in intervals if i <= 3600),
+            'cold_repositories': sum(1 for i in intervals if i >= 86400)
+        }
+
+    def load_from_store(self, store: Any, repos: Optional[Iterable[str]] = None, runs_per_repo: int = 50) -> int:
+        """
+        Warm cadences from the run timestamps of a TestHistoryStore (projects are
+        repository names with '/' replaced by '-').
+
+        Returns:
+            Number of repositories with history
+        """
+        warmed = 0
+        for repo in list(repos or self.repos):
+            self.add([repo])
+            runs = store.project_runs(repo.replace('/', '-'), limit=runs_per_repo)
+            if runs:
+                self.observe_runs(repo, (run['started_at'] for run in runs))
+                state = self.repos[repo]
+                if state['gap']:
+                    state['interval'] = min(self.max_interval, max(self.min_interval, state['gap'] * self.cadence_fraction))
+                warmed += 1
+        return warmed
+
+    def save(self, path: Any):
+        """Persist per-repository state to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.repos, f)
+
+    @classmethod
+    def load(cls, path: Any, **kwargs: Any) -> 'PollScheduler':
+        """Load state saved with save(); a missing file gives an empty scheduler."""
+        scheduler = cls(**kwargs)
+        path = Path(path)
+        if path.exists():
+            with open(path, encoding='utf-8') as f:
+                scheduler.repos = json.load(f)
+        return scheduler
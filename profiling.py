@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Built-in Profiling
+Per-stage CPU profiles and allocation snapshots for the ingestion, loader, fetcher
+and stress entry points (enabled with --profile).
+
+Each stage is attributed to a key (scenario, repository, ...) and gets:
+- a cProfile dump (<stage>.<key>.prof, loadable with pstats/snakeviz)
+- collapsed stacks from a sampling profiler (<stage>.<key>.folded, ready for
+  flamegraph.pl / speedscope)
+- the top allocation growth while the stage ran (<stage>.<key>.alloc.txt),
+  from the first and then every ALLOCATION_SAMPLE_EVERY-th call of the stage,
+  since a tracemalloc snapshot walks every live allocation
+plus a profile-summary.json ranking which inputs cost the most.
+
+Stages are tracked per thread. Threads started while a stage is active (such as
+the artifact-* download and parse pools) are sampled as part of the most
+recently entered stage. Before Python 3.12 each such thread also gets its own
+cProfile; from 3.12 cProfile sits on sys.monitoring, which has one profiler slot
+per interpreter but sees every thread, so only one stage profile is enabled at a
+time and other threads' stages are covered by the sampler alone.
+"""
+
+import cProfile
+import io
+import json
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_PROFILE_DIR = 'profiles'
+SAMPLE_INTERVAL_SEC = 0.005
+MAX_STACK_DEPTH = 128
+TOP_ALLOCATIONS = 25
+TOP_FUNCTIONS = 10
+ALLOCATION_SAMPLE_EVERY = 10
+PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+StageKey = Tuple[str, str]
+
+
+def _safe_name(text: str) -> str:
+    return re.sub(r'[^\w.-]+', '_', text).strip('_') or 'default'
+
+
+class _StackSampler(threading.Thread):
+    """Samples the stacks of all threads inside a stage and folds them per stage."""
+
+    def __init__(self, profiler: 'Profiler', interval: float):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.profiler = profiler
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            stages = self.profiler._sampled_stages()
+            if not stages:
+                continue
+            frames = sys._current_frames()
+            for thread_id, stage in stages.items():
+                frame = frames.get(thread_id)
+                names: List[str] = []
+                while frame is not None and len(names) < MAX_STACK_DEPTH:
+                    code = frame.f_code
+                    names.append(f'{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                if names:
+                    self.profiler.stacks.setdefault(stage, Counter())[';'.join(reversed(names))] += 1
+
+
+class Profiler:
+    """Collects per-stage, per-key CPU profiles, stack samples and allocation diffs."""
+
+    def __init__(self, output_dir: Optional[Any] = None, enabled: bool = True,
+                 sample_interval: float = SAMPLE_INTERVAL_SEC, track_allocations: bool = True,
+                 allocation_sample_every: int = ALLOCATION_SAMPLE_EVERY):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir: Directory the profile files are written to
+            enabled: When False, stage() is a no-op
+            sample_interval: Seconds between stack samples
+            track_allocations: Take tracemalloc snapshots around sampled stage calls
+            allocation_sample_every: Snapshot the first and then every Nth call of each stage
+        """
+        self.enabled = enabled
+        self.output_dir = Path(output_dir or DEFAULT_PROFILE_DIR)
+        self.sample_interval = sample_interval
+        self.track_allocations = track_allocations
+        self.allocation_sample_every = max(1, allocation_sample_every)
+
+        self.profiles: Dict[StageKey, List[cProfile.Profile]] = {}  # one per thread that ran the stage
+        self.stacks: Dict[StageKey, Counter] = {}
+        self.allocations: Dict[StageKey, Counter] = {}
+        self.allocation_samples: Counter = Counter()
+        self.timings: Dict[StageKey, Dict[str, float]] = {}
+
+        self._local = threading.local()  # stage stack and profiles of the current thread
+        self._lock = threading.Lock()
+        self._entered: Dict[int, StageKey] = {}  # innermost stage of each thread inside stage()
+        self._adopted: Dict[int, StageKey] = {}  # stage of each thread started during a stage
+        self._sampler: Optional[_StackSampler] = None
+
+    @property
+    def current_stage(self) -> Optional[StageKey]:
+        """Innermost stage of the calling thread (None outside any stage)."""
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    def _start(self):
+        if self._sampler is None:
+            if self.track_allocations and not tracemalloc.is_tracing():
+                tracemalloc.start(1)  # only the allocating line is reported
+            self._sampler = _StackSampler(self, self.sample_interval)
+            self._sampler.start()
+            threading.setprofile(self._adopt_thread)
+
+    def _thread_profile(self, stage_key: StageKey) -> cProfile.Profile:
+        """The calling thread's profile for a stage (cProfile only sees the thread that enabled it)."""
+        profiles = self._local.__dict__.setdefault('profiles', {})
+        if stage_key not in profiles:
+            profiles[stage_key] = cProfile.Profile()
+            with self._lock:
+                self.profiles.setdefault(stage_key, []).append(profiles[stage_key])
+        return profiles[stage_key]
+
+    @staticmethod
+    def _enable(profile: cProfile.Profile):
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+: another thread's stage holds the single profiler slot
+            pass
+
+    def _adopt_thread(self, frame: Any, event: str, arg: Any):
+        """Profile hook run once by each new thread: attribute it to the most recently entered stage."""
+        sys.setprofile(None)
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._entered.pop(thread_id, None)
+            stage_key = next(reversed(self._entered.values()), None)
+            if stage_key is None:
+                self._adopted.pop(thread_id, None)
+                return
+            self._adopted[thread_id] = stage_key
+        self._local.stack = [stage_key]
+        if PER_THREAD_PROFILES:
+            self._thread_profile(stage_key).enable()
+
+    def _sampled_stages(self) -> Dict[int, StageKey]:
+        """Stage of every thread to sample (adopted threads only while their stage is still active)."""
+        with self._lock:
+            active = set(self._entered.values())
+            stages = {thread_id: stage for thread_id, stage in self._adopted.items() if stage in active}
+            stages.update(self._entered)
+        return stages
+
+    @contextmanager
+    def stage(self, stage: str, key: str = 'default') -> Iterator[None]:
+        """
+        Profile a stage, attributed to a key (scenario, repository, ...).
+
+        Nested stages pause the enclosing stage's profile, so functions are
+        attributed to the innermost stage only; wall/CPU timings are inclusive.
+        """
+        if not self.enabled:
+            yield
+            return
+        self._start()
+
+        stage_key = (stage, str(key))
+        thread_id = threading.get_ident()
+        stack = self._local.__dict__.setdefault('stack', [])
+        outer = stack[-1] if stack else None
+        if outer is not None:
+            self._thread_profile(outer).disable()
+
+        profile = self._thread_profile(stage_key)
+        stack.append(stage_key)
+        with self._lock:
+            self._entered.pop(thread_id, None)  # re-inserted last: the stage new threads adopt
+            self._entered[thread_id] = stage_key
+            calls = self.timings.get(stage_key, {}).get('calls', 0)
+        sampled = self.track_allocations and calls % self.allocation_sample_every == 0
+        snapshot = tracemalloc.take_snapshot() if sampled else None
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        self._enable(profile)
+        try:
+            yield
+        finally:
+            profile.disable()
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            stack.pop()
+            growth = Counter()
+            if snapshot is not None:
+                for stat in tracemalloc.take_snapshot().compare_to(snapshot, 'lineno')[:TOP_ALLOCATIONS]:
+                    if stat.size_diff > 0:
+                        growth[str(stat.traceback[0])] += stat.size_diff
+
+            with self._lock:
+                self._entered.pop(thread_id, None)
+                if outer is not None and thread_id not in self._adopted:
+                    self._entered[thread_id] = outer
+                timing = self.timings.setdefault(stage_key, {'calls': 0, 'wall_sec': 0.0, 'cpu_sec': 0.0})
+                timing['calls'] += 1
+                timing['wall_sec'] += wall
+                timing['cpu_sec'] += cpu
+                if snapshot is not None:
+                    self.allocations.setdefault(stage_key, Counter()).update(growth)
+                    self.allocation_samples[stage_key] += 1
+
+            if outer is not None:
+                self._enable(self._thread_profile(outer))
+
+    def stop(self):
+        """Stop sampling, profiling new threads and allocation tracing."""
+        if self._sampler is not None:
+            threading.setprofile(None)
+            self._sampler.stopped.set()
+            self._sampler.join()
+            self._sampler = None
+        if self.track_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def write(self, prefix: str = 'profile') -> Optional[Path]:
+        """
+        Write all profile files and the summary.
+
+        Returns:
+            Path of profile-summary.json, or None when disabled
+        """
+        if not self.enabled:
+            return None
+        self.stop()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        summary = []
+        for stage_key, timing in self.timings.items():
+            stage, key = stage_key
+            base = self.output_dir / f'{_safe_name(prefix)}.{_safe_name(stage)}.{_safe_name(key)}'
+
+            stats = self._stage_stats(stage_key)
+            stats.dump_stats(str(base) + '.prof')
+
+            stacks = self.stacks.get(stage_key, Counter())
+            with open(str(base) + '.folded', 'w', encoding='utf-8') as f:
+                for stack, count in stacks.most_common():
+                    f.write(f'{stack} {count}\n')
+
+            allocations = self.allocations.get(stage_key, Counter())
+            with open(str(base) + '.alloc.txt', 'w', encoding='utf-8') as f:
+                for location, size in allocations.most_common(TOP_ALLOCATIONS):
+                    f.write(f'{size / 1024:10.1f} KiB  {location}\n')
+
+            summary.append({
+                'stage': stage,
+                'key': key,
+                **timing,
+                'samples': sum(stacks.values()),
+                'allocated_kib': sum(allocations.values()) / 1024,
+                'allocation_samples': self.allocation_samples[stage_key],
+                'top_functions': self._top_functions(stats),
+                'files': {
+                    'cprofile': str(base) + '.prof',
+                    'folded': str(base) + '.folded',
+                    'allocations': str(base) + '.alloc.txt'
+                }
+            })
+
+        summary.sort(key=lambda s: s['cpu_sec'], reverse=True)
+        summary_file = self.output_dir / f'{_safe_name(prefix)}.profile-summary.json'
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'stages': summary}, f, indent=2)
+        return summary_file
+
+    def _stage_stats(self, stage_key: StageKey) -> Any:
+        """A stage's profiles from all threads merged into one pstats.Stats."""
+        import pstats  # only needed when profiles are written
+        stats = pstats.Stats(stream=io.StringIO())
+        for profile in self.profiles.get(stage_key, []):
+            profile.create_stats()
+            if profile.stats:
+                stats.add(profile)
+        return stats
+
+    def _top_functions(self, stats: Any) -> List[Dict[str, Any]]:
+        if not stats.stats:
+            return []
+        ranked = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]
+        return [
+            {'function': f'{name} ({Path(filename).name}:{line})', 'calls': calls,
+             'tottime': tottime, 'cumtime': cumtime}
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in ranked
+        ]
+
+    def print_summary(self, limit: int = 5):
+        """Print the costliest stages."""
+        if not self.enabled or not self.timings:
+            return
+        print(f"\n🔬 Profile: costliest stages")
+        ranked = sorted(self.timings.items(), key=lambda item: item[1]['cpu_sec'], reverse=True)
+        for (stage, key), timing in ranked[:limit]:
+            print(f"   • {stage} [{key}]: {timing['cpu_sec']:.3f}s CPU, {timing['wall_sec']:.3f}s wall, {timing['calls']} call(s)")
+
+
+def add_profile_argument(parser: Any):
+    """Add the standard --profile [DIR] option to an argparse parser."""
+    parser.add_argument(
+        '--profile', nargs='?', const=DEFAULT_PROFILE_DIR, default=None, metavar='DIR',
+        help=f'capture per-stage CPU profiles, flamegraph stacks and allocation snapshots into DIR (default: {DEFAULT_PROFILE_DIR})'
+    )
+
+
+def profiler_from_args(args: Any) -> Profiler:
+    """Build a Profiler from parsed --profile arguments (disabled when absent)."""
+    return Profiler(args.profile, enabled=args.profile is not None)
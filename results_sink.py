@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Streaming Results Sink
+Appends each parse result as one compact NDJSON line as soon as it completes and
+keeps running aggregates, so ingestion memory stays flat regardless of run size and
+a crash loses at most the last unsynced lines instead of the whole run.
+
+Uses orjson when installed (pip install orjson), the standard json module otherwise.
+"""
+
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+DEFAULT_FSYNC_EVERY = 100
+DEFAULT_FSYNC_INTERVAL_SEC = 2.0
+
+
+def dumps_line(record: Dict[str, Any]) -> bytes:
+    """Serialize a record as one compact JSON line (newline included)."""
+    if orjson is not None:
+        return orjson.dumps(record, default=str, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(record, separators=(',', ':'), default=str, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def loads_line(line: bytes) -> Dict[str, Any]:
+    """Parse one NDJSON line."""
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+
+def iter_results(path: Any, session_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Read results back from an NDJSON file, optionally for one session only.
+
+    A truncated last line (from a crash mid-write) is skipped.
+    """
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            record = loads_line(line)
+            if session_id is None or record.get('session_id') == session_id:
+                yield record
+
+
+class ResultsSink:
+    """Append-only NDJSON result writer with running aggregates."""
+
+    def __init__(self, path: Any, fsync_every: int = DEFAULT_FSYNC_EVERY,
+                 fsync_interval: float = DEFAULT_FSYNC_INTERVAL_SEC, session_id: Optional[str] = None):
+        """
+        Open (or create) the results file for appending.
+
+        Args:
+            path: NDJSON file the results are appended to
+            fsync_every: Force the file to disk after this many results
+            fsync_interval: ... or after this many seconds, whichever comes first
+            session_id: Tag added to every line of this session (generated when omitted)
+        """
+        self.path = Path(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.session_id = session_id or f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self._file = open(self.path, 'ab', buffering=1 << 16)
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+        # Running aggregates
+        self.results = 0
+        self.successes = 0
+        self.failures = 0
+        self.test_cases = 0
+        self.parse_time_total = 0.0
+        self.bytes_written = 0
+        self.frameworks: Dict[str, int] = {}
+        self.repositories: Dict[str, Dict[str, int]] = {}
+
+    def write(self, result: Dict[str, Any]):
+        """Append one parse result and fold it into the aggregates."""
+        line = dumps_line({'session_id': self.session_id, 'recorded_at': time.time(), **result})
+        self._file.write(line)
+        self.bytes_written += len(line)
+
+        self.results += 1
+        self.parse_time_total += result.get('parse_time', 0.0)
+        repo = self.repositories.setdefault(result.get('repo_name', ''), {'results': 0, 'failures': 0, 'test_cases': 0})
+        repo['results'] += 1
+        if result.get('success'):
+            self.successes += 1
+            self.test_cases += result.get('test_count', 0)
+            repo['test_cases'] += result.get('test_count', 0)
+            framework = result.get('framework')
+            if framework:
+                self.frameworks[framework] = self.frameworks.get(framework, 0) + 1
+        else:
+            self.failures += 1
+            repo['failures'] += 1
+
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._synced_at >= self.fsync_interval:
+            self.flush()
+
+    def flush(self, fsync: bool = True):
+        """Flush buffered lines, and by default force them to disk."""
+        self._file.flush()
+        if fsync:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregates of everything written in this session."""
+        return {
+            'results_file': str(self.path),
+            'session_id': self.session_id,
+            'results': self.results,
+            'successes': self.successes,
+            'failures': self.failures,
+            'test_cases': self.test_cases,
+            'avg_parse_time': self.parse_time_total / self.results if self.results else 0.0,
+            'frameworks': dict(self.frameworks),
+            'repositories': {name: dict(stats) for name, stats in self.repositories.items()},
+            'serializer': 'orjson' if orjson is not None else 'json'
+        }
+
+    def close(self):
+        """Flush, sync and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> 'ResultsSink':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
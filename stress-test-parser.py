@@ -12,24 +12,35 @@ Tests parsing robustness with various scenarios including:
 import os
 import sys
 import json
+import argparse
 import time
 import random
 import string
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 # Add the test parser to Python path
 parser_path = Path(r'C:\autotest\test-parser-mvp')
 sys.path.insert(0, str(parser_path))
 
-from core.parser_orchestrator import get_orchestrator
-from models import ParseRequest, TestStatus
+from lazy_imports import get_orchestrator, parse_request
+
+from profiling import Profiler, add_profile_argument, profiler_from_args
+from structured_log import configure_logging_from_env, get_logger
+from fair_scheduler import configure_scheduler_from_env, get_scheduler
+
+# Local report corpus produced by download_test_reports.py
+TESTDATA_DIR = Path(__file__).resolve().parent / 'testdata'
 
 class ParserStressTester:
     """Comprehensive stress tester for the parser system."""
     
-    def __init__(self):
+    def __init__(self, profiler: Optional[Profiler] = None):
         self.orchestrator = get_orchestrator()
+        self.scheduler = get_scheduler()
+        self.profiler = profiler or Profiler(enabled=False)
+        self._root_log = get_logger('stress')
+        self.log = self._root_log
         self.results = {
             'total_tests': 0,
             'passed_tests': 0,
@@ -53,16 +64,18 @@ class ParserStressTester:
             ("Unicode/Encoding", self.test_unicode_content),
             ("Memory Stress", self.test_memory_stress),
             ("Timeout Scenarios", self.test_timeout_scenarios),
-            ("Mixed Frameworks", self.test_mixed_frameworks)
+            ("Mixed Frameworks", self.test_mixed_frameworks),
+            ("Corpus Files", self.test_corpus_files)
         ]
         
-        for scenario_name, test_func in scenarios:
-            print(f"\n🔍 Testing: {scenario_name}")
-            print("-" * 30)
+        for scenario_index, (scenario_name, test_func) in enumerate(scenarios, 1):
+            self.log = self._root_log.bind(scenario=scenario_name)
+            self.log.info('scenario.start', f"\n🔍 Testing: {scenario_name}\n" + "-" * 30)
             
             try:
                 start_time = time.time()
-                results = test_func()
+                with self.profiler.stage('scenario', scenario_name):
+                    results = test_func()
                 end_time = time.time()
                 
                 self.results['scenarios'][scenario_name] = {
@@ -70,14 +83,19 @@ class ParserStressTester:
                     'results': results
                 }
                 
-                print(f"✅ {scenario_name}: {results['passed']}/{results['total']} passed ({end_time - start_time:.2f}s)")
+                self.log.info('scenario.done', f"✅ {scenario_name}: {results['passed']}/{results['total']} passed ({end_time - start_time:.2f}s)",
+                              passed=results['passed'], total=results['total'], duration=end_time - start_time)
                 
             except Exception as e:
-                print(f"❌ {scenario_name}: Exception - {str(e)}")
+                self.log.error('scenario.error', f"❌ {scenario_name}: Exception - {str(e)}", error=str(e))
                 self.results['scenarios'][scenario_name] = {
                     'error': str(e)
                 }
+            
+            self._root_log.progress(scenario_index, len(scenarios))
         
+        self.log = self._root_log
+        self.log.flush()
         self.print_summary()
     
     def test_normal_reports(self) -> Dict[str, int]:
@@ -114,10 +132,10 @@ Database connection failed
         results['total'] += 1
         if result['success']:
             results['passed'] += 1
-            print(f"   ✅ JUnit XML: {result['data']['totals']['total']} tests parsed")
+            self.log.info('case.ok', f"   ✅ JUnit XML: {result['data']['totals']['total']} tests parsed")
         else:
             results['failed'] += 1
-            print(f"   ❌ JUnit XML: {result['error']}")
+            self.log.error('case.failed', f"   ❌ JUnit XML: {result['error']}")
         
         # Pytest JSON with mixed results
         pytest_json = {
@@ -159,10 +177,10 @@ Database connection failed
         results['total'] += 1
         if result['success']:
             results['passed'] += 1
-            print(f"   ✅ Pytest JSON: {result['data']['totals']['total']} tests parsed")
+            self.log.info('case.ok', f"   ✅ Pytest JSON: {result['data']['totals']['total']} tests parsed")
         else:
             results['failed'] += 1
-            print(f"   ❌ Pytest JSON: {result['error']}")
+            self.log.error('case.failed', f"   ❌ Pytest JSON: {result['error']}")
         
         # Jest JSON with mixed results
         jest_json = {
@@ -204,10 +222,10 @@ Database connection failed
         results['total'] += 1
         if result['success']:
             results['passed'] += 1
-            print(f"   ✅ Jest JSON: {result['data']['totals']['total']} tests parsed")
+            self.log.info('case.ok', f"   ✅ Jest JSON: {result['data']['totals']['total']} tests parsed")
         else:
             results['failed'] += 1
-            print(f"   ❌ Jest JSON: {result['error']}")
+            self.log.error('case.failed', f"   ❌ Jest JSON: {result['error']}")
         
         return results
     
@@ -237,10 +255,10 @@ Database connection failed
             result = self._parse_content(corrupted_xml, 'junit', f'corrupted-{i}.xml')
             
             if result['success']:
-                print(f"   ⚠️  Corrupted XML {i+1}: Unexpectedly parsed successfully")
+                self.log.warning('case.unexpected', f"   ⚠️  Corrupted XML {i+1}: Unexpectedly parsed successfully")
                 results['passed'] += 1
             else:
-                print(f"   ✅ Corrupted XML {i+1}: Correctly rejected - {result['error'][:50]}...")
+                self.log.info('case.ok', f"   ✅ Corrupted XML {i+1}: Correctly rejected - {result['error'][:50]}...")
                 results['passed'] += 1  # Rejection is the correct behavior
         
         return results
@@ -271,10 +289,10 @@ Database connection failed
             result = self._parse_content(malformed_json, 'pytest', f'malformed-{i}.json')
             
             if result['success']:
-                print(f"   ⚠️  Malformed JSON {i+1}: Unexpectedly parsed successfully")
+                self.log.warning('case.unexpected', f"   ⚠️  Malformed JSON {i+1}: Unexpectedly parsed successfully")
                 results['passed'] += 1
             else:
-                print(f"   ✅ Malformed JSON {i+1}: Correctly rejected - {result['error'][:50]}...")
+                self.log.info('case.ok', f"   ✅ Malformed JSON {i+1}: Correctly rejected - {result['error'][:50]}...")
                 results['passed'] += 1  # Rejection is the correct behavior
         
         return results
@@ -283,7 +301,7 @@ Database connection failed
         """Test with very large report files."""
         results = {'total': 0, 'passed': 0, 'failed': 0}
         
-        print("   🔄 Generating large test reports...")
+        self.log.info('scenario.step', "   🔄 Generating large test reports...")
         
         # Test 1: Large JUnit XML (5MB)
         large_junit = self._generate_large_junit_xml(5000)  # 5000 test cases
@@ -294,10 +312,10 @@ Database connection failed
         
         if result['success']:
             results['passed'] += 1
-            print(f"   ✅ Large JUnit (5K tests): Parsed in {parse_time:.2f}s")
+            self.log.info('case.ok', f"   ✅ Large JUnit (5K tests): Parsed in {parse_time:.2f}s")
         else:
             results['failed'] += 1
-            print(f"   ❌ Large JUnit: {result['error']}")
+            self.log.error('case.failed', f"   ❌ Large JUnit: {result['error']}")
         
         # Test 2: Large Pytest JSON (3MB)
         large_pytest = self._generate_large_pytest_json(3000)  # 3000 test cases
@@ -308,10 +326,10 @@ Database connection failed
         
         if result['success']:
             results['passed'] += 1
-            print(f"   ✅ Large Pytest (3K tests): Parsed in {parse_time:.2f}s")
+            self.log.info('case.ok', f"   ✅ Large Pytest (3K tests): Parsed in {parse_time:.2f}s")
         else:
             results['failed'] += 1
-            print(f"   ❌ Large Pytest: {result['error']}")
+            self.log.error('case.failed', f"   ❌ Large Pytest: {result['error']}")
         
         # Test 3: Oversized file (>10MB) - should be rejected
         oversized_content = b'x' * (11 * 1024 * 1024)  # 11MB
@@ -320,10 +338,10 @@ Database connection failed
         
         if not result['success'] and 'limit' in result['error'].lower():
             results['passed'] += 1
-            print(f"   ✅ Oversized file: Correctly rejected - {result['error']}")
+            self.log.info('case.ok', f"   ✅ Oversized file: Correctly rejected - {result['error']}")
         else:
             results['failed'] += 1
-            print(f"   ❌ Oversized file: Should have been rejected")
+            self.log.error('case.failed', f"   ❌ Oversized file: Should have been rejected")
         
         return results
     
@@ -364,15 +382,15 @@ Database connection failed
             if result['success']:
                 results['passed'] += 1
                 test_count = result['data']['totals']['total']
-                print(f"   ✅ {case_name}: {test_count} tests parsed")
+                self.log.info('case.ok', f"   ✅ {case_name}: {test_count} tests parsed")
             else:
                 # For edge cases, both success and controlled failure are acceptable
                 if 'invalid' in result['error'].lower() or 'format' in result['error'].lower():
                     results['passed'] += 1
-                    print(f"   ✅ {case_name}: Correctly handled - {result['error'][:40]}...")
+                    self.log.info('case.ok', f"   ✅ {case_name}: Correctly handled - {result['error'][:40]}...")
                 else:
                     results['failed'] += 1
-                    print(f"   ❌ {case_name}: Unexpected error - {result['error'][:40]}...")
+                    self.log.error('case.failed', f"   ❌ {case_name}: Unexpected error - {result['error'][:40]}...")
         
         return results
     
@@ -395,10 +413,10 @@ Database connection failed
             
             if not result['success']:
                 results['passed'] += 1
-                print(f"   ✅ {case_name}: Correctly rejected")
+                self.log.info('case.ok', f"   ✅ {case_name}: Correctly rejected")
             else:
                 results['failed'] += 1
-                print(f"   ❌ {case_name}: Should have been rejected")
+                self.log.error('case.failed', f"   ❌ {case_name}: Should have been rejected")
         
         return results
     
@@ -425,10 +443,10 @@ Stack trace with unicode: файл.py:42
         
         if result['success']:
             results['passed'] += 1
-            print(f"   ✅ Unicode XML: {result['data']['totals']['total']} tests with Unicode names")
+            self.log.info('case.ok', f"   ✅ Unicode XML: {result['data']['totals']['total']} tests with Unicode names")
         else:
             results['failed'] += 1
-            print(f"   ❌ Unicode XML: {result['error']}")
+            self.log.error('case.failed', f"   ❌ Unicode XML: {result['error']}")
         
         return results
     
@@ -436,7 +454,7 @@ Stack trace with unicode: файл.py:42
         """Test memory usage with multiple large files."""
         results = {'total': 0, 'passed': 0, 'failed': 0}
         
-        print("   🔄 Testing memory stress with multiple large files...")
+        self.log.info('scenario.step', "   🔄 Testing memory stress with multiple large files...")
         
         # Parse multiple large files in sequence
         for i in range(5):
@@ -449,10 +467,10 @@ Stack trace with unicode: файл.py:42
             
             if result['success']:
                 results['passed'] += 1
-                print(f"   ✅ Memory test {i+1}: Parsed 1K tests in {parse_time:.2f}s")
+                self.log.info('case.ok', f"   ✅ Memory test {i+1}: Parsed 1K tests in {parse_time:.2f}s")
             else:
                 results['failed'] += 1
-                print(f"   ❌ Memory test {i+1}: {result['error']}")
+                self.log.error('case.failed', f"   ❌ Memory test {i+1}: {result['error']}")
         
         return results
     
@@ -460,7 +478,7 @@ Stack trace with unicode: файл.py:42
         """Test timeout handling (simulated with very large files)."""
         results = {'total': 0, 'passed': 0, 'failed': 0}
         
-        print("   ⏱️  Testing timeout scenarios...")
+        self.log.info('scenario.step', "   ⏱️  Testing timeout scenarios...")
         
         # Create an extremely large file that might timeout
         huge_content = self._generate_large_junit_xml(10000)  # 10K tests
@@ -472,13 +490,13 @@ Stack trace with unicode: файл.py:42
         
         if result['success']:
             results['passed'] += 1
-            print(f"   ✅ Huge file: Parsed 10K tests in {parse_time:.2f}s (within timeout)")
+            self.log.info('case.ok', f"   ✅ Huge file: Parsed 10K tests in {parse_time:.2f}s (within timeout)")
         elif 'timeout' in result['error'].lower():
             results['passed'] += 1
-            print(f"   ✅ Huge file: Correctly timed out after {parse_time:.2f}s")
+            self.log.info('case.ok', f"   ✅ Huge file: Correctly timed out after {parse_time:.2f}s")
         else:
             results['failed'] += 1
-            print(f"   ❌ Huge file: Unexpected error - {result['error']}")
+            self.log.error('case.failed', f"   ❌ Huge file: Unexpected error - {result['error']}")
         
         return results
     
@@ -502,19 +520,45 @@ Stack trace with unicode: файл.py:42
                 detected_framework = result['data']['framework']
                 if detected_framework == expected_framework:
                     results['passed'] += 1
-                    print(f"   ✅ {framework_name}: Correctly detected as {detected_framework}")
+                    self.log.info('case.ok', f"   ✅ {framework_name}: Correctly detected as {detected_framework}")
                 else:
                     results['failed'] += 1
-                    print(f"   ❌ {framework_name}: Expected {expected_framework}, got {detected_framework}")
+                    self.log.error('case.failed', f"   ❌ {framework_name}: Expected {expected_framework}, got {detected_framework}")
+            else:
+                results['failed'] += 1
+                self.log.error('case.failed', f"   ❌ {framework_name}: Parse failed - {result['error']}")
+        
+        return results
+    
+    def test_corpus_files(self) -> Dict[str, int]:
+        """Test with the local report corpus, read from testdata/."""
+        results = {'total': 0, 'passed': 0, 'failed': 0}
+        
+        corpus_files = sorted(p for p in TESTDATA_DIR.rglob('*') if p.is_file()) if TESTDATA_DIR.exists() else []
+        if not corpus_files:
+            self.log.warning('case.unexpected', f"   ⚠️  No corpus files found in {TESTDATA_DIR}")
+            return results
+        
+        for path in corpus_files:
+            category = path.parent.name
+            results['total'] += 1
+            result = self._parse_content(path.read_bytes(), 'auto', path.name)
+            
+            if result['success']:
+                results['passed'] += 1
+                self.log.info('case.ok', f"   ✅ {category}/{path.name}: {result['data']['totals']['total']} tests parsed")
+            elif category in ('invalid', 'edge') or path.suffix not in ('.xml', '.json', '.trx', '.tap'):
+                results['passed'] += 1  # Rejection is the correct behavior
+                self.log.info('case.ok', f"   ✅ {category}/{path.name}: Correctly rejected - {result['error'][:50]}...")
             else:
                 results['failed'] += 1
-                print(f"   ❌ {framework_name}: Parse failed - {result['error']}")
+                self.log.error('case.failed', f"   ❌ {category}/{path.name}: {result['error']}")
         
         return results
     
     def _parse_content(self, content: bytes, format_hint: str, filename: str) -> Dict[str, Any]:
         """Parse content and return structured result."""
-        request = ParseRequest(
+        request = parse_request(
             tenant_id="stress-test",
             project_id="stress-test",
             report_type=format_hint if format_hint != 'auto' else None,
@@ -523,8 +567,9 @@ Stack trace with unicode: файл.py:42
         
         start_time = time.time()
         try:
-            response = self.orchestrator.parse_report(content, request)
-            parse_time = time.time() - start_time
+            with self.scheduler.slot(request.tenant_id, len(content)) as queue_wait:
+                response = self.orchestrator.parse_report(content, request)
+            parse_time = time.time() - start_time - queue_wait
             self.results['parse_times'].append(parse_time)
             
             return {
@@ -739,10 +784,54 @@ Stack trace with unicode: файл.py:42
         print(f"   • Assessed memory usage")
         print(f"   • Checked timeout protection")
 
-def main():
-    """Run the stress test suite."""
-    tester = ParserStressTester()
+def run_fuzzer(args):
+    """Fuzz the parser with mutants of the local corpus and report pathological inputs."""
+    from parser_fuzzer import DEFAULT_TARGET, DEFAULT_TIMEOUT_SEC, ParserFuzzer, load_corpus
+    seeds = load_corpus([TESTDATA_DIR / 'valid', TESTDATA_DIR / 'edge'])
+    fuzzer = ParserFuzzer(seeds, target=args.fuzz_target or DEFAULT_TARGET, workers=args.fuzz_workers,
+                          timeout=args.fuzz_timeout or DEFAULT_TIMEOUT_SEC, findings_dir=args.fuzz_output)
+    print(f"🧨 Fuzzing {fuzzer.target} for {args.fuzz:.0f}s with {fuzzer.workers} workers "
+          f"({len(seeds)} seeds)")
+    fuzzer.fit_baseline()
+
+    def report(finding):
+        print(f"   ⚠️  {finding['reason']}: {'+'.join(finding['mutators']) or 'seed'} on {Path(finding['seed']).name} "
+              f"({finding['size']:,} bytes, {finding['seconds']:.2f}s, {finding['peak'] / 1024 ** 2:.1f}MB) "
+              f"-> {finding['input']}")
+
+    summary = fuzzer.fuzz(duration=args.fuzz, on_finding=report)
+    print(f"\n📊 {summary['executions']:,} inputs in {summary['elapsed']:.0f}s "
+          f"({summary['execs_per_sec']:.1f}/s), outcomes: {summary['outcomes']}")
+    if summary['findings']:
+        print(f"⚠️  {summary['findings']} findings {summary['flagged']} written to {summary['findings_dir']}")
+    else:
+        print("✅ No pathological inputs found")
+
+def main(argv: Optional[List[str]] = None):
+    """Run the stress test suite (argv defaults to the command line)."""
+    parser = argparse.ArgumentParser(description="Comprehensive Parser Stress Test Suite")
+    add_profile_argument(parser)
+    parser.add_argument('--fuzz', type=float, metavar='SECONDS',
+                        help='fuzz the parser with mutated corpus reports for this long instead of the test scenarios')
+    parser.add_argument('--fuzz-workers', type=int, help='sandboxed fuzzing worker processes (default: CPU count)')
+    parser.add_argument('--fuzz-timeout', type=float, help='seconds before a parse counts as a hang (default: 10)')
+    parser.add_argument('--fuzz-target', help="parse function as 'module:function' (default: the parser orchestrator)")
+    parser.add_argument('--fuzz-output', default='fuzz-findings', help='directory for flagged inputs')
+    args = parser.parse_args(argv)
+    profiler = profiler_from_args(args)
+    configure_scheduler_from_env()
+    configure_logging_from_env()
+    
+    if args.fuzz:
+        run_fuzzer(args)
+        return
+    
+    tester = ParserStressTester(profiler=profiler)
     tester.run_all_tests()
+    profile_file = profiler.write('stress-test')
+    if profile_file:
+        profiler.print_summary()
+        print(f"🔬 Profiles written to: {profile_file.parent} (summary: {profile_file.name})")
 
 if __name__ == "__main__":
     main()
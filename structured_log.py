@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Structured Logging
+Leveled, buffered event logging for the ingestion system, demo loader, fetcher and
+stress suite, replacing per-artifact print() calls.
+
+Events are rendered either as the familiar console lines or as JSON lines, and are
+written in batches by a background thread through a bounded buffer, so logging
+never blocks the pipeline: when the buffer is full, events are dropped and counted.
+Repetitive per-item events are sampled (the first N of each event, then every Mth),
+while warnings and errors are always kept. A rate-limited progress line summarizes
+long runs.
+
+Environment:
+    AUTOTEST_LOG_FORMAT=text|json    output format (default: text)
+    AUTOTEST_LOG_LEVEL=info          minimum level (debug, info, warning, error)
+    AUTOTEST_LOG_FILE=path           write to a file instead of stdout
+    AUTOTEST_LOG_SAMPLE=100          keep every Nth repetitive event (1 keeps all)
+"""
+
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, TextIO
+
+LEVELS = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+
+DEFAULT_BUFFER_SIZE = 10_000
+DEFAULT_BATCH_SIZE = 512
+DEFAULT_SAMPLE_AFTER = 20
+DEFAULT_SAMPLE_EVERY = 100
+DEFAULT_PROGRESS_INTERVAL = 5.0
+
+_CLOSE = object()
+
+
+class LogWriter:
+    """Bounded, batching writer that drains log lines from a background thread."""
+
+    def __init__(self, stream: Optional[TextIO] = None, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.stream = stream
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self._closed = False
+        self._start()
+        _writers.add(self)
+
+    def _start(self):
+        self.dropped = 0
+        self._stream_lock = threading.Lock()
+        self._queue: 'queue.Queue[Any]' = queue.Queue(maxsize=self.buffer_size)
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def write(self, line: str):
+        """Queue a line without blocking; drops it when the buffer is full."""
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch: List[str] = []
+            closing = False
+            while True:
+                if item is _CLOSE:
+                    closing = True
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                if batch:
+                    with self._stream_lock:
+                        # Resolve stdout at write time so redirections (and pytest capture) are honoured
+                        stream = self.stream or sys.stdout
+                        stream.write('\n'.join(batch) + '\n')
+                        stream.flush()
+            except Exception:
+                # A failing stream (closed file, full disk) loses the batch, not the writer thread
+                self.dropped += len(batch)
+            finally:
+                # flush() waits on these, so they are marked done whatever happened
+                for _ in range(len(batch) + closing):
+                    self._queue.task_done()
+            if closing:
+                return
+            if len(batch) < self.batch_size:
+                # Let more lines accumulate instead of waking per event
+                time.sleep(0.01)
+
+    def flush(self):
+        """Block until every queued line has been written."""
+        self._queue.join()
+
+    def reopen(self, stream: Optional[TextIO] = None) -> Optional[TextIO]:
+        """
+        Flush and switch to another stream, keeping this writer (and the loggers
+        holding it) usable; restarts a closed writer.
+
+        Returns:
+            The previous stream, which is no longer written to
+        """
+        if self._closed or not self._thread.is_alive():
+            self._closed = False
+            self._start()
+        else:
+            self.flush()
+        with self._stream_lock:
+            previous, self.stream = self.stream, stream
+        return previous
+
+    def close(self):
+        """Flush and stop the writer thread."""
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_CLOSE)
+            self._thread.join()
+
+
+# Writers whose thread must be restarted in forked children (e.g. run_worker_pool workers)
+_writers: 'weakref.WeakSet[LogWriter]' = weakref.WeakSet()
+
+
+def _before_fork():
+    # Drain queued lines (and the stream's buffer) so a child neither loses nor repeats them
+    for writer in list(_writers):
+        if not writer._closed and writer._thread.is_alive():
+            writer.flush()
+
+
+def _after_fork_in_child():
+    # Only the forking thread survives fork: give each open writer a fresh queue and thread
+    for writer in list(_writers):
+        if not writer._closed:
+            writer._start()
+
+
+os.register_at_fork(before=_before_fork, after_in_child=_after_fork_in_child)
+
+
+class StructuredLogger:
+    """Leveled event logger with per-event sampling and context fields."""
+
+    def __init__(self, component: str, writer: LogWriter, level: str = 'info', fmt: str = 'text',
+                 sample_after: int = DEFAULT_SAMPLE_AFTER, sample_every: int = DEFAULT_SAMPLE_EVERY,
+                 context: Optional[Dict[str, Any]] = None, _shared: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the logger.
+
+        Args:
+            component: Name of the emitting component (ingestion, loader, ...)
+            writer: Writer the rendered lines are queued to
+            level: Minimum level that is emitted
+            fmt: 'text' for console lines, 'json' for JSON lines
+            sample_after: Occurrences of an info/debug event always emitted
+            sample_every: Afterwards, emit every Nth occurrence (1 disables sampling)
+            context: Fields added to every event
+        """
+        self.component = component
+        self.writer = writer
+        self.level = LEVELS[level]
+        self.fmt = fmt
+        self.sample_after = sample_after
+        self.sample_every = max(1, sample_every)
+        self.context = context or {}
+        # Sampling counters and progress timing are shared with bound children
+        self._shared = _shared if _shared is not None else {'seen': {}, 'suppressed': {}, 'progress_at': 0.0}
+
+    def bind(self, **context: Any) -> 'StructuredLogger':
+        """Child logger that adds fields to every event."""
+        return StructuredLogger(self.component, self.writer, self._level_name(), self.fmt,
+                                self.sample_after, self.sample_every, {**self.context, **context}, self._shared)
+
+    def _level_name(self) -> str:
+        return next(name for name, value in LEVELS.items() if value == self.level)
+
+    def enabled_for(self, level: str) -> bool:
+        return LEVELS[level] >= self.level
+
+    def log(self, level: str, event: str, message: str = '', **fields: Any):
+        """
+        Emit an event.
+
+        Args:
+            level: debug, info, warning or error
+            event: Stable event name (e.g. 'artifact.parsed'), the sampling key
+            message: Human-readable console line
+            **fields: Structured fields (rendered in JSON output only)
+        """
+        level_value = LEVELS[level]
+        if level_value < self.level:
+            return
+        if level_value < LEVELS['warning']:
+            seen = self._shared['seen']
+            count = seen.get(event, 0) + 1
+            seen[event] = count
+            if count > self.sample_after and (count - self.sample_after) % self.sample_every:
+                suppressed = self._shared['suppressed']
+                suppressed[event] = suppressed.get(event, 0) + 1
+                return
+        self._emit(level, event, message, fields)
+
+    def _emit(self, level: str, event: str, message: str, fields: Dict[str, Any]):
+        if self.fmt == 'json':
+            record = {'ts': round(time.time(), 3), 'level': level, 'component': self.component,
+                      'event': event, 'msg': message.strip(), **self.context, **fields}
+            self.writer.write(json.dumps(record, default=str, ensure_ascii=False))
+        else:
+            self.writer.write(message)
+
+    def debug(self, event: str, message: str = '', **fields: Any):
+        self.log('debug', event, message, **fields)
+
+    def info(self, event: str, message: str = '', **fields: Any):
+        self.log('info', event, message, **fields)
+
+    def warning(self, event: str, message: str = '', **fields: Any):
+        self.log('warning', event, message, **fields)
+
+    def error(self, event: str, message: str = '', **fields: Any):
+        self.log('error', event, message, **fields)
+
+    def progress(self, done: int, total: Optional[int] = None, force: bool = False,
+                 interval: float = DEFAULT_PROGRESS_INTERVAL, **counters: Any):
+        """
+        Emit a progress summary line, at most once per interval (and always at completion).
+
+        Args:
+            done: Units of work completed
+            total: Units of work expected, when known
+            force: Emit regardless of the interval
+            **counters: Running totals to include (runs, artifacts, tests, ...)
+        """
+        if not self.enabled_for('info'):
+            return
+        now = time.monotonic()
+        finished = total is not None and done >= total
+        if not (force or finished) and now - self._shared['progress_at'] < interval:
+            return
+        self._shared['progress_at'] = now
+        position = f"{done}/{total}" if total is not None else str(done)
+        details = ''.join(f" | {name} {value}" for name, value in counters.items())
+        # Already rate limited, so progress bypasses sampling
+        self._emit('info', 'progress', f"   ⏳ Progress {position}{details}",
+                   {'done': done, 'total': total, **counters})
+
+    def sampled(self) -> Dict[str, int]:
+        """Number of events suppressed by sampling, per event name."""
+        return dict(self._shared['suppressed'])
+
+    def flush(self):
+        """Write out everything logged so far (call before printing summaries)."""
+        suppressed = self._shared['suppressed']
+        if suppressed:
+            total = sum(suppressed.values())
+            self._emit('info', 'log.sampled',
+                       f"   … {total} repetitive log line(s) sampled out ({', '.join(sorted(suppressed))})",
+                       {'suppressed': dict(suppressed)})
+            suppressed.clear()
+        if self.writer.dropped:
+            self._emit('warning', 'log.dropped', f"   ⚠️  {self.writer.dropped} log line(s) dropped (buffer full)",
+                       {'dropped': self.writer.dropped})
+            self.writer.dropped = 0
+        self.writer.flush()
+
+
+_writer: Optional[LogWriter] = None
+_settings: Dict[str, Any] = {'level': 'info', 'fmt': 'text', 'sample_every': DEFAULT_SAMPLE_EVERY}
+_lock = threading.Lock()
+
+
+def _get_writer() -> LogWriter:
+    global _writer
+    with _lock:
+        if _writer is None:
+            _writer = LogWriter()
+            atexit.register(_close_writer)
+        return _writer
+
+
+def _close_writer():
+    if _writer is not None:
+        _writer.close()
+
+
+def get_logger(component: str, **context: Any) -> StructuredLogger:
+    """Get a logger for a component using the process-wide writer and settings."""
+    return StructuredLogger(component, _get_writer(), _settings['level'], _settings['fmt'],
+                            sample_every=_settings['sample_every'], context=context)
+
+
+def configure_logging_from_env() -> Dict[str, Any]:
+    """Apply AUTOTEST_LOG_* settings; call before creating loggers."""
+    global _writer
+    fmt = os.getenv('AUTOTEST_LOG_FORMAT', 'text').lower()
+    level = os.getenv('AUTOTEST_LOG_LEVEL', 'info').lower()
+    _settings['fmt'] = fmt if fmt in ('text', 'json') else 'text'
+    _settings['level'] = level if level in LEVELS else 'info'
+    _settings['sample_every'] = int(os.getenv('AUTOTEST_LOG_SAMPLE', str(DEFAULT_SAMPLE_EVERY)))
+
+    log_file = os.getenv('AUTOTEST_LOG_FILE')
+    stream = open(log_file, 'a', encoding='utf-8', buffering=1 << 16) if log_file else None
+    with _lock:
+        if _writer is None:
+            _writer = LogWriter(stream)
+            atexit.register(_close_writer)
+            return dict(_settings)
+        # Reconfigured (e.g. per daemon job): loggers created earlier keep this writer
+        previous = _writer.reopen(stream)
+    if previous is not None:
+        previous.close()
+    return dict(_settings)
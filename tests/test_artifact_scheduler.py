@@ -0,0 +1,51 @@
+"""Tests for size-aware artifact scheduling."""
+
+import time
+
+from artifact_scheduler import ThroughputModel, execute, plan_artifacts
+
+
+class RecordingModel(ThroughputModel):
+    def __init__(self):
+        super().__init__()
+        self.observed = []
+
+    def observe(self, size, seconds):
+        self.observed.append((size, seconds))
+        super().observe(size, seconds)
+
+
+def test_queue_wait_and_failures_are_not_fed_to_the_throughput_model():
+    def process(artifact, streaming):
+        if artifact['name'] == 'broken':
+            raise OSError('download failed')
+        time.sleep(0.2)  # all of it spent waiting for a parse slot
+        return {'queue_wait': 0.2}
+
+    model = RecordingModel()
+    plan = plan_artifacts([{'name': 'junit', 'size_in_bytes': 1000}, {'name': 'broken', 'size_in_bytes': 5000}],
+                          workers=2, model=model)
+    outcomes = {artifact['name']: error for artifact, _, error in execute(plan, process, model)}
+
+    assert isinstance(outcomes['broken'], OSError)
+    [(size, seconds)] = model.observed
+    assert size == 1000 and seconds < 0.1
+    assert plan.report['actual_work'] < 0.1
+
+
+def test_artifacts_expected_to_overrun_the_deadline_are_not_started():
+    started = []
+
+    def process(artifact, streaming):
+        started.append(artifact['name'])
+        return {}
+
+    # 20 MiB/s: the 10 GiB artifact needs minutes, the small one milliseconds
+    model = ThroughputModel()
+    plan = plan_artifacts([{'name': 'small', 'size_in_bytes': 1000},
+                           {'name': 'huge', 'size_in_bytes': 10 * 1024 ** 3}], workers=2, model=model)
+    results = list(execute(plan, process, model, deadline=time.monotonic() + 5))
+
+    assert started == ['small'] and [a['name'] for a, _, _ in results] == ['small']
+    assert [a['name'] for a in plan.cancelled] == ['huge']
+    assert plan.report['cancelled'] == 1
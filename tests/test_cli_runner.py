@@ -0,0 +1,32 @@
+"""Tests for the in-process job daemon."""
+
+import urllib.error
+
+import pytest
+
+import cli_runner
+from cli_runner import JobDaemon, daemon_status, submit_job
+
+
+def test_job_daemon_requires_the_shared_token(monkeypatch):
+    ran = []
+    monkeypatch.setattr(cli_runner, 'run_captured', lambda command, argv=None, env=None: ran.append(
+        (command, argv, env)) or {'command': command, 'exit_code': 0, 'seconds': 0.0, 'output': ''})
+    with pytest.raises(ValueError):
+        JobDaemon('', port=0)
+    daemon = JobDaemon('secret', port=0).start()
+    try:
+        monkeypatch.delenv('AUTOTEST_DAEMON_TOKEN', raising=False)
+        with pytest.raises(urllib.error.HTTPError) as rejected:
+            submit_job(daemon.url, 'ingest', ['--max-runs', '1'], env={'GITHUB_TOKEN': 'x'})
+        assert rejected.value.code == 401
+        with pytest.raises(urllib.error.HTTPError):
+            daemon_status(daemon.url, token='guess')
+        assert ran == []
+
+        monkeypatch.setenv('AUTOTEST_DAEMON_TOKEN', 'secret')
+        assert submit_job(daemon.url, 'ingest', ['--max-runs', '1'])['exit_code'] == 0
+        assert daemon_status(daemon.url)['jobs'] == 1
+        assert ran == [('ingest', ['--max-runs', '1'], {})]
+    finally:
+        daemon.stop()
@@ -0,0 +1,32 @@
+"""Tests for the duration regression detector."""
+
+import pytest
+
+pytest.importorskip('numpy')
+
+import history_store  # noqa: E402
+from duration_regression import DurationRegressionDetector  # noqa: E402
+
+
+def cases(slow: float):
+    return [{'suite': 'api', 'name': 'test_fast', 'status': 'passed', 'duration': 0.2},
+            {'suite': 'api', 'name': 'test_slow', 'status': 'passed', 'duration': slow},
+            {'suite': 'api', 'name': 'test_skipped', 'status': 'skipped', 'duration': 0.0}]
+
+
+def test_fresh_detector_warmed_from_store_flags_slowdowns(tmp_path):
+    store = history_store.TestHistoryStore(tmp_path / 'history.db')
+    for n in range(8):
+        store.record_run('org-repo', cases(1.0 + 0.01 * n), started_at=1000.0 + n)
+
+    # A new worker process: baselines come from the database, not from its own earlier runs
+    cold = DurationRegressionDetector()
+    warm = DurationRegressionDetector()
+    assert warm.load_from_store(store, runs_per_project=6) == 6
+
+    recorded = store.record_run('org-repo', cases(5.0), started_at=2000.0)
+    assert cold.observe_run('org-repo', recorded['cases'], recorded['test_ids'])['case_regressions'] == []
+    regressions = warm.observe_run('org-repo', recorded['cases'], recorded['test_ids'])
+    assert [(r['name'], r['samples']) for r in regressions['case_regressions']] == [('test_slow', 6)]
+    assert [r['suite'] for r in regressions['suite_regressions']] == ['api']
+    store.close()
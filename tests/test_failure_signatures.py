@@ -0,0 +1,27 @@
+"""Tests for failure signature clustering."""
+
+from failure_signatures import FailureClusterIndex, failure_signature
+
+TRACEBACK = '''Traceback (most recent call last):
+  File "/home/ci/app/tests/test_client.py", line 42, in test_fetch
+    result = client.fetch(key)
+  File "/home/ci/app/client.py", line 17, in fetch
+    return self.cache[key]
+{error}'''
+
+
+def test_python_tracebacks_cluster_by_the_raised_exception():
+    index = FailureClusterIndex()
+    key_errors = {index.add(TRACEBACK.format(error=f"KeyError: 'user-{n}'")) for n in range(3)}
+    timeout = index.add(TRACEBACK.format(error='TimeoutError: timed out after 30.0s'))
+
+    assert len(key_errors) == 1
+    assert timeout not in key_errors
+    assert failure_signature(TRACEBACK.format(error="KeyError: 'user-1'")).splitlines()[1] == "KeyError: 'user-#'"
+
+
+def test_chained_python_tracebacks_use_the_last_exception():
+    chained = (TRACEBACK.format(error="KeyError: 'a'")
+               + '\n\nDuring handling of the above exception, another exception occurred:\n\n'
+               + TRACEBACK.format(error='myapp.errors.NotFound: no user a'))
+    assert failure_signature(chained).splitlines()[1] == 'myapp.errors.NotFound: no user a'
@@ -0,0 +1,76 @@
+"""Tests for weighted fair admission across tenants."""
+
+import threading
+import time
+
+from fair_scheduler import FairScheduler, TenantPolicy
+
+
+def wait_until(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.005)
+
+
+def queued(scheduler):
+    return sum(stats['queued'] for stats in scheduler.stats().values())
+
+
+def test_waiting_tenants_are_admitted_in_weighted_finish_order():
+    scheduler = FairScheduler(max_concurrency=1, policies={'interactive': TenantPolicy(weight=4)})
+    scheduler.acquire('holder')
+    order = []
+
+    def job(tenant, cost):
+        with scheduler.slot(tenant, cost):
+            order.append(tenant)
+
+    # Finish tags: interactive 25, 50, 75, 100 (weight 4); backfill 90, 180 (weight 1)
+    threads = [threading.Thread(target=job, args=(tenant, cost))
+               for tenant, cost in [('interactive', 100)] * 4 + [('backfill', 90)] * 2]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: queued(scheduler) == 6)
+    scheduler.release('holder')
+    for thread in threads:
+        thread.join(10)
+
+    assert order == ['interactive'] * 3 + ['backfill', 'interactive', 'backfill']
+    assert scheduler.stats()['backfill']['admitted'] == 2
+
+
+def test_concurrency_cap_holds_back_only_the_capped_tenant():
+    scheduler = FairScheduler(policies={'stress-test': TenantPolicy(max_concurrency=2)})
+    scheduler.acquire('stress-test')
+    scheduler.acquire('stress-test')
+    third = threading.Thread(target=scheduler.acquire, args=('stress-test',))
+    third.start()
+    wait_until(lambda: scheduler.stats()['stress-test']['queued'] == 1)
+
+    assert scheduler.acquire('pipeline-ingestion') < 0.5  # other tenants are not capped
+    assert third.is_alive()
+    scheduler.release('stress-test')
+    third.join(10)
+    assert not third.is_alive()
+    assert scheduler.stats()['stress-test']['running'] == 2
+
+
+def test_byte_budget_blocks_until_the_bucket_refills():
+    scheduler = FairScheduler(policies={'backfill': TenantPolicy(bytes_per_sec=1000, burst_bytes=1000)})
+    with scheduler.slot('backfill', 1000) as waited:
+        assert waited < 0.1  # the bucket starts full
+    with scheduler.slot('backfill', 500) as waited:
+        assert 0.3 < waited < 2.0  # 500 bytes at 1000 bytes/s
+
+    # An over-budget tenant does not hold up a tenant queued after it
+    scheduler = FairScheduler(max_concurrency=2, policies={'backfill': TenantPolicy(bytes_per_sec=100, burst_bytes=100)})
+    scheduler.acquire('backfill', 100)
+    blocked = threading.Thread(target=scheduler.acquire, args=('backfill', 100))
+    blocked.start()
+    wait_until(lambda: scheduler.stats()['backfill']['queued'] == 1)
+    assert scheduler.acquire('interactive', 10_000) < 0.5
+    assert scheduler.stats()['backfill']['queued'] == 1
+    scheduler.release('interactive')
+    blocked.join(10)
+    assert scheduler.stats()['backfill']['admitted'] == 2
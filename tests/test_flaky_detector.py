@@ -0,0 +1,48 @@
+"""Tests for the streaming flakiness scorer."""
+
+import history_store
+from flaky_detector import FlakinessScorer
+
+
+def run(status: str):
+    return [{'suite': 'api.Client', 'name': 'test_retry', 'status': status, 'duration': 0.1}]
+
+
+def test_same_commit_retry_flips_age_out_of_the_window():
+    scorer = FlakinessScorer(window=4, min_runs=2)
+    scorer.observe_run('org-repo', run('failed'), commit_sha='a')
+    scorer.observe_run('org-repo', run('passed'), commit_sha='a')
+    assert scorer.test_stats(0)['same_commit_retry_flips'] == 1
+
+    for sha in 'bcd':
+        scorer.observe_run('org-repo', run('passed'), commit_sha=sha)
+    assert scorer.test_stats(0)['same_commit_retry_flips'] == 1
+    scorer.observe_run('org-repo', run('passed'), commit_sha='e')
+    stats = scorer.test_stats(0)
+    assert (stats['same_commit_retry_flips'], stats['score']) == (0, 0.0)
+    assert scorer.top_flaky('org-repo') == []
+
+
+def test_top_flaky_names_tests_from_the_store(tmp_path):
+    store = history_store.TestHistoryStore(tmp_path / 'history.db')
+    for n, status in enumerate(['passed', 'failed'] * 3):
+        store.record_run('org-repo', run(status), commit_sha=f'sha{n}', started_at=1000.0 + n)
+
+    scorer = FlakinessScorer()
+    assert scorer.load_from_store(store) == 6
+    [top] = scorer.top_flaky('org-repo')
+    assert (top['suite'], top['name'], top['flips']) == ('api.Client', 'test_retry', 5)
+    store.close()
+
+
+def test_rerun_flips_inside_a_stored_run_count_as_same_commit_retries(tmp_path):
+    store = history_store.TestHistoryStore(tmp_path / 'history.db')
+    for n in range(3):
+        store.record_run('org-repo', run('failed') + run('passed'), commit_sha=f'sha{n}', external_id=str(n),
+                         started_at=1000.0 + n)
+
+    scorer = FlakinessScorer(min_runs=2)
+    assert scorer.load_from_store(store) == 3
+    [top] = scorer.top_flaky('org-repo')
+    assert top['same_commit_retry_flips'] == 3
+    store.close()
@@ -0,0 +1,64 @@
+"""Tests for the sliced GitHub history backfill against GitHubSimulator."""
+
+from datetime import timedelta
+
+from github_backfill import BackfillCheckpoint, GitHubBackfill, _utc, date_slices, parse_date
+from github_simulator import GitHubSimulator
+
+
+def list_history(simulator, since, until, checkpoint):
+    backfill = GitHubBackfill('org/app', base_url=simulator.url, max_workers=4)
+    listed = []
+    for key, runs in backfill.iter_slices(since, until, slice_days=1, checkpoint=checkpoint):
+        listed.extend(run['id'] for run in runs)
+        checkpoint.mark('org/app', key, len(runs))
+    return listed
+
+
+def test_slices_sit_on_a_fixed_grid():
+    day = timedelta(days=1)
+    since = parse_date('2024-03-01T10:30:00Z')
+    slices = date_slices(since, since + 3 * day, slice_days=1)
+    assert slices[-1] == (since, parse_date('2024-03-02T00:00:00Z'))
+    # Starting a day later keeps the boundaries of the cells both ranges share
+    assert date_slices(since + day, since + 3 * day, slice_days=1)[:2] == slices[:2]
+
+
+def test_resumed_backfill_on_a_later_day_only_lists_new_history(tmp_path):
+    simulator = GitHubSimulator(runs_per_repo=300, run_interval=1800, rate_limit=None).start()
+    try:
+        now = _utc(int(simulator.anchor) + 1)
+        checkpoint = BackfillCheckpoint(tmp_path / 'backfill.json')
+        first = list_history(simulator, now - timedelta(days=5), now - timedelta(days=2, hours=5), checkpoint)
+
+        # The next invocation's default range moved: a later since and until
+        resumed = list_history(simulator, now - timedelta(days=4), now, BackfillCheckpoint(tmp_path / 'backfill.json'))
+    finally:
+        simulator.stop()
+
+    assert first and resumed
+    assert not set(first) & set(resumed)
+    assert len(first) + len(resumed) == len(set(first) | set(resumed))
+    expected = {run['id'] for i in range(300) for run in [simulator.run('org/app', i)]
+                if parse_date(run['created_at']) >= now - timedelta(days=5)}
+    assert set(first) | set(resumed) == expected
+
+
+def test_split_slices_list_every_run_once_and_count_what_cannot_be_split():
+    simulator = GitHubSimulator(runs_per_repo=2500, run_interval=1, rate_limit=None).start()
+    try:
+        now = _utc(int(simulator.anchor) + 1)
+        backfill = GitHubBackfill('org/app', base_url=simulator.url, requests_per_hour=10 ** 6)
+        [(_, runs)] = list(backfill.iter_slices(now - timedelta(hours=1), now, slice_days=1))
+        assert backfill.stats['slices_split'] > 0 and backfill.truncated == []
+        assert len(runs) == len({run['id'] for run in runs}) == 2500
+
+        # 2500 runs in well under MIN_SLICE: listed up to the query cap and reported
+        dense = GitHubBackfill('org/dense', base_url=simulator.url, requests_per_hour=10 ** 6)
+        simulator.run_interval = 0.1
+        [(_, runs)] = list(dense.iter_slices(now - timedelta(hours=1), now, slice_days=1))
+    finally:
+        simulator.stop()
+    assert len(runs) == 1000
+    assert (dense.stats['slices_truncated'], dense.stats['runs_truncated']) == (1, 1500)
+    assert dense.truncated and dense.truncated[0].endswith(_utc(int(now.timestamp()) - 1).strftime('%H:%M:%SZ'))
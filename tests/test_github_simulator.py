@@ -0,0 +1,78 @@
+"""Tests for the offline GitHub Actions API simulator."""
+
+import io
+import json
+import urllib.error
+import urllib.request
+import zipfile
+
+import pytest
+
+from github_simulator import GitHubSimulator
+
+
+def get(simulator, path, token='token-a'):
+    request = urllib.request.Request(simulator.url + path, headers={'Authorization': f'Bearer {token}'})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        body = response.read()
+        return (json.loads(body) if response.headers['Content-Type'].startswith('application/json') else body,
+                response.headers)
+
+
+def test_runs_are_deterministic_and_paginated_newest_first():
+    simulator = GitHubSimulator(runs_per_repo=45, rate_limit=None).start()
+    try:
+        first, _ = get(simulator, '/repos/org/app/actions/runs?per_page=30&page=1')
+        second, _ = get(simulator, '/repos/org/app/actions/runs?per_page=30&page=2')
+    finally:
+        simulator.stop()
+    runs = first['workflow_runs'] + second['workflow_runs']
+
+    assert first['total_count'] == 45 and len(runs) == 45
+    assert len({run['id'] for run in runs}) == 45
+    assert [run['created_at'] for run in runs] == sorted((run['created_at'] for run in runs), reverse=True)
+    # Another simulator with the same seed serves the same history
+    again = GitHubSimulator(runs_per_repo=45, rate_limit=None).start()
+    try:
+        assert [again.run('org/app', i)['head_sha'] for i in range(45)] == [run['head_sha'] for run in runs]
+    finally:
+        again.stop()
+
+
+def test_artifact_listing_matches_the_served_zip():
+    simulator = GitHubSimulator(runs_per_repo=5, rate_limit=None, frameworks={'org/app': 'junit'}).start()
+    try:
+        run_id = simulator.run('org/app', 0)['id']
+        listing, _ = get(simulator, f'/repos/org/app/actions/runs/{run_id}/artifacts')
+        artifact = listing['artifacts'][0]
+        # The download redirects to blob storage, as on GitHub
+        archive, _ = get(simulator, artifact['archive_download_url'][len(simulator.url):])
+    finally:
+        simulator.stop()
+
+    assert [a['name'] for a in listing['artifacts']] == ['surefire-reports', 'integration-test-results', 'build-output']
+    assert artifact['size_in_bytes'] == len(archive)
+    with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+        assert zf.namelist() == ['TEST-results.xml']
+        assert zf.read('TEST-results.xml').lstrip().startswith(b'<')
+    assert simulator.summary()['downloads'] == 1
+
+
+def test_rate_limit_is_per_token_and_errors_can_be_injected():
+    simulator = GitHubSimulator(runs_per_repo=5, rate_limit=2).start()
+    try:
+        for remaining in ('1', '0'):
+            _, headers = get(simulator, '/repos/org/app/actions/runs')
+            assert headers['X-RateLimit-Remaining'] == remaining
+        with pytest.raises(urllib.error.HTTPError) as limited:
+            get(simulator, '/repos/org/app/actions/runs')
+        assert limited.value.code == 403 and limited.value.headers['X-RateLimit-Remaining'] == '0'
+        get(simulator, '/repos/org/app/actions/runs', token='token-b')
+
+        simulator.error_rate = 1.0
+        with pytest.raises(urllib.error.HTTPError) as failed:
+            get(simulator, '/repos/org/app/actions/runs', token='token-c')
+        assert failed.value.code in (500, 502)
+    finally:
+        simulator.stop()
+    assert simulator.summary()['rate_limited'] == 1 and simulator.summary()['errors_injected'] == 1
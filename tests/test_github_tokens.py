@@ -0,0 +1,52 @@
+"""Tests for the GitHub token pool's handling of exhausted rate limits."""
+
+import time
+
+import pytest
+import requests
+
+from github_simulator import GitHubSimulator
+from github_tokens import MAX_ATTEMPTS, GitHubTokenPool, RateLimitExhausted
+
+
+class SecondaryLimitedSession(requests.Session):
+    """Answers every request with a secondary rate limit that clears at once."""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        response = requests.Response()
+        response.status_code = 429
+        response.headers['Retry-After'] = '0'
+        response._content = b'{"message": "secondary rate limit"}'
+        return response
+
+
+def test_request_is_refused_when_no_token_frees_up_within_max_park():
+    simulator = GitHubSimulator(runs_per_repo=10, rate_limit=2).start()
+    try:
+        pool = GitHubTokenPool(['token-a'], max_park=5)
+        url = f'{simulator.url}/repos/org/app/actions/runs'
+        assert [pool.get(url).status_code for _ in range(2)] == [200, 200]
+        started = time.monotonic()
+        with pytest.raises(RateLimitExhausted) as exhausted:
+            pool.get(url)
+    finally:
+        simulator.stop()
+
+    # Refused up front: nothing sent, nothing parked
+    assert time.monotonic() - started < 1
+    assert simulator.stats['rate_limited'] == 0
+    assert exhausted.value.retry_at > time.time() + 3000
+
+
+def test_rate_limited_response_is_not_returned_after_max_attempts():
+    session = SecondaryLimitedSession()
+    pool = GitHubTokenPool(['token-a', 'token-b'], session=session)
+    with pytest.raises(RateLimitExhausted):
+        pool.get('https://api.github.invalid/repos/org/app/actions/runs')
+    assert session.requests == MAX_ATTEMPTS
+    assert pool.stats['rate_limited'] == MAX_ATTEMPTS
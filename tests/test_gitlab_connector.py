@@ -0,0 +1,178 @@
+"""Tests for the GitLab CI connector against a fake GitLab API."""
+
+import gzip
+import io
+import json
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from gitlab_connector import GitLabConnector
+
+JUNIT = b'<testsuite name="s" tests="1"><testcase classname="c" name="t"/></testsuite>'
+
+
+class FakeGitLabServer:
+    """
+    Minimal local GitLab API for offline tests.
+
+    projects maps a project path to its pipelines, newest first; each pipeline is a
+    dict with 'status', 'ref', 'sha', 'updated_at', optional 'jobs'
+    {job id: {file name: bytes}}, optional 'test_report' (test_report payload) and
+    optional 'error', an HTTP status to answer the pipeline's report requests with.
+    Listings are served two per page with Link headers to exercise pagination.
+    """
+
+    PAGE_SIZE = 2
+
+    def __init__(self, projects: Dict[str, List[Dict[str, Any]]], host: str = '127.0.0.1', port: int = 0):
+        self.projects = projects
+        self.requests: List[str] = []
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self.url = f'http://{host}:{self._server.server_address[1]}'
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fake.requests.append(self.path)
+                parts = urlsplit(self.path)
+                status, body, headers = fake.route(parts.path, parse_qs(parts.query))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def route(self, path: str, query: Dict[str, List[str]]) -> Tuple[int, bytes, Dict[str, str]]:
+        """Resolve an API path to (status, body, headers)."""
+        segments = path.split('/')
+        if segments[1:4] != ['api', 'v4', 'projects'] or len(segments) < 6:
+            return 404, b'{}', {'Content-Type': 'application/json'}
+        project = unquote(segments[4])
+        pipelines = self.projects.get(project)
+        if pipelines is None:
+            return 404, b'{}', {'Content-Type': 'application/json'}
+        rest = segments[5:]
+
+        if rest == ['pipelines']:
+            page = int(query.get('page', ['1'])[0])
+            start = (page - 1) * self.PAGE_SIZE
+            items = [self._pipeline(project, i) for i in range(start, min(start + self.PAGE_SIZE, len(pipelines)))]
+            headers = {'Content-Type': 'application/json'}
+            if start + self.PAGE_SIZE < len(pipelines):
+                headers['Link'] = f'<{self.url}{path}?page={page + 1}>; rel="next"'
+            return 200, json.dumps(items).encode('utf-8'), headers
+        if len(rest) == 3 and rest[0] == 'pipelines':
+            index = self._pipeline_index(pipelines, rest[1])
+            if index is None:
+                return 404, b'{}', {'Content-Type': 'application/json'}
+            if pipelines[index].get('error'):
+                return pipelines[index]['error'], b'{}', {'Content-Type': 'application/json'}
+            report = pipelines[index].get('test_report', {'test_suites': []})
+            if rest[2] == 'test_report':
+                return 200, json.dumps(report).encode('utf-8'), {'Content-Type': 'application/json'}
+            if rest[2] == 'test_report_summary':
+                return 200, json.dumps(self._summary(pipelines[index])).encode('utf-8'), {'Content-Type': 'application/json'}
+        if len(rest) == 3 and rest[0] == 'jobs' and rest[2] == 'artifacts':
+            for pipeline in pipelines:
+                files = pipeline.get('jobs', {}).get(int(rest[1]))
+                if files is not None:
+                    buffer = io.BytesIO()
+                    with zipfile.ZipFile(buffer, 'w') as zf:
+                        for name, data in files.items():
+                            zf.writestr(name, bytes(data))
+                    return 200, buffer.getvalue(), {'Content-Type': 'application/zip'}
+        return 404, b'{}', {'Content-Type': 'application/json'}
+
+    def _pipeline_index(self, pipelines: List[Dict[str, Any]], pipeline_id: str) -> Optional[int]:
+        index = len(pipelines) - int(pipeline_id) if pipeline_id.isdigit() else -1
+        return index if 0 <= index < len(pipelines) else None
+
+    def _pipeline(self, project: str, index: int) -> Dict[str, Any]:
+        pipelines = self.projects[project]
+        pipeline = pipelines[index]
+        pipeline_id = len(pipelines) - index
+        return {
+            'id': pipeline_id,
+            'iid': pipeline_id,
+            'status': pipeline.get('status', 'success'),
+            'ref': pipeline.get('ref', 'main'),
+            'sha': pipeline.get('sha', f'{pipeline_id:040x}'),
+            'created_at': pipeline.get('created_at', '2024-01-01T00:00:00Z'),
+            'updated_at': pipeline.get('updated_at', '2024-01-01T00:10:00Z'),
+            'web_url': f'{self.url}/{project}/-/pipelines/{pipeline_id}'
+        }
+
+    def _summary(self, pipeline: Dict[str, Any]) -> Dict[str, Any]:
+        jobs = pipeline.get('jobs', {})
+        cases = [c for s in pipeline.get('test_report', {}).get('test_suites', []) for c in s.get('test_cases', [])]
+        count = pipeline.get('test_count', len(cases) or (len(jobs) and 1))
+        return {
+            'total': {'count': count, 'failed': sum(1 for c in cases if c.get('status') == 'failed'), 'error': 0},
+            'test_suites': [{'name': 'test', 'build_ids': sorted(jobs)}] if jobs else [{'name': 'test', 'build_ids': []}]
+        }
+
+    def __enter__(self) -> str:
+        threading.Thread(target=self._server.serve_forever, name='fake-gitlab', daemon=True).start()
+        return self.url
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def test_pipelines_are_known_only_once_their_reports_are_consumed():
+    projects = {'group/app': [{'jobs': {11: {'junit.xml': JUNIT}}}, {'jobs': {12: {'junit.xml': JUNIT}}}]}
+    with FakeGitLabServer(projects) as url:
+        connector = GitLabConnector(url, max_workers=2)
+        known = {}
+        reports = connector.iter_reports(['group/app'], known=known)
+        first_run = next(reports)[0]
+        # The consumer stops here (e.g. its parse raised): nothing has been fully ingested
+        assert known == {}
+        next(reports)
+        assert list(known) == [f"group/app:{first_run['id']}"]
+        assert list(reports) == []
+        assert sorted(known) == ['group/app:1', 'group/app:2']
+        assert connector.stats['requests'] > 0
+
+
+def test_corrupt_gzip_members_are_skipped():
+    files = {'broken-junit.xml.gz': b'not gzip', 'junit.xml.gz': gzip.compress(JUNIT)}
+    with FakeGitLabServer({'group/app': [{'jobs': {7: files}}]}) as url:
+        reports = list(GitLabConnector(url).iter_reports(['group/app']))
+    assert [(name, data) for _, name, data in reports] == [('job-7/junit.xml', JUNIT)]
+
+
+def test_failing_projects_and_pipelines_do_not_abort_the_others():
+    projects = {'group/app': [{'jobs': {21: {'junit.xml': JUNIT}}}, {'error': 500}]}
+    with FakeGitLabServer(projects) as url:
+        connector = GitLabConnector(url, max_workers=2)
+        known = {}
+        reports = list(connector.iter_reports(['group/missing', 'group/app'], known=known))
+
+    assert [name for _, name, _ in reports] == ['job-21/junit.xml']
+    assert list(known) == ['group/app:2']
+    assert (connector.stats['projects_failed'], connector.stats['pipelines_failed']) == (1, 1)
+    assert [error.split(':')[0] for error in sorted(connector.errors)] == ['group/app#1', 'group/missing']
+
+
+def test_reports_inflating_beyond_max_report_bytes_are_skipped():
+    big = b'<testsuite>' + b' ' * 20_000 + b'</testsuite>'
+    files = {'junit.xml': JUNIT, 'big-junit.xml': big, 'bomb-junit.xml.gz': gzip.compress(big)}
+    with FakeGitLabServer({'group/app': [{'jobs': {7: files}}]}) as url:
+        connector = GitLabConnector(url, max_report_bytes=10_000)
+        reports = list(connector.iter_reports(['group/app']))
+
+    assert [(name, data) for _, name, data in reports] == [('job-7/junit.xml', JUNIT)]
+    assert connector.stats['reports_too_large'] == 2
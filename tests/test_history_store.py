@@ -0,0 +1,63 @@
+"""Tests for the SQLite test history store."""
+
+import sqlite3
+
+import history_store
+
+
+def test_repeated_test_identities_keep_every_attempt_with_totals_by_the_last(tmp_path):
+    store = history_store.TestHistoryStore(tmp_path / 'history.db')
+    cases = [
+        {'suite': 'api', 'name': 'test_login', 'status': 'failed', 'duration': 1.0, 'message': 'timeout'},
+        {'suite': 'api', 'name': 'test_logout', 'status': 'passed', 'duration': 0.5},
+        {'suite': 'api', 'name': 'test_login', 'status': 'passed', 'duration': 0.8},  # rerun
+    ]
+    recorded = store.record_run('org-repo', cases)
+
+    assert recorded['retries'] == 1
+    assert (recorded['total'], recorded['passed'], recorded['failed']) == (2, 2, 0)
+    assert [case[1] for case in recorded['cases']] == ['test_login', 'test_logout', 'test_login']
+    assert recorded['last_attempts'] == [1, 2]
+    assert len(set(recorded['test_ids'])) == 2
+    assert [(h['attempt'], h['status']) for h in store.test_history('org-repo', 'test_login')] == [(1, 'passed'), (0, 'failed')]
+    assert store.project_runs('org-repo')[0]['total'] == 2
+    store.close()
+
+
+def test_reports_of_one_ci_run_are_recorded_into_one_run(tmp_path):
+    store = history_store.TestHistoryStore(tmp_path / 'history.db')
+    unit = [{'suite': 'unit', 'name': 'test_a', 'status': 'failed'}]
+    e2e = [{'suite': 'e2e', 'name': 'test_b', 'status': 'passed'}, {'suite': 'unit', 'name': 'test_a', 'status': 'passed'}]
+    first = store.record_run('org-repo', unit, commit_sha='abc', external_id='42')
+    second = store.record_run('org-repo', e2e, commit_sha='abc', external_id='42')
+    rerun = store.record_run('org-repo', unit, commit_sha='abc', external_id='42', run_attempt=2)
+
+    assert first['run_id'] == second['run_id'] != rerun['run_id']
+    assert (second['total'], second['passed'], second['failed']) == (2, 2, 0)
+    assert [(run['external_id'], run['run_attempt'], run['total']) for run in store.project_runs('org-repo')] == \
+        [('42', 2, 1), ('42', 1, 2)]
+    assert [h['attempt'] for h in store.test_history('org-repo', 'test_a')] == [0, 1, 0]
+    store.close()
+
+
+def test_databases_from_before_attempts_are_migrated(tmp_path):
+    path = tmp_path / 'history.db'
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        history_store.SCHEMA.replace('    run_attempt INTEGER NOT NULL DEFAULT 1,\n', '') +
+        'CREATE TABLE case_results (test_id INTEGER NOT NULL, run_id INTEGER NOT NULL, status INTEGER NOT NULL, '
+        'duration REAL, message TEXT, PRIMARY KEY (test_id, run_id)) WITHOUT ROWID;'
+        "INSERT INTO projects (id, name) VALUES (1, 'org-repo');"
+        "INSERT INTO suites (id, project_id, name) VALUES (1, 1, 'api');"
+        "INSERT INTO tests (id, project_id, suite_id, name) VALUES (1, 1, 1, 'test_login');"
+        "INSERT INTO runs (id, project_id, external_id, started_at, total, passed, failed, skipped) "
+        "VALUES (1, 1, '7', 1000.0, 1, 1, 0, 0);"
+        'INSERT INTO case_results VALUES (1, 1, 0, 0.5, NULL);'
+    )
+    conn.close()
+
+    store = history_store.TestHistoryStore(path)
+    store.record_run('org-repo', [{'suite': 'api', 'name': 'test_login', 'status': 'failed'}], external_id='7')
+    assert [(h['run_id'], h['attempt'], h['status']) for h in store.test_history('org-repo', 'test_login')] == \
+        [(1, 1, 'failed'), (1, 0, 'passed')]
+    store.close()
@@ -0,0 +1,42 @@
+"""Tests for stage metrics and their Prometheus exposition."""
+
+import pytest
+
+from instrumentation import Histogram, Metrics
+
+
+def test_disabled_registry_records_nothing():
+    metrics = Metrics()
+    metrics.inc('bytes_downloaded_total', 100)
+    with metrics.span('download'):
+        pass
+    assert metrics.render_prometheus() == '\n'
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    histogram = Histogram(buckets=(1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+    assert histogram.quantile(0.25) == pytest.approx(1.0)
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    assert histogram.quantile(1.0) == pytest.approx(4.0)
+    assert Histogram().quantile(0.99) == 0.0
+
+
+def test_spans_count_errors_and_render_cumulative_buckets():
+    metrics = Metrics(enabled=True)
+    with metrics.span('parse', component='ingestion'):
+        pass
+    with pytest.raises(OSError):
+        with metrics.span('parse', component='ingestion'):
+            raise OSError('truncated report')
+    metrics.inc('bytes_downloaded_total', 2048, component='ingestion')
+
+    text = metrics.render_prometheus()
+    assert 'autotest_bytes_downloaded_total{component="ingestion"} 2048' in text
+    assert 'autotest_stage_errors_total{component="ingestion",stage="parse"} 1' in text
+    assert 'autotest_stage_in_flight{component="ingestion",stage="parse"} 0' in text
+    assert 'autotest_stage_seconds_bucket{component="ingestion",stage="parse",le="+Inf"} 2' in text
+    assert 'autotest_stage_seconds_count{component="ingestion",stage="parse"} 2' in text
+    [summary] = metrics.stage_quantiles().values()
+    assert summary['count'] == 2 and summary['p50'] <= summary['p99']
@@ -0,0 +1,194 @@
+"""Tests for the Jenkins connector against a fake Jenkins JSON API."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import quote, unquote, urlsplit
+from xml.etree import ElementTree
+
+import jenkins_connector
+from jenkins_connector import FAILED_STATUSES, SKIPPED_STATUSES, JenkinsConnector
+
+JUNIT = b'<testsuite name="s" tests="1"><testcase classname="c" name="t"/></testsuite>'
+
+
+class FakeJenkinsServer:
+    """
+    Minimal local Jenkins JSON API for offline tests.
+
+    jobs maps a job path ('team/service') to its builds, oldest first; each build is
+    a dict with 'result', optional 'artifacts' {relative path: bytes}, optional
+    'test_report' (testReport API payload), 'sha' and 'branch'. A build with
+    'status' answers its detail request with that HTTP status, and a 'malformed'
+    one leaves fields out of its detail.
+    """
+
+    def __init__(self, jobs: Dict[str, List[Dict[str, Any]]], host: str = '127.0.0.1', port: int = 0):
+        self.jobs = jobs
+        self.requests: List[str] = []
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self.url = f'http://{host}:{self._server.server_address[1]}/'
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fake.requests.append(self.path)
+                path = unquote(urlsplit(self.path).path)
+                status, body, content_type = fake.route(path)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _job_url(self, name: str) -> str:
+        return self.url + ''.join(f'job/{quote(part)}/' for part in name.split('/'))
+
+    def route(self, path: str) -> Tuple[int, bytes, str]:
+        """Resolve an API path to (status, body, content type)."""
+        segments = [s for s in path.split('/') if s]
+        job_parts = []
+        while len(segments) >= 2 and segments[0] == 'job':
+            job_parts.append(segments[1])
+            segments = segments[2:]
+        job_name = '/'.join(job_parts)
+
+        if segments == ['api', 'json']:
+            if job_name in self.jobs:
+                builds = [self._build_summary(job_name, n) for n in range(len(self.jobs[job_name]), 0, -1)]
+                return self._json({'name': job_parts[-1], 'builds': builds})
+            return self._json({'jobs': self._children(job_name)})
+        if job_name not in self.jobs or not segments or not segments[0].isdigit():
+            return 404, b'not found', 'text/plain'
+
+        number = int(segments[0])
+        builds = self.jobs[job_name]
+        if not 1 <= number <= len(builds):
+            return 404, b'not found', 'text/plain'
+        build = builds[number - 1]
+        rest = segments[1:]
+        if rest == ['api', 'json'] and build.get('status'):
+            return build['status'], b'server error', 'text/plain'
+        if rest == ['api', 'json']:
+            detail = self._build_summary(job_name, number)
+            if build.get('malformed'):
+                del detail['timestamp']
+            detail['artifacts'] = [{'fileName': p.rsplit('/', 1)[-1], 'relativePath': p}
+                                   for p in build.get('artifacts', {})]
+            actions: List[Dict[str, Any]] = [{}]
+            if build.get('sha'):
+                actions.append({'lastBuiltRevision': {'SHA1': build['sha'],
+                                                      'branch': [{'name': f"origin/{build.get('branch', 'main')}"}]}})
+            if build.get('test_report'):
+                cases = [c for s in build['test_report']['suites'] for c in s['cases']]
+                actions.append({'totalCount': len(cases),
+                                'failCount': sum(1 for c in cases if c.get('status') in FAILED_STATUSES),
+                                'skipCount': sum(1 for c in cases if c.get('status') in SKIPPED_STATUSES)})
+            detail['actions'] = actions
+            return self._json(detail)
+        if rest[:1] == ['artifact']:
+            data = build.get('artifacts', {}).get('/'.join(rest[1:]))
+            if data is None:
+                return 404, b'not found', 'text/plain'
+            return 200, bytes(data), 'application/xml'
+        if rest == ['testReport', 'api', 'json'] and build.get('test_report'):
+            return self._json(build['test_report'])
+        return 404, b'not found', 'text/plain'
+
+    def _children(self, folder: str) -> List[Dict[str, Any]]:
+        prefix = f'{folder}/' if folder else ''
+        children: Dict[str, Dict[str, Any]] = {}
+        for name in self.jobs:
+            if not name.startswith(prefix):
+                continue
+            child = name[len(prefix):].split('/', 1)[0]
+            full = prefix + child
+            if full in self.jobs:
+                children[child] = {'_class': 'hudson.model.FreeStyleProject', 'name': child, 'url': self._job_url(full)}
+            else:
+                children[child] = {'_class': 'com.cloudbees.hudson.plugins.folder.Folder', 'name': child,
+                                   'url': self._job_url(full), 'jobs': self._children(full)}
+        return list(children.values())
+
+    def _build_summary(self, job_name: str, number: int) -> Dict[str, Any]:
+        build = self.jobs[job_name][number - 1]
+        return {
+            'number': number,
+            'url': f'{self._job_url(job_name)}{number}/',
+            'result': build.get('result', 'SUCCESS'),
+            'timestamp': build.get('timestamp', 1_700_000_000_000 + number * 60_000),
+            'duration': build.get('duration', 60_000),
+            'building': build.get('building', False)
+        }
+
+    def _json(self, payload: Any) -> Tuple[int, bytes, str]:
+        return 200, json.dumps(payload).encode('utf-8'), 'application/json'
+
+    def __enter__(self) -> str:
+        threading.Thread(target=self._server.serve_forever, name='fake-jenkins', daemon=True).start()
+        return self.url
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+
+def test_reports_from_artifacts_and_the_test_report_api():
+    report = {'suites': [{'name': 'unit', 'duration': 1.0,
+                          'cases': [{'className': 'a.B', 'name': 'test_x', 'status': 'FAILED', 'errorDetails': 'boom'}]}]}
+    jobs = {'team/api': [{'artifacts': {'reports/TEST-api.xml': JUNIT}, 'sha': 'abc', 'branch': 'main'}],
+            'team/web': [{'test_report': report}]}
+    with FakeJenkinsServer(jobs) as url:
+        connector = JenkinsConnector(url, max_workers=2)
+        reports = {(run['name'], name): bytes(data) for run, name, data in connector.iter_reports()}
+
+    assert reports[('team/api', 'reports/TEST-api.xml')] == JUNIT
+    assert b'<failure message="boom">' in reports[('team/web', 'testReport.xml')]
+    assert connector.stats == {'jobs_failed': 0, 'builds': 2, 'builds_failed': 0}
+
+
+def test_failing_builds_are_counted_and_skipped():
+    builds = [{'artifacts': {'TEST-1.xml': JUNIT}}, {'status': 500}, {'malformed': True}, {'artifacts': {'TEST-4.xml': JUNIT}}]
+    with FakeJenkinsServer({'api': builds}) as url:
+        connector = JenkinsConnector(url, max_workers=2)
+        runs = sorted(run['run_number'] for run, _, _ in connector.iter_reports())
+
+    assert runs == [1, 4]
+    assert connector.stats == {'jobs_failed': 0, 'builds': 2, 'builds_failed': 2}
+    assert sorted(error.split(':')[0] for error in connector.errors) == ['api#2', 'api#3']
+
+
+def test_test_report_is_rendered_as_escaped_junit():
+    report = {'suites': [
+        {'name': 'unit <fast>', 'duration': 2.5, 'cases': [
+            {'className': 'a.B', 'name': 'test_ok', 'status': 'PASSED', 'duration': 0.5},
+            {'className': 'a.B', 'name': 'test_"quoted"', 'status': 'REGRESSION',
+             'errorDetails': 'expected 1 < 2\nsecond line', 'errorStackTrace': 'Traceback & <frames>'},
+            {'className': 'a.B', 'name': 'test_bare', 'status': 'FAILED'},
+            {'className': 'a.C', 'name': 'test_later', 'status': 'SKIPPED'},
+        ]},
+        {'cases': []}
+    ]}
+    # Called through the module: pytest would collect a test_* name imported into this file
+    root = ElementTree.fromstring(jenkins_connector.test_report_to_junit(report))
+
+    first, empty = root.findall('testsuite')
+    assert (first.get('name'), first.get('tests'), first.get('failures'), first.get('skipped'), first.get('time')) == \
+        ('unit <fast>', '4', '2', '1', '2.5')
+    ok, regression, bare, skipped = first.findall('testcase')
+    assert (ok.get('time'), list(ok)) == ('0.5', [])
+    failure = regression.find('failure')
+    assert regression.get('name') == 'test_"quoted"'
+    assert failure.get('message') == 'expected 1 < 2' and failure.text == 'Traceback & <frames>'
+    assert bare.find('failure').get('message') == 'failed'
+    assert skipped.find('skipped') is not None
+    assert (empty.get('name'), empty.get('tests')) == ('jenkins', '0')
@@ -0,0 +1,71 @@
+"""Tests for the parser fuzzing harness."""
+
+import json
+import os
+import random
+import time
+
+from parser_fuzzer import Baseline, ParserFuzzer, detect_kind, mutate
+
+SEEDS = {
+    'junit.xml': b'<testsuite name="s" tests="2"><testcase classname="c" name="a"/>'
+                 b'<testcase classname="c" name="b"><failure message="x">boom</failure></testcase></testsuite>',
+    'pytest.json': json.dumps({'tests': [{'nodeid': 't::a', 'outcome': 'passed'}]}).encode()
+}
+
+
+def hostile_target(data):
+    """Fuzz target (resolved in the workers as test_parser_fuzzer:hostile_target)."""
+    if data.startswith(b'HANG'):
+        time.sleep(60)
+    if data.startswith(b'CRASH'):
+        os._exit(3)
+    if data.startswith(b'DEEP'):
+        raise RecursionError('maximum recursion depth exceeded')
+    if data.startswith(b'BAD'):
+        raise ValueError('not a report')
+    return True
+
+
+def test_mutations_suit_the_format_and_replay_from_their_seed():
+    for data in SEEDS.values():
+        kind = detect_kind(data)
+        mutant, applied = mutate(data, random.Random(7))
+        assert kind in ('xml', 'json') and applied
+        assert all(name.startswith((kind, 'bytes_')) for name in applied)
+        assert mutate(data, random.Random(7)) == (mutant, applied)
+
+
+def test_flags_parses_far_above_the_size_normalized_baseline():
+    baseline = Baseline()
+    baseline.fit([{'kind': 'xml', 'size': 1000, 'seconds': 0.01, 'peak': 100_000},
+                  {'kind': 'xml', 'size': 10_000, 'seconds': 0.02, 'peak': 200_000}])
+    # Overhead of the cheapest seed plus the median per-byte rate
+    seconds, peak = baseline.expected('xml', 101_000)
+    assert abs(seconds - 0.111) < 1e-9 and abs(peak - 1_110_000) < 1e-6
+
+    fuzzer = ParserFuzzer(SEEDS, target='test_parser_fuzzer:hostile_target', workers=1)
+    fuzzer.baseline = baseline
+    task = {'outcome': 'ok', 'kind': 'xml', 'size': 101_000, 'seconds': 0.1, 'peak': 1_000_000}
+    assert fuzzer.classify(task) is None
+    assert fuzzer.classify({**task, 'seconds': 5.0}) == 'slow'
+    assert fuzzer.classify({**task, 'peak': 512 * 1024 ** 2}) == 'memory'
+
+
+def test_hangs_crashes_and_fatal_errors_are_recorded_and_workers_replaced(tmp_path):
+    fuzzer = ParserFuzzer(SEEDS, target='test_parser_fuzzer:hostile_target', workers=2, timeout=1.0,
+                          memory_limit=None, findings_dir=tmp_path)
+    inputs = [b'HANG', b'CRASH', b'DEEP', b'BAD', b'<ok/>', b'<ok/>']
+    tasks = ({'id': i, 'data': data, 'kind': detect_kind(data), 'size': len(data)} for i, data in enumerate(inputs))
+    outcomes = {}
+    for task in fuzzer._run(tasks):
+        outcomes[bytes(task['data'])] = task['outcome']
+        reason = fuzzer.classify(task)
+        if reason in ('hang', 'crash', 'fatal'):
+            fuzzer._record(task, reason)
+
+    assert outcomes == {b'HANG': 'hang', b'CRASH': 'crash', b'DEEP': 'fatal', b'BAD': 'rejected', b'<ok/>': 'ok'}
+    findings = [json.loads(line) for line in (tmp_path / 'findings.jsonl').read_text().splitlines()]
+    assert sorted(f['reason'] for f in findings) == ['crash', 'fatal', 'hang']
+    for finding in findings:
+        assert open(finding['input'], 'rb').read() in inputs
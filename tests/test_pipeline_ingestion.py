@@ -0,0 +1,264 @@
+"""Tests for pipeline-ingestion-system.py's long-running modes."""
+
+import io
+import json
+import threading
+import time
+import zipfile
+from types import SimpleNamespace
+from xml.etree import ElementTree
+
+import pytest
+
+import work_queue
+from cli_runner import load_command
+from github_simulator import GitHubSimulator
+from github_tokens import GitHubTokenPool, RateLimitExhausted
+from synthetic_reports import GENERATORS, generate_report
+from upload_service import ReportSpool
+from webhook_receiver import WebhookReceiver
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    """The ingestion script's module, run from a scratch directory."""
+    monkeypatch.chdir(tmp_path)
+    return load_command('ingest')
+
+
+def test_webhook_run_that_fails_to_ingest_can_be_redelivered(pipeline, monkeypatch):
+    system = pipeline.PipelineIngestionSystem()
+    attempts = []
+
+    def ingest(repo_info, run, totals):
+        attempts.append(run['id'])
+        if len(attempts) == 1:
+            raise RuntimeError('artifact download failed')
+        stop.set()
+
+    monkeypatch.setattr(system, '_ingest_github_run', ingest)
+    receiver = WebhookReceiver(None, port=0)
+    stop = threading.Event()
+    assert receiver.offer('org/repo', {'id': 7}, delivery_id='d1') == 'accepted'
+    serving = threading.Thread(target=system.serve_webhooks, args=(receiver,),
+                               kwargs={'reconcile_interval': 0, 'stop_event': stop}, daemon=True)
+    serving.start()
+    receiver.queue.join()
+
+    assert receiver.offer('org/repo', {'id': 7}, delivery_id='d1') == 'accepted'
+    serving.join(10)
+    assert attempts == [7, 7]
+
+
+def test_webhook_mode_requires_a_secret_unless_insecure(pipeline, monkeypatch, capsys):
+    monkeypatch.delenv('WEBHOOK_SECRET', raising=False)
+    with pytest.raises(SystemExit) as exited:
+        pipeline.main(['--webhook-port', '0'])
+    assert exited.value.code == 2
+    assert 'WEBHOOK_SECRET' in capsys.readouterr().err
+
+
+def test_serve_queue_requires_workers(pipeline, monkeypatch, capsys):
+    monkeypatch.setenv('WORK_QUEUE_TOKEN', 'secret')
+    with pytest.raises(SystemExit):
+        pipeline.main(['--serve-queue', '8093'])
+    assert '--serve-queue is only served while --workers run' in capsys.readouterr().err
+
+
+def test_upload_mode_requires_a_token_unless_insecure(pipeline, monkeypatch, capsys):
+    monkeypatch.delenv('UPLOAD_TOKEN', raising=False)
+    with pytest.raises(SystemExit) as exited:
+        pipeline.main(['--upload-port', '0'])
+    assert exited.value.code == 2
+    assert 'UPLOAD_TOKEN' in capsys.readouterr().err
+
+
+class FakeArtifactApi:
+    """Stands in for the GitHub token pool: serves one artifact archive."""
+
+    def __init__(self, archive: bytes):
+        self.archive = archive
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append(kwargs)
+        archive = self.archive
+
+        class Response:
+            content = archive
+
+            def raise_for_status(self):
+                pass
+
+            def iter_content(self, chunk_size):
+                yield archive
+
+        return Response()
+
+
+def zip_of(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_artifact_reports_are_extracted_within_the_size_limit(pipeline, tmp_path):
+    system = pipeline.PipelineIngestionSystem(max_report_bytes=4096)
+    artifact = {'name': 'junit', 'archive_download_url': 'https://api.github.invalid/zip'}
+    report = b'<testsuite/>' * 100
+    system.github = FakeArtifactApi(zip_of({'results/junit.xml': report, 'small.txt': b'x'}))
+    assert system._download_github_artifact(artifact) == report
+    assert system._download_github_artifact(artifact, str(tmp_path)) == report
+
+    system.github = FakeArtifactApi(zip_of({'results/junit.xml': b'\0' * 10_000}))
+    for spool_dir in (None, str(tmp_path)):
+        with pytest.raises(ValueError, match='limit 4096'):
+            system._download_github_artifact(artifact, spool_dir)
+
+
+def test_artifact_download_parks_only_within_the_deadline(pipeline):
+    from ingestion_budget import Deadline
+
+    system = pipeline.PipelineIngestionSystem()
+    report = b'<testsuite/>'
+    system.github = api = FakeArtifactApi(zip_of({'junit.xml': report}))
+    artifact = {'name': 'junit', 'archive_download_url': 'https://api.github.invalid/zip'}
+    assert system._download_github_artifact(artifact, deadline=Deadline(30)) == report
+    [request] = api.requests
+    assert 0 < request['max_park'] <= 30 and request['timeout'] <= 30
+
+
+def budget_results():
+    return {'repositories_processed': 0, 'workflow_runs_processed': 0, 'artifacts_downloaded': 0,
+            'test_cases_ingested': 0, 'frameworks_found': set(), 'errors': []}
+
+
+def test_budgeted_ingestion_keeps_failed_artifacts_and_runs_pending(pipeline, monkeypatch, tmp_path):
+    from ingestion_budget import Deadline, IngestionCheckpoint
+    from results_sink import ResultsSink
+
+    system = pipeline.PipelineIngestionSystem(results_sink=ResultsSink(tmp_path / 'results.ndjson'))
+    run = {'id': 1, 'name': 'CI', 'conclusion': 'failure', 'created_at': '2024-01-01T00:00:00Z'}
+    artifacts = [{'name': 'junit-a', 'size_in_bytes': 100}, {'name': 'junit-b', 'size_in_bytes': 200}]
+    listing = {'fails': True}
+    broken = {'junit-b'}
+
+    def list_artifacts(repo, run_id, max_park=None):
+        if listing['fails']:
+            raise OSError('artifact listing failed')
+        return artifacts
+
+    def process(repo_info, run, artifact, streaming=False, deadline=None):
+        if artifact['name'] in broken:
+            raise OSError('download reset')
+        return {'success': True, 'test_count': 1, 'framework': 'junit', 'parse_time': 0.0}
+
+    monkeypatch.setattr(system, '_get_github_workflow_runs', lambda repo, limit, max_park=None: [run])
+    monkeypatch.setattr(system, '_get_github_artifacts', list_artifacts)
+    monkeypatch.setattr(system, '_process_github_artifact', process)
+    checkpoint_file = tmp_path / 'checkpoint.json'
+    window = lambda: system._ingest_within_budget([{'name': 'org/repo'}], 5, Deadline(60), checkpoint_file,
+                                                  budget_results())
+
+    # The run raised: it stays pending instead of being lost
+    assert window()['runs']['pending'] == 1
+    assert [item['run']['id'] for item in IngestionCheckpoint.load(checkpoint_file).pending] == [1]
+
+    # One artifact errored: only that one is left for the next window
+    listing['fails'] = False
+    coverage = window()
+    assert (coverage['runs']['partial'], coverage['artifacts']['done']) == (1, 1)
+    [item] = IngestionCheckpoint.load(checkpoint_file).pending
+    assert [a['name'] for a in item['artifacts']] == ['junit-b']
+
+    broken.clear()
+    assert window()['runs']['done'] == 1
+    checkpoint = IngestionCheckpoint.load(checkpoint_file)
+    assert checkpoint.pending == [] and checkpoint.done == ['org/repo:1:1']
+
+
+def test_budgeted_ingestion_stops_at_an_exhausted_rate_limit(pipeline, monkeypatch, tmp_path):
+    from ingestion_budget import Deadline, IngestionCheckpoint
+    from results_sink import ResultsSink
+
+    system = pipeline.PipelineIngestionSystem(results_sink=ResultsSink(tmp_path / 'results.ndjson'))
+    runs = [{'id': n, 'name': 'CI', 'conclusion': 'success', 'created_at': f'2024-01-0{n}T00:00:00Z'} for n in (1, 2)]
+    parks = []
+
+    def list_artifacts(repo, run_id, max_park=None):
+        parks.append(max_park)
+        raise RateLimitExhausted(time.time() + 3600)
+
+    monkeypatch.setattr(system, '_get_github_workflow_runs', lambda repo, limit, max_park=None: runs)
+    monkeypatch.setattr(system, '_get_github_artifacts', list_artifacts)
+    checkpoint_file = tmp_path / 'checkpoint.json'
+    results = budget_results()
+    coverage = system._ingest_within_budget([{'name': 'org/repo'}], 5, Deadline(60), checkpoint_file, results)
+
+    # Parks no longer than the budget, stops at the first refusal and keeps every run without using up attempts
+    assert len(parks) == 1 and 0 < parks[0] <= 60
+    assert coverage['runs']['pending'] == 2 and coverage['deadline_hit']
+    assert [item.get('attempts', 0) for item in IngestionCheckpoint.load(checkpoint_file).pending] == [0, 0]
+    assert any('rate limited' in error for error in results['errors'])
+
+
+class StrictOrchestrator:
+    """Parses like the real parser: bytes only, as XML, JSON or go test JSON lines."""
+
+    def parse_report(self, content, request):
+        if not isinstance(content, bytes):
+            raise TypeError(f'expected bytes, got {type(content).__name__}')
+        if content.lstrip().startswith(b'<'):
+            root = ElementTree.fromstring(content)
+            framework, cases = 'xml', len(root.findall('.//testcase') + root.findall('.//test'))
+        else:
+            try:
+                framework, cases = 'json', len(json.loads(content))
+            except json.JSONDecodeError:
+                framework, cases = 'go-test', len([json.loads(line) for line in content.splitlines() if line.strip()])
+        totals = SimpleNamespace(total=cases, passed=cases, failed=0, skipped=0, duration_sec=0.0)
+        return SimpleNamespace(success=True, error=None, run_id='r1', data=SimpleNamespace(framework=framework, totals=totals))
+
+
+@pytest.mark.parametrize('framework', sorted(GENERATORS))
+def test_framework_samples_reach_the_parser_as_bytes(pipeline, monkeypatch, tmp_path, framework):
+    monkeypatch.setattr(pipeline, 'parse_request', lambda **fields: SimpleNamespace(**fields))
+    system = pipeline.PipelineIngestionSystem(download_artifacts=False)
+    system.orchestrator = StrictOrchestrator()
+    result = system._process_github_artifact({'name': 'org/repo', 'framework': framework}, {}, {'name': 'unit-tests'})
+    assert result['success'], result['error']
+    assert result['test_count'] > 0
+
+    # An upload large enough to be spooled to disk
+    spool = ReportSpool(max_memory=16, directory=str(tmp_path))
+    spool.write(generate_report(framework, 'unit-tests'))
+    try:
+        result = system._parse_test_data(spool.source(), 'unit-tests', 'org/repo')
+    finally:
+        spool.close()
+    assert result['success'], result['error']
+
+
+def test_queue_mode_does_not_warm_the_flaky_scorer(pipeline, monkeypatch):
+    def warm(history_store):
+        raise AssertionError('the flaky scorer was warmed')
+
+    monkeypatch.setattr(pipeline, 'warm_flaky_scorer', warm)
+    # Queue mode imports run_worker_pool when it starts
+    monkeypatch.setattr(work_queue, 'run_worker_pool', lambda *args, **kwargs: {'completed': 0, 'failed': 0, 'dead': 0,
+                                                                            'crashed': 0})
+    pipeline.main(['--workers', '1', '--queue', 'queue.db'])
+
+
+def test_exhausted_rate_limit_is_raised_instead_of_ending_the_listing(pipeline):
+    simulator = GitHubSimulator(runs_per_repo=50, rate_limit=1).start()
+    try:
+        ingestion_system = pipeline.PipelineIngestionSystem(github_tokens=GitHubTokenPool(['token-a']),
+                                                            github_api=simulator.url)
+        assert len(ingestion_system._get_github_workflow_runs('org/app', limit=5)) == 5
+        with pytest.raises(RateLimitExhausted):
+            ingestion_system._get_github_workflow_runs('org/app', limit=5, max_park=1.0)
+    finally:
+        simulator.stop()
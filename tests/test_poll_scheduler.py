@@ -0,0 +1,28 @@
+"""Tests for the adaptive polling scheduler."""
+
+from poll_scheduler import PollScheduler
+
+
+def test_runs_are_new_until_ingested_regardless_of_creation_order():
+    scheduler = PollScheduler()
+    scheduler.add(['org/repo'], now=0.0)
+    scheduler.mark_ingested('org/repo', [2])
+    scheduler.observe_runs('org/repo', [200.0])
+    # Run 1 was created before run 2 but finished (and is listed) only now
+    assert scheduler.unseen_runs('org/repo', {1: 100.0, 2: 200.0}) == [1]
+    # Its ingestion failed: it stays new on the next poll
+    assert scheduler.unseen_runs('org/repo', {1: 100.0, 2: 200.0, 3: 300.0}) == [1, 3]
+    scheduler.mark_ingested('org/repo', [1, 3])
+    assert scheduler.unseen_runs('org/repo', {1: 100.0, 2: 200.0, 3: 300.0}) == []
+
+
+def test_state_without_tracked_ids_falls_back_to_last_run_time(tmp_path):
+    scheduler = PollScheduler()
+    scheduler.add(['org/repo'], now=0.0)
+    scheduler.observe_runs('org/repo', [200.0])
+    del scheduler.repos['org/repo']['ingested']
+    scheduler.save(tmp_path / 'state.json')
+
+    loaded = PollScheduler.load(tmp_path / 'state.json')
+    assert loaded.unseen_runs('org/repo', {1: 100.0, 2: 200.0, 3: 300.0}) == [3]
+    assert loaded.unseen_runs('org/repo', {2: 200.0, 3: 300.0}) == [3]
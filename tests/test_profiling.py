@@ -0,0 +1,110 @@
+"""Tests for the per-stage profiler."""
+
+import cProfile
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import profiling
+from profiling import Profiler
+
+
+def parse_in_pool():
+    deadline = time.perf_counter() + 0.2
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def test_threads_started_in_a_stage_are_profiled_and_sampled(tmp_path):
+    profiler = Profiler(tmp_path, sample_interval=0.001, track_allocations=False)
+    with profiler.stage('repository', 'org/app'):
+        assert profiler.current_stage == ('repository', 'org/app')
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix='artifact') as pool:
+            list(pool.map(lambda _: parse_in_pool(), range(2)))
+    assert profiler.current_stage is None
+
+    [stage] = json.loads(profiler.write('test').read_text())['stages']
+    assert any(f['function'].startswith('parse_in_pool ') for f in stage['top_functions'])
+    folded = (tmp_path / 'test.repository.org_app.folded').read_text()
+    assert 'parse_in_pool (test_profiling.py' in folded
+
+
+def test_stages_are_tracked_per_thread(tmp_path):
+    profiler = Profiler(tmp_path, track_allocations=False)
+    seen = {}
+    started = threading.Barrier(2)
+
+    def scenario(name):
+        with profiler.stage('scenario', name):
+            started.wait()
+            seen[name] = profiler.current_stage
+
+    threads = [threading.Thread(target=scenario, args=(name,)) for name in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    profiler.stop()
+    assert seen == {'a': ('scenario', 'a'), 'b': ('scenario', 'b')}
+    assert {key for _, key in profiler.timings} == {'a', 'b'}
+
+
+class SingleSlotProfile(cProfile.Profile):
+    """Mimics Python 3.12+, where only one cProfile can be enabled per interpreter."""
+    holder = None
+    lock = threading.Lock()
+
+    def enable(self, *args, **kwargs):
+        with SingleSlotProfile.lock:
+            if SingleSlotProfile.holder not in (None, self):
+                raise ValueError('Another profiling tool is already active')
+            SingleSlotProfile.holder = self
+        super().enable(*args, **kwargs)
+
+    def disable(self):
+        super().disable()
+        with SingleSlotProfile.lock:
+            if SingleSlotProfile.holder is self:
+                SingleSlotProfile.holder = None
+
+
+def test_single_profiler_slot_falls_back_to_sampling(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling.cProfile, 'Profile', SingleSlotProfile)
+    monkeypatch.setattr(profiling, 'PER_THREAD_PROFILES', False)
+    profiler = Profiler(tmp_path, sample_interval=0.001, track_allocations=False)
+    started = threading.Barrier(2)
+
+    def scenario(name):
+        with profiler.stage('scenario', name):
+            started.wait()
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                list(pool.map(lambda _: parse_in_pool(), range(2)))
+            with profiler.stage('nested', name):
+                sum(range(1000))
+
+    threads = [threading.Thread(target=scenario, args=(name,)) for name in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stages = json.loads(profiler.write('test').read_text())['stages']
+    assert {(s['stage'], s['key']) for s in stages} == {
+        ('scenario', 'a'), ('scenario', 'b'), ('nested', 'a'), ('nested', 'b')}
+    # Pool threads get no profile of their own but are still sampled
+    assert sum(len(profiler.profiles[key]) for key in profiler.profiles) == 4
+    folded = (tmp_path / 'test.scenario.a.folded').read_text() + (tmp_path / 'test.scenario.b.folded').read_text()
+    assert 'parse_in_pool (test_profiling.py' in folded
+
+
+def test_allocation_snapshots_are_sampled(tmp_path):
+    profiler = Profiler(tmp_path, track_allocations=True, allocation_sample_every=4)
+    kept = []
+    for _ in range(10):
+        with profiler.stage('parse', 'report'):
+            kept.append(bytearray(64 * 1024))
+    [stage] = json.loads(profiler.write('test').read_text())['stages']
+    assert stage['calls'] == 10
+    assert stage['allocation_samples'] == 3  # calls 1, 5 and 9
+    assert stage['allocated_kib'] >= 3 * 64
@@ -0,0 +1,36 @@
+"""Tests for the append-only NDJSON results sink."""
+
+from results_sink import ResultsSink, iter_results
+
+
+def test_results_are_appended_per_session_with_running_aggregates(tmp_path):
+    path = tmp_path / 'results.ndjson'
+    with ResultsSink(path, session_id='first') as sink:
+        sink.write({'success': True, 'test_count': 3, 'framework': 'junit', 'parse_time': 0.5, 'repo_name': 'org/app'})
+        sink.write({'success': False, 'error': 'bad xml', 'parse_time': 0.25, 'repo_name': 'org/app'})
+        summary = sink.summary()
+    assert (summary['results'], summary['successes'], summary['failures'], summary['test_cases']) == (2, 1, 1, 3)
+    assert summary['avg_parse_time'] == 0.375
+    assert summary['frameworks'] == {'junit': 1}
+    assert summary['repositories'] == {'org/app': {'results': 2, 'failures': 1, 'test_cases': 3}}
+
+    # A later session appends instead of overwriting
+    with ResultsSink(path, session_id='second') as sink:
+        sink.write({'success': True, 'test_count': 1, 'framework': 'pytest'})
+    assert [r['session_id'] for r in iter_results(path)] == ['first', 'first', 'second']
+    assert [r['framework'] for r in iter_results(path, session_id='second')] == ['pytest']
+
+
+def test_lines_are_synced_in_batches_and_a_torn_last_line_is_skipped(tmp_path):
+    path = tmp_path / 'results.ndjson'
+    sink = ResultsSink(path, fsync_every=2, fsync_interval=3600)
+    sink.write({'success': True, 'test_count': 1})
+    assert path.read_bytes() == b''  # still buffered
+    sink.write({'success': True, 'test_count': 2})
+    assert len(path.read_bytes().splitlines()) == 2
+    sink.close()
+
+    # A crash mid-write leaves a partial line behind
+    with open(path, 'ab') as f:
+        f.write(b'{"success": tr')
+    assert [r['test_count'] for r in iter_results(path)] == [1, 2]
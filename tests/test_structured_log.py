@@ -0,0 +1,51 @@
+"""Tests for the structured logger's process-wide writer."""
+
+import io
+import threading
+
+from structured_log import LogWriter, configure_logging_from_env, get_logger
+
+
+def test_loggers_survive_reconfiguration(tmp_path, monkeypatch):
+    # Long-lived objects (e.g. a cached token pool) keep the logger they were created with
+    monkeypatch.setenv('AUTOTEST_LOG_FILE', str(tmp_path / 'first.log'))
+    configure_logging_from_env()
+    cached = get_logger('cached').bind(job=1)
+    cached.info('job.one', 'first job')
+    cached.flush()
+
+    monkeypatch.setenv('AUTOTEST_LOG_FILE', str(tmp_path / 'second.log'))
+    configure_logging_from_env()
+    cached.info('job.two', 'second job')
+    flushed = threading.Thread(target=cached.flush, daemon=True)
+    flushed.start()
+    flushed.join(10)
+
+    assert not flushed.is_alive(), 'flush hung on a closed writer'
+    assert (tmp_path / 'first.log').read_text() == 'first job\n'
+    assert (tmp_path / 'second.log').read_text() == 'second job\n'
+
+
+def test_failing_stream_drops_lines_without_hanging_flush():
+    class BrokenStream:
+        def write(self, text):
+            raise OSError('No space left on device')
+
+        def flush(self):
+            pass
+
+    writer = LogWriter(BrokenStream())
+    writer.write('lost')
+    flushed = threading.Thread(target=writer.flush, daemon=True)
+    flushed.start()
+    flushed.join(10)
+    assert not flushed.is_alive(), 'flush hung after a failed write'
+    assert writer.dropped == 1
+
+    # The writer thread survived and keeps serving later lines
+    output = io.StringIO()
+    writer.reopen(output)
+    writer.write('kept')
+    writer.flush()
+    assert output.getvalue() == 'kept\n'
+    writer.close()
@@ -0,0 +1,114 @@
+"""Tests for the durable work queue and its worker processes."""
+
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import urllib.error
+from contextlib import contextmanager
+
+import pytest
+
+from structured_log import configure_logging_from_env, get_logger
+from work_queue import QueueServer, RemoteWorkQueue, open_queue, run_worker, run_worker_pool
+
+
+@contextmanager
+def logging_worker(work_queue):
+    """Handlers factory that logs every job and flushes on exit, like ingestion_worker."""
+    log = get_logger('test-worker')
+    try:
+        yield {'echo': lambda job: log.info('job.done', f"job {job['payload']['n']}")}
+    finally:
+        log.flush()
+
+
+def test_worker_pool_runs_to_completion_with_logging_configured(tmp_path, monkeypatch):
+    # The parent's log writer thread does not survive fork; workers must still log and exit
+    monkeypatch.setenv('AUTOTEST_LOG_FILE', str(tmp_path / 'worker.log'))
+    configure_logging_from_env()
+    db = str(tmp_path / 'queue.db')
+    work_queue = open_queue(db)
+    for n in range(5):
+        work_queue.enqueue('echo', {'n': n})
+
+    counts = {}
+    pool = threading.Thread(target=lambda: counts.update(
+        run_worker_pool(db, logging_worker, 2, exit_when_idle=True, idle_sleep=0.05)), daemon=True)
+    pool.start()
+    pool.join(timeout=60)
+    hung = pool.is_alive()
+    for child in multiprocessing.active_children():
+        child.kill()
+
+    assert not hung, 'worker pool did not exit'
+    assert counts['completed'] == 5
+    assert work_queue.stats()['by_status'] == {'done': {'echo': 5}}
+    lines = (tmp_path / 'worker.log').read_text().splitlines()
+    assert sorted(lines) == [f'job {n}' for n in range(5)]
+    work_queue.close()
+
+
+@contextmanager
+def killed_worker(work_queue):
+    """Handlers factory whose process is SIGKILLed mid-job, like an OOM kill."""
+    yield {'echo': lambda job: os.kill(os.getpid(), signal.SIGKILL)}
+
+
+def test_worker_pool_returns_when_a_worker_is_killed(tmp_path):
+    db = str(tmp_path / 'queue.db')
+    work_queue = open_queue(db)
+    work_queue.enqueue('echo', {'n': 1})
+
+    counts = {}
+    pool = threading.Thread(target=lambda: counts.update(
+        run_worker_pool(db, killed_worker, 1, exit_when_idle=True, idle_sleep=0.05)), daemon=True)
+    pool.start()
+    pool.join(timeout=30)
+    hung = pool.is_alive()
+    for child in multiprocessing.active_children():
+        child.kill()
+
+    assert not hung, 'worker pool waited for a killed worker'
+    assert counts == {'completed': 0, 'failed': 0, 'dead': 0, 'crashed': 1}
+    # The job stays leased until its lease expires, then another worker picks it up
+    assert work_queue.stats()['by_status'] == {'leased': {'echo': 1}}
+    work_queue.close()
+
+
+def test_queue_server_requires_the_shared_token(tmp_path, monkeypatch):
+    server = QueueServer(open_queue(str(tmp_path / 'queue.db')), 'secret', port=0).start()
+    url = f'http://127.0.0.1:{server.port}'
+    try:
+        monkeypatch.delenv('WORK_QUEUE_TOKEN', raising=False)
+        with pytest.raises(urllib.error.HTTPError) as rejected:
+            RemoteWorkQueue(url).enqueue('echo', {'n': 1})
+        assert rejected.value.code == 401
+        with pytest.raises(urllib.error.HTTPError):
+            RemoteWorkQueue(url, token='guess').stats()
+
+        monkeypatch.setenv('WORK_QUEUE_TOKEN', 'secret')
+        remote = open_queue(url)
+        remote.enqueue('echo', {'n': 1})
+        assert remote.stats()['pending'] == 1
+    finally:
+        server.stop()
+
+
+def test_failed_job_is_not_retried_before_its_retry_at(tmp_path):
+    class RateLimited(Exception):
+        retry_at = time.time() + 3600
+
+    def fail(job):
+        raise RateLimited('all tokens rate limited')
+
+    work_queue = open_queue(str(tmp_path / 'queue.db'))
+    work_queue.enqueue('echo', {'n': 1})
+    counts = run_worker(work_queue, {'echo': fail}, max_jobs=1)
+
+    assert counts['failed'] == 1
+    assert work_queue.claim('worker', ['echo']) == []
+    available_at = work_queue.conn.execute('SELECT available_at FROM jobs').fetchone()[0]
+    assert available_at >= RateLimited.retry_at
+    work_queue.close()
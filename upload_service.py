@@ -0,0 +1,638 @@
+#!/usr/bin/env python3
+"""
+Report Upload Service
+HTTP endpoint that lets CI agents push test reports directly instead of waiting
+for the ingestion scripts to pull them from GitHub.
+
+    POST /uploads?project=org/repo[&artifact=NAME&branch=B&commit=SHA&build=N&run_id=ID&created_at=ISO&wait=1]
+         body: the report, raw or gzip (Content-Encoding: gzip or gzip magic) or a zip
+         archive (its largest file is parsed), with Content-Length or chunked transfer
+    GET  /uploads/<id>   state of an upload and, once parsed, its parse result
+    GET  /status         counters, uploads in flight and backlog
+
+The body is consumed as it arrives. Chunks are decompressed incrementally and
+spooled to memory, or to a temporary file beyond spool_memory_bytes. JUnit, xUnit,
+NUnit and TRX XML and go test2json output are also counted chunk by chunk, so the
+202 response carries the report's totals as soon as the last byte is in. Zip
+archives need their central directory and are spooled before extraction. Each
+upload is then queued for the parse workers, which run the full parser and hand
+the cases to the storage pipeline. With wait=1 the response waits for that step.
+
+Only the totals are incremental: the parser takes the whole report as bytes, so a
+finished upload is read back once (ReportSpool.source) and parsed in one call.
+The server is a ThreadingHTTPServer (one thread per connection), like the webhook
+receiver and the queue server, rather than an asyncio service: parsing is
+CPU-bound and runs on the worker threads either way, and max_concurrent already
+bounds how many upload threads can be busy receiving at once.
+
+Limits are enforced while reading: raw body size (413), decoded report size
+(413, which also stops zip/gzip bombs) and a socket timeout for stalled clients.
+Backpressure: an upload is admitted only while fewer than max_concurrent uploads are
+being received and the parse backlog has room. Otherwise the service answers 503
+with Retry-After before reading the body. Uploads are authenticated with a bearer
+token; the service listens on loopback unless told otherwise.
+"""
+
+import hmac
+import io
+import itertools
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+import zlib
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from http_limits import MAX_REPORT_BYTES
+from instrumentation import get_metrics
+
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+SPOOL_MEMORY_BYTES = 1024 * 1024
+DEFAULT_MAX_CONCURRENT = 8
+DEFAULT_BACKLOG = 32
+DEFAULT_WORKERS = 2
+DEFAULT_READ_TIMEOUT_SEC = 30.0
+DEFAULT_WAIT_TIMEOUT_SEC = 120.0
+UPLOADS_KEPT = 10_000
+READ_CHUNK = 64 * 1024
+FORMAT_SNIFF_BYTES = 64 * 1024
+GZIP_MAGIC = b'\x1f\x8b'
+ZIP_MAGIC = b'PK\x03\x04'
+GZIP_WBITS = zlib.MAX_WBITS | 16
+
+# Elements that are one test result, and result/outcome attribute values that are not passes
+CASE_TAGS = {'testcase', 'test', 'test-case', 'UnitTestResult'}
+FAILED_RESULTS = {'fail', 'failed', 'failure', 'error', 'timeout', 'aborted'}
+SKIPPED_RESULTS = {'skip', 'skipped', 'ignored', 'notexecuted', 'notrunnable', 'inconclusive', 'pending'}
+
+
+class UploadRejected(Exception):
+    """An upload that cannot be accepted, with the HTTP status to answer."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def iter_body(rfile: BinaryIO, headers: Mapping[str, str], max_bytes: int) -> Iterator[bytes]:
+    """Yield a request body in chunks as it arrives (Content-Length or chunked transfer encoding)."""
+    if 'chunked' in (headers.get('Transfer-Encoding') or '').lower():
+        yield from _iter_chunked(rfile, max_bytes)
+        return
+    if headers.get('Content-Length') is None:
+        raise UploadRejected(411, 'Content-Length or chunked transfer encoding required')
+    try:
+        remaining = int(headers['Content-Length'])
+    except ValueError:
+        raise UploadRejected(400, 'invalid Content-Length')
+    if remaining > max_bytes:
+        raise UploadRejected(413, f'upload exceeds {max_bytes} bytes')
+    while remaining:
+        chunk = rfile.read(min(remaining, READ_CHUNK))
+        if not chunk:
+            raise UploadRejected(400, 'body ended before Content-Length')
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _iter_chunked(rfile: BinaryIO, max_bytes: int) -> Iterator[bytes]:
+    received = 0
+    while True:
+        line = rfile.readline(1024)
+        try:
+            size = int(line.split(b';', 1)[0].strip(), 16)
+        except ValueError:
+            raise UploadRejected(400, 'invalid chunk size')
+        if size == 0:
+            # Trailer headers end with an empty line
+            while rfile.readline(1024).strip():
+                pass
+            return
+        received += size
+        if received > max_bytes:
+            raise UploadRejected(413, f'upload exceeds {max_bytes} bytes')
+        while size:
+            chunk = rfile.read(min(size, READ_CHUNK))
+            if not chunk:
+                raise UploadRejected(400, 'body ended inside a chunk')
+            size -= len(chunk)
+            yield chunk
+        rfile.readline(1024)  # CRLF after the chunk data
+
+
+def decode_report(chunks: Iterator[bytes], content_encoding: Optional[str] = None,
+                  content_type: Optional[str] = None, max_bytes: int = MAX_REPORT_BYTES) -> Tuple[str, Iterator[bytes]]:
+    """
+    Decode an uploaded body chunk by chunk.
+
+    Returns:
+        (compression: 'none', 'gzip' or 'zip', iterator of decoded report chunks);
+        the iterator raises UploadRejected once the decoded size passes max_bytes
+    """
+    chunks = iter(chunks)
+    first = next((chunk for chunk in chunks if chunk), b'')
+    stream = itertools.chain([first], chunks)
+    if first.startswith(ZIP_MAGIC) or 'zip' in (content_type or '').split(';')[0].split('/')[-1]:
+        compression, decoded = 'zip', _unzip(stream)
+    elif first.startswith(GZIP_MAGIC) or (content_encoding or '').lower() in ('gzip', 'x-gzip'):
+        compression, decoded = 'gzip', _gunzip(stream)
+    else:
+        compression, decoded = 'none', stream
+
+    def limited() -> Iterator[bytes]:
+        size = 0
+        for piece in decoded:
+            size += len(piece)
+            if size > max_bytes:
+                raise UploadRejected(413, f'decoded report exceeds {max_bytes} bytes')
+            yield piece
+
+    return compression, limited()
+
+
+def _gunzip(stream: Iterator[bytes]) -> Iterator[bytes]:
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    fed = False
+    try:
+        for chunk in stream:
+            while chunk:
+                fed = True
+                # Output is capped per call, so a bomb cannot expand one chunk all at once
+                piece = decompressor.decompress(chunk, READ_CHUNK)
+                if piece:
+                    yield piece
+                if decompressor.eof:
+                    # Concatenated gzip members continue in unused_data
+                    chunk = decompressor.unused_data
+                    decompressor = zlib.decompressobj(GZIP_WBITS)
+                    fed = False
+                else:
+                    chunk = decompressor.unconsumed_tail
+        piece = decompressor.flush()
+        if piece:
+            yield piece
+    except zlib.error as e:
+        raise UploadRejected(400, f'invalid gzip data: {e}')
+    if fed and not decompressor.eof:
+        raise UploadRejected(400, 'truncated gzip data')
+
+
+def _unzip(stream: Iterator[bytes]) -> Iterator[bytes]:
+    with tempfile.TemporaryFile(prefix='upload-') as archive:
+        for chunk in stream:
+            archive.write(chunk)
+        try:
+            with zipfile.ZipFile(archive) as zf:
+                members = [m for m in zf.infolist() if not m.is_dir()]
+                if not members:
+                    raise UploadRejected(400, 'zip archive has no files')
+                # Same choice as artifact downloads: the largest file is the report
+                with zf.open(max(members, key=lambda m: m.file_size)) as f:
+                    while True:
+                        piece = f.read(READ_CHUNK)
+                        if not piece:
+                            break
+                        yield piece
+        except (zipfile.BadZipFile, zlib.error, NotImplementedError, RuntimeError, EOFError) as e:
+            raise UploadRejected(400, f'invalid zip archive: {e}')
+
+
+class StreamingTotals:
+    """
+    Counts test results while a report streams in: XML reports (JUnit, xUnit, NUnit,
+    TRX) through a pull parser whose finished elements are dropped, and go test2json
+    lines. Other formats (JSON documents) are left to the full parse.
+    """
+
+    def __init__(self):
+        self.format: Optional[str] = None
+        self.error: Optional[str] = None
+        self.counts = {'total': 0, 'passed': 0, 'failed': 0, 'skipped': 0}
+        self._head = b''
+        self._xml = None
+        self._stack = []
+        self._line = b''
+
+    def feed(self, data: bytes):
+        if self.error or self.format in ('json', 'unknown'):
+            return
+        if self.format is None:
+            self._head += data
+            if not self._sniff(final=False):
+                return
+            data, self._head = self._head, b''
+        self._dispatch(data)
+
+    def finish(self) -> Optional[Dict[str, int]]:
+        """End of the report: the totals, or None when the format is not counted while streaming."""
+        if self.format is None:
+            self._sniff(final=True)
+            data, self._head = self._head, b''
+            self._dispatch(data)
+        if self.format == 'xml' and not self.error:
+            try:
+                self._xml.close()
+            except Exception as e:  # ParseError: truncated document
+                self.error = str(e)
+        elif self.format == 'go-test-json':
+            self._feed_lines(b'\n')
+        if self.error or self.format not in ('xml', 'go-test-json'):
+            return None
+        return dict(self.counts)
+
+    def _sniff(self, final: bool) -> bool:
+        """Decide the format from the first bytes; False while more are needed."""
+        head = self._head.lstrip(b'\xef\xbb\xbf \t\r\n')
+        if head.startswith(b'<'):
+            self._start_xml()
+        elif head and not head.startswith(b'{'):
+            self.format = 'unknown'
+        elif b'\n' in head or final or len(self._head) > FORMAT_SNIFF_BYTES:
+            # test2json writes one event object per line; a JSON document's first line is not an event
+            try:
+                first = json.loads(head.split(b'\n', 1)[0])
+            except ValueError:
+                first = None
+            self.format = 'go-test-json' if isinstance(first, dict) and 'Action' in first else 'json'
+        else:
+            return False
+        return True
+
+    def _dispatch(self, data: bytes):
+        if self.format == 'xml':
+            self._feed_xml(data)
+        elif self.format == 'go-test-json':
+            self._feed_lines(data)
+
+    def _start_xml(self):
+        from xml.etree.ElementTree import XMLPullParser  # only when an XML report arrives
+        self.format = 'xml'
+        self._xml = XMLPullParser(events=('start', 'end'))
+
+    def _feed_xml(self, data: bytes):
+        try:
+            self._xml.feed(data)
+            for event, elem in self._xml.read_events():
+                if event == 'start':
+                    self._stack.append(elem)
+                    continue
+                self._stack.pop()
+                tag = elem.tag.rsplit('}', 1)[-1]
+                if tag in CASE_TAGS and (tag != 'test' or elem.get('result') is not None):
+                    self._count_case(elem)
+                    # Drop finished cases so memory stays flat however large the report is
+                    if self._stack:
+                        self._stack[-1].remove(elem)
+        except Exception as e:  # ParseError: malformed XML is left to the full parser
+            self.error = str(e)
+
+    def _count_case(self, elem: Any):
+        result = (elem.get('result') or elem.get('outcome') or '').lower()
+        if not result:
+            children = {child.tag.rsplit('}', 1)[-1] for child in elem}
+            result = 'failed' if children & {'failure', 'error'} else 'skipped' if 'skipped' in children else 'passed'
+        self.counts['total'] += 1
+        if result in FAILED_RESULTS:
+            self.counts['failed'] += 1
+        elif result in SKIPPED_RESULTS:
+            self.counts['skipped'] += 1
+        else:
+            self.counts['passed'] += 1
+
+    def _feed_lines(self, data: bytes):
+        lines = (self._line + data).split(b'\n')
+        self._line = lines.pop()
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(event, dict) and event.get('Test') and event.get('Action') in ('pass', 'fail', 'skip'):
+                self.counts['total'] += 1
+                self.counts[{'pass': 'passed', 'fail': 'failed', 'skip': 'skipped'}[event['Action']]] += 1
+
+
+class ReportSpool:
+    """Decoded report kept in memory up to max_memory bytes and in a temporary file beyond."""
+
+    def __init__(self, max_memory: int = SPOOL_MEMORY_BYTES, directory: Optional[str] = None):
+        self.max_memory = max_memory
+        self.directory = directory
+        self.size = 0
+        self.path: Optional[str] = None
+        self._buffer: Optional[io.BytesIO] = io.BytesIO()
+        self._file: Optional[BinaryIO] = None
+
+    def write(self, data: bytes):
+        if self._file is None and self.size + len(data) > self.max_memory:
+            fd, self.path = tempfile.mkstemp(prefix='upload-', suffix='.report', dir=self.directory)
+            self._file = os.fdopen(fd, 'wb')
+            self._file.write(self._buffer.getbuffer())
+            self._buffer = None
+        (self._file or self._buffer).write(data)
+        self.size += len(data)
+
+    def source(self) -> bytes:
+        """
+        The finished report for the parser, which only takes bytes: a spooled report
+        is read back from its file here, once, as the one in-memory copy parsing needs.
+        """
+        if self._file is not None:
+            self._file.close()
+            with open(self.path, 'rb') as f:
+                return f.read()
+        return self._buffer.getvalue()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self.path:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+        self._buffer = None
+
+
+def upload_limits_from_env() -> Dict[str, Any]:
+    """UploadService limits from UPLOAD_MAX_MB, UPLOAD_MAX_REPORT_MB, UPLOAD_MAX_CONCURRENT, UPLOAD_BACKLOG and UPLOAD_WORKERS."""
+    limits = {}
+    if os.getenv('UPLOAD_MAX_MB'):
+        limits['max_upload_bytes'] = int(float(os.environ['UPLOAD_MAX_MB']) * 1024 * 1024)
+    if os.getenv('UPLOAD_MAX_REPORT_MB'):
+        limits['max_report_bytes'] = int(float(os.environ['UPLOAD_MAX_REPORT_MB']) * 1024 * 1024)
+    for name, key in (('UPLOAD_MAX_CONCURRENT', 'max_concurrent'), ('UPLOAD_BACKLOG', 'max_backlog'),
+                      ('UPLOAD_WORKERS', 'workers')):
+        if os.getenv(name):
+            limits[key] = int(os.environ[name])
+    return limits
+
+
+class UploadService:
+    """HTTP endpoint that streams uploaded reports in and queues them for parsing and storage."""
+
+    def __init__(self, process: Callable[[bytes, Dict[str, Any]], Dict[str, Any]], token: Optional[str] = None,
+                 host: str = '127.0.0.1', port: int = 8088, max_upload_bytes: int = MAX_UPLOAD_BYTES,
+                 max_report_bytes: int = MAX_REPORT_BYTES, max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+                 max_backlog: int = DEFAULT_BACKLOG, workers: int = DEFAULT_WORKERS,
+                 spool_memory_bytes: int = SPOOL_MEMORY_BYTES, spool_dir: Optional[str] = None,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT_SEC):
+        """
+        Initialize the service (call start() or serve_forever() to begin serving).
+
+        Args:
+            process: Parses and stores one report; called on a worker thread with the
+                report and the upload ({'upload_id', 'project', 'artifact', 'run'}),
+                returns the parse result ('success', 'test_count', ...)
+            token: Bearer token uploads must present; unauthenticated uploads are
+                accepted only when this is None
+            host: Interface to bind (loopback by default; bind a public interface only with a token)
+            port: Port to bind (0 picks a free port)
+            max_upload_bytes: Largest request body
+            max_report_bytes: Largest report after decompression
+            max_concurrent: Uploads received at the same time
+            max_backlog: Uploads admitted but not yet parsed and stored (includes those being received)
+            workers: Parse worker threads
+            spool_memory_bytes: Reports above this size are spooled to a temporary file
+            spool_dir: Directory for spool files (system temp directory by default)
+            read_timeout: Seconds a client may stall mid-upload
+        """
+        self.process = process
+        self.token = token
+        self.max_upload_bytes = max_upload_bytes
+        self.max_report_bytes = max_report_bytes
+        self.spool_memory_bytes = spool_memory_bytes
+        self.spool_dir = spool_dir
+        self.workers = workers
+        self.metrics = get_metrics()
+        self.queue: 'queue.Queue[Optional[Dict[str, Any]]]' = queue.Queue()
+        self.stats = {'received': 0, 'accepted': 0, 'rejected': 0, 'busy': 0, 'parsed': 0, 'failed': 0,
+                      'bytes_received': 0, 'bytes_decoded': 0}
+        self._receiving = threading.BoundedSemaphore(max_concurrent)
+        self._backlog = threading.BoundedSemaphore(max_backlog)
+        self._uploads: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._server = ThreadingHTTPServer((host, port), self._handler(read_timeout))
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+
+    def _count(self, key: str, value: int = 1):
+        with self._lock:
+            self.stats[key] += value
+
+    def upload(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """State of a recent upload (None when unknown or evicted)."""
+        with self._lock:
+            state = self._uploads.get(upload_id)
+            return {k: v for k, v in state.items() if not k.startswith('_')} if state else None
+
+    def authorized(self, headers: Mapping[str, str]) -> bool:
+        if self.token is None:
+            return True
+        scheme, _, credentials = (headers.get('Authorization') or '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(credentials.strip().encode(), self.token.encode())
+
+    def receive(self, headers: Mapping[str, str], rfile: BinaryIO, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Stream in one upload and queue it for parsing.
+
+        Returns:
+            (HTTP status, response payload)
+        """
+        self._count('received')
+        if not self.authorized(headers):
+            self._count('rejected')
+            return 401, {'error': 'invalid or missing bearer token'}
+        if not params.get('project'):
+            self._count('rejected')
+            return 400, {'error': 'project query parameter required'}
+        # Admission before reading the body: refused clients retry later instead of queueing here
+        if not self._backlog.acquire(blocking=False):
+            self._count('busy')
+            return 503, {'error': 'parse backlog full'}
+        if not self._receiving.acquire(blocking=False):
+            self._backlog.release()
+            self._count('busy')
+            return 503, {'error': 'too many concurrent uploads'}
+
+        upload_id = uuid.uuid4().hex
+        spool = ReportSpool(self.spool_memory_bytes, self.spool_dir)
+        totals = StreamingTotals()
+        received = 0
+        start = time.perf_counter()
+        admitted = False
+        try:
+            def body() -> Iterator[bytes]:
+                nonlocal received
+                for chunk in iter_body(rfile, headers, self.max_upload_bytes):
+                    received += len(chunk)
+                    yield chunk
+
+            compression, report = decode_report(body(), headers.get('Content-Encoding'), headers.get('Content-Type'),
+                                                self.max_report_bytes)
+            for piece in report:
+                totals.feed(piece)
+                spool.write(piece)
+            if not spool.size:
+                raise UploadRejected(400, 'empty report')
+            admitted = True
+        except UploadRejected as e:
+            self._count('rejected')
+            return e.status, {'error': str(e)}
+        except OSError as e:  # client stalled (socket timeout) or disconnected
+            self._count('rejected')
+            return 400, {'error': f'upload interrupted: {e}'}
+        finally:
+            self._receiving.release()
+            if not admitted:
+                spool.close()
+                self._backlog.release()
+
+        seconds = time.perf_counter() - start
+        streamed = totals.finish()
+        state = {
+            'upload_id': upload_id,
+            'status': 'queued',
+            'project': params['project'],
+            'artifact': params.get('artifact') or 'upload',
+            'bytes_received': received,
+            'bytes_decoded': spool.size,
+            'compression': compression,
+            'format': totals.format,
+            'totals': streamed,
+            'receive_seconds': seconds,
+            'status_url': f'/uploads/{upload_id}',
+            '_spool': spool,
+            '_done': threading.Event(),
+            '_run': {key: params[param] for key, param in (('id', 'run_id'), ('head_branch', 'branch'), ('head_sha', 'commit'),
+                                                            ('run_number', 'build'), ('created_at', 'created_at'))
+                     if params.get(param)}
+        }
+        with self._lock:
+            self._uploads[upload_id] = state
+            while len(self._uploads) > UPLOADS_KEPT:
+                self._uploads.popitem(last=False)
+            self.stats['accepted'] += 1
+            self.stats['bytes_received'] += received
+            self.stats['bytes_decoded'] += spool.size
+        self.metrics.inc('upload_bytes_total', received, component='uploads')
+        self.metrics.observe('upload_receive_seconds', seconds, component='uploads')
+        self.queue.put(state)
+
+        if params.get('wait') in ('1', 'true', 'yes'):
+            if state['_done'].wait(DEFAULT_WAIT_TIMEOUT_SEC):
+                return 200, self.upload(upload_id)
+        return 202, self.upload(upload_id)
+
+    def _work(self):
+        while True:
+            state = self.queue.get()
+            if state is None:
+                return
+            spool = state['_spool']
+            with self._lock:
+                state['status'] = 'parsing'
+            try:
+                result = self.process(spool.source(), {'upload_id': state['upload_id'], 'project': state['project'],
+                                                       'artifact': state['artifact'], 'run': state['_run']})
+                failed = not result.get('success')
+            except Exception as e:
+                result, failed = {'success': False, 'error': str(e)}, True
+            finally:
+                spool.close()
+                self._backlog.release()
+            with self._lock:
+                state['status'] = 'failed' if failed else 'done'
+                state['result'] = result
+                state['_spool'] = None
+                self.stats['failed' if failed else 'parsed'] += 1
+            state['_done'].set()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, 'backlog': self.queue.qsize(),
+                    'in_progress': sum(1 for state in self._uploads.values() if state['status'] in ('queued', 'parsing'))}
+
+    def _handler(self, read_timeout: float):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 so clients sending Expect: 100-continue get an answer
+            protocol_version = 'HTTP/1.1'
+            timeout = read_timeout
+
+            def do_POST(self):
+                url = urlsplit(self.path)
+                if url.path.rstrip('/') != '/uploads':
+                    self.close_connection = True
+                    self._reply(404, {'error': 'not found'})
+                    return
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                status, payload = service.receive(self.headers, self.rfile, params)
+                if status >= 400:
+                    # The rest of a refused body is never read, so this connection cannot be reused
+                    self.close_connection = True
+                self._reply(status, payload, retry_after=status == 503)
+
+            def do_GET(self):
+                path = urlsplit(self.path).path.rstrip('/')
+                if path == '/status':
+                    self._reply(200, service.status())
+                elif path.startswith('/uploads/') and service.upload(path[len('/uploads/'):]):
+                    self._reply(200, service.upload(path[len('/uploads/'):]))
+                else:
+                    self._reply(404, {'error': 'not found'})
+
+            def _reply(self, status: int, payload: Dict[str, Any], retry_after: bool = False):
+                data = json.dumps(payload, default=str).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                if retry_after:
+                    self.send_header('Retry-After', '5')
+                if self.close_connection:
+                    self.send_header('Connection', 'close')
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _start_workers(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'upload-parse-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def start(self) -> 'UploadService':
+        """Serve uploads from a daemon thread."""
+        self._start_workers()
+        threading.Thread(target=self._server.serve_forever, name='upload-http', daemon=True).start()
+        return self
+
+    def serve_forever(self):
+        """Serve uploads in this thread until interrupted."""
+        self._start_workers()
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving, then let the workers finish the queued uploads."""
+        self._server.shutdown()
+        self._server.server_close()
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Warm Process Cache
+Process-wide cache of expensive objects that jobs can reuse: GitHub token pools
+(with their pooled HTTP connections), the history database, the flakiness scorer
+warmed from it, duration baselines and the failure cluster index.
+
+Scripts build these through shared(key, factory). A one-shot invocation builds
+each object once, as before. Inside the autotest-cli.py daemon, later jobs get the
+objects built by earlier ones and skip reconnecting and re-warming. The key
+carries whatever configuration the object depends on (a path, the tokens), so a job
+with other settings gets its own instance.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+_cache: Dict[Hashable, Any] = {}
+_lock = threading.RLock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def shared(key: Hashable, factory: Callable[[], Any]) -> Any:
+    """Object cached under key, built with factory on first request."""
+    with _lock:
+        if key in _cache:
+            _stats['hits'] += 1
+            return _cache[key]
+        _stats['misses'] += 1
+        # Built under the (reentrant) lock: factories may request other shared objects
+        value = _cache[key] = factory()
+        return value
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit/miss counts and the kinds of cached objects (keys may hold credentials, so only their first part)."""
+    with _lock:
+        kinds: Dict[str, int] = {}
+        for key in _cache:
+            kind = str(key[0] if isinstance(key, tuple) else key)
+            kinds[kind] = kinds.get(kind, 0) + 1
+        return {**_stats, 'objects': kinds}
+
+
+def clear_shared():
+    """Drop every cached object, closing those that have close()."""
+    with _lock:
+        for value in _cache.values():
+            close = getattr(value, 'close', None)
+            if callable(close):
+                close()
+        _cache.clear()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Webhook Receiver
+Accepts GitHub workflow_run "completed" webhooks so runs are ingested seconds after
+a build finishes instead of waiting for the next poll.
+
+Deliveries are authenticated with the X-Hub-Signature-256 HMAC, acknowledged
+immediately and handed to the ingestion loop through a bounded queue. Redelivered
+events (same delivery id, or same run and attempt) are dropped by a bounded
+dedupe cache. When the queue is full the receiver answers 503 so bursts apply
+backpressure instead of growing memory; polling remains as a reconciliation
+fallback for anything missed.
+"""
+
+import hashlib
+import hmac
+import json
+import queue
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Hashable, Mapping, Optional
+
+MAX_BODY_BYTES = 5 * 1024 * 1024
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_DEDUPE_SIZE = 50_000
+
+
+def verify_signature(secret: bytes, body: bytes, signature_header: Optional[str]) -> bool:
+    """Check a GitHub X-Hub-Signature-256 header ('sha256=<hex>') against the body."""
+    if not signature_header or not signature_header.startswith('sha256='):
+        return False
+    expected = hmac.new(secret, body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature_header[len('sha256='):])
+
+
+class DedupeCache:
+    """Bounded, thread-safe set of recently seen keys (oldest evicted first)."""
+
+    def __init__(self, max_size: int = DEFAULT_DEDUPE_SIZE):
+        self.max_size = max_size
+        self._keys: 'OrderedDict[Hashable, None]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, *keys: Hashable) -> bool:
+        """Record keys; returns False if any of them was already seen."""
+        with self._lock:
+            if any(key in self._keys for key in keys if key is not None):
+                return False
+            for key in keys:
+                if key is not None:
+                    self._keys[key] = None
+            while len(self._keys) > self.max_size:
+                self._keys.popitem(last=False)
+            return True
+
+    def discard(self, *keys: Hashable):
+        """Forget keys (so a later delivery of the same event is accepted)."""
+        with self._lock:
+            for key in keys:
+                self._keys.pop(key, None)
+
+
+class WebhookReceiver:
+    """HTTP endpoint that turns completed workflow_run events into queued run jobs."""
+
+    def __init__(self, secret: Optional[str], host: str = '127.0.0.1', port: int = 8085,
+                 queue_size: int = DEFAULT_QUEUE_SIZE, dedupe_size: int = DEFAULT_DEDUPE_SIZE):
+        """
+        Initialize the receiver (call start() to begin serving).
+
+        Args:
+            secret: Webhook secret configured on GitHub; unsigned deliveries are
+                accepted only when this is None
+            host: Interface to bind (loopback by default; bind a public interface only with a secret)
+            port: Port to bind (0 picks a free port)
+            queue_size: Runs buffered before deliveries are refused with 503
+            dedupe_size: Delivery/run keys remembered for redelivery detection
+        """
+        self.secret = secret.encode('utf-8') if secret else None
+        self.queue: 'queue.Queue[Dict[str, Any]]' = queue.Queue(maxsize=queue_size)
+        self.seen = DedupeCache(dedupe_size)
+        self.stats = {'received': 0, 'accepted': 0, 'duplicates': 0, 'ignored': 0, 'rejected': 0, 'overflow': 0}
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self.port = self._server.server_address[1]
+
+    @staticmethod
+    def run_key(repo: str, run: Dict[str, Any]) -> tuple:
+        return (repo, run.get('id'), run.get('run_attempt', 1))
+
+    def offer(self, repo: str, run: Dict[str, Any], source: str = 'webhook', delivery_id: Optional[str] = None) -> str:
+        """
+        Enqueue a completed run unless it was already seen.
+
+        Returns:
+            'accepted', 'duplicate' or 'overflow'
+        """
+        key = self.run_key(repo, run)
+        delivery_key = ('delivery', delivery_id) if delivery_id else None
+        if not self.seen.add(key, delivery_key):
+            self.stats['duplicates'] += 1
+            return 'duplicate'
+        try:
+            self.queue.put_nowait({'repo': repo, 'run': run, 'source': source, 'delivery_key': delivery_key})
+        except queue.Full:
+            # Forget the keys so the redelivery (or the next poll) can get through
+            self.seen.discard(key, delivery_key)
+            self.stats['overflow'] += 1
+            return 'overflow'
+        self.stats['accepted'] += 1
+        return 'accepted'
+
+    def handle(self, headers: Mapping[str, str], body: bytes) -> tuple:
+        """
+        Process one delivery.
+
+        Returns:
+            (HTTP status, response message)
+        """
+        self.stats['received'] += 1
+        if self.secret is not None and not verify_signature(self.secret, body, headers.get('X-Hub-Signature-256')):
+            self.stats['rejected'] += 1
+            return 401, 'invalid signature'
+
+        event = headers.get('X-GitHub-Event')
+        if event == 'ping':
+            return 200, 'pong'
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self.stats['rejected'] += 1
+            return 400, 'invalid JSON'
+        if event != 'workflow_run' or payload.get('action') != 'completed':
+            self.stats['ignored'] += 1
+            return 202, 'ignored'
+
+        run = payload.get('workflow_run') or {}
+        repo = (payload.get('repository') or {}).get('full_name')
+        if not repo or not run.get('id'):
+            self.stats['rejected'] += 1
+            return 400, 'missing repository or workflow_run'
+
+        outcome = self.offer(repo, run, delivery_id=headers.get('X-GitHub-Delivery'))
+        if outcome == 'overflow':
+            return 503, 'queue full'
+        return 202, outcome
+
+    def _handler(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length > MAX_BODY_BYTES:
+                    self._reply(413, 'payload too large')
+                    return
+                body = self.rfile.read(length)
+                # self.headers looks names up case-insensitively (proxies may lowercase them)
+                status, message = receiver.handle(self.headers, body)
+                self._reply(status, message, retry_after=status == 503)
+
+            def do_GET(self):
+                body = json.dumps({**receiver.stats, 'queued': receiver.queue.qsize()})
+                self._reply(200, body, content_type='application/json')
+
+            def _reply(self, status: int, message: str, retry_after: bool = False,
+                       content_type: str = 'text/plain; charset=utf-8'):
+                data = message.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                if retry_after:
+                    self.send_header('Retry-After', '5')
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'WebhookReceiver':
+        """Serve deliveries from a daemon thread."""
+        threading.Thread(target=self._server.serve_forever, name='webhook-http', daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+Durable Work Queue
+SQLite-backed job queue for repo/run/artifact ingestion jobs, claimed by any
+number of worker processes.
+
+Claiming a job takes a lease (visibility timeout). A worker that dies without
+completing its job simply lets the lease expire and the job becomes claimable
+again. Failed jobs are retried with exponential backoff and moved to the dead
+letter state after max_attempts. Everything lives in the database file, so
+progress survives restarts.
+
+Every job belongs to a tenant. Claims go to the ready tenant holding the fewest
+leases relative to its weight (and below its concurrency cap, see
+fair_scheduler.TenantPolicy), so one tenant's backfill cannot starve the others;
+how long each job waited is recorded as queue_wait_seconds{tenant=...}.
+
+Workers on one machine share the file directly (WAL mode). For several machines,
+QueueServer exposes the same queue over HTTP and RemoteWorkQueue is a drop-in
+client for it; requests must carry the shared bearer token (WORK_QUEUE_TOKEN).
+"""
+
+import hmac
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import urllib.request
+from queue import Empty
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional
+
+from fair_scheduler import DEFAULT_TENANT, TenantPolicy, tenant_policies_from_env
+from instrumentation import get_metrics
+
+DEFAULT_QUEUE_PATH = 'ingestion-queue.db'
+DEFAULT_LEASE_SEC = 300.0
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY_SEC = 5.0
+RETRY_MAX_DELAY_SEC = 600.0
+POOL_POLL_SEC = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    tenant TEXT NOT NULL DEFAULT 'default',
+    payload TEXT NOT NULL,
+    dedupe_key TEXT UNIQUE,
+    status TEXT NOT NULL DEFAULT 'queued',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(status, lease_expires);
+"""
+
+# Created after the tenant column migration of pre-tenant databases
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, tenant, priority DESC, available_at);
+"""
+
+JOB_COLUMNS = 'id, kind, payload, attempts, max_attempts, priority, tenant'
+READY = "((status = 'queued' AND available_at <= ?) OR (status = 'leased' AND lease_expires < ?))"
+
+
+def default_worker_id() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _job(row: tuple) -> Dict[str, Any]:
+    job_id, kind, payload, attempts, max_attempts, priority, tenant = row
+    return {'id': job_id, 'kind': kind, 'payload': json.loads(payload), 'attempts': attempts,
+            'max_attempts': max_attempts, 'priority': priority, 'tenant': tenant}
+
+
+class WorkQueue:
+    """Lease-based job queue in a SQLite database."""
+
+    def __init__(self, db_path: Any = DEFAULT_QUEUE_PATH, policies: Optional[Dict[str, TenantPolicy]] = None):
+        """
+        Open (or create) the queue database.
+
+        Args:
+            db_path: Path of the SQLite database file
+            policies: Tenant id -> policy (weight, max_concurrency = leases held at once)
+        """
+        self.db_path = str(db_path)
+        self.policies = dict(policies or {})
+        self.default_policy = TenantPolicy()
+        self.metrics = get_metrics()
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(jobs)')}
+        if 'tenant' not in columns:
+            self.conn.execute(f"ALTER TABLE jobs ADD COLUMN tenant TEXT NOT NULL DEFAULT '{DEFAULT_TENANT}'")
+        self.conn.executescript(INDEXES)
+        self._lock = threading.Lock()
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], dedupe_key: Optional[str] = None, priority: int = 0,
+                max_attempts: int = DEFAULT_MAX_ATTEMPTS, delay: float = 0.0,
+                tenant: str = DEFAULT_TENANT) -> Optional[int]:
+        """
+        Add a job.
+
+        Args:
+            kind: Job type ('repo', 'run', 'artifact', ...)
+            payload: JSON-serializable job arguments
+            dedupe_key: Jobs with a key already in the queue (in any state) are not added again
+            priority: Higher priorities are claimed first
+            max_attempts: Attempts before the job is dead-lettered
+            delay: Seconds before the job becomes claimable
+            tenant: Tenant the job is scheduled under
+
+        Returns:
+            Job id, or None if it was a duplicate
+        """
+        return self.enqueue_many([{'kind': kind, 'payload': payload, 'dedupe_key': dedupe_key, 'priority': priority,
+                                   'max_attempts': max_attempts, 'delay': delay, 'tenant': tenant}])[0]
+
+    def enqueue_many(self, jobs: Iterable[Dict[str, Any]]) -> List[Optional[int]]:
+        """Add several jobs (dicts with enqueue()'s arguments) in one transaction."""
+        now = time.time()
+        ids: List[Optional[int]] = []
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute('BEGIN IMMEDIATE')
+            try:
+                for job in jobs:
+                    cur.execute(
+                        'INSERT OR IGNORE INTO jobs (kind, tenant, payload, dedupe_key, priority, max_attempts, '
+                        'available_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        (job['kind'], job.get('tenant') or DEFAULT_TENANT, json.dumps(job['payload'], default=str),
+                         job.get('dedupe_key'),
+                         job.get('priority', 0), job.get('max_attempts', DEFAULT_MAX_ATTEMPTS),
+                         now + job.get('delay', 0.0), now, now)
+                    )
+                    ids.append(cur.lastrowid if cur.rowcount else None)
+                cur.execute('COMMIT')
+            except BaseException:
+                cur.execute('ROLLBACK')
+                raise
+        return ids
+
+    def claim(self, worker_id: str, kinds: Optional[List[str]] = None, lease_sec: float = DEFAULT_LEASE_SEC,
+              limit: int = 1) -> List[Dict[str, Any]]:
+        """
+        Lease up to limit claimable jobs: queued jobs that are due, and leased jobs
+        whose lease has expired (their worker died). Expired jobs that already used
+        all their attempts are dead-lettered instead.
+
+        Slots are handed out one at a time to the ready tenant with the lowest
+        (leases held + 1) / weight that is below its concurrency cap.
+        """
+        now = time.time()
+        kind_filter = ''
+        params: List[Any] = []
+        if kinds:
+            kind_filter = f" AND kind IN ({','.join('?' * len(kinds))})"
+            params = list(kinds)
+
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute('BEGIN IMMEDIATE')
+            try:
+                cur.execute(
+                    "UPDATE jobs SET status = 'dead', last_error = COALESCE(last_error, 'lease expired'), "
+                    "lease_owner = NULL, updated_at = ? "
+                    "WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                    (now, now)
+                )
+                ready = dict(cur.execute(
+                    f"SELECT tenant, COUNT(*) FROM jobs WHERE {READY}{kind_filter} GROUP BY tenant", [now, now, *params]
+                ).fetchall())
+                shares = self._share_slots(cur, ready, now, limit)
+                rows = []
+                for tenant, count in shares.items():
+                    rows += cur.execute(
+                        f"SELECT {JOB_COLUMNS}, available_at FROM jobs WHERE {READY} AND tenant = ?{kind_filter} "
+                        f"ORDER BY priority DESC, available_at, id LIMIT ?",
+                        [now, now, tenant, *params, count]
+                    ).fetchall()
+                cur.executemany(
+                    "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                    "lease_expires = ?, updated_at = ? WHERE id = ?",
+                    [(worker_id, now + lease_sec, now, row[0]) for row in rows]
+                )
+                cur.execute('COMMIT')
+            except BaseException:
+                cur.execute('ROLLBACK')
+                raise
+        jobs = []
+        for row in rows:
+            job = _job(row[:-1])
+            job['attempts'] += 1
+            job['queue_wait'] = max(0.0, now - row[-1])
+            self.metrics.observe('queue_wait_seconds', job['queue_wait'], tenant=job['tenant'], kind=job['kind'])
+            jobs.append(job)
+        return jobs
+
+    def _share_slots(self, cur: sqlite3.Cursor, ready: Dict[str, int], now: float, limit: int) -> Dict[str, int]:
+        """Split limit claims between tenants with ready jobs (weighted least-leased first)."""
+        if len(ready) == 1 and not self.policies:
+            return {tenant: min(count, limit) for tenant, count in ready.items()}
+        leased = dict(cur.execute(
+            "SELECT tenant, COUNT(*) FROM jobs WHERE status = 'leased' AND lease_expires >= ? GROUP BY tenant", (now,)
+        ).fetchall())
+        shares: Dict[str, int] = {}
+        for _ in range(limit):
+            candidates = []
+            for tenant, count in ready.items():
+                policy = self.policies.get(tenant, self.default_policy)
+                held = leased.get(tenant, 0) + shares.get(tenant, 0)
+                if count > shares.get(tenant, 0) and (policy.max_concurrency is None or held < policy.max_concurrency):
+                    candidates.append(((held + 1) / policy.weight, tenant))
+            if not candidates:
+                break
+            tenant = min(candidates)[1]
+            shares[tenant] = shares.get(tenant, 0) + 1
+        return shares
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_sec: float = DEFAULT_LEASE_SEC) -> bool:
+        """Extend a lease; False if the job is no longer leased by this worker."""
+        with self._lock:
+            cur = self.conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time() + lease_sec, time.time(), job_id, worker_id)
+            )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str) -> bool:
+        """Mark a leased job done; False if the lease was lost meanwhile."""
+        with self._lock:
+            cur = self.conn.execute(
+                "UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time(), job_id, worker_id)
+            )
+        return cur.rowcount == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str, retry_at: Optional[float] = None) -> str:
+        """
+        Record a failed attempt: retry with exponential backoff (not before retry_at,
+        e.g. a rate limit reset), or dead-letter the job once it has used max_attempts.
+
+        Returns:
+            New status ('queued' or 'dead'), or '' if the lease was lost meanwhile
+        """
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (job_id, worker_id)
+            ).fetchone()
+            if row is None:
+                return ''
+            attempts, max_attempts = row
+            status = 'dead' if attempts >= max_attempts else 'queued'
+            delay = min(RETRY_MAX_DELAY_SEC, RETRY_BASE_DELAY_SEC * 2 ** (attempts - 1))
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, last_error = ?, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE id = ?",
+                (status, max(now + delay, retry_at or 0.0), error[:2000], now, job_id)
+            )
+        return status
+
+    def requeue_dead(self, kind: Optional[str] = None) -> int:
+        """Give dead-lettered jobs a fresh set of attempts."""
+        query = "UPDATE jobs SET status = 'queued', attempts = 0, available_at = ?, updated_at = ? WHERE status = 'dead'"
+        params: List[Any] = [time.time(), time.time()]
+        if kind:
+            query += ' AND kind = ?'
+            params.append(kind)
+        with self._lock:
+            return self.conn.execute(query, params).rowcount
+
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Dead-lettered jobs with their last error."""
+        rows = self.conn.execute(
+            f"SELECT {JOB_COLUMNS}, last_error FROM jobs WHERE status = 'dead' ORDER BY updated_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [{**_job(row[:-1]), 'last_error': row[-1]} for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counts per status and kind, per tenant and status, plus claimable-now count."""
+        counts: Dict[str, Dict[str, int]] = {}
+        for status, kind, count in self.conn.execute('SELECT status, kind, COUNT(*) FROM jobs GROUP BY status, kind'):
+            counts.setdefault(status, {})[kind] = count
+        tenants: Dict[str, Dict[str, int]] = {}
+        for tenant, status, count in self.conn.execute('SELECT tenant, status, COUNT(*) FROM jobs GROUP BY tenant, status'):
+            tenants.setdefault(tenant, {})[status] = count
+        now = time.time()
+        ready = self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE (status = 'queued' AND available_at <= ?) "
+            "OR (status = 'leased' AND lease_expires < ?)", (now, now)
+        ).fetchone()[0]
+        return {'by_status': counts, 'by_tenant': tenants, 'ready': ready,
+                'pending': sum(sum(kinds.values()) for status, kinds in counts.items() if status in ('queued', 'leased'))}
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RemoteWorkQueue:
+    """Client for a QueueServer, with the same methods as WorkQueue."""
+
+    def __init__(self, url: str, token: Optional[str] = None, timeout: float = 30):
+        """
+        Args:
+            url: QueueServer URL
+            token: The server's shared token (default: WORK_QUEUE_TOKEN)
+            timeout: Per-request timeout in seconds
+        """
+        self.url = url.rstrip('/')
+        self.token = token or os.getenv('WORK_QUEUE_TOKEN')
+        self.timeout = timeout
+
+    def _call(self, method: str, **kwargs: Any) -> Any:
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        request = urllib.request.Request(
+            f'{self.url}/{method}', data=json.dumps(kwargs, default=str).encode('utf-8'),
+            headers=headers, method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], **options: Any) -> Optional[int]:
+        return self._call('enqueue', kind=kind, payload=payload, **options)
+
+    def enqueue_many(self, jobs: Iterable[Dict[str, Any]]) -> List[Optional[int]]:
+        return self._call('enqueue_many', jobs=list(jobs))
+
+    def claim(self, worker_id: str, kinds: Optional[List[str]] = None, lease_sec: float = DEFAULT_LEASE_SEC,
+              limit: int = 1) -> List[Dict[str, Any]]:
+        return self._call('claim', worker_id=worker_id, kinds=kinds, lease_sec=lease_sec, limit=limit)
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_sec: float = DEFAULT_LEASE_SEC) -> bool:
+        return self._call('heartbeat', job_id=job_id, worker_id=worker_id, lease_sec=lease_sec)
+
+    def complete(self, job_id: int, worker_id: str) -> bool:
+        return self._call('complete', job_id=job_id, worker_id=worker_id)
+
+    def fail(self, job_id: int, worker_id: str, error: str, retry_at: Optional[float] = None) -> str:
+        return self._call('fail', job_id=job_id, worker_id=worker_id, error=error, retry_at=retry_at)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._call('stats')
+
+    def close(self):
+        pass
+
+
+class QueueServer:
+    """Serves a WorkQueue over HTTP (POST /<method> with JSON keyword arguments and a bearer token)."""
+
+    METHODS = ('enqueue', 'enqueue_many', 'claim', 'heartbeat', 'complete', 'fail', 'stats')
+
+    def __init__(self, queue: WorkQueue, token: str, host: str = '127.0.0.1', port: int = 8086):
+        """
+        Args:
+            queue: Queue to serve
+            token: Shared bearer token every request must present
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        if not token:
+            raise ValueError('QueueServer needs a shared token (WORK_QUEUE_TOKEN)')
+        self.queue = queue
+        self.token = token
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self.port = self._server.server_address[1]
+
+    def authorized(self, headers: Any) -> bool:
+        scheme, _, credentials = (headers.get('Authorization') or '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(credentials.strip().encode(), self.token.encode())
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if not server.authorized(self.headers):
+                    self.send_error(401)
+                    return
+                method = self.path.strip('/')
+                if method not in server.METHODS:
+                    self.send_error(404)
+                    return
+                kwargs = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                try:
+                    body = json.dumps(getattr(server.queue, method)(**kwargs)).encode('utf-8')
+                    status = 200
+                except (TypeError, ValueError, sqlite3.Error) as e:
+                    body = json.dumps({'error': str(e)}).encode('utf-8')
+                    status = 400
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'QueueServer':
+        threading.Thread(target=self._server.serve_forever, name='queue-http', daemon=True).start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def open_queue(location: str = DEFAULT_QUEUE_PATH) -> Any:
+    """
+    Open a queue from a database path (with AUTOTEST_TENANT_* policies) or a
+    QueueServer URL (authenticated with WORK_QUEUE_TOKEN).
+    """
+    if location.startswith(('http://', 'https://')):
+        return RemoteWorkQueue(location)
+    return WorkQueue(location, tenant_policies_from_env())
+
+
+def run_worker(queue: Any, handlers: Dict[str, Callable[[Dict[str, Any]], None]], worker_id: Optional[str] = None,
+               lease_sec: float = DEFAULT_LEASE_SEC, idle_sleep: float = 1.0, exit_when_idle: bool = False,
+               max_jobs: Optional[int] = None) -> Dict[str, int]:
+    """
+    Claim and execute jobs until stopped.
+
+    A background heartbeat keeps the current job's lease alive, so lease_sec only
+    bounds how long a crashed worker's job stays invisible.
+
+    Args:
+        queue: WorkQueue or RemoteWorkQueue
+        handlers: Job kind -> callable taking the job dict
+        worker_id: Unique worker identity (host:pid by default)
+        lease_sec: Lease length
+        idle_sleep: Seconds to wait when no job is ready
+        exit_when_idle: Return once no job is pending anywhere in the queue
+        max_jobs: Return after this many jobs
+
+    Returns:
+        Counts of completed, failed and dead-lettered jobs
+    """
+    worker_id = worker_id or default_worker_id()
+    counts = {'completed': 0, 'failed': 0, 'dead': 0}
+    kinds = list(handlers)
+    current: Dict[str, Any] = {}
+    stop = threading.Event()
+
+    def heartbeat():
+        while not stop.wait(lease_sec / 3):
+            job_id = current.get('id')
+            if job_id is not None:
+                queue.heartbeat(job_id, worker_id, lease_sec)
+
+    threading.Thread(target=heartbeat, name='lease-heartbeat', daemon=True).start()
+    try:
+        while max_jobs is None or sum(counts.values()) < max_jobs:
+            jobs = queue.claim(worker_id, kinds, lease_sec)
+            if not jobs:
+                if exit_when_idle and not queue.stats()['pending']:
+                    break
+                time.sleep(idle_sleep)
+                continue
+            job = jobs[0]
+            current['id'] = job['id']
+            try:
+                handlers[job['kind']](job)
+            except Exception as e:
+                current['id'] = None
+                # Handlers that know when to try again (RateLimitExhausted) carry retry_at
+                status = queue.fail(job['id'], worker_id, f'{type(e).__name__}: {e}', getattr(e, 'retry_at', None))
+                counts['dead' if status == 'dead' else 'failed'] += 1
+            else:
+                current['id'] = None
+                queue.complete(job['id'], worker_id)
+                counts['completed'] += 1
+    finally:
+        stop.set()
+    return counts
+
+
+def _worker_process(location: str, handlers_factory: Callable[[Any], ContextManager[Dict[str, Callable]]],
+                    index: int, options: Dict[str, Any], results: Any):
+    queue = open_queue(location)
+    try:
+        with handlers_factory(queue) as handlers:
+            results.put((index, run_worker(queue, handlers, worker_id=f'{default_worker_id()}:{index}', **options)))
+    except BaseException:
+        results.put((index, {'completed': 0, 'failed': 0, 'dead': 0, 'crashed': 1}))
+        raise
+    finally:
+        queue.close()
+
+
+def run_worker_pool(location: str, handlers_factory: Callable[[Any], ContextManager[Dict[str, Callable]]],
+                    processes: int, **options: Any) -> Dict[str, int]:
+    """
+    Run worker processes against a queue until they exit (see run_worker options).
+
+    handlers_factory is called inside each process with its own queue connection
+    and returns a context manager yielding the handlers, so every process builds
+    (and cleans up) its own parser, HTTP sessions and database connections. It must
+    be a module-level function so it can be pickled.
+
+    A worker killed before it could report (SIGKILL, the OOM killer) is counted
+    as crashed instead of being waited for; the jobs it held are claimed again
+    once their lease expires.
+
+    Returns:
+        Job counts summed over all workers
+    """
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_worker_process, args=(location, handlers_factory, i, options, results),
+                                name=f'ingest-worker-{i}')
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    reported: Dict[int, Dict[str, int]] = {}
+    while len(reported) < len(workers):
+        try:
+            index, counts = results.get(timeout=POOL_POLL_SEC)
+            reported[index] = counts
+            continue
+        except Empty:
+            pass
+        exited = [i for i, worker in enumerate(workers) if i not in reported and worker.exitcode is not None]
+        if not exited:
+            continue
+        # A worker that reported just before exiting has its counts in the pipe already
+        try:
+            while True:
+                index, counts = results.get(timeout=0.1)
+                reported[index] = counts
+        except Empty:
+            pass
+        for i in exited:
+            reported.setdefault(i, {'completed': 0, 'failed': 0, 'dead': 0, 'crashed': 1})
+    for worker in workers:
+        worker.join()
+    totals = {'completed': 0, 'failed': 0, 'dead': 0, 'crashed': 0}
+    for counts in reported.values():
+        for key, value in counts.items():
+            totals[key] += value
+    return totals